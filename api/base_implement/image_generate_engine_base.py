@@ -3,6 +3,7 @@ import inspect
 
 from langfuse import propagate_attributes
 from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
 import crud
 from common.ai import (
@@ -254,10 +255,11 @@ class ImageGenerateEngineBase(EngineBase):
             user_id=str(user_id),
             tags=[f'model:{model_conf.model_name}']
         ):
-            client = AsyncOpenAI(
-                api_key=model_conf.api_key,
+            lease = await acquire_llm_client(
                 base_url=model_conf.base_url,
+                api_key=model_conf.api_key,
             )
+            client = lease.client
             try:
                 completion = await client.chat.completions.create(
                     model=model_conf.model_name,
@@ -341,4 +343,4 @@ class ImageGenerateEngineBase(EngineBase):
                     plans=plans,
                 )
             finally:
-                await ImageGenerateEngineBase._safe_close_async_client(client)
+                await lease.release()
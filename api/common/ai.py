@@ -1,4 +1,3 @@
-import inspect
 import json
 import asyncio
 import random
@@ -8,6 +7,7 @@ from typing import Any
 import crud
 from langfuse import propagate_attributes
 from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 from prompts.podcast_dialogue import podcast_dialogue_prompt
 from prompts.summary_content import summary_content_prompt
 from prompts.reducer_summary import reducer_summary_prompt
@@ -85,33 +85,6 @@ def build_structured_output_language_instruction(language: int | None) -> str:
     )
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
 def _get_error_status_code(error: Exception) -> int | None:
     status_code = getattr(error, "status_code", None)
     if isinstance(status_code, int):
@@ -259,12 +232,13 @@ async def summary_content(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        owns_client = client is None
+        lease = None
         if client is None:
-            client = AsyncOpenAI(
-                api_key=model_configuration.api_key,
+            lease = await acquire_llm_client(
                 base_url=model_configuration.base_url,
+                api_key=model_configuration.api_key,
             )
+            client = lease.client
         try:
             completion = await _call_with_llm_retry(
                 operation_name="summary_content",
@@ -304,8 +278,8 @@ async def summary_content(
                 summary=summary
             )
         finally:
-            if owns_client:
-                await _safe_close_async_client(client)
+            if lease is not None:
+                await lease.release()
 
 async def reducer_summary(
     user_id: int,
@@ -338,12 +312,13 @@ async def reducer_summary(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        owns_client = client is None
+        lease = None
         if client is None:
-            client = AsyncOpenAI(
-                api_key=model_configuration.api_key,
+            lease = await acquire_llm_client(
                 base_url=model_configuration.base_url,
+                api_key=model_configuration.api_key,
             )
+            client = lease.client
         try:
             completion = await _call_with_llm_retry(
                 operation_name="reducer_summary",
@@ -383,8 +358,8 @@ async def reducer_summary(
                 summary=summary
             )
         finally:
-            if owns_client:
-                await _safe_close_async_client(client)
+            if lease is not None:
+                await lease.release()
 
 
 async def make_section_markdown(
@@ -416,10 +391,11 @@ async def make_section_markdown(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        client = AsyncOpenAI(
-            api_key=model_configuration.api_key,
+        lease = await acquire_llm_client(
             base_url=model_configuration.base_url,
+            api_key=model_configuration.api_key,
         )
+        client = lease.client
         try:
             completion = await _call_with_llm_retry(
                 operation_name="make_section_markdown",
@@ -457,7 +433,7 @@ async def make_section_markdown(
             )
             return sanitize_mermaid_blocks(revised_content)
         finally:
-            await _safe_close_async_client(client)
+            await lease.release()
 
 
 async def revise_section_markdown(
@@ -502,12 +478,13 @@ Draft:
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        owns_client = client is None
+        lease = None
         if client is None:
-            client = AsyncOpenAI(
-                api_key=model_configuration.api_key,
+            lease = await acquire_llm_client(
                 base_url=model_configuration.base_url,
+                api_key=model_configuration.api_key,
             )
+            client = lease.client
         try:
             completion = await _call_with_llm_retry(
                 operation_name="revise_section_markdown",
@@ -538,8 +515,8 @@ Draft:
                 raise Exception("No content returned for ai")
             return content
         finally:
-            if owns_client:
-                await _safe_close_async_client(client)
+            if lease is not None:
+                await lease.release()
 
 
 def _extract_json_object_text(content: str) -> str:
@@ -695,10 +672,11 @@ async def generate_podcast_dialogue_turns(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        client = AsyncOpenAI(
-            api_key=model_configuration.api_key,
+        lease = await acquire_llm_client(
             base_url=model_configuration.base_url,
+            api_key=model_configuration.api_key,
         )
+        client = lease.client
         try:
             completion = await _call_with_llm_retry(
                 operation_name="generate_podcast_dialogue_turns",
@@ -743,4 +721,4 @@ async def generate_podcast_dialogue_turns(
                 speakers=speakers,
             )
         finally:
-            await _safe_close_async_client(client)
+            await lease.release()
@@ -0,0 +1,245 @@
+"""Per-process cache of authenticated principals.
+
+Every authenticated request used to load the user (and, for API-key auth,
+the key) from the database, rewrite the user's timezone in Redis, and open a
+separate write transaction to bump ``api_key.last_used_time``. This module
+keeps those lookups in a small in-process LRU and defers the bookkeeping
+writes:
+
+- users are cached by ``(uuid, auth_epoch)`` for JWT auth and by id for
+  API-key auth, API keys by a digest of the key;
+- each entry remembers the owner's auth version
+  (``auth:user:version:<user_id>`` in Redis) and re-checks it at most every
+  ``AUTH_CACHE_VERSION_CHECK_SECONDS``, the same scheme ``FileSystemProxy``
+  uses for file system clients;
+- any committed ORM update/delete of a ``User`` (``auth_epoch`` bumps,
+  ``is_forbidden`` changes, profile edits) drops that user's local entries
+  and bumps the version so other processes follow. Bulk ``update()``
+  statements bypass the ORM hooks; call ``invalidate_user_auth_cache`` after
+  them (API-key deletion does).
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+import crud
+import models
+from common.logger import exception_logger, format_log_message
+from common.redis import redis_pool
+from data.sql.base import async_session_context
+
+AUTH_CACHE_TTL_SECONDS = 60
+AUTH_CACHE_VERSION_CHECK_SECONDS = 5
+AUTH_CACHE_MAX_ENTRIES = 20000
+AUTH_VERSION_KEY_PREFIX = "auth:user:version:"
+# A user's timezone is rewritten to Redis only when it changed, or when the
+# last write from this process is older than this.
+USER_TIMEZONE_WRITE_REFRESH_SECONDS = 600
+API_KEY_TOUCH_FLUSH_SECONDS = 30
+API_KEY_TOUCH_THROTTLE_SECONDS = 60
+
+_PENDING_USER_IDS_KEY = "auth_cache_changed_user_ids"
+
+
+@dataclass
+class _AuthCacheEntry:
+    value: Any
+    user_id: int
+    version: str
+    expires_at: float
+    checked_at: float
+
+
+_entries: OrderedDict[tuple, _AuthCacheEntry] = OrderedDict()
+_user_timezones: dict[int, tuple[str, float]] = {}
+_pending_api_key_touches: set[int] = set()
+_api_key_touched_at: dict[int, float] = {}
+_last_api_key_flush_at = 0.0
+_background_tasks: set[asyncio.Task] = set()
+
+
+def api_key_cache_key(api_key: str) -> tuple:
+    return ("api_key", hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+
+
+def token_user_cache_key(uuid: str, auth_epoch: int) -> tuple:
+    return ("token_user", uuid, auth_epoch)
+
+
+def user_cache_key(user_id: int) -> tuple:
+    return ("user", user_id)
+
+
+async def get_auth_version(redis_conn: Redis | None, user_id: int) -> str | None:
+    """``None`` when the version cannot be read; such results are not cached."""
+    if redis_conn is None:
+        return None
+    try:
+        return await redis_conn.get(f"{AUTH_VERSION_KEY_PREFIX}{user_id}") or "0"
+    except Exception as e:
+        exception_logger.warning(format_log_message("auth_cache_version_read_failed", error=e))
+        return None
+
+
+async def get_cached_auth_value(
+    key: tuple,
+    *,
+    redis_conn: Redis | None,
+) -> Any | None:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    now = time.monotonic()
+    if entry.expires_at <= now:
+        _entries.pop(key, None)
+        return None
+    if now - entry.checked_at >= AUTH_CACHE_VERSION_CHECK_SECONDS:
+        version = await get_auth_version(redis_conn, entry.user_id)
+        if version != entry.version:
+            _entries.pop(key, None)
+            return None
+        entry.checked_at = now
+    _entries.move_to_end(key)
+    return entry.value
+
+
+def set_cached_auth_value(
+    key: tuple,
+    value: Any,
+    *,
+    user_id: int,
+    version: str | None,
+) -> None:
+    if version is None:
+        return
+    now = time.monotonic()
+    _entries[key] = _AuthCacheEntry(
+        value=value,
+        user_id=user_id,
+        version=version,
+        expires_at=now + AUTH_CACHE_TTL_SECONDS,
+        checked_at=now,
+    )
+    _entries.move_to_end(key)
+    while len(_entries) > AUTH_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def _drop_local_entries(user_ids: set[int]) -> None:
+    for key in [key for key, entry in _entries.items() if entry.user_id in user_ids]:
+        _entries.pop(key, None)
+
+
+async def _bump_auth_versions(user_ids: set[int]) -> None:
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        async with redis_conn.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.incr(f"{AUTH_VERSION_KEY_PREFIX}{user_id}")
+            await pipe.execute()
+    except Exception as e:
+        exception_logger.error(format_log_message("auth_cache_version_bump_failed", error=e))
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def invalidate_user_auth_cache(user_ids: list[int]) -> None:
+    """Drop cached principals of ``user_ids`` in every process."""
+    if not user_ids:
+        return
+    _drop_local_entries(set(user_ids))
+    await _bump_auth_versions(set(user_ids))
+
+
+def _spawn(coro) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return
+    task = loop.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _remember_changed_user(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_USER_IDS_KEY, set()).add(target.id)
+
+
+event.listen(models.user.User, "after_update", _remember_changed_user)
+event.listen(models.user.User, "after_delete", _remember_changed_user)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_PENDING_USER_IDS_KEY, None)
+    if not user_ids:
+        return
+    _drop_local_entries(user_ids)
+    _spawn(_bump_auth_versions(user_ids))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_USER_IDS_KEY, None)
+
+
+def should_write_user_timezone(user_id: int, timezone_name: str) -> bool:
+    now = time.monotonic()
+    written = _user_timezones.get(user_id)
+    if written is not None and written[0] == timezone_name and now - written[1] < USER_TIMEZONE_WRITE_REFRESH_SECONDS:
+        return False
+    _user_timezones[user_id] = (timezone_name, now)
+    return True
+
+
+def forget_user_timezone(user_id: int) -> None:
+    _user_timezones.pop(user_id, None)
+
+
+async def flush_api_key_touches() -> None:
+    """Write the buffered ``last_used_time`` bumps in one statement."""
+    global _last_api_key_flush_at
+    _last_api_key_flush_at = time.monotonic()
+    if not _pending_api_key_touches:
+        return
+    api_key_ids = list(_pending_api_key_touches)
+    _pending_api_key_touches.clear()
+    try:
+        async with async_session_context() as db:
+            await crud.api_key.touch_api_keys_last_used_async(
+                db=db,
+                api_key_ids=api_key_ids,
+                used_time=datetime.now(timezone.utc),
+                throttle_seconds=API_KEY_TOUCH_THROTTLE_SECONDS,
+            )
+            await db.commit()
+    except Exception as e:
+        exception_logger.error(
+            format_log_message("api_key_touch_last_used_failed", count=len(api_key_ids), error=e)
+        )
+
+
+def record_api_key_use(api_key_id: int) -> None:
+    """Buffer a ``last_used_time`` bump; the buffer is flushed in the
+    background at most every ``API_KEY_TOUCH_FLUSH_SECONDS``."""
+    now = time.monotonic()
+    touched_at = _api_key_touched_at.get(api_key_id)
+    if touched_at is not None and now - touched_at < API_KEY_TOUCH_THROTTLE_SECONDS:
+        return
+    _api_key_touched_at[api_key_id] = now
+    _pending_api_key_touches.add(api_key_id)
+    if now - _last_api_key_flush_at >= API_KEY_TOUCH_FLUSH_SECONDS:
+        _spawn(flush_api_key_touches())
@@ -47,6 +47,7 @@ start_process_section_ppt = _task("common.celery.app.start_process_section_ppt")
 update_section_process_status = _task("common.celery.app.update_section_process_status")
 finalize_section_images = _task("common.celery.app.finalize_section_images")
 start_trigger_user_notification_event = _task("common.celery.app.start_trigger_user_notification_event")
+start_migrate_stored_files = _task("common.celery.app.start_migrate_stored_files")
 
 
 def revoke_task(
@@ -19,6 +19,17 @@ from config.base import OFFICIAL, DEPLOY_HOSTS, UNION_PAY_API_PREFIX
 from urllib.parse import urlparse
 from fastapi import Request, HTTPException, status, Depends, Header
 from config.langfuse import LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY
+from common.auth_cache import (
+    api_key_cache_key,
+    forget_user_timezone,
+    get_auth_version,
+    get_cached_auth_value,
+    record_api_key_use,
+    set_cached_auth_value,
+    should_write_user_timezone,
+    token_user_cache_key,
+    user_cache_key,
+)
 from common.env import is_env_disabled, is_env_enabled
 from common.logger import exception_logger, format_log_message
 from common.subscription_access import get_plan_access_level_from_product_uuid
@@ -111,6 +122,43 @@ def _reject_if_stale_auth_epoch(payload: dict, user: models.user.User) -> None:
         )
 
 
+def _get_request_redis(request: Request | None):
+    if request is None:
+        return None
+    return getattr(request.app.state, "redis", None)
+
+
+async def _get_user_for_token(
+    *,
+    request: Request | None,
+    payload: dict,
+    uuid: str,
+) -> models.user.User | None:
+    """Load the token's user through the auth cache; callers still apply the
+    auth-epoch and forbidden checks on the result."""
+    token_auth_epoch = payload.get("auth_epoch")
+    if token_auth_epoch is None:
+        token_auth_epoch = 0
+    redis_conn = _get_request_redis(request)
+    cache_key = token_user_cache_key(uuid, token_auth_epoch)
+    user = await get_cached_auth_value(cache_key, redis_conn=redis_conn)
+    if user is not None:
+        return user
+    async with async_session_context() as db:
+        user = await crud.user.get_user_by_uuid_async(
+            db=db,
+            uuid=uuid,
+        )
+    if user is not None and user.auth_epoch == token_auth_epoch:
+        set_cached_auth_value(
+            cache_key,
+            user,
+            user_id=user.id,
+            version=await get_auth_version(redis_conn, user.id),
+        )
+    return user
+
+
 async def resolve_current_user_from_token(
     *,
     request: Request,
@@ -135,25 +183,25 @@ async def resolve_current_user_from_token(
         )
         raise credentials_exception
 
-    async with async_session_context() as db:
-        user = await crud.user.get_user_by_uuid_async(
-            db=db,
-            uuid=uuid,
-        )
-        if user is None:
-            raise credentials_exception
-        _reject_if_stale_auth_epoch(payload=payload, user=user)
-        if user.is_forbidden:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are forbidden"
-            )
-        await _cache_user_timezone(
-            request=request,
-            user_id=user.id,
-            raw_timezone=raw_timezone,
+    user = await _get_user_for_token(
+        request=request,
+        payload=payload,
+        uuid=uuid,
+    )
+    if user is None:
+        raise credentials_exception
+    _reject_if_stale_auth_epoch(payload=payload, user=user)
+    if user.is_forbidden:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are forbidden"
         )
-        return user
+    await _cache_user_timezone(
+        request=request,
+        user_id=user.id,
+        raw_timezone=raw_timezone,
+    )
+    return user
 
 
 async def _is_admin_or_root_from_authorization_async(
@@ -205,9 +253,12 @@ async def _cache_user_timezone(
     redis_conn = getattr(request.app.state, "redis", None)
     if redis_conn is None:
         return timezone_name
+    if not should_write_user_timezone(user_id, timezone_name):
+        return timezone_name
     try:
         await redis_conn.set(timezone_cache_key(user_id), timezone_name)
     except Exception as e:
+        forget_user_timezone(user_id)
         exception_logger.warning(
             format_log_message(
                 "user_timezone_cache_failed",
@@ -225,28 +276,30 @@ def get_request_timezone(
     return normalize_timezone_name(x_user_timezone)
 
 async def get_api_key(
+    request: Request,
     api_key: str | None = Header(default=None),
     db: AsyncSession = Depends(get_async_db)
 ):
     if api_key is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API Key")
-    db_api_key = await crud.api_key.get_api_key_by_api_key_async(
-        db=db,
-        api_key=api_key,
-    )
+    redis_conn = _get_request_redis(request)
+    cache_key = api_key_cache_key(api_key)
+    db_api_key = await get_cached_auth_value(cache_key, redis_conn=redis_conn)
     if db_api_key is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API Key")
-    try:
-        async with async_session_context() as touch_db:
-            await crud.api_key.touch_api_key_last_used_async(
-                db=touch_db,
-                api_key_id=db_api_key.id,
-            )
-            await touch_db.commit()
-    except Exception as e:
-        exception_logger.error(
-            format_log_message("api_key_touch_last_used_failed", error=e)
+        db_api_key = await crud.api_key.get_api_key_by_api_key_async(
+            db=db,
+            api_key=api_key,
+        )
+        if db_api_key is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API Key")
+        set_cached_auth_value(
+            cache_key,
+            db_api_key,
+            user_id=db_api_key.user_id,
+            version=await get_auth_version(redis_conn, db_api_key.user_id),
         )
+    # last_used_time 在进程内缓冲，后台批量写入
+    record_api_key_use(db_api_key.id)
     return db_api_key
 
 async def get_current_user_with_api_key(
@@ -258,24 +311,34 @@ async def get_current_user_with_api_key(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials"
     )
-    async with async_session_context() as db:
-        user = await crud.user.get_user_by_id_async(
-            db=db,
-            user_id=api_key.user_id,
-        )
+    redis_conn = _get_request_redis(request)
+    cache_key = user_cache_key(api_key.user_id)
+    user = await get_cached_auth_value(cache_key, redis_conn=redis_conn)
+    if user is None:
+        async with async_session_context() as db:
+            user = await crud.user.get_user_by_id_async(
+                db=db,
+                user_id=api_key.user_id,
+            )
         if user is None:
             raise credentials_exception
-        if user.is_forbidden:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are forbidden"
-            )
-        await _cache_user_timezone(
-            request=request,
+        set_cached_auth_value(
+            cache_key,
+            user,
             user_id=user.id,
-            raw_timezone=x_user_timezone,
+            version=await get_auth_version(redis_conn, user.id),
         )
-        return user
+    if user.is_forbidden:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are forbidden"
+        )
+    await _cache_user_timezone(
+        request=request,
+        user_id=user.id,
+        raw_timezone=x_user_timezone,
+    )
+    return user
 
 def _trusted_proxy_count() -> int:
     """Number of trusted reverse-proxy hops in front of the API.
@@ -372,25 +435,25 @@ async def get_current_user_without_throw(
         )
         raise invalid_credentials_exception
 
-    async with async_session_context() as db:
-        user = await crud.user.get_user_by_uuid_async(
-            db=db,
-            uuid=uuid,
-        )
-        if user is None:
-            raise invalid_credentials_exception
-        _reject_if_stale_auth_epoch(payload=payload, user=user)
-        if user.is_forbidden:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are forbidden",
-            )
-        await _cache_user_timezone(
-            request=request,
-            user_id=user.id,
-            raw_timezone=x_user_timezone,
+    user = await _get_user_for_token(
+        request=request,
+        payload=payload,
+        uuid=uuid,
+    )
+    if user is None:
+        raise invalid_credentials_exception
+    _reject_if_stale_auth_epoch(payload=payload, user=user)
+    if user.is_forbidden:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are forbidden",
         )
-        return user
+    await _cache_user_timezone(
+        request=request,
+        user_id=user.id,
+        raw_timezone=x_user_timezone,
+    )
+    return user
 
 async def get_current_user(
     request: Request,
@@ -418,25 +481,25 @@ async def get_current_user(
             format_log_message("token_decode_failed", source="required_auth", error=e)
         )
         raise credentials_exception
-    async with async_session_context() as db:
-        user = await crud.user.get_user_by_uuid_async(
-            db=db,
-            uuid=uuid,
-        )
-        if user is None:
-            raise credentials_exception
-        _reject_if_stale_auth_epoch(payload=payload, user=user)
-        if user.is_forbidden:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are forbidden"
-            )
-        await _cache_user_timezone(
-            request=request,
-            user_id=user.id,
-            raw_timezone=x_user_timezone,
+    user = await _get_user_for_token(
+        request=request,
+        payload=payload,
+        uuid=uuid,
+    )
+    if user is None:
+        raise credentials_exception
+    _reject_if_stale_auth_epoch(payload=payload, user=user)
+    if user.is_forbidden:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are forbidden"
         )
-        return user
+    await _cache_user_timezone(
+        request=request,
+        user_id=user.id,
+        raw_timezone=x_user_timezone,
+    )
+    return user
 
 
 async def get_current_user_short_lived(
@@ -0,0 +1,170 @@
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+
+from common.logger import exception_logger, format_log_message
+from common.redis import redis_pool
+
+DOCUMENT_COUNT_CACHE_KEY_PREFIX = "document:count:"
+DOCUMENT_COUNT_VERSION_KEY_PREFIX = "document:count:version:"
+# Entries are keyed by the user's count version, which is bumped when the
+# user's own documents, reads or stars change; the TTL bounds how stale a
+# count can get through changes made elsewhere (collaborators, the worker).
+DOCUMENT_COUNT_CACHE_TTL_SECONDS = 120
+
+
+def document_count_cache_key(
+    *,
+    version: str,
+    user_id: int,
+    scope: str,
+    keyword: str | None,
+    label_ids: list[int] | None,
+) -> str:
+    filters = json.dumps(
+        {
+            "keyword": keyword or None,
+            "label_ids": sorted(label_ids) if label_ids is not None else None,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(filters.encode("utf-8")).hexdigest()
+    return f"{DOCUMENT_COUNT_CACHE_KEY_PREFIX}{user_id}:v{version}:{scope}:{digest}"
+
+
+async def get_cached_document_count(
+    *,
+    user_id: int,
+    scope: str,
+    keyword: str | None,
+    label_ids: list[int] | None,
+) -> tuple[str, int | None]:
+    """Return ``(version, count)`` with ``count`` ``None`` on a miss. Pass
+    ``version`` back to ``set_cached_document_count``."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        version = await redis_conn.get(f"{DOCUMENT_COUNT_VERSION_KEY_PREFIX}{user_id}") or "0"
+        raw = await redis_conn.get(
+            document_count_cache_key(
+                version=version,
+                user_id=user_id,
+                scope=scope,
+                keyword=keyword,
+                label_ids=label_ids,
+            )
+        )
+        return version, int(raw) if raw is not None else None
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "document_count_cache_read_failed",
+                user_id=user_id,
+                scope=scope,
+                error=e,
+            )
+        )
+        return "", None
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def set_cached_document_count(
+    *,
+    version: str,
+    user_id: int,
+    scope: str,
+    keyword: str | None,
+    label_ids: list[int] | None,
+    count: int,
+) -> None:
+    if not version:
+        return
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.set(
+            document_count_cache_key(
+                version=version,
+                user_id=user_id,
+                scope=scope,
+                keyword=keyword,
+                label_ids=label_ids,
+            ),
+            count,
+            ex=DOCUMENT_COUNT_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "document_count_cache_write_failed",
+                user_id=user_id,
+                scope=scope,
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def resolve_user_document_count(
+    *,
+    user_id: int,
+    scope: str,
+    keyword: str | None,
+    label_ids: list[int] | None,
+    start: int | None,
+    count_on_first_page_only: bool,
+    count: Callable[[], Awaitable[int]],
+) -> int | None:
+    """Total for an infinite-scroll list, served from the per-user count
+    cache. With ``count_on_first_page_only`` later pages never run the count
+    query; they report the cached total, or ``None`` (unknown) once it has
+    expired."""
+    version, cached = await get_cached_document_count(
+        user_id=user_id,
+        scope=scope,
+        keyword=keyword,
+        label_ids=label_ids,
+    )
+    if cached is not None:
+        return cached
+    if count_on_first_page_only and start is not None:
+        return None
+    total = int(await count())
+    await set_cached_document_count(
+        version=version,
+        user_id=user_id,
+        scope=scope,
+        keyword=keyword,
+        label_ids=label_ids,
+        count=total,
+    )
+    return total
+
+
+async def bump_document_count_version(user_ids: list[int]) -> None:
+    """Invalidate every cached document count of ``user_ids``. Call after the
+    change has been committed."""
+    if not user_ids:
+        return
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        async with redis_conn.pipeline(transaction=False) as pipe:
+            for user_id in set(user_ids):
+                pipe.incr(f"{DOCUMENT_COUNT_VERSION_KEY_PREFIX}{user_id}")
+            await pipe.execute()
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "document_count_cache_invalidate_failed",
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
@@ -13,6 +13,7 @@ from common.apscheduler.app import scheduler
 from common.celery.app import start_process_document, start_process_section
 from common.encrypt import encrypt_share_access_key
 from common.file import register_remote_file
+from common.document_count_cache import bump_document_count_version
 from common.resource_plan_access import ensure_engine_access, ensure_model_access
 from common.stt_capability import engine_supports_meeting_mode
 from common.section_schedule import build_day_section_trigger
@@ -593,6 +594,7 @@ async def create_document_for_user(
             db_publish_document.access_key_encrypted = encrypt_share_access_key(access_key)
 
     await db.commit()
+    await bump_document_count_version([user.id])
     _schedule_section_process_for_today_section(
         db_section=db_today_section,
         section_date=summary_date,
@@ -1,14 +1,294 @@
+"""Engine concurrency slots shared by every api / worker process.
+
+``EngineBase.set_concurrency_control`` caps how many calls of one engine run
+at the same time (provider limits such as Volc TTS or MinerU). Slots are a
+fair (FIFO) semaphore in Redis: waiters take a ticket and are admitted in
+ticket order, holders keep a lease that is renewed while the call runs, so a
+crashed process gives its slot back once the lease expires. Waiting is a
+plain ``asyncio.sleep`` poll — no thread is parked per waiter.
+
+``ENGINE_CONCURRENCY_BACKEND=local`` (or Redis being unreachable) falls back
+to the old per-process semaphore.
+
+Per-queue counters are logged as ``engine_concurrency_stats`` events at most
+every ``ENGINE_CONCURRENCY_STATS_LOG_SECONDS``, together with the
+cluster-wide holders / waiters when the Redis backend is in use.
+"""
 from __future__ import annotations
 
 import asyncio
+import random
 import threading
+import time
+import uuid
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from common.logger import exception_logger, info_logger, log_event
+from common.redis import redis_pool
+from config.engine import (
+    ENGINE_CONCURRENCY_BACKEND,
+    ENGINE_CONCURRENCY_LEASE_SECONDS,
+    ENGINE_CONCURRENCY_STATS_LOG_SECONDS,
+)
+
+ENGINE_SLOT_KEY_PREFIX = "engine:concurrency:"
+# A waiter that has not polled for this long is considered gone (crashed
+# process / killed task) and is dropped from the queue.
+ENGINE_SLOT_WAITER_TTL_MS = 10_000
+ENGINE_SLOT_KEY_TTL_MS = 24 * 3600 * 1000
+ENGINE_SLOT_POLL_MIN_SECONDS = 0.05
+ENGINE_SLOT_POLL_MAX_SECONDS = 0.5
+# Waits longer than this are logged as ``engine_slot_wait`` events.
+ENGINE_SLOT_SLOW_WAIT_MS = 1000.0
+
+# KEYS: waiters (token -> ticket), heartbeats (token -> last poll ms),
+#       holders (token -> lease expiry ms), ticket sequence
+# ARGV: token, limit, lease ms, waiter ttl ms, key ttl ms
+# Returns {granted, position in queue}. Uses the Redis server clock so lease
+# expiry does not depend on clock skew between pods.
+_ACQUIRE_SLOT_LUA = """
+local token = ARGV[1]
+local limit = tonumber(ARGV[2])
+local lease_ms = tonumber(ARGV[3])
+local waiter_ttl = tonumber(ARGV[4])
+local key_ttl = tonumber(ARGV[5])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now - waiter_ttl)
+for _, stale_token in ipairs(stale) do
+  redis.call('ZREM', KEYS[1], stale_token)
+  redis.call('ZREM', KEYS[2], stale_token)
+end
+
+if not redis.call('ZSCORE', KEYS[1], token) then
+  redis.call('ZADD', KEYS[1], redis.call('INCR', KEYS[4]), token)
+end
+redis.call('ZADD', KEYS[2], now, token)
+
+local position = redis.call('ZRANK', KEYS[1], token)
+local granted = 0
+if position < limit - redis.call('ZCARD', KEYS[3]) then
+  redis.call('ZREM', KEYS[1], token)
+  redis.call('ZREM', KEYS[2], token)
+  redis.call('ZADD', KEYS[3], now + lease_ms, token)
+  granted = 1
+end
+for i = 1, 4 do
+  redis.call('PEXPIRE', KEYS[i], key_ttl)
+end
+return {granted, position}
+"""
+
+# KEYS: holders; ARGV: token, lease ms. Returns 0 when the lease was lost.
+_RENEW_SLOT_LUA = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+  return 0
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
 
+@dataclass
+class _EngineQueueStats:
+    waiting: int = 0
+    in_flight: int = 0
+    acquired: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    lease_lost: int = 0
+    local_fallbacks: int = 0
+
+
+_STATS_LOCK = threading.Lock()
+_STATS: dict[str, _EngineQueueStats] = {}
+_last_stats_log_at = time.monotonic()
 
 _SEMAPHORE_LOCK = threading.Lock()
 _SEMAPHORE_REGISTRY: dict[str, tuple[int, threading.BoundedSemaphore]] = {}
 
 
+def _update_stats(queue_key: str, **deltas: float) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(queue_key, _EngineQueueStats())
+        for name, delta in deltas.items():
+            setattr(stats, name, getattr(stats, name) + delta)
+
+
+def _record_acquired(queue_key: str, wait_ms: float) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(queue_key, _EngineQueueStats())
+        stats.waiting -= 1
+        stats.in_flight += 1
+        stats.acquired += 1
+        stats.total_wait_ms += wait_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+
+
+def engine_concurrency_stats() -> dict[str, dict[str, float | int]]:
+    """Per-queue counters for this process (waiting / in-flight / wait time)."""
+    with _STATS_LOCK:
+        return {
+            queue_key: {
+                "waiting": stats.waiting,
+                "in_flight": stats.in_flight,
+                "acquired": stats.acquired,
+                "avg_wait_ms": round(stats.total_wait_ms / stats.acquired, 2) if stats.acquired else 0.0,
+                "max_wait_ms": round(stats.max_wait_ms, 2),
+                "lease_lost": stats.lease_lost,
+                "local_fallbacks": stats.local_fallbacks,
+            }
+            for queue_key, stats in _STATS.items()
+        }
+
+
+def _slot_keys(queue_key: str) -> list[str]:
+    # The braces are a Redis Cluster hash tag: all keys of one queue share a slot.
+    base = f"{ENGINE_SLOT_KEY_PREFIX}{{{queue_key}}}"
+    return [f"{base}:waiters", f"{base}:heartbeats", f"{base}:holders", f"{base}:seq"]
+
+
+async def get_engine_queue_state(queue_key: str) -> dict[str, int]:
+    """Cluster-wide view of one queue: current holders and waiters."""
+    waiters_key, _, holders_key, _ = _slot_keys(queue_key)
+    redis_conn = await redis_pool()
+    try:
+        now_ms = int(time.time() * 1000)
+        in_flight = await redis_conn.zcount(holders_key, now_ms, "+inf")
+        waiting = await redis_conn.zcard(waiters_key)
+        return {"in_flight": int(in_flight), "waiting": int(waiting)}
+    finally:
+        await redis_conn.aclose()
+
+
+def _stats_log_interval_seconds() -> int:
+    try:
+        return max(0, int(float(ENGINE_CONCURRENCY_STATS_LOG_SECONDS)))
+    except (TypeError, ValueError):
+        return 60
+
+
+async def _maybe_log_stats() -> None:
+    global _last_stats_log_at
+    interval = _stats_log_interval_seconds()
+    now = time.monotonic()
+    with _STATS_LOCK:
+        if interval == 0 or now - _last_stats_log_at < interval:
+            return
+        _last_stats_log_at = now
+    for queue_key, stats in engine_concurrency_stats().items():
+        cluster_state: dict[str, int] = {}
+        if ENGINE_CONCURRENCY_BACKEND == "redis":
+            try:
+                state = await get_engine_queue_state(queue_key)
+                cluster_state = {
+                    "cluster_in_flight": state["in_flight"],
+                    "cluster_waiting": state["waiting"],
+                }
+            except (RedisError, OSError) as e:
+                exception_logger.warning(f"Failed to read engine slot queue state for {queue_key}: {e}")
+        log_event(info_logger, "engine_concurrency_stats", queue_key=queue_key, **stats, **cluster_state)
+
+
+def _lease_ms() -> int:
+    try:
+        return max(5, int(float(ENGINE_CONCURRENCY_LEASE_SECONDS))) * 1000
+    except (TypeError, ValueError):
+        return 30_000
+
+
+class _RedisSlotLease:
+
+    def __init__(self, *, redis_conn: Redis, queue_key: str, token: str, lease_ms: int):
+        self.redis_conn = redis_conn
+        self.queue_key = queue_key
+        self.token = token
+        self.lease_ms = lease_ms
+        self.keys = _slot_keys(queue_key)
+        self._renew_task: asyncio.Task | None = None
+
+    @classmethod
+    async def acquire(cls, *, queue_key: str, limit: int) -> tuple["_RedisSlotLease", int]:
+        redis_conn = await redis_pool()
+        lease = cls(
+            redis_conn=redis_conn,
+            queue_key=queue_key,
+            token=uuid.uuid4().hex,
+            lease_ms=_lease_ms(),
+        )
+        try:
+            first_position = await lease._wait(limit=limit)
+        except BaseException:
+            await lease._abandon()
+            raise
+        lease._renew_task = asyncio.create_task(lease._renew_forever())
+        return lease, first_position
+
+    async def _wait(self, *, limit: int) -> int:
+        acquire_script = self.redis_conn.register_script(_ACQUIRE_SLOT_LUA)
+        first_position: int | None = None
+        delay = ENGINE_SLOT_POLL_MIN_SECONDS
+        while True:
+            granted, position = await acquire_script(
+                keys=self.keys,
+                args=[self.token, limit, self.lease_ms, ENGINE_SLOT_WAITER_TTL_MS, ENGINE_SLOT_KEY_TTL_MS],
+            )
+            if first_position is None:
+                first_position = int(position)
+            if int(granted) == 1:
+                return first_position
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(ENGINE_SLOT_POLL_MAX_SECONDS, delay * 1.5)
+
+    async def _renew_forever(self) -> None:
+        renew_script = self.redis_conn.register_script(_RENEW_SLOT_LUA)
+        while True:
+            await asyncio.sleep(self.lease_ms / 3000)
+            try:
+                renewed = await renew_script(keys=[self.keys[2]], args=[self.token, self.lease_ms])
+            except RedisError as e:
+                exception_logger.warning(f"Failed to renew engine slot lease for {self.queue_key}: {e}")
+                continue
+            if int(renewed) == 0:
+                # The lease expired before we could renew it (e.g. the event
+                # loop was blocked); the slot may already be reused.
+                _update_stats(self.queue_key, lease_lost=1)
+                exception_logger.warning(f"Engine slot lease lost for {self.queue_key}")
+                return
+
+    async def _abandon(self) -> None:
+        waiters_key, heartbeats_key, _, _ = self.keys
+        try:
+            async with self.redis_conn.pipeline(transaction=False) as pipe:
+                pipe.zrem(waiters_key, self.token)
+                pipe.zrem(heartbeats_key, self.token)
+                await pipe.execute()
+        except Exception as e:
+            exception_logger.warning(f"Failed to leave engine slot queue {self.queue_key}: {e}")
+        finally:
+            await self.redis_conn.aclose()
+
+    async def release(self) -> None:
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+            await asyncio.gather(self._renew_task, return_exceptions=True)
+        try:
+            await self.redis_conn.zrem(self.keys[2], self.token)
+        except Exception as e:
+            # The lease expires on its own; the slot is only held a little longer.
+            exception_logger.warning(f"Failed to release engine slot for {self.queue_key}: {e}")
+        finally:
+            await self.redis_conn.aclose()
+
+
 def _get_semaphore(queue_key: str, limit: int) -> threading.BoundedSemaphore:
     normalized_limit = max(1, int(limit))
     with _SEMAPHORE_LOCK:
@@ -20,11 +300,58 @@ def _get_semaphore(queue_key: str, limit: int) -> threading.BoundedSemaphore:
         return semaphore
 
 
+async def _acquire_local(semaphore: threading.BoundedSemaphore) -> None:
+    delay = ENGINE_SLOT_POLL_MIN_SECONDS
+    while not semaphore.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(ENGINE_SLOT_POLL_MAX_SECONDS, delay * 1.5)
+
+
 @asynccontextmanager
 async def acquire_engine_slot(*, queue_key: str, limit: int):
-    semaphore = _get_semaphore(queue_key=queue_key, limit=limit)
-    await asyncio.to_thread(semaphore.acquire)
+    normalized_limit = max(1, int(limit))
+    started_at = time.perf_counter()
+    lease: _RedisSlotLease | None = None
+    semaphore: threading.BoundedSemaphore | None = None
+    first_position = 0
+    _update_stats(queue_key, waiting=1)
+    try:
+        if ENGINE_CONCURRENCY_BACKEND == "redis":
+            try:
+                lease, first_position = await _RedisSlotLease.acquire(
+                    queue_key=queue_key,
+                    limit=normalized_limit,
+                )
+            except (RedisError, OSError) as e:
+                _update_stats(queue_key, local_fallbacks=1)
+                exception_logger.warning(
+                    f"Engine slot backend unavailable for {queue_key}, falling back to local semaphore: {e}"
+                )
+        if lease is None:
+            semaphore = _get_semaphore(queue_key=queue_key, limit=normalized_limit)
+            await _acquire_local(semaphore)
+    except BaseException:
+        _update_stats(queue_key, waiting=-1)
+        raise
+
+    wait_ms = (time.perf_counter() - started_at) * 1000
+    _record_acquired(queue_key, wait_ms)
+    if wait_ms >= ENGINE_SLOT_SLOW_WAIT_MS:
+        log_event(
+            info_logger,
+            "engine_slot_wait",
+            queue_key=queue_key,
+            limit=normalized_limit,
+            wait_ms=round(wait_ms, 2),
+            queue_position=first_position,
+            backend="redis" if lease is not None else "local",
+        )
     try:
         yield
     finally:
-        semaphore.release()
+        _update_stats(queue_key, in_flight=-1)
+        if lease is not None:
+            await lease.release()
+        elif semaphore is not None:
+            semaphore.release()
+        await _maybe_log_stats()
@@ -0,0 +1,112 @@
+"""Stored-file migration jobs (api side).
+
+Migrations run in the celery worker (``common/file_migration.py`` there) so a
+user with tens of thousands of files or multi-GB audio never hits a request
+timeout. The api records the job in Redis, enqueues it, and reads progress
+back from the same hash. Key names must stay in sync with the worker.
+"""
+import uuid
+
+from common.celery.app import start_migrate_stored_files
+from common.redis import redis_pool
+
+FILE_MIGRATION_JOB_KEY_PREFIX = "file_migration:job:"
+FILE_MIGRATION_ACTIVE_KEY_PREFIX = "file_migration:active:"
+FILE_MIGRATION_JOB_TTL_SECONDS = 7 * 24 * 3600
+# While the job waits in the celery queue nothing refreshes the active
+# marker, so it is taken for a whole day at enqueue; once the worker starts it
+# keeps the marker on its own short heartbeat TTL (300s, see the worker).
+FILE_MIGRATION_PENDING_TTL_SECONDS = 24 * 3600
+FILE_MIGRATION_FINISHED_STATUSES = ("completed", "failed")
+
+_INT_FIELDS = (
+    "user_id",
+    "source_user_file_system_id",
+    "target_user_file_system_id",
+    "total",
+    "migrated",
+    "skipped",
+    "failed",
+    "bytes_copied",
+    "server_side_copies",
+    "throughput_bytes_per_second",
+)
+_FLOAT_FIELDS = ("elapsed_seconds", "throughput_files_per_second")
+
+
+def _parse_job_state(job_id: str, raw: dict[str, str]) -> dict:
+    state: dict = {"job_id": job_id, "status": raw.get("status"), "error": raw.get("error")}
+    for field in _INT_FIELDS:
+        if raw.get(field) not in (None, ""):
+            state[field] = int(float(raw[field]))
+    for field in _FLOAT_FIELDS:
+        if raw.get(field) not in (None, ""):
+            state[field] = float(raw[field])
+    return state
+
+
+async def get_stored_file_migration_job(job_id: str) -> dict | None:
+    redis_conn = await redis_pool()
+    try:
+        raw = await redis_conn.hgetall(f"{FILE_MIGRATION_JOB_KEY_PREFIX}{job_id}")
+    finally:
+        await redis_conn.aclose()
+    if not raw:
+        return None
+    return _parse_job_state(job_id, raw)
+
+
+async def start_stored_file_migration_job(
+    *,
+    user_id: int,
+    source_user_file_system_id: int,
+    target_user_file_system_id: int,
+    stored_file_ids: list[int] | None = None,
+) -> dict:
+    """Enqueue a migration, or return the user's migration already in
+    flight — only one runs per user at a time."""
+    job_id = uuid.uuid4().hex
+    job_key = f"{FILE_MIGRATION_JOB_KEY_PREFIX}{job_id}"
+    active_key = f"{FILE_MIGRATION_ACTIVE_KEY_PREFIX}{user_id}"
+    redis_conn = await redis_pool()
+    try:
+        acquired = await redis_conn.set(active_key, job_id, nx=True, ex=FILE_MIGRATION_PENDING_TTL_SECONDS)
+        if not acquired:
+            active_job_id = await redis_conn.get(active_key)
+            if active_job_id:
+                raw = await redis_conn.hgetall(f"{FILE_MIGRATION_JOB_KEY_PREFIX}{active_job_id}")
+                if raw and raw.get("status") not in FILE_MIGRATION_FINISHED_STATUSES:
+                    return _parse_job_state(active_job_id, raw)
+            # 标记残留但对应任务已不存在或已结束，接管
+            await redis_conn.set(active_key, job_id, ex=FILE_MIGRATION_PENDING_TTL_SECONDS)
+        await redis_conn.hset(
+            job_key,
+            mapping={
+                "status": "pending",
+                "user_id": user_id,
+                "source_user_file_system_id": source_user_file_system_id,
+                "target_user_file_system_id": target_user_file_system_id,
+                "migrated": 0,
+                "skipped": 0,
+                "failed": 0,
+                "bytes_copied": 0,
+            },
+        )
+        await redis_conn.expire(job_key, FILE_MIGRATION_JOB_TTL_SECONDS)
+        try:
+            start_migrate_stored_files.apply_async(
+                kwargs={
+                    "job_id": job_id,
+                    "user_id": user_id,
+                    "source_user_file_system_id": source_user_file_system_id,
+                    "target_user_file_system_id": target_user_file_system_id,
+                    "stored_file_ids": stored_file_ids,
+                }
+            )
+        except Exception as e:
+            await redis_conn.hset(job_key, mapping={"status": "failed", "error": str(e)[:500]})
+            await redis_conn.delete(active_key)
+            raise
+        return _parse_job_state(job_id, await redis_conn.hgetall(job_key))
+    finally:
+        await redis_conn.aclose()
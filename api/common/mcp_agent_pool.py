@@ -0,0 +1,473 @@
+"""Reusable MCP agents for the streaming AI endpoints.
+
+``create_agent`` used to run for every ``/ai/ask`` (and document / section
+ask) message: user and model lookups, the MCP plan check over HTTP, a fresh
+``MCPClient`` that spawned every stdio server and opened every HTTP session,
+then a new ``ChatOpenAI`` and ``MCPAgent`` whose sessions were never closed.
+Built agents are now leased from a per-loop pool keyed by
+``(user_id, model_id, enable_mcp)``:
+
+- A lease is exclusive, since agents carry conversation state and the system
+  prompt of the request; ``lease.release()`` resets both and parks the agent
+  for the next message. Idle agents are closed after
+  ``MCP_AGENT_POOL_IDLE_SECONDS`` and every agent after
+  ``MCP_AGENT_POOL_MAX_AGE_SECONDS``, which also bounds how long a plan check
+  result lives.
+- Agents are tagged with the user's agent config version kept in Redis.
+  Changing MCP servers, the default model, or a model / provider bumps it
+  (``bump_ai_agent_config_version``) and outdated agents are closed instead
+  of reused.
+- ``warm_mcp_agent`` builds the agent tools from MCP tool schemas cached per
+  server config for ``MCP_TOOL_SCHEMA_TTL_SECONDS``. A server is connected
+  only when its schemas are not cached yet or when one of its tools is
+  called for the first time.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from mcp.types import CallToolResult, GetPromptResult, Prompt, ReadResourceResult, Resource, Tool
+from mcp_use import MCPAgent, MCPClient
+
+from common.logger import exception_logger, format_log_message, info_logger, log_event
+from common.redis import redis_pool
+from config.mcp import (
+    MCP_AGENT_POOL_IDLE_SECONDS,
+    MCP_AGENT_POOL_MAX_AGE_SECONDS,
+    MCP_AGENT_POOL_MAX_IDLE_AGENTS,
+    MCP_AGENT_POOL_MAX_IDLE_PER_KEY,
+    MCP_TOOL_SCHEMA_TTL_SECONDS,
+)
+
+AI_AGENT_VERSION_KEY_PREFIX = "ai:agent:version:"
+AI_AGENT_GLOBAL_VERSION_KEY = f"{AI_AGENT_VERSION_KEY_PREFIX}global"
+MCP_TOOL_SCHEMA_CACHE_MAX_SERVERS = 1024
+
+AgentPoolKey = tuple[int, int | None, bool]
+
+
+def _int_setting(value: str, default: int, *, minimum: int) -> int:
+    try:
+        return max(minimum, int(float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+# ==========================
+# 配置版本（Redis）
+# ==========================
+
+def ai_agent_user_version_key(user_id: int) -> str:
+    return f"{AI_AGENT_VERSION_KEY_PREFIX}user:{user_id}"
+
+
+async def get_ai_agent_config_version(user_id: int) -> str | None:
+    """Version that pooled agents of ``user_id`` must carry to be reused;
+    ``None`` when Redis is unavailable, in which case nothing is pooled."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        global_version, user_version = await redis_conn.mget(
+            AI_AGENT_GLOBAL_VERSION_KEY,
+            ai_agent_user_version_key(user_id),
+        )
+        return f"{global_version or 0}:{user_version or 0}"
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "ai_agent_version_read_failed",
+                user_id=user_id,
+                error=e,
+            )
+        )
+        return None
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def bump_ai_agent_config_version(user_id: int | None = None) -> None:
+    """Retire the pooled agents of ``user_id``, or of every user when
+    ``user_id`` is ``None`` (models and providers can be shared). Call after
+    the change has been committed."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incr(
+            AI_AGENT_GLOBAL_VERSION_KEY if user_id is None else ai_agent_user_version_key(user_id)
+        )
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "ai_agent_version_bump_failed",
+                user_id=user_id,
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+# ==========================
+# MCP tool schema 缓存与懒连接
+# ==========================
+
+@dataclass
+class _ServerSchemas:
+    tools: list[Tool]
+    resources: list[Resource]
+    prompts: list[Prompt]
+    fetched_at: float
+
+
+_schema_cache: OrderedDict[str, _ServerSchemas] = OrderedDict()
+
+
+def mcp_server_fingerprint(server_config: dict[str, Any]) -> str:
+    """Stable digest of a server config (command, args, env / url, headers);
+    secrets only ever end up hashed."""
+    payload = json.dumps(server_config, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LazyMCPServerConnector:
+    """Stands in for the connector of one server in the converted tools and
+    opens the client session on the first call."""
+
+    def __init__(self, client: MCPClient, server_name: str):
+        self.client = client
+        self.server_name = server_name
+        self._lock = asyncio.Lock()
+
+    @property
+    def public_identifier(self) -> str:
+        return self.server_name
+
+    async def _connector(self):
+        session = self.client.sessions.get(self.server_name)
+        if session is not None:
+            return session.connector
+        async with self._lock:
+            session = self.client.sessions.get(self.server_name)
+            if session is None:
+                started_at = time.perf_counter()
+                session = await self.client.create_session(self.server_name)
+                if session is None:
+                    raise RuntimeError(f"MCP server {self.server_name} is not configured")
+                log_event(
+                    info_logger,
+                    "mcp_server_connected",
+                    server=self.server_name,
+                    connect_ms=round((time.perf_counter() - started_at) * 1000, 2),
+                )
+        return session.connector
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any],
+        read_timeout_seconds: timedelta | None = None,
+    ) -> CallToolResult:
+        connector = await self._connector()
+        return await connector.call_tool(name, arguments, read_timeout_seconds)
+
+    async def read_resource(self, uri) -> ReadResourceResult:
+        connector = await self._connector()
+        return await connector.read_resource(uri)
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None) -> GetPromptResult:
+        connector = await self._connector()
+        return await connector.get_prompt(name, arguments)
+
+
+async def _load_server_schemas(
+    client: MCPClient,
+    server_name: str,
+    server_config: dict[str, Any],
+) -> _ServerSchemas | None:
+    fingerprint = mcp_server_fingerprint(server_config)
+    ttl_seconds = _int_setting(MCP_TOOL_SCHEMA_TTL_SECONDS, 600, minimum=0)
+    now = time.monotonic()
+    cached = _schema_cache.get(fingerprint)
+    if cached is not None and now - cached.fetched_at < ttl_seconds:
+        _schema_cache.move_to_end(fingerprint)
+        return cached
+
+    # 未命中：连接该服务读取描述；会话保留给本 agent 后续的工具调用
+    try:
+        session = await client.create_session(server_name)
+        if session is None:
+            return None
+        connector = session.connector
+        capabilities = connector.capabilities
+        tools = await connector.list_tools() if capabilities.tools else []
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "mcp_server_connect_failed",
+                server=server_name,
+                error=e,
+            )
+        )
+        return None
+    resources: list[Resource] = []
+    prompts: list[Prompt] = []
+    try:
+        if capabilities.resources:
+            resources = await connector.list_resources()
+        if capabilities.prompts:
+            prompts = await connector.list_prompts()
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "mcp_server_list_failed",
+                server=server_name,
+                error=e,
+            )
+        )
+    schemas = _ServerSchemas(
+        tools=list(tools),
+        resources=list(resources),
+        prompts=list(prompts),
+        fetched_at=now,
+    )
+    _schema_cache[fingerprint] = schemas
+    _schema_cache.move_to_end(fingerprint)
+    while len(_schema_cache) > MCP_TOOL_SCHEMA_CACHE_MAX_SERVERS:
+        _schema_cache.popitem(last=False)
+    return schemas
+
+
+async def warm_mcp_agent(agent: MCPAgent) -> None:
+    """Initialize ``agent`` in place of ``MCPAgent.initialize``: tools come
+    from cached schemas and are bound to lazy connectors, so servers whose
+    schemas are known are not contacted until a tool of theirs is called. A
+    server that cannot be reached is left out instead of failing the chat."""
+    client = agent.client
+    adapter = agent.adapter
+    tools: list = []
+    resources: list = []
+    prompts: list = []
+    if client is not None:
+        client._record_telemetry = False
+        for server_name, server_config in client.config.get("mcpServers", {}).items():
+            schemas = await _load_server_schemas(client, server_name, server_config)
+            if schemas is None:
+                continue
+            connector = LazyMCPServerConnector(client, server_name)
+            tools.extend(
+                tool for tool in (adapter._convert_tool(item, connector) for item in schemas.tools)
+                if tool is not None
+            )
+            resources.extend(
+                tool for tool in (adapter._convert_resource(item, connector) for item in schemas.resources)
+                if tool is not None
+            )
+            prompts.extend(
+                tool for tool in (adapter._convert_prompt(item, connector) for item in schemas.prompts)
+                if tool is not None
+            )
+    adapter.tools = tools
+    adapter.resources = resources
+    adapter.prompts = prompts
+    agent._tools = tools + resources + prompts
+    await agent._create_system_message_from_tools(agent._tools)
+    agent._agent_executor = agent._create_agent()
+    agent._initialized = True
+
+
+# ==========================
+# agent 池
+# ==========================
+
+@dataclass
+class _PooledAgent:
+    key: AgentPoolKey
+    agent: MCPAgent
+    model_id: int
+    version: str | None
+    created_at: float
+    last_used_at: float
+    system_prompt: str | None
+    system_message: BaseMessage | None
+
+
+class _LoopPool:
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.idle: OrderedDict[int, _PooledAgent] = OrderedDict()
+        # 已归还但不再复用的 agent，在下一次 acquire 时关闭
+        self.retired: list[_PooledAgent] = []
+
+    def take(self, key: AgentPoolKey, version: str) -> _PooledAgent | None:
+        # 最近归还的优先复用；版本过期的同 key agent 顺带退役
+        for entry_id, entry in reversed(list(self.idle.items())):
+            if entry.key != key:
+                continue
+            self.idle.pop(entry_id)
+            if entry.version == version:
+                return entry
+            self.retired.append(entry)
+        return None
+
+    def put(self, entry: _PooledAgent) -> None:
+        per_key = _int_setting(MCP_AGENT_POOL_MAX_IDLE_PER_KEY, 2, minimum=0)
+        if per_key == 0:
+            self.retired.append(entry)
+            return
+        same_key = [entry_id for entry_id, idle in self.idle.items() if idle.key == entry.key]
+        while len(same_key) >= per_key:
+            self.retired.append(self.idle.pop(same_key.pop(0)))
+        self.idle[id(entry)] = entry
+
+    def pop_evictable(self, now: float) -> list[_PooledAgent]:
+        idle_seconds = _int_setting(MCP_AGENT_POOL_IDLE_SECONDS, 300, minimum=1)
+        max_age_seconds = _int_setting(MCP_AGENT_POOL_MAX_AGE_SECONDS, 1800, minimum=1)
+        max_idle = _int_setting(MCP_AGENT_POOL_MAX_IDLE_AGENTS, 128, minimum=0)
+        overflow = len(self.idle) - max_idle
+        evicted, self.retired = self.retired, []
+        # 最早归还的优先淘汰
+        for entry_id, entry in list(self.idle.items()):
+            if (
+                overflow > 0
+                or now - entry.last_used_at >= idle_seconds
+                or now - entry.created_at >= max_age_seconds
+            ):
+                evicted.append(self.idle.pop(entry_id))
+                overflow -= 1
+        return evicted
+
+
+# loop_id -> pool; MCP sessions are bound to the loop that opened them, see
+# data/neo4j/base.py for why loops are keyed by id().
+_pools: dict[int, _LoopPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for_running_loop() -> _LoopPool:
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(id(loop))
+    if pool is not None and pool.loop is loop:
+        return pool
+    with _pools_lock:
+        for loop_id, stale in list(_pools.items()):
+            if stale.loop.is_closed():
+                _pools.pop(loop_id, None)
+        pool = _pools.get(id(loop))
+        if pool is None or pool.loop is not loop:
+            pool = _LoopPool(loop)
+            _pools[id(loop)] = pool
+        return pool
+
+
+async def _close_agents(entries: list[_PooledAgent]) -> None:
+    for entry in entries:
+        try:
+            await entry.agent.close()
+        except Exception as e:
+            exception_logger.warning(
+                format_log_message(
+                    "mcp_agent_close_failed",
+                    user_id=entry.key[0],
+                    error=e,
+                )
+            )
+
+
+class MCPAgentLease:
+
+    def __init__(self, *, pool: _LoopPool, entry: _PooledAgent):
+        self.agent = entry.agent
+        self.model_id = entry.model_id
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+
+    def release(self) -> None:
+        """Hand the agent back. Synchronous so it is safe in the ``finally``
+        of a streaming generator that is being closed."""
+        if self._released:
+            return
+        self._released = True
+        entry = self._entry
+        agent = entry.agent
+        entry.last_used_at = time.monotonic()
+        if entry.version is None or not agent._initialized:
+            self._pool.retired.append(entry)
+            return
+        agent.clear_conversation_history()
+        if agent.system_prompt != entry.system_prompt or agent._system_message is not entry.system_message:
+            agent.system_prompt = entry.system_prompt
+            agent._system_message = entry.system_message
+            agent._agent_executor = agent._create_agent()
+        self._pool.put(entry)
+
+
+async def acquire_mcp_agent(
+    *,
+    user_id: int,
+    model_id: int | None,
+    enable_mcp: bool,
+    create: Callable[[], Awaitable[tuple[MCPAgent, int]]],
+) -> MCPAgentLease:
+    """Exclusive lease on a ready agent for the key, built with ``create``
+    when no current one is idle. Always ``lease.release()`` in a ``finally``
+    block."""
+    pool = _pool_for_running_loop()
+    await _close_agents(pool.pop_evictable(time.monotonic()))
+
+    key: AgentPoolKey = (user_id, model_id, enable_mcp)
+    started_at = time.perf_counter()
+    version = await get_ai_agent_config_version(user_id)
+    entry = pool.take(key, version) if version is not None else None
+    reused = entry is not None
+    if entry is None:
+        agent, resolved_model_id = await create()
+        now = time.monotonic()
+        entry = _PooledAgent(
+            key=key,
+            agent=agent,
+            model_id=resolved_model_id,
+            version=version,
+            created_at=now,
+            last_used_at=now,
+            system_prompt=agent.system_prompt,
+            system_message=agent._system_message,
+        )
+    log_event(
+        info_logger,
+        "mcp_agent_acquired",
+        user_id=user_id,
+        model_id=entry.model_id,
+        enable_mcp=enable_mcp,
+        reused=reused,
+        prepare_ms=round((time.perf_counter() - started_at) * 1000, 2),
+    )
+    return MCPAgentLease(pool=pool, entry=entry)
+
+
+async def close_mcp_agents_for_current_loop() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _pools_lock:
+        pool = _pools.pop(id(loop), None)
+    if pool is None or pool.loop is not loop:
+        return
+    entries = pool.retired + list(pool.idle.values())
+    pool.retired = []
+    pool.idle.clear()
+    await _close_agents(entries)
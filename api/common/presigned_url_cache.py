@@ -0,0 +1,109 @@
+"""Process-local caches behind ``/file-system/url/resolve``.
+
+Every image of a rendered document is served through that redirect, so a
+page with 50 images used to cost 50 stored-file lookups and 50 presignings.
+Two small LRU maps fix that:
+
+- ``(owner, path) -> user_file_system_id`` resolutions, kept briefly (a
+  migration may move the file; the old object stays readable meanwhile);
+- signed URLs per ``(owner, user_file_system_id, path)``, reused until they
+  get close to expiry.
+
+Signing itself is local: the cached ``FileSystemProxy`` service already holds
+its credentials. A signed URL is tied to the service object that produced it,
+so a config change (which rebuilds the service) also drops its URLs.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from protocol.remote_file_service import RemoteFileServiceProtocol
+
+PRESIGNED_URL_EXPIRES_SECONDS = 600
+# A URL is handed out (and cached by browsers) only while it has at least
+# this much lifetime left, so a redirect never points at a nearly-dead link.
+PRESIGNED_URL_MIN_REMAINING_SECONDS = 120
+PRESIGNED_URL_CACHE_MAX_ENTRIES = 20000
+STORED_FILE_LOCATION_CACHE_TTL_SECONDS = 60
+STORED_FILE_LOCATION_CACHE_MAX_ENTRIES = 20000
+
+
+@dataclass
+class _CachedPresignedUrl:
+    service: RemoteFileServiceProtocol
+    url: str
+    expires_at: float
+
+
+_presigned_urls: OrderedDict[tuple[int, int | None, str], _CachedPresignedUrl] = OrderedDict()
+_stored_file_locations: OrderedDict[tuple[int, str], tuple[int | None, float]] = OrderedDict()
+
+
+def get_cached_stored_file_location(
+    *,
+    owner_id: int,
+    path: str,
+    now: float | None = None,
+) -> tuple[bool, int | None]:
+    """``(hit, user_file_system_id)``; a hit may carry ``None`` when the path
+    is not tracked and the owner's default file system applies."""
+    now = time.monotonic() if now is None else now
+    key = (owner_id, path)
+    entry = _stored_file_locations.get(key)
+    if entry is None:
+        return False, None
+    if entry[1] <= now:
+        _stored_file_locations.pop(key, None)
+        return False, None
+    return True, entry[0]
+
+
+def set_cached_stored_file_location(
+    *,
+    owner_id: int,
+    path: str,
+    user_file_system_id: int | None,
+    now: float | None = None,
+) -> None:
+    now = time.monotonic() if now is None else now
+    key = (owner_id, path)
+    _stored_file_locations[key] = (user_file_system_id, now + STORED_FILE_LOCATION_CACHE_TTL_SECONDS)
+    _stored_file_locations.move_to_end(key)
+    while len(_stored_file_locations) > STORED_FILE_LOCATION_CACHE_MAX_ENTRIES:
+        _stored_file_locations.popitem(last=False)
+
+
+def get_presigned_url(
+    *,
+    service: RemoteFileServiceProtocol,
+    owner_id: int,
+    user_file_system_id: int | None,
+    path: str,
+    now: float | None = None,
+) -> tuple[str, int]:
+    """Return ``(url, max_age)`` where ``max_age`` is how long clients may
+    reuse the redirect to ``url``."""
+    now = time.monotonic() if now is None else now
+    key = (owner_id, user_file_system_id, path)
+    entry = _presigned_urls.get(key)
+    if (
+        entry is not None
+        and entry.service is service
+        and entry.expires_at - now > PRESIGNED_URL_MIN_REMAINING_SECONDS
+    ):
+        _presigned_urls.move_to_end(key)
+        return entry.url, int(entry.expires_at - now - PRESIGNED_URL_MIN_REMAINING_SECONDS)
+
+    url = service.presign_get_url(
+        file_path=path,
+        expires_seconds=PRESIGNED_URL_EXPIRES_SECONDS,
+    )
+    _presigned_urls[key] = _CachedPresignedUrl(
+        service=service,
+        url=url,
+        expires_at=now + PRESIGNED_URL_EXPIRES_SECONDS,
+    )
+    _presigned_urls.move_to_end(key)
+    while len(_presigned_urls) > PRESIGNED_URL_CACHE_MAX_ENTRIES:
+        _presigned_urls.popitem(last=False)
+    return url, PRESIGNED_URL_EXPIRES_SECONDS - PRESIGNED_URL_MIN_REMAINING_SECONDS
@@ -0,0 +1,110 @@
+import hashlib
+import json
+
+from common.logger import exception_logger, format_log_message
+from common.redis import redis_pool
+
+PUBLIC_SEARCH_CACHE_KEY_PREFIX = "public:search:"
+PUBLIC_SEARCH_VERSION_KEY = "public:search:version"
+# Entries are also keyed by the publish version, so a publish/unpublish makes
+# every older entry unreachable; the TTL only bounds how long they linger.
+PUBLIC_SEARCH_CACHE_TTL_SECONDS = 600
+
+
+def normalize_public_search_query(query: str) -> str:
+    return " ".join(query.split()).casefold()
+
+
+def public_search_cache_key(*, version: str, query: str, limit: int) -> str:
+    digest = hashlib.sha256(normalize_public_search_query(query).encode("utf-8")).hexdigest()
+    return f"{PUBLIC_SEARCH_CACHE_KEY_PREFIX}v{version}:{limit}:{digest}"
+
+
+async def get_cached_public_search(
+    *,
+    query: str,
+    limit: int,
+) -> tuple[str, tuple[list[int], dict[int, str]] | None]:
+    """Return ``(version, cached)`` where ``cached`` is the published document
+    id order plus snippets, or ``None`` on a miss. ``version`` must be passed
+    back to ``set_cached_public_search`` so a result computed while a publish
+    happened is stored under the old (already stale) version."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        version = await redis_conn.get(PUBLIC_SEARCH_VERSION_KEY) or "0"
+        raw = await redis_conn.get(
+            public_search_cache_key(version=version, query=query, limit=limit)
+        )
+        if raw is None:
+            return version, None
+        payload = json.loads(raw)
+        document_ids = [int(document_id) for document_id in payload["document_ids"]]
+        snippets = {int(document_id): text for document_id, text in payload["snippets"].items()}
+        return version, (document_ids, snippets)
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "public_search_cache_read_failed",
+                error=e,
+            )
+        )
+        return "", None
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def set_cached_public_search(
+    *,
+    version: str,
+    query: str,
+    limit: int,
+    document_ids: list[int],
+    snippets: dict[int, str],
+) -> None:
+    if not version:
+        return
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.set(
+            public_search_cache_key(version=version, query=query, limit=limit),
+            json.dumps(
+                {
+                    "document_ids": document_ids,
+                    "snippets": {str(document_id): text for document_id, text in snippets.items()},
+                },
+                ensure_ascii=False,
+            ),
+            ex=PUBLIC_SEARCH_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "public_search_cache_write_failed",
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def bump_public_search_version() -> None:
+    """Invalidate every cached public search result. Call after the publish
+    state of a document has been committed."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incr(PUBLIC_SEARCH_VERSION_KEY)
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "public_search_cache_invalidate_failed",
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
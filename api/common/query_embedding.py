@@ -0,0 +1,124 @@
+"""Query-time embedding with an in-memory TTL/LRU cache and singleflight.
+
+Search endpoints embed ``search_text`` on every request; popular (especially
+public) queries were therefore re-embedded over and over, and a burst of
+identical requests ran the model once per request. ``embed_query`` keeps the
+most recent query vectors in process memory and lets concurrent identical
+queries share one in-flight embedding computation. Hit / miss counters are
+logged as ``query_embedding_cache_stats`` events at most every
+``QUERY_EMBEDDING_STATS_LOG_SECONDS``.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+from opentelemetry import trace
+
+from common.embedding_utils import extract_single_embedding_vector
+from common.logger import info_logger, log_event
+from config.embedding import QUERY_EMBEDDING_STATS_LOG_SECONDS
+from engine.embedding.factory import get_embedding_engine
+
+QUERY_EMBEDDING_CACHE_MAX_ENTRIES = 2048
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = 600.0
+
+_cache: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+_inflight: dict[str, asyncio.Future[list[float]]] = {}
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "shared": 0,
+    "evictions": 0,
+}
+_last_stats_log_at = time.monotonic()
+
+
+def query_embedding_cache_stats() -> dict[str, int]:
+    return {**_stats, "size": len(_cache), "inflight": len(_inflight)}
+
+
+def _stats_log_interval_seconds() -> int:
+    try:
+        return max(0, int(float(QUERY_EMBEDDING_STATS_LOG_SECONDS)))
+    except (TypeError, ValueError):
+        return 60
+
+
+def _maybe_log_stats() -> None:
+    global _last_stats_log_at
+    interval = _stats_log_interval_seconds()
+    now = time.monotonic()
+    if interval == 0 or now - _last_stats_log_at < interval:
+        return
+    _last_stats_log_at = now
+    log_event(info_logger, "query_embedding_cache_stats", **query_embedding_cache_stats())
+
+
+def _record(outcome: str) -> None:
+    _stats[outcome] += 1
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute("query_embedding.cache", outcome)
+    _maybe_log_stats()
+
+
+def _cache_get(key: str) -> list[float] | None:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, vector = entry
+    if expires_at <= time.monotonic():
+        _cache.pop(key, None)
+        return None
+    _cache.move_to_end(key)
+    return vector
+
+
+def _cache_put(key: str, vector: list[float]) -> None:
+    _cache[key] = (time.monotonic() + QUERY_EMBEDDING_CACHE_TTL_SECONDS, vector)
+    _cache.move_to_end(key)
+    while len(_cache) > QUERY_EMBEDDING_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+async def embed_query(search_text: str) -> list[float]:
+    """Return the embedding vector for ``search_text``. Callers must not mutate
+    the returned list — it is shared with the cache and other requests."""
+    vector = _cache_get(search_text)
+    if vector is not None:
+        _record("hits")
+        return vector
+
+    inflight = _inflight.get(search_text)
+    if inflight is not None:
+        _record("shared")
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            # The leading request went away (e.g. client disconnect); take over
+            # unless this request is itself being cancelled.
+            task = asyncio.current_task()
+            if inflight.cancelled() and task is not None and not task.cancelling():
+                return await embed_query(search_text)
+            raise
+
+    _record("misses")
+    future: asyncio.Future[list[float]] = asyncio.get_running_loop().create_future()
+    _inflight[search_text] = future
+    try:
+        embedding_engine = get_embedding_engine()
+        vector = extract_single_embedding_vector(await embedding_engine.embed([search_text]))
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so an unawaited failure doesn't log "exception never retrieved".
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(search_text, None)
+    _cache_put(search_text, vector)
+    future.set_result(vector)
+    return vector
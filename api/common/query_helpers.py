@@ -25,3 +25,17 @@ def resolve_infinite_scroll_meta(
     if next_item_id is None:
         return False, None
     return True, next_item_id
+
+
+def split_infinite_scroll_page(
+    *,
+    items: list,
+    limit: int,
+) -> tuple[list, int | None]:
+    """Split a ``limit + 1`` row result into the page and the id the next page
+    starts at, replacing a separate ``search_next_*`` probe query."""
+    if limit <= 0:
+        return [], None
+    if len(items) > limit:
+        return items[:limit], int(items[limit].id)
+    return items, None
@@ -1,8 +1,12 @@
 import asyncio
+import json
 import os
-from inspect import isawaitable
+import socket
 from collections import defaultdict, deque
-from typing import Any, Awaitable, TypeVar, cast
+from collections.abc import Awaitable
+from inspect import isawaitable
+from typing import Any, TypeVar, cast
+from uuid import uuid4
 
 from fastapi import WebSocket
 
@@ -30,6 +34,24 @@ def _read_int_env(env_name: str, default_value: int) -> int:
 
 WS_OFFLINE_CACHE_TTL_SECONDS = _read_int_env("WS_OFFLINE_CACHE_TTL_SECONDS", 86400)
 WS_OFFLINE_CACHE_MAX_MESSAGES = _read_int_env("WS_OFFLINE_CACHE_MAX_MESSAGES", 200)
+# 单次 send_text 的超时（秒），超时的连接按断开处理，消息转入离线缓存
+WS_SEND_TIMEOUT_SECONDS = _read_int_env("WS_SEND_TIMEOUT_SECONDS", 5)
+# broadcast 时同时发送的连接数上限
+WS_BROADCAST_CONCURRENCY = _read_int_env("WS_BROADCAST_CONCURRENCY", 64)
+# 在线状态 key 的 TTL（秒），持有连接的实例每 TTL/3 续期一次
+WS_PRESENCE_TTL_SECONDS = _read_int_env("WS_PRESENCE_TTL_SECONDS", 60)
+# pub/sub 订阅断开后的重连间隔（秒）
+WS_BACKPLANE_RETRY_SECONDS = _read_int_env("WS_BACKPLANE_RETRY_SECONDS", 2)
+# 从 pub/sub 收到、尚未发送完的消息上限，达到上限时订阅循环才会等待
+WS_BACKPLANE_DISPATCH_CONCURRENCY = _read_int_env("WS_BACKPLANE_DISPATCH_CONCURRENCY", 256)
+
+# 仅当持有者仍是本实例时才删除在线状态，避免误删用户在其他实例上的新连接
+_PRESENCE_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 
 T = TypeVar("T")
@@ -42,6 +64,18 @@ async def _resolve_redis_call(result: T | Awaitable[T]) -> T:
 
 
 class ConnectionManager:
+    """WebSocket connections of one channel, delivered across API replicas.
+
+    Sockets live in the process that accepted them. Every process subscribes
+    to a Redis pub/sub channel per websocket id it holds
+    (``ws:deliver:{channel}:{id}``) plus the channel-wide
+    ``ws:broadcast:{channel}``, so a message published by any replica is
+    written by whichever one holds the socket. ``ws:presence:{channel}:{id}``
+    names the instance holding a socket and is refreshed while it stays
+    connected. Messages nobody is subscribed for go to the offline list and
+    are replayed on the next connect, as before.
+    """
+
     def __init__(
         self,
         channel: str,
@@ -58,6 +92,14 @@ class ConnectionManager:
         self._memory_offline_messages: dict[str, deque[str]] = defaultdict(
             lambda: deque(maxlen=self.offline_cache_max_messages)
         )
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._pubsub: Any | None = None
+        self._backplane_task: asyncio.Task | None = None
+        self._presence_task: asyncio.Task | None = None
+        self._dispatch_semaphore: asyncio.Semaphore | None = None
+        self._dispatch_tasks: set[asyncio.Task] = set()
+        # 每个 pub/sub channel 最后一条待发送消息，后续消息排在它之后以保持顺序
+        self._dispatch_tails: dict[str, asyncio.Task] = {}
 
     async def _ensure_cache(self) -> Any | None:
         if self.cache is not None:
@@ -166,7 +208,7 @@ class ConnectionManager:
         )
         for index, message in enumerate(cached_messages):
             try:
-                await connection.send_text(message)
+                await asyncio.wait_for(connection.send_text(message), timeout=WS_SEND_TIMEOUT_SECONDS)
             except Exception as e:
                 exception_logger.error(
                     format_log_message(
@@ -176,7 +218,7 @@ class ConnectionManager:
                         error=e,
                     )
                 )
-                self.disconnect(websocket_id)
+                await self.disconnect(websocket_id)
                 remain_messages = cached_messages[index:]
                 for remain_message in remain_messages:
                     await self._cache_offline_message(
@@ -185,6 +227,234 @@ class ConnectionManager:
                     )
                 return
 
+    def _personal_channel(self, websocket_id: str) -> str:
+        return f"ws:deliver:{self.channel}:{websocket_id}"
+
+    def _broadcast_channel(self) -> str:
+        return f"ws:broadcast:{self.channel}"
+
+    def _presence_key(self, websocket_id: str) -> str:
+        return f"ws:presence:{self.channel}:{websocket_id}"
+
+    def _ensure_backplane(self):
+        if self._backplane_task is None or self._backplane_task.done():
+            self._backplane_task = asyncio.create_task(self._run_backplane())
+        if self._presence_task is None or self._presence_task.done():
+            self._presence_task = asyncio.create_task(self._refresh_presence())
+
+    async def _run_backplane(self):
+        while True:
+            client = None
+            pubsub = None
+            try:
+                client = await redis_pool()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                # 重连后重新订阅本实例持有的全部连接
+                subscribed_ids = set(self.connections)
+                await pubsub.subscribe(
+                    self._broadcast_channel(),
+                    *[self._personal_channel(websocket_id) for websocket_id in subscribed_ids],
+                )
+                self._pubsub = pubsub
+                # 上面 await 期间接入的连接在 _subscribe 里看到的是 None，这里补订阅
+                missed_ids = set(self.connections) - subscribed_ids
+                if missed_ids:
+                    await pubsub.subscribe(
+                        *[self._personal_channel(websocket_id) for websocket_id in missed_ids]
+                    )
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        await self._dispatch_backplane_message(item["channel"], item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                exception_logger.error(
+                    format_log_message(
+                        "websocket_backplane_failed",
+                        channel=self.channel,
+                        error=e,
+                    )
+                )
+            finally:
+                self._pubsub = None
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                if client is not None:
+                    try:
+                        await client.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(WS_BACKPLANE_RETRY_SECONDS)
+
+    async def _dispatch_backplane_message(self, redis_channel: str, data: str):
+        """Hand a message to a background task so a slow socket or a large
+        broadcast never stalls the listener; only waits when
+        ``WS_BACKPLANE_DISPATCH_CONCURRENCY`` messages are already in flight."""
+        if self._dispatch_semaphore is None:
+            self._dispatch_semaphore = asyncio.Semaphore(max(1, WS_BACKPLANE_DISPATCH_CONCURRENCY))
+        await self._dispatch_semaphore.acquire()
+        previous = self._dispatch_tails.get(redis_channel)
+        task = asyncio.create_task(self._deliver_backplane_message(redis_channel, data, previous))
+        self._dispatch_tasks.add(task)
+        self._dispatch_tails[redis_channel] = task
+        task.add_done_callback(lambda done: self._on_backplane_message_done(redis_channel, done))
+
+    async def _deliver_backplane_message(
+        self,
+        redis_channel: str,
+        data: str,
+        previous: asyncio.Task | None,
+    ):
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await self._handle_backplane_message(redis_channel, data)
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_backplane_delivery_failed",
+                    channel=self.channel,
+                    redis_channel=redis_channel,
+                    error=e,
+                )
+            )
+
+    def _on_backplane_message_done(self, redis_channel: str, task: asyncio.Task):
+        self._dispatch_tasks.discard(task)
+        if self._dispatch_tails.get(redis_channel) is task:
+            self._dispatch_tails.pop(redis_channel, None)
+        if self._dispatch_semaphore is not None:
+            self._dispatch_semaphore.release()
+
+    async def _handle_backplane_message(self, redis_channel: str, data: str):
+        if redis_channel == self._broadcast_channel():
+            try:
+                envelope = json.loads(data)
+            except ValueError:
+                return
+            # 发起方已经直接发给了自己持有的连接
+            if envelope.get("origin") == self.instance_id:
+                return
+            await self._broadcast_local(envelope.get("message", ""))
+            return
+        websocket_id = redis_channel.removeprefix(f"ws:deliver:{self.channel}:")
+        connection = self.get_connection(websocket_id)
+        if connection is None:
+            # 发布时还在，此刻已断开
+            await self._cache_offline_message(websocket_id=websocket_id, message=data)
+            return
+        await self._send_local(websocket_id, connection, data)
+
+    async def _subscribe(self, websocket_id: str):
+        self._ensure_backplane()
+        pubsub = self._pubsub
+        if pubsub is None:
+            # 订阅连接建立时会按 self.connections 补订阅
+            return
+        try:
+            await pubsub.subscribe(self._personal_channel(websocket_id))
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_subscribe_failed",
+                    channel=self.channel,
+                    websocket_id=websocket_id,
+                    error=e,
+                )
+            )
+
+    async def _unsubscribe(self, websocket_id: str):
+        pubsub = self._pubsub
+        if pubsub is None:
+            return
+        try:
+            await pubsub.unsubscribe(self._personal_channel(websocket_id))
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_unsubscribe_failed",
+                    channel=self.channel,
+                    websocket_id=websocket_id,
+                    error=e,
+                )
+            )
+
+    async def _claim_presence(self, websocket_ids: list[str]):
+        if not websocket_ids:
+            return
+        cache = await self._ensure_cache()
+        if cache is None:
+            return
+        try:
+            async with cache.pipeline(transaction=False) as pipeline:
+                for websocket_id in websocket_ids:
+                    pipeline.set(
+                        self._presence_key(websocket_id),
+                        self.instance_id,
+                        ex=max(WS_PRESENCE_TTL_SECONDS, 1),
+                    )
+                await _resolve_redis_call(pipeline.execute())
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_presence_update_failed",
+                    channel=self.channel,
+                    error=e,
+                )
+            )
+
+    async def _release_presence(self, websocket_id: str):
+        cache = await self._ensure_cache()
+        if cache is None:
+            return
+        try:
+            await _resolve_redis_call(
+                cache.eval(
+                    _PRESENCE_RELEASE_SCRIPT,
+                    1,
+                    self._presence_key(websocket_id),
+                    self.instance_id,
+                )
+            )
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_presence_release_failed",
+                    channel=self.channel,
+                    websocket_id=websocket_id,
+                    error=e,
+                )
+            )
+
+    async def _refresh_presence(self):
+        interval = max(WS_PRESENCE_TTL_SECONDS / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            await self._claim_presence(list(self.connections))
+
+    async def is_online(self, websocket_id: str) -> bool:
+        """Whether any replica currently holds a socket for ``websocket_id``."""
+        if websocket_id in self.connections:
+            return True
+        cache = await self._ensure_cache()
+        if cache is None:
+            return False
+        try:
+            return bool(await _resolve_redis_call(cache.exists(self._presence_key(websocket_id))))
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_presence_read_failed",
+                    channel=self.channel,
+                    websocket_id=websocket_id,
+                    error=e,
+                )
+            )
+            return False
+
     async def connect(self, id: str, websocket: WebSocket):
         info_logger.info(
             format_log_message(
@@ -195,26 +465,26 @@ class ConnectionManager:
         )
         await websocket.accept()
         self.connections[id] = websocket
+        await self._subscribe(id)
+        await self._claim_presence([id])
         await self._replay_offline_messages(websocket_id=id)
 
-    def disconnect(self, id: str, websocket: WebSocket | None = None):
+    async def disconnect(self, id: str, websocket: WebSocket | None = None):
         current_connection = self.connections.get(id)
         if current_connection is None:
             return
         if websocket is not None and current_connection is not websocket:
             return
         self.connections.pop(id, None)
+        await self._unsubscribe(id)
+        await self._release_presence(id)
 
     def get_connection(self, id: str):
         return self.connections.get(id)
 
-    async def send_personal_message(self, message: str, websocket_id: str) -> bool:
-        connection = self.get_connection(websocket_id)
-        if connection is None:
-            await self._cache_offline_message(websocket_id=websocket_id, message=message)
-            return False
+    async def _send_local(self, websocket_id: str, connection: WebSocket, message: str) -> bool:
         try:
-            await connection.send_text(message)
+            await asyncio.wait_for(connection.send_text(message), timeout=WS_SEND_TIMEOUT_SECONDS)
             return True
         except Exception as e:
             exception_logger.error(
@@ -222,31 +492,89 @@ class ConnectionManager:
                     "websocket_send_failed",
                     channel=self.channel,
                     websocket_id=websocket_id,
-                    error=e,
+                    error=repr(e) if isinstance(e, asyncio.TimeoutError) else e,
                 )
             )
-            self.disconnect(websocket_id)
+            await self.disconnect(websocket_id, websocket=connection)
             await self._cache_offline_message(websocket_id=websocket_id, message=message)
             return False
 
-    async def broadcast(self, message: str):
-        connection_items = list(self.connections.items())
-        for connection_id, connection in connection_items:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                exception_logger.error(
-                    format_log_message(
-                        "websocket_broadcast_failed",
-                        channel=self.channel,
-                        websocket_id=connection_id,
-                        error=e,
-                    )
+    async def _publish(self, redis_channel: str, message: str) -> int | None:
+        """Number of replicas that received ``message``; ``None`` when Redis
+        is unavailable."""
+        cache = await self._ensure_cache()
+        if cache is None:
+            return None
+        try:
+            return int(await _resolve_redis_call(cache.publish(redis_channel, message)))
+        except Exception as e:
+            exception_logger.error(
+                format_log_message(
+                    "websocket_publish_failed",
+                    channel=self.channel,
+                    redis_channel=redis_channel,
+                    error=e,
                 )
-                self.disconnect(connection_id)
+            )
+            return None
+
+    async def send_personal_message(self, message: str, websocket_id: str) -> bool:
+        connection = self.get_connection(websocket_id)
+        if connection is not None:
+            return await self._send_local(websocket_id, connection, message)
+        # 连接不在本实例：交给持有它的实例发送，失败时由对方写入离线缓存
+        receivers = await self._publish(self._personal_channel(websocket_id), message)
+        if receivers:
+            return True
+        await self._cache_offline_message(websocket_id=websocket_id, message=message)
+        return False
+
+    async def _broadcast_local(self, message: str):
+        if not self.connections:
+            return
+        semaphore = asyncio.Semaphore(max(WS_BROADCAST_CONCURRENCY, 1))
+
+        async def _send(connection_id: str, connection: WebSocket):
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(connection.send_text(message), timeout=WS_SEND_TIMEOUT_SECONDS)
+                except Exception as e:
+                    exception_logger.error(
+                        format_log_message(
+                            "websocket_broadcast_failed",
+                            channel=self.channel,
+                            websocket_id=connection_id,
+                            error=repr(e) if isinstance(e, asyncio.TimeoutError) else e,
+                        )
+                    )
+                    await self.disconnect(connection_id, websocket=connection)
+
+        await asyncio.gather(
+            *(_send(connection_id, connection) for connection_id, connection in list(self.connections.items()))
+        )
+
+    async def broadcast(self, message: str):
+        await self._publish(
+            self._broadcast_channel(),
+            json.dumps({"origin": self.instance_id, "message": message}, ensure_ascii=False),
+        )
+        await self._broadcast_local(message)
 
     async def count(self):
         return len(self.connections)
 
+    async def close(self):
+        for task in (self._backplane_task, self._presence_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._backplane_task = None
+        self._presence_task = None
+        for websocket_id in list(self.connections):
+            await self._release_presence(websocket_id)
+        await self.close_cache()
 
 notificationManager = ConnectionManager(channel="notification")
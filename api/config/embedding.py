@@ -0,0 +1,10 @@
+import os
+
+# 向量缓存：按 (模型名, 维度, sha256(文本)) 缓存 embedding，重复处理同一内容时不再重新计算
+# disk: 本地 sqlite 文件（按最近访问时间淘汰）；redis: 共享 Redis（按 TTL 过期，淘汰依赖 Redis maxmemory 策略）；off: 关闭
+EMBEDDING_CACHE_BACKEND = os.environ.get('EMBEDDING_CACHE_BACKEND', 'disk')
+EMBEDDING_CACHE_DIR = os.environ.get('EMBEDDING_CACHE_DIR')
+EMBEDDING_CACHE_MAX_MB = os.environ.get('EMBEDDING_CACHE_MAX_MB', '1024')
+EMBEDDING_CACHE_REDIS_TTL_SECONDS = os.environ.get('EMBEDDING_CACHE_REDIS_TTL_SECONDS', str(7 * 24 * 3600))
+# 查询向量缓存（common/query_embedding.py）命中 / 未命中统计写日志的间隔（秒），0 表示关闭
+QUERY_EMBEDDING_STATS_LOG_SECONDS = os.environ.get('QUERY_EMBEDDING_STATS_LOG_SECONDS', '60')
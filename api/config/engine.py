@@ -0,0 +1,10 @@
+import os
+
+# 引擎并发控制（EngineBase.set_concurrency_control）
+# redis: 基于 Redis 的集群级公平（FIFO）信号量，所有 api / worker 进程共享同一个并发上限
+# local: 进程内信号量（旧行为），只限制单个进程
+ENGINE_CONCURRENCY_BACKEND = os.environ.get('ENGINE_CONCURRENCY_BACKEND', 'redis').strip().lower()
+# 槽位租约时长（秒），持有期间自动续约；进程崩溃后最多经过该时长槽位即被回收
+ENGINE_CONCURRENCY_LEASE_SECONDS = os.environ.get('ENGINE_CONCURRENCY_LEASE_SECONDS', '30')
+# 每隔多少秒把各引擎队列的排队 / 在途 / 等待耗时统计写一次日志（engine_concurrency_stats），0 表示关闭
+ENGINE_CONCURRENCY_STATS_LOG_SECONDS = os.environ.get('ENGINE_CONCURRENCY_STATS_LOG_SECONDS', '60')
@@ -0,0 +1,12 @@
+import os
+
+# MCP agent 池（common/mcp_agent_pool.py），按 (user_id, model_id, enable_mcp) 复用已构建的 agent
+# 空闲超过该时长（秒）的 agent 会被关闭（同时关闭其 MCP 会话与 stdio 子进程）
+MCP_AGENT_POOL_IDLE_SECONDS = os.environ.get('MCP_AGENT_POOL_IDLE_SECONDS', '300')
+# agent 最长存活时间（秒），也决定了 MCP 套餐权限检查结果最多被缓存多久
+MCP_AGENT_POOL_MAX_AGE_SECONDS = os.environ.get('MCP_AGENT_POOL_MAX_AGE_SECONDS', '1800')
+# 每个事件循环最多保留的空闲 agent 数量，以及同一个 key 下最多保留的空闲 agent 数量
+MCP_AGENT_POOL_MAX_IDLE_AGENTS = os.environ.get('MCP_AGENT_POOL_MAX_IDLE_AGENTS', '128')
+MCP_AGENT_POOL_MAX_IDLE_PER_KEY = os.environ.get('MCP_AGENT_POOL_MAX_IDLE_PER_KEY', '2')
+# MCP 服务的 tool / resource / prompt 描述按服务配置缓存的时长（秒）
+MCP_TOOL_SCHEMA_TTL_SECONDS = os.environ.get('MCP_TOOL_SCHEMA_TTL_SECONDS', '600')
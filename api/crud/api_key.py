@@ -141,6 +141,32 @@ async def touch_api_key_last_used_async(
     await db.execute(stmt)
     await db.flush()
 
+async def touch_api_keys_last_used_async(
+    db: AsyncSession,
+    api_key_ids: list[int],
+    used_time: datetime,
+    throttle_seconds: int = 60,
+):
+    if not api_key_ids:
+        return
+    stmt = (
+        update(models.api_key.ApiKey)
+        .where(
+            models.api_key.ApiKey.id.in_(api_key_ids),
+            models.api_key.ApiKey.delete_at.is_(None),
+            (
+                models.api_key.ApiKey.last_used_time.is_(None)
+                | (
+                    models.api_key.ApiKey.last_used_time
+                    < used_time - timedelta(seconds=throttle_seconds)
+                )
+            ),
+        )
+        .values(last_used_time=used_time)
+    )
+    await db.execute(stmt)
+    await db.flush()
+
 async def update_api_key_description_async(
     db: AsyncSession,
     user_id: int,
@@ -3,12 +3,13 @@ from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import Date, and_, cast, func, or_, select
+from sqlalchemy import Date, and_, cast, exists, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 import models
 from crud import document_delete_subtypes as _document_delete_subtypes
+from crud.keyword_search import document_label_filter, keyword_filter, keyword_rank
 from enums.document import DocumentCategory, UserDocumentAuthority
 
 delete_quick_note_documents_by_document_ids = _document_delete_subtypes.delete_quick_note_documents_by_document_ids
@@ -469,36 +470,38 @@ async def search_published_documents_async(
     creator_id: int | None = None,
     desc: bool = True,
     only_published: bool = True,
+    order_by_relevance: bool = False,
 ):
+    """``order_by_relevance`` ranks keyword hits by trigram similarity
+    instead of id; only for callers that do not paginate with ``start``."""
     stmt = select(models.document.Document)
     if only_published:
-        stmt = stmt.join(
-            models.document.PublishDocument,
-            models.document.PublishDocument.document_id == models.document.Document.id,
-        ).where(
-            models.document.PublishDocument.delete_at.is_(None),
-            models.document.PublishDocument.access_key_encrypted.is_(None),
+        # EXISTS 而不是 JOIN：同一文档的多条发布记录不会产生重复行，也就不需要 DISTINCT
+        stmt = stmt.where(
+            exists().where(
+                models.document.PublishDocument.document_id == models.document.Document.id,
+                models.document.PublishDocument.delete_at.is_(None),
+                models.document.PublishDocument.access_key_encrypted.is_(None),
+            )
         )
     stmt = stmt.where(
         models.document.Document.delete_at.is_(None),
-    ).distinct()
+    )
 
     if creator_id is not None:
         stmt = stmt.where(models.document.Document.creator_id == creator_id)
 
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f"%{keyword}%"),
-                models.document.Document.description.ilike(f"%{keyword}%"),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
+        if order_by_relevance:
+            stmt = stmt.order_by(
+                keyword_rank(keyword, models.document.Document.title, models.document.Document.description).desc()
+            )
 
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.join(models.document.DocumentLabel).where(
-            models.document.DocumentLabel.label_id.in_(label_ids),
-            models.document.DocumentLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
 
     if start is not None:
         stmt = stmt.where(
@@ -550,16 +553,10 @@ async def count_published_documents_async(
         stmt = stmt.where(models.document.Document.creator_id == creator_id)
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f"%{keyword}%"),
-                models.document.Document.description.ilike(f"%{keyword}%"),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.document.DocumentLabel).where(
-            models.document.DocumentLabel.label_id.in_(label_ids),
-            models.document.DocumentLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     return int((await db.execute(stmt)).scalar_one())
 
 
@@ -588,16 +585,10 @@ async def search_next_published_document_async(
         stmt = stmt.where(models.document.Document.creator_id == creator_id)
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f"%{keyword}%"),
-                models.document.Document.description.ilike(f"%{keyword}%"),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.join(models.document.DocumentLabel).where(
-            models.document.DocumentLabel.label_id.in_(label_ids),
-            models.document.DocumentLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if desc:
         stmt = stmt.where(
             models.document.Document.id < document.id,
@@ -918,7 +909,7 @@ def search_section_documents(
         )
         query = query.filter(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f"%{keyword}%"))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if start is not None:
         if desc:
             query = query.filter(
@@ -965,7 +956,7 @@ async def search_section_documents_async(
             models.document.PublishDocument.document_id == models.document.Document.id,
         ).where(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        stmt = stmt.where(models.document.Document.title.ilike(f"%{keyword}%"))
+        stmt = stmt.where(keyword_filter(keyword, models.document.Document.title))
     if start is not None:
         stmt = stmt.where(
             models.document.Document.id <= start if desc else models.document.Document.id >= start
@@ -995,7 +986,7 @@ def search_next_section_document(
         )
         query = query.filter(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f"%{keyword}%"))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if desc:
         query = query.filter(
             models.document.Document.id < document.id,
@@ -1034,7 +1025,7 @@ async def search_next_section_document_async(
             models.document.PublishDocument.document_id == models.document.Document.id,
         ).where(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        stmt = stmt.where(models.document.Document.title.ilike(f"%{keyword}%"))
+        stmt = stmt.where(keyword_filter(keyword, models.document.Document.title))
     if desc:
         stmt = stmt.where(models.document.Document.id < document.id).order_by(models.document.Document.id.desc())
     else:
@@ -1060,7 +1051,7 @@ def count_section_documents(
         )
         query = query.filter(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f"%{keyword}%"))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     return query.count()
 
 
@@ -1089,7 +1080,7 @@ async def count_section_documents_async(
             models.document.PublishDocument.document_id == models.document.Document.id,
         ).where(models.document.PublishDocument.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        stmt = stmt.where(models.document.Document.title.ilike(f"%{keyword}%"))
+        stmt = stmt.where(keyword_filter(keyword, models.document.Document.title))
     return (await db.execute(stmt)).scalar_one()
 
 def search_next_user_document(
@@ -1106,7 +1097,7 @@ def search_next_user_document(
                          models.document.UserDocument.delete_at.is_(None))
     query = query.filter(models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f"%{keyword}%"))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -1129,7 +1120,6 @@ async def search_next_user_document_async(
     stmt = (
         select(models.document.Document)
         .join(models.document.UserDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.UserDocument.delete_at.is_(None),
@@ -1138,16 +1128,10 @@ async def search_next_user_document_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f"%{keyword}%"),
-                models.document.Document.description.ilike(f"%{keyword}%"),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if desc:
         stmt = stmt.where(
             models.document.Document.id < document.id,
@@ -1175,7 +1159,7 @@ def search_user_documents(
                          models.document.UserDocument.delete_at.is_(None))
     query = query.filter(models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f'%{keyword}%'))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -1201,33 +1185,33 @@ async def search_user_documents_async(
     keyword: str | None = None,
     label_ids: list[int] | None = None,
     desc: bool = True,
+    order_by_relevance: bool = False,
 ):
+    """``order_by_relevance`` ranks keyword hits by trigram similarity
+    instead of id; only for callers that do not paginate with ``start``."""
+    # 每个用户对同一文档只有一条有效的 UserDocument，标签走 EXISTS，无需 DISTINCT
     stmt = (
         select(models.document.Document)
         .join(models.document.UserDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.UserDocument.delete_at.is_(None),
             models.document.Document.delete_at.is_(None),
         )
         .options(selectinload(models.document.Document.creator))
-        .distinct()
     )
 
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f"%{keyword}%"),
-                models.document.Document.description.ilike(f"%{keyword}%"),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
+        if order_by_relevance:
+            stmt = stmt.order_by(
+                keyword_rank(keyword, models.document.Document.title, models.document.Document.description).desc()
+            )
 
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
 
     if start is not None:
         stmt = stmt.where(
@@ -1269,7 +1253,7 @@ def count_user_documents(
                          models.document.UserDocument.delete_at.is_(None))
     query = query.filter(models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f'%{keyword}%'))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -1304,10 +1288,9 @@ async def count_user_documents_async(
     filter_timezone: str | None = None,
 ):
     stmt = (
-        select(func.count(func.distinct(models.document.Document.id)))
+        select(func.count(models.document.Document.id))
         .select_from(models.document.Document)
         .join(models.document.UserDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.UserDocument.delete_at.is_(None),
@@ -1316,16 +1299,10 @@ async def count_user_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if filter_category is not None:
         stmt = stmt.where(models.document.Document.category == filter_category)
     if filter_platform is not None:
@@ -1700,7 +1677,7 @@ def search_all_documents(
     query = query.filter(models.document.UserDocument.delete_at.is_(None),
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f'%{keyword}%'))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -1722,7 +1699,7 @@ def count_all_documents(
     query = query.filter(models.document.UserDocument.delete_at.is_(None))
     query = query.filter(models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f'%{keyword}%'))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -1740,7 +1717,7 @@ def search_next_all_document(
     query = query.filter(models.document.UserDocument.delete_at.is_(None),
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
-        query = query.filter(models.document.Document.title.ilike(f"%{keyword}%"))
+        query = query.filter(keyword_filter(keyword, models.document.Document.title))
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
                              models.document.DocumentLabel.label_id.in_(label_ids))
@@ -2052,10 +2029,7 @@ def search_user_unread_documents(
                              models.document.ReadDocument.id.is_(None)))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2087,7 +2061,6 @@ async def search_user_unread_documents_async(
         select(models.document.Document)
         .join(models.document.UserDocument)
         .outerjoin(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.Document.delete_at.is_(None),
@@ -2102,16 +2075,10 @@ async def search_user_unread_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     stmt = stmt.order_by(models.document.Document.id.desc() if desc else models.document.Document.id.asc())
     if start is not None:
         stmt = stmt.where(models.document.Document.id <= start if desc else models.document.Document.id >= start)
@@ -2134,10 +2101,7 @@ def search_next_user_unread_document(
                              models.document.ReadDocument.id.is_(None)))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2162,7 +2126,6 @@ async def search_next_user_unread_document_async(
         select(models.document.Document)
         .join(models.document.UserDocument)
         .outerjoin(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.Document.delete_at.is_(None),
@@ -2174,16 +2137,10 @@ async def search_next_user_unread_document_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if desc:
         stmt = stmt.where(models.document.Document.id < document.id).order_by(models.document.Document.id.desc())
     else:
@@ -2205,10 +2162,7 @@ def count_user_unread_documents(
                              models.document.ReadDocument.id.is_(None)))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2226,7 +2180,6 @@ async def count_user_unread_documents_async(
         select(func.count(func.distinct(models.document.Document.id)))
         .join(models.document.UserDocument)
         .outerjoin(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.UserDocument.user_id == user_id,
             models.document.Document.delete_at.is_(None),
@@ -2238,16 +2191,10 @@ async def count_user_unread_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     return (await db.execute(stmt)).scalar_one()
 
 def search_user_recent_read_documents(
@@ -2266,10 +2213,7 @@ def search_user_recent_read_documents(
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2300,7 +2244,6 @@ async def search_user_recent_read_documents_async(
     stmt = (
         select(models.document.Document)
         .join(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.ReadDocument.delete_at.is_(None),
             models.document.ReadDocument.user_id == user_id,
@@ -2312,16 +2255,10 @@ async def search_user_recent_read_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     stmt = stmt.order_by(models.document.Document.id.desc() if desc else models.document.Document.id.asc())
     if start is not None:
         stmt = stmt.where(models.document.Document.id <= start if desc else models.document.Document.id >= start)
@@ -2342,10 +2279,7 @@ def search_next_user_recent_read_document(
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2369,7 +2303,6 @@ async def search_next_user_recent_read_document_async(
     stmt = (
         select(models.document.Document)
         .join(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.ReadDocument.delete_at.is_(None),
             models.document.ReadDocument.user_id == user_id,
@@ -2378,16 +2311,10 @@ async def search_next_user_recent_read_document_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if desc:
         stmt = stmt.where(models.document.Document.id < document.id).order_by(models.document.Document.id.desc())
     else:
@@ -2407,10 +2334,7 @@ def count_user_recent_read_documents(
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2427,7 +2351,6 @@ async def count_user_recent_read_documents_async(
     stmt = (
         select(func.count(func.distinct(models.document.Document.id)))
         .join(models.document.ReadDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.ReadDocument.delete_at.is_(None),
             models.document.ReadDocument.user_id == user_id,
@@ -2436,16 +2359,10 @@ async def count_user_recent_read_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     return (await db.execute(stmt)).scalar_one()
 
 def search_user_stared_documents(
@@ -2464,10 +2381,7 @@ def search_user_stared_documents(
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2498,7 +2412,6 @@ async def search_user_stared_documents_async(
     stmt = (
         select(models.document.Document)
         .join(models.document.StarDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.StarDocument.delete_at.is_(None),
             models.document.StarDocument.user_id == user_id,
@@ -2510,16 +2423,10 @@ async def search_user_stared_documents_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     stmt = stmt.order_by(models.document.Document.id.desc() if desc else models.document.Document.id.asc())
     if start is not None:
         stmt = stmt.where(models.document.Document.id <= start if desc else models.document.Document.id >= start)
@@ -2540,10 +2447,7 @@ def search_next_user_star_document(
                          models.document.Document.delete_at.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
         query = query.filter(models.document.DocumentLabel.delete_at.is_(None),
@@ -2567,7 +2471,6 @@ async def search_next_user_star_document_async(
     stmt = (
         select(models.document.Document)
         .join(models.document.StarDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.StarDocument.delete_at.is_(None),
             models.document.StarDocument.user_id == user_id,
@@ -2576,16 +2479,10 @@ async def search_next_user_star_document_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if desc:
         stmt = stmt.where(models.document.Document.id < document.id).order_by(models.document.Document.id.desc())
     else:
@@ -2608,10 +2505,7 @@ def count_user_stared_documents(
                              models.document.DocumentLabel.label_id.in_(label_ids))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     query = query.distinct(models.document.Document.id)
     return query.count()
@@ -2625,7 +2519,6 @@ async def count_user_stared_documents_async(
     stmt = (
         select(func.count(func.distinct(models.document.Document.id)))
         .join(models.document.StarDocument)
-        .outerjoin(models.document.DocumentLabel)
         .where(
             models.document.StarDocument.delete_at.is_(None),
             models.document.StarDocument.user_id == user_id,
@@ -2633,16 +2526,10 @@ async def count_user_stared_documents_async(
         )
     )
     if label_ids is not None:
-        stmt = stmt.where(
-            models.document.DocumentLabel.delete_at.is_(None),
-            models.document.DocumentLabel.label_id.in_(label_ids),
-        )
+        stmt = stmt.where(document_label_filter(label_ids))
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.document.Document.title.ilike(f'%{keyword}%'),
-                models.document.Document.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.document.Document.title, models.document.Document.description)
         )
     return (await db.execute(stmt)).scalar_one()
 
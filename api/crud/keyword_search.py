@@ -0,0 +1,48 @@
+"""Keyword and label filters shared by the document and section list queries.
+
+Keyword search stays a case-insensitive substring match on title and
+description (so CJK keywords keep working), and is served by the
+``gin_trgm_ops`` indexes declared on ``Document`` and ``Section``; the
+``pg_trgm`` extension is created by ``data/sql/create.py``. Label filters are
+``EXISTS`` subqueries rather than joins, so the list queries no longer fan out
+per label and need no ``DISTINCT`` to fold the rows back.
+"""
+from sqlalchemy import ColumnElement, exists, func, or_
+
+import models
+
+
+def keyword_like_pattern(keyword: str) -> str:
+    # 转义 LIKE 通配符，用户输入的 % 和 _ 按字面匹配（PostgreSQL 默认转义符为反斜杠）
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def keyword_filter(keyword: str, *columns) -> ColumnElement[bool]:
+    pattern = keyword_like_pattern(keyword)
+    return or_(*[column.ilike(pattern) for column in columns])
+
+
+def keyword_rank(keyword: str, title, description) -> ColumnElement[float]:
+    """Relevance of a row for ``keyword``: trigram word similarity, with
+    title hits weighted above description hits."""
+    return (
+        func.word_similarity(keyword, title) * 2
+        + func.word_similarity(keyword, func.coalesce(description, ""))
+    )
+
+
+def document_label_filter(label_ids: list[int]) -> ColumnElement[bool]:
+    return exists().where(
+        models.document.DocumentLabel.document_id == models.document.Document.id,
+        models.document.DocumentLabel.label_id.in_(label_ids),
+        models.document.DocumentLabel.delete_at.is_(None),
+    )
+
+
+def section_label_filter(label_ids: list[int]) -> ColumnElement[bool]:
+    return exists().where(
+        models.section.SectionLabel.section_id == models.section.Section.id,
+        models.section.SectionLabel.label_id.in_(label_ids),
+        models.section.SectionLabel.delete_at.is_(None),
+    )
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 import models
+from crud.keyword_search import keyword_filter, section_label_filter
 from enums.section import SectionDocumentIntegration, UserSectionRole, UserSectionAuthority
 
 
@@ -499,10 +500,7 @@ def search_user_sections(
                          )
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if only_published:
         query = query.join(models.section.PublishSection, models.section.PublishSection.section_id == models.section.Section.id)
@@ -557,10 +555,7 @@ async def search_user_sections_async(
 
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
 
     if only_published:
@@ -572,10 +567,7 @@ async def search_user_sections_async(
         )
 
     if label_ids is not None and len(label_ids) > 0:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
 
     if start is not None:
         stmt = stmt.where(
@@ -604,10 +596,7 @@ def count_user_sections(
     )
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if only_published:
         query = query.join(models.section.PublishSection, models.section.PublishSection.section_id == models.section.Section.id)
@@ -639,10 +628,7 @@ async def count_user_sections_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if only_published:
         stmt = stmt.join(
@@ -650,10 +636,7 @@ async def count_user_sections_async(
             models.section.PublishSection.section_id == models.section.Section.id,
         ).where(models.section.PublishSection.delete_at.is_(None))
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     return (await db.execute(stmt)).scalar_one()
 
 def search_next_user_section(
@@ -675,10 +658,7 @@ def search_next_user_section(
     )
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if only_published:
         query = query.join(models.section.PublishSection, models.section.PublishSection.section_id == models.section.Section.id)
@@ -724,10 +704,7 @@ async def search_next_user_section_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if only_published:
         stmt = stmt.join(
@@ -735,10 +712,7 @@ async def search_next_user_section_async(
             models.section.PublishSection.section_id == models.section.Section.id,
         ).where(models.section.PublishSection.delete_at.is_(None))
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     if desc:
         stmt = stmt.where(
             models.section.Section.id < section.id,
@@ -769,10 +743,7 @@ def search_user_subscribed_sections(
     query = query.join(models.section.SectionUser)
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -827,16 +798,10 @@ async def search_user_subscribed_sections_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     if start is not None:
         stmt = stmt.where(
             models.section.Section.id <= start if desc else models.section.Section.id >= start
@@ -857,10 +822,7 @@ def count_user_subscribed_sections(
     query = query.join(models.section.SectionUser)
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -900,16 +862,10 @@ async def count_user_subscribed_sections_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     return (await db.execute(stmt)).scalar_one()
 
 def search_next_user_subscribed_section(
@@ -931,10 +887,7 @@ def search_next_user_subscribed_section(
                              models.section.SectionUser.expire_time.is_(None)))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -974,16 +927,10 @@ async def search_next_user_subscribed_section_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     if desc:
         stmt = stmt.where(models.section.Section.id < section.id).order_by(models.section.Section.id.desc())
     else:
@@ -1280,10 +1227,7 @@ def search_published_sections(
     query = db.query(models.section.Section)
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -1333,16 +1277,10 @@ async def search_published_sections_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     if start is not None:
         stmt = stmt.where(
             models.section.Section.id <= start if desc else models.section.Section.id >= start
@@ -1360,10 +1298,7 @@ def count_published_sections(
     query = db.query(models.section.Section)
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -1397,16 +1332,10 @@ async def count_published_sections_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     return (await db.execute(stmt)).scalar_one()
 
 
@@ -1424,10 +1353,7 @@ def search_next_published_section(
                          models.section.PublishSection.access_key_encrypted.is_(None))
     if keyword is not None and len(keyword) > 0:
         query = query.filter(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%')
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
         query = query.join(models.section.SectionLabel)
@@ -1463,16 +1389,10 @@ async def search_next_published_section_async(
     )
     if keyword is not None and len(keyword) > 0:
         stmt = stmt.where(
-            or_(
-                models.section.Section.title.ilike(f'%{keyword}%'),
-                models.section.Section.description.ilike(f'%{keyword}%'),
-            )
+            keyword_filter(keyword, models.section.Section.title, models.section.Section.description)
         )
     if label_ids is not None:
-        stmt = stmt.join(models.section.SectionLabel).where(
-            models.section.SectionLabel.label_id.in_(label_ids),
-            models.section.SectionLabel.delete_at.is_(None),
-        )
+        stmt = stmt.where(section_label_filter(label_ids))
     if desc:
         stmt = stmt.where(models.section.Section.id < section.id).order_by(models.section.Section.id.desc())
     else:
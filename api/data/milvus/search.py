@@ -1,8 +1,7 @@
 import asyncio
 from typing import cast, Any
 from pymilvus.client.search_result import SearchResult
-from common.embedding_utils import extract_single_embedding_vector
-from engine.embedding.factory import get_embedding_engine
+from common.query_embedding import embed_query
 from data.milvus.base import milvus_client, MILVUS_COLLECTION
 
 def _normalize_search_result(
@@ -50,8 +49,7 @@ async def naive_search(
     top_k: int = 5
 ) -> list[dict[str, Any]]:
     """Run dense vector search across all chunks owned by the target user."""
-    embedding_engine = get_embedding_engine()
-    qvec = extract_single_embedding_vector(await embedding_engine.embed([search_text]))
+    qvec = await embed_query(search_text)
     search_params = {
         "anns_field": "embedding",
         "metric_type": "IP",
@@ -86,8 +84,7 @@ async def public_naive_search(
     returned doc_ids against the set of currently-published documents before
     exposing any results to unauthenticated users.
     """
-    embedding_engine = get_embedding_engine()
-    qvec = extract_single_embedding_vector(await embedding_engine.embed([search_text]))
+    qvec = await embed_query(search_text)
     search_params = {
         "anns_field": "embedding",
         "metric_type": "IP",
@@ -121,8 +118,7 @@ async def naive_search_for_documents(
     if not document_ids:
         return []
 
-    embedding_engine = get_embedding_engine()
-    qvec = extract_single_embedding_vector(await embedding_engine.embed([search_text]))
+    qvec = await embed_query(search_text)
     search_params = {
         "anns_field": "embedding",
         "metric_type": "IP",
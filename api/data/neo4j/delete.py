@@ -1,6 +1,10 @@
-from common.logger import info_logger
+from common.logger import exception_logger, info_logger
+from common.redis import redis_pool
 from data.neo4j.base import async_neo4j_driver
 
+# 与 celery-worker common/graph_community.py 中的全局图谱版本保持一致
+GRAPH_VERSION_GLOBAL_KEY = "graph:version:global"
+
 
 async def clear_data():
     async with async_neo4j_driver.session() as session:
@@ -18,6 +22,19 @@ async def delete_documents_and_related_from_neo4j(
 
     async with async_neo4j_driver.session() as session:
         await session.execute_write(_delete_documents_tx, doc_ids)
+    # 删除会清理共享的 Entity / Community，按全局版本失效 worker 侧的图谱缓存
+    await _bump_global_graph_version()
+
+async def _bump_global_graph_version():
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incr(GRAPH_VERSION_GLOBAL_KEY)
+    except Exception as e:
+        exception_logger.error(f"Failed to bump graph version: {e}")
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
 
 async def _delete_documents_tx(
     tx,
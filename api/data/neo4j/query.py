@@ -1,48 +1,19 @@
-import inspect
 
 from langfuse import propagate_attributes
 
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
 import crud
 from common.ai import (
     _get_user_ai_interaction_language,
     build_text_output_language_instruction,
 )
-from common.logger import exception_logger
 from data.neo4j.search import global_search, naive_search
 from data.sql.base import async_session_context
 from prompts.query import query_context_summary
 from proxy.ai_model_proxy import AIModelProxy
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
 async def global_query(
     user_id: int,
     query: str
@@ -75,10 +46,11 @@ async def global_query(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        llm_client = AsyncOpenAI(
+        llm_lease = await acquire_llm_client(
+            base_url=model_configuration.base_url,
             api_key=model_configuration.api_key,
-            base_url=model_configuration.base_url
         )
+        llm_client = llm_lease.client
         try:
             resp = await llm_client.chat.completions.create(
                 model=model_configuration.model_name,
@@ -89,7 +61,7 @@ async def global_query(
             )
             return resp.choices[0].message.content
         finally:
-            await _safe_close_async_client(llm_client)
+            await llm_lease.release()
 
 async def naive_query(
     user_id: int,
@@ -123,10 +95,11 @@ async def naive_query(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        llm_client = AsyncOpenAI(
+        llm_lease = await acquire_llm_client(
+            base_url=model_configuration.base_url,
             api_key=model_configuration.api_key,
-            base_url=model_configuration.base_url
         )
+        llm_client = llm_lease.client
         try:
             resp = await llm_client.chat.completions.create(
                 model=model_configuration.model_name,
@@ -137,4 +110,4 @@ async def naive_query(
             )
             return resp.choices[0].message.content
         finally:
-            await _safe_close_async_client(llm_client)
+            await llm_lease.release()
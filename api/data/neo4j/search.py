@@ -259,6 +259,8 @@ async def global_search(
         OPTIONAL MATCH (e)<-[:MENTIONS]-(c2:Chunk)<-[:HAS_CHUNK]-(d2:Document)
         WHERE d2.creator_id = $user_id  // 相关 chunk 的文档也要过滤
         OPTIONAL MATCH (e)-[:BELONGS_TO]->(com:Community)
+        WHERE NOT toString(com.id) STARTS WITH 'u'  // 全量模式的全局社区
+           OR com.id STARTS WITH 'u' + toString($user_id) + ':'  // 仅当前用户分区的社区
         RETURN DISTINCT 
             e.id AS entity_id,
             e.text AS entity_text,
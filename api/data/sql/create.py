@@ -6,6 +6,7 @@ load_dotenv(override=True)
 import os
 from alembic.config import Config
 from alembic import command
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import crud
@@ -433,6 +434,11 @@ async def main():
     # 让 alembic 与 session_scope 使用同一个库
     alembic_cfg.set_main_option("sqlalchemy.url", str(engine.url))
 
+    # 0) 关键词搜索的 trigram 索引依赖 pg_trgm，需在 autogenerate/upgrade 之前创建
+    info_logger.warning("PRE-STEP: Ensuring pg_trgm extension...")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     # 1) 自动生成 migration（如果没有变化会报错，我们要吞掉）
     msg = f"auto {datetime.now().strftime('%Y%m%d_%H%M%S')}"
     info_logger.warning(f"STEP 0: Autogenerate migration: {msg}")
@@ -5,12 +5,21 @@ load_dotenv(override=True)
 import os
 
 from common.env import is_env_enabled
+from engine.embedding.cache import CachedEmbeddingEngine, get_embedding_cache_backend
 from engine.embedding.qwen_cloud import CloudQwen3EmbeddingEngine
 from engine.embedding.qwen_local import LocalQwen3EmbeddingEngine
 
 
-def get_embedding_engine():
+def _get_raw_embedding_engine():
     if is_env_enabled(os.getenv("ALI_DASHSCOPE_EMBEDDING_ON")):
         return CloudQwen3EmbeddingEngine()
     else:
         return LocalQwen3EmbeddingEngine()
+
+
+def get_embedding_engine():
+    engine = _get_raw_embedding_engine()
+    backend = get_embedding_cache_backend()
+    if backend is None:
+        return engine
+    return CachedEmbeddingEngine(engine=engine, backend=backend)
@@ -6,6 +6,8 @@ from sentence_transformers import SentenceTransformer
 
 from base_implement.embedding_engine_base import EmbeddingEngineBase
 
+LOCAL_EMBEDDING_MODEL_NAME = "Qwen/Qwen3-Embedding-0.6B"
+
 _model = None
 
 def get_device() -> str:
@@ -20,7 +22,7 @@ def get_embedding_model() -> SentenceTransformer:
     global _model
     if _model is None:
         _model = SentenceTransformer(
-            "Qwen/Qwen3-Embedding-0.6B",
+            LOCAL_EMBEDDING_MODEL_NAME,
             device=get_device()
         )
     return _model
@@ -28,6 +30,7 @@ def get_embedding_model() -> SentenceTransformer:
 class LocalQwen3EmbeddingEngine(EmbeddingEngineBase):
     def __init__(self, dim: int = 1024):
         self.model = get_embedding_model()
+        self.model_name = LOCAL_EMBEDDING_MODEL_NAME
         self.dim = dim
 
     @torch.inference_mode()
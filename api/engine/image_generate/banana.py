@@ -1,7 +1,7 @@
 import re
 
 from langfuse import propagate_attributes
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
 from common.logger import exception_logger
 from common.usage_billing import persist_engine_usage_from_completion
@@ -98,10 +98,11 @@ class BananaImageGenerateEngine(ImageGenerateEngineBase):
             user_id=str(self.user_id),
             tags=[f'model:{model_name}']
         ):
-            llm_client = AsyncOpenAI(
+            llm_lease = await acquire_llm_client(
                 base_url=base_url,
-                api_key=api_key
+                api_key=api_key,
             )
+            llm_client = llm_lease.client
             try:
                 response = await llm_client.chat.completions.create(
                     model=model_name,
@@ -134,4 +135,4 @@ class BananaImageGenerateEngine(ImageGenerateEngineBase):
                     return normalized
                 return None
             finally:
-                await self._safe_close_async_client(llm_client)
+                await llm_lease.release()
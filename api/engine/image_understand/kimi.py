@@ -1,6 +1,6 @@
 import re
 from langfuse import propagate_attributes
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
 from common.usage_billing import persist_engine_usage_from_completion
 from base_implement.image_understand_engine_base import ImageUnderstandEngineBase
@@ -91,52 +91,56 @@ class KimiImageUnderstandEngine(ImageUnderstandEngineBase):
             user_id=str(self.user_id),
             tags=[f'model:{model_name}']
         ):
-            llm_client = AsyncOpenAI(
+            llm_lease = await acquire_llm_client(
                 base_url=base_url,
-                api_key=api_key
+                api_key=api_key,
             )
-            response = await llm_client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": SYSTEM_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": image,
+            llm_client = llm_lease.client
+            try:
+                response = await llm_client.chat.completions.create(
+                    model=model_name,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": image,
+                                    },
                                 },
-                            },
-                            {
-                                "type": "text",
-                                "text": "Please provide a complete and detailed single-paragraph description of this image for embedding inside markdown brackets.",
-                            },
-                        ],
-                    },
-                ]
-            )
-            await persist_engine_usage_from_completion(
-                user_id=self.user_id,
-                resource_uuid=self.resource_uuid or self.engine_uuid,
-                completion=response,
-                source="kimi_image_understand",
-            )
-            if len(response.choices) > 0 and response.choices[0].message is not None:
-                content = response.choices[0].message.content
-                if isinstance(content, str):
-                    return self._normalize_for_markdown_description(content)
-                if isinstance(content, list):
-                    text_parts: list[str] = []
-                    for part in content:
-                        if isinstance(part, dict) and part.get("type") == "text" and isinstance(part.get("text"), str):
-                            text_parts.append(part["text"])
-                    if text_parts:
-                        return self._normalize_for_markdown_description(" ".join(text_parts))
-            return None
+                                {
+                                    "type": "text",
+                                    "text": "Please provide a complete and detailed single-paragraph description of this image for embedding inside markdown brackets.",
+                                },
+                            ],
+                        },
+                    ]
+                )
+                await persist_engine_usage_from_completion(
+                    user_id=self.user_id,
+                    resource_uuid=self.resource_uuid or self.engine_uuid,
+                    completion=response,
+                    source="kimi_image_understand",
+                )
+                if len(response.choices) > 0 and response.choices[0].message is not None:
+                    content = response.choices[0].message.content
+                    if isinstance(content, str):
+                        return self._normalize_for_markdown_description(content)
+                    if isinstance(content, list):
+                        text_parts: list[str] = []
+                        for part in content:
+                            if isinstance(part, dict) and part.get("type") == "text" and isinstance(part.get("text"), str):
+                                text_parts.append(part["text"])
+                        if text_parts:
+                            return self._normalize_for_markdown_description(" ".join(text_parts))
+                return None
+            finally:
+                await llm_lease.release()
 
 # if __name__ == '__main__':
 #     import base64
@@ -1,46 +1,17 @@
 import json
-import inspect
 
 import crud
 import schemas
 from langfuse import propagate_attributes
 
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
-from common.logger import exception_logger
 from prompts.document_auto_tag import document_auto_tag_prompt
 from common.markdown_helpers import get_markdown_content_by_document_id
 from data.sql.base import async_session_context
 from proxy.ai_model_proxy import AIModelProxy
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
 class LLMDocumentTagEngine:
     
     user_id: int
@@ -104,10 +75,11 @@ class LLMDocumentTagEngine:
             user_id=str(self.user_id),
             tags=[f'model:{model_configuration.model_name}']
         ):
-            llm_client = AsyncOpenAI(
+            llm_lease = await acquire_llm_client(
                 base_url=model_configuration.base_url,
-                api_key=model_configuration.api_key
+                api_key=model_configuration.api_key,
             )
+            llm_client = llm_lease.client
             try:
                 response = await llm_client.chat.completions.create(
                     model=model_configuration.model_name,
@@ -131,7 +103,7 @@ class LLMDocumentTagEngine:
                     return res
                 return None
             finally:
-                await _safe_close_async_client(llm_client)
+                await llm_lease.release()
 
 if __name__ == '__main__':
     async def main():
@@ -1,11 +1,9 @@
-import inspect
 
 from base_implement.tts_engine_base import TTSEngineBase, TTSSynthesisResult
 from langfuse import propagate_attributes
 
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
-from common.logger import exception_logger
 from common.ai import (
     _get_user_ai_interaction_language,
     build_text_output_language_instruction,
@@ -14,33 +12,6 @@ from enums.engine_enums import EngineCategory, EngineProvided
 from prompts.podcast_generation import podcast_generation_prompt
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
 class OpenAIAudioEngine(TTSEngineBase):
     """此引擎使用的是openai的tts接口
     """
@@ -79,10 +50,11 @@ class OpenAIAudioEngine(TTSEngineBase):
             language_instruction = build_text_output_language_instruction(
                 await _get_user_ai_interaction_language(self.user_id),
             )
-            llm_client = AsyncOpenAI(
+            llm_lease = await acquire_llm_client(
                 base_url=base_url,
-                api_key=api_key
+                api_key=api_key,
             )
+            llm_client = llm_lease.client
             try:
                 completion = await llm_client.chat.completions.create(
                     model=model_name,
@@ -109,4 +81,4 @@ class OpenAIAudioEngine(TTSEngineBase):
                     script_text=script_text,
                 )
             finally:
-                await _safe_close_async_client(llm_client)
+                await llm_lease.release()
@@ -15,6 +15,10 @@ from protocol.remote_file_service import RemoteFileServiceProtocol
 from datetime import timedelta
 
 
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
 class AliyunOSSRemoteFileService(RemoteFileServiceProtocol):
 
     def __init__(self):
@@ -126,7 +130,8 @@ class AliyunOSSRemoteFileService(RemoteFileServiceProtocol):
 
                 config = Config(
                     s3={"addressing_style": "virtual"},
-                    signature_version='s3'
+                    signature_version='s3',
+                    max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS
                 )
 
                 s3 = boto3.client(
@@ -15,6 +15,10 @@ from enums.file import RemoteFileService
 from protocol.remote_file_service import RemoteFileServiceProtocol
 
 
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
 class AWSS3RemoteFileService(RemoteFileServiceProtocol):
 
     def __init__(self):
@@ -135,6 +139,7 @@ class AWSS3RemoteFileService(RemoteFileServiceProtocol):
                         retries={"max_attempts": 5, "mode": "standard"},
                         connect_timeout=5,
                         read_timeout=60,
+                        max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS,
                     )
                 )
                 self.s3_client = s3
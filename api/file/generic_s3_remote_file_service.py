@@ -16,6 +16,10 @@ from protocol.remote_file_service import RemoteFileServiceProtocol
 from botocore.exceptions import ClientError
 
 
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
 class GenericS3RemoteFileService(RemoteFileServiceProtocol):
 
     def __init__(self):
@@ -113,6 +117,7 @@ class GenericS3RemoteFileService(RemoteFileServiceProtocol):
                         retries={"max_attempts": 5, "mode": "standard"},
                         connect_timeout=5,
                         read_timeout=30,
+                        max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS,
                         s3={
                             'addressing_style': 'virtual'
                         },
@@ -14,8 +14,11 @@ from fastapi.responses import JSONResponse, Response
 
 import schemas
 from common.apscheduler.app import initialize_scheduler_jobs, scheduler
+from common.auth_cache import flush_api_key_touches
 from common.env import is_env_enabled
+from common.llm_client_pool import close_llm_clients_for_current_loop
 from common.logger import exception_logger, format_log_message, info_logger
+from common.mcp_agent_pool import close_mcp_agents_for_current_loop
 from common.request_logging import (
     build_request_log,
     emit_request_log,
@@ -110,10 +113,13 @@ async def lifespan(app: FastAPI):
         info_logger.info(format_log_message("fastapi_shutdown_started"))
         if scheduler.running:
             scheduler.shutdown(wait=False)
+        await flush_api_key_touches()
         if redis_conn is not None:
             await redis_conn.aclose()
             info_logger.info(format_log_message("redis_connection_closed"))
-        await notificationManager.close_cache()
+        await notificationManager.close()
+        await close_mcp_agents_for_current_loop()
+        await close_llm_clients_for_current_loop()
 
 app = FastAPI(
         title="Revornix Main Backend",
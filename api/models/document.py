@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from data.sql.base import Base
@@ -96,6 +96,22 @@ class Document(Base):
 
     creator: Mapped[User] = relationship("User", backref="created_documents")
 
+    # 关键词搜索（ILIKE '%kw%'）走 pg_trgm GIN 索引，扩展由 data/sql/create.py 创建
+    __table_args__ = (
+        Index(
+            "ix_document_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_document_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
+
 
 class QuickNoteDocument(Base):
     __tablename__ = "quick_note_document"
@@ -102,6 +102,22 @@ class Section(Base):
 
     creator: Mapped[User] = relationship("User", backref="created_sections")
 
+    # 关键词搜索（ILIKE '%kw%'）走 pg_trgm GIN 索引，扩展由 data/sql/create.py 创建
+    __table_args__ = (
+        Index(
+            "ix_section_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_section_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Label(Base):
     __tablename__ = "section_label"
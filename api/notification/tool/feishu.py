@@ -4,18 +4,36 @@ import hashlib
 import hmac
 import io
 import json
+import threading
 import time
 from typing import Any
 from urllib.parse import urljoin
 
-import httpx
 import lark_oapi as lark
 from lark_oapi.api.im.v1 import CreateImageRequest, CreateImageRequestBody, CreateImageResponse
 
 from common.logger import exception_logger
 from config.base import WEB_BASE_URL
+from notification.provider_clients import get_notification_http_client
 from protocol.notification_tool import NotificationToolProtocol
 
+_lark_clients: dict[tuple[str, str], lark.Client] = {}
+_lark_clients_lock = threading.Lock()
+
+
+def _get_lark_client(*, app_id: str, app_secret: str) -> lark.Client:
+    cache_key = (app_id, hashlib.sha256(app_secret.encode("utf-8")).hexdigest())
+    with _lark_clients_lock:
+        client = _lark_clients.get(cache_key)
+        if client is None:
+            client = lark.Client.builder() \
+                .app_id(app_id=app_id) \
+                .app_secret(app_secret=app_secret) \
+                .log_level(lark.LogLevel.DEBUG) \
+                .build()
+            _lark_clients[cache_key] = client
+        return client
+
 
 class FeishuNotificationTool(NotificationToolProtocol):
     
@@ -61,12 +79,8 @@ class FeishuNotificationTool(NotificationToolProtocol):
         if app_id is None or app_secret is None:
             raise ValueError("The app_id or app_secret of the notification is not set")
 
-        # 创建client
-        client = lark.Client.builder() \
-            .app_id(app_id=app_id) \
-            .app_secret(app_secret=app_secret) \
-            .log_level(lark.LogLevel.DEBUG) \
-            .build()
+        # 复用 client：lark client 内部缓存 tenant_access_token，每次新建都会重新换取 token
+        client = _get_lark_client(app_id=app_id, app_secret=app_secret)
 
         # 构造请求对象
         request: CreateImageRequest = CreateImageRequest.builder() \
@@ -150,9 +164,8 @@ class FeishuNotificationTool(NotificationToolProtocol):
         ]
 
         if cover:
-            async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-                cover_res = await client.get(cover)
-                cover_res.raise_for_status()
+            cover_res = await get_notification_http_client("feishu").get(cover, follow_redirects=True)
+            cover_res.raise_for_status()
             image_key = await asyncio.to_thread(self.upload_image, image=cover_res.content)
             if image_key is not None:
                 elements.insert(0, {
@@ -229,8 +242,7 @@ class FeishuNotificationTool(NotificationToolProtocol):
             })
         try:
             headers = {"Content-Type": "application/json"}
-            async with httpx.AsyncClient(timeout=10) as client:
-                res = await client.post(webhook_url, json=payload, headers=headers)
+            res = await get_notification_http_client("feishu").post(webhook_url, json=payload, headers=headers)
             if res.json().get('code') != 0:
                 exception_logger.error(f'Failed to send notification to Feishu: {res.json()}')
 
@@ -1,6 +1,8 @@
 import asyncio
 import crud
 import json
+import time
+from dataclasses import dataclass
 from data.sql.base import async_session_context
 from file.aliyun_oss_remote_file_service import AliyunOSSRemoteFileService
 from file.aws_s3_remote_file_service import AWSS3RemoteFileService
@@ -9,9 +11,115 @@ from file.generic_s3_remote_file_service import GenericS3RemoteFileService
 from enums.file import RemoteFileService
 from common.encrypt import decrypt_file_system_config
 from common.logger import exception_logger
+from common.redis import redis_pool
 from protocol.remote_file_service import RemoteFileServiceProtocol
 
+# Initialised services are cached per process so hot paths skip the three DB
+# lookups, config decryption and client / STS setup. Keep the TTL well below
+# the 3600s STS credential lifetime so presigned URLs stay valid long enough.
+FILE_SYSTEM_CLIENT_CACHE_TTL_SECONDS = 600
+# A cached service is trusted this long before its owner's config version is
+# re-read from redis; editing the config bumps that version (see ``invalidate``).
+FILE_SYSTEM_CLIENT_VERSION_CHECK_SECONDS = 5
+FILE_SYSTEM_CONFIG_VERSION_KEY_PREFIX = "file_system:config:version:"
+
+
+@dataclass
+class _CachedRemoteFileService:
+    service: RemoteFileServiceProtocol
+    config_version: str
+    expires_at: float
+    checked_at: float
+
+
+# (user_id, user_file_system_id or None for the user's default) -> service
+_remote_file_service_cache: dict[tuple[int, int | None], _CachedRemoteFileService] = {}
+
+
 class FileSystemProxy:
+    # =========================
+    # Client cache
+    # =========================
+    @staticmethod
+    async def _get_config_versions(user_ids: list[int]) -> dict[int, str]:
+        """Current config version per user; users whose version could not be
+        read are missing from the result and must not be cached."""
+        redis_conn = None
+        try:
+            redis_conn = await redis_pool()
+            values = await redis_conn.mget(
+                [f"{FILE_SYSTEM_CONFIG_VERSION_KEY_PREFIX}{user_id}" for user_id in user_ids]
+            )
+            return {user_id: value or "0" for user_id, value in zip(user_ids, values)}
+        except Exception as e:
+            exception_logger.warning(f"Failed to read file system config version: {e}")
+            return {}
+        finally:
+            if redis_conn is not None:
+                await redis_conn.aclose()
+
+    @classmethod
+    async def _get_cached(
+        cls,
+        *,
+        user_id: int,
+        user_file_system_id: int | None,
+    ) -> RemoteFileServiceProtocol | None:
+        key = (user_id, user_file_system_id)
+        entry = _remote_file_service_cache.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            _remote_file_service_cache.pop(key, None)
+            return None
+        if now - entry.checked_at < FILE_SYSTEM_CLIENT_VERSION_CHECK_SECONDS:
+            return entry.service
+        config_version = (await cls._get_config_versions([user_id])).get(user_id)
+        if config_version != entry.config_version:
+            _remote_file_service_cache.pop(key, None)
+            return None
+        entry.checked_at = now
+        return entry.service
+
+    @staticmethod
+    def _store_cached(
+        *,
+        user_id: int,
+        user_file_system_id: int | None,
+        config_version: str | None,
+        service: RemoteFileServiceProtocol,
+    ) -> None:
+        if config_version is None:
+            return
+        now = time.monotonic()
+        _remote_file_service_cache[(user_id, user_file_system_id)] = _CachedRemoteFileService(
+            service=service,
+            config_version=config_version,
+            expires_at=now + FILE_SYSTEM_CLIENT_CACHE_TTL_SECONDS,
+            checked_at=now,
+        )
+
+    @classmethod
+    async def invalidate(
+        cls,
+        *,
+        user_id: int,
+    ) -> None:
+        """Drop cached services of ``user_id`` in every process. Call after the
+        user's file system config or default file system changed."""
+        for key in [key for key in _remote_file_service_cache if key[0] == user_id]:
+            _remote_file_service_cache.pop(key, None)
+        redis_conn = None
+        try:
+            redis_conn = await redis_pool()
+            await redis_conn.incr(f"{FILE_SYSTEM_CONFIG_VERSION_KEY_PREFIX}{user_id}")
+        except Exception as e:
+            exception_logger.error(f"Failed to bump file system config version: {e}")
+        finally:
+            if redis_conn is not None:
+                await redis_conn.aclose()
+
     # =========================
     # Factory（唯一推荐入口）
     # =========================
@@ -52,6 +160,12 @@ class FileSystemProxy:
         *,
         user_id: int
     ) -> RemoteFileServiceProtocol:
+        cached = await cls._get_cached(user_id=user_id, user_file_system_id=None)
+        if cached is not None:
+            return cached
+        # Read the version before the config so a concurrent edit can only make
+        # the cached entry look stale, never fresh.
+        config_version = (await cls._get_config_versions([user_id])).get(user_id)
         try:
             async with async_session_context() as db:
                 db_user = await crud.user.get_user_by_id_async(
@@ -77,11 +191,18 @@ class FileSystemProxy:
                 if not db_file_system:
                     raise Exception("File system not found")
             
-            return await cls._build_remote_file_service(
+            remote_file_service = await cls._build_remote_file_service(
                 user_id=user_id,
                 db_user_file_system=db_user_file_system,
                 db_file_system=db_file_system,
             )
+            cls._store_cached(
+                user_id=user_id,
+                user_file_system_id=None,
+                config_version=config_version,
+                service=remote_file_service,
+            )
+            return remote_file_service
         except Exception as e:
             exception_logger.error(f'''Failed to create file system proxy: {e}''')
             raise
@@ -93,6 +214,10 @@ class FileSystemProxy:
         user_id: int,
         user_file_system_id: int,
     ) -> RemoteFileServiceProtocol:
+        cached = await cls._get_cached(user_id=user_id, user_file_system_id=user_file_system_id)
+        if cached is not None:
+            return cached
+        config_version = (await cls._get_config_versions([user_id])).get(user_id)
         async with async_session_context() as db:
             db_user_file_system = await crud.file_system.get_user_file_system_by_id_async(
                 db=db,
@@ -110,11 +235,18 @@ class FileSystemProxy:
             if db_file_system is None:
                 raise Exception("File system not found")
 
-        return await cls._build_remote_file_service(
+        remote_file_service = await cls._build_remote_file_service(
             user_id=user_id,
             db_user_file_system=db_user_file_system,
             db_file_system=db_file_system,
         )
+        cls._store_cached(
+            user_id=user_id,
+            user_file_system_id=user_file_system_id,
+            config_version=config_version,
+            service=remote_file_service,
+        )
+        return remote_file_service
 
     @classmethod
     async def create_for_users(
@@ -125,6 +257,17 @@ class FileSystemProxy:
         if not user_ids:
             return []
         normalized_user_ids = list(dict.fromkeys(user_ids))
+        service_by_user_id: dict[int, RemoteFileServiceProtocol] = {}
+        for user_id in normalized_user_ids:
+            cached = await cls._get_cached(user_id=user_id, user_file_system_id=None)
+            if cached is not None:
+                service_by_user_id[user_id] = cached
+        normalized_user_ids = [
+            user_id for user_id in normalized_user_ids if user_id not in service_by_user_id
+        ]
+        if not normalized_user_ids:
+            return [service_by_user_id[user_id] for user_id in user_ids]
+        config_versions = await cls._get_config_versions(normalized_user_ids)
         async with async_session_context() as db:
             db_users = await crud.user.get_users_by_ids_async(
                 db=db,
@@ -164,7 +307,7 @@ class FileSystemProxy:
                 file_system.id: file_system for file_system in db_file_systems
             }
 
-        return await asyncio.gather(
+        built_services = await asyncio.gather(
             *[
                 cls._build_remote_file_service(
                     user_id=user_id,
@@ -173,6 +316,15 @@ class FileSystemProxy:
                         user_file_system_by_id[user_by_id[user_id].default_user_file_system].file_system_id
                     ],
                 )
-                for user_id in user_ids
+                for user_id in normalized_user_ids
             ]
         )
+        for user_id, remote_file_service in zip(normalized_user_ids, built_services):
+            service_by_user_id[user_id] = remote_file_service
+            cls._store_cached(
+                user_id=user_id,
+                user_file_system_id=None,
+                config_version=config_versions.get(user_id),
+                service=remote_file_service,
+            )
+        return [service_by_user_id[user_id] for user_id in user_ids]
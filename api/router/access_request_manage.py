@@ -10,6 +10,7 @@ import models
 import schemas
 from common.celery.app import start_trigger_user_notification_event
 from common.dependencies import get_async_db, get_current_user
+from common.document_count_cache import bump_document_count_version
 from enums.access_request import AccessRequestStatus, AccessRequestTargetType
 from enums.document import UserDocumentAuthority
 from enums.notification import NotificationTriggerEventUUID
@@ -355,6 +356,8 @@ async def handle_access_request(
 
     await db.commit()
     await db.refresh(db_request)
+    if request.approve and target_type == AccessRequestTargetType.DOCUMENT:
+        await bump_document_count_version([applicant_id])
 
     if target_type == AccessRequestTargetType.SECTION:
         trigger_uuid = NotificationTriggerEventUUID.SECTION_JOIN_REQUEST_HANDLED.value
@@ -37,6 +37,12 @@ from common.interpret_event import EventInterpreter
 from common.kimi_compat import build_kimi_tool_compatible_extra_body
 from common.jwt_utils import create_token
 from common.logger import exception_logger, format_log_message, info_logger
+from common.mcp_agent_pool import (
+    MCPAgentLease,
+    acquire_mcp_agent,
+    bump_ai_agent_config_version,
+    warm_mcp_agent,
+)
 from common.subscription_access import (
     SUBSCRIPTION_REQUIRED_ERROR_MESSAGE,
     has_plan_level_access,
@@ -518,6 +524,7 @@ async def delete_ai_model(
     if user.default_document_reader_model_id in delete_model_request.model_ids:
         user.default_document_reader_model_id = None
     await db.commit()
+    await bump_ai_agent_config_version()
     return schemas.common.SuccessResponse()
 
 @ai_router.post("/model-provider/delete", response_model=schemas.common.NormalResponse)
@@ -554,6 +561,7 @@ async def delete_ai_model_provider(
     if user.default_document_reader_model_id in db_model_ids:
         user.default_document_reader_model_id = None
     await db.commit()
+    await bump_ai_agent_config_version()
     return schemas.common.SuccessResponse()
 
 @ai_router.post("/model-provider/community", response_model=schemas.pagination.InfiniteScrollPagination[schemas.ai.ModelProvider])
@@ -772,6 +780,7 @@ async def update_ai_model(
         db_ai_model.compute_point_multiplier = model_update_request.compute_point_multiplier
     db_ai_model.update_time = now
     await db.commit()
+    await bump_ai_agent_config_version()
     return schemas.common.SuccessResponse()
 
 @ai_router.post("/model-provider/update", response_model=schemas.common.NormalResponse)
@@ -804,6 +813,7 @@ async def update_ai_model_provider(
     db_ai_model_provider.update_time = now
 
     await db.commit()
+    await bump_ai_agent_config_version()
     return schemas.common.SuccessResponse()
 
 async def create_agent(
@@ -901,6 +911,11 @@ async def create_agent(
         agent = MCPAgent(llm=llm, client=mcp_client, max_steps=MCP_AGENT_MAX_STEPS)
         agent.adapter = StructuredLangChainAdapter(disallowed_tools=agent.disallowed_tools)
         agent.adapter._record_telemetry = False
+        try:
+            await warm_mcp_agent(agent)
+        except Exception:
+            await agent.close()
+            raise
         return agent, resolved_model_id
     except Exception as e:
         exception_logger.error(
@@ -909,6 +924,25 @@ async def create_agent(
         raise
 
 
+async def acquire_agent(
+    user_id: int,
+    enable_mcp: bool = False,
+    model_id: int | None = None,
+) -> MCPAgentLease:
+    """Lease a ready agent from the pool, building one with ``create_agent``
+    when none is idle. Release it once the answer has been streamed."""
+    return await acquire_mcp_agent(
+        user_id=user_id,
+        model_id=model_id,
+        enable_mcp=enable_mcp,
+        create=lambda: create_agent(
+            user_id=user_id,
+            enable_mcp=enable_mcp,
+            model_id=model_id,
+        ),
+    )
+
+
 def _build_ai_language_instruction(language: int | None) -> str:
     if language == AIInteractionLanguage.CHINESE:
         return (
@@ -1162,7 +1196,7 @@ async def stream_ops_request(
                 },
             )
         )
-        agent, resolved_model_id = await create_agent(
+        agent_lease = await acquire_agent(
             user_id=user.id,
             enable_mcp=enable_mcp,
             model_id=model_id,
@@ -1192,16 +1226,19 @@ async def stream_ops_request(
         )
         return
 
-    async for event in stream_ops_with_agent(
-        user_id=user.id,
-        model_id=resolved_model_id,
-        agent=agent,
-        messages=messages,
-        system_prompt=system_prompt,
-        chat_id=chat_id,
-        emit_initial_status=False,
-    ):
-        yield event
+    try:
+        async for event in stream_ops_with_agent(
+            user_id=user.id,
+            model_id=agent_lease.model_id,
+            agent=agent_lease.agent,
+            messages=messages,
+            system_prompt=system_prompt,
+            chat_id=chat_id,
+            emit_initial_status=False,
+        ):
+            yield event
+    finally:
+        agent_lease.release()
 
 def _sse(event: dict) -> str:
     """
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import crud
 import models
 import schemas
+from common.auth_cache import invalidate_user_auth_cache
 from common.dependencies import get_async_db, get_current_user
 
 api_key_router = APIRouter()
@@ -87,4 +88,6 @@ async def delete_api_key(
         api_key_ids=api_keys_delete_request.api_key_ids
     )
     await db.commit()
+    # 批量 update 不触发 ORM 事件，需手动让已缓存的 API key 失效
+    await invalidate_user_auth_cache([user.id])
     return schemas.common.SuccessResponse()
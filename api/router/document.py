@@ -22,6 +22,8 @@ from common.document_creation import (
     ensure_sections_attachable,
 )
 from common.file import register_remote_file
+from common.public_search_cache import bump_public_search_version
+from common.document_count_cache import bump_document_count_version
 from proxy.file_system_proxy import FileSystemProxy
 from common.dependencies import (
     check_deployed_by_official,
@@ -1081,6 +1083,7 @@ async def update_document(
     )
 
     section_process_tasks = None
+    publish_state_changed = False
     if document_update_request.title is not None:
         db_document.title = document_update_request.title
     if document_update_request.description is not None:
@@ -1098,11 +1101,13 @@ async def update_document(
                 db=db,
                 document_id=document_update_request.document_id,
             )
+            publish_state_changed = True
         elif not document_update_request.is_public and db_publish_document is not None:
             await crud.document.delete_published_document_by_document_id_async(
                 db=db,
                 document_id=document_update_request.document_id,
             )
+            publish_state_changed = True
     if document_update_request.content is not None:
         if db_document.category != DocumentCategory.QUICK_NOTE:
             raise schemas.error.CustomException(
@@ -1213,6 +1218,9 @@ async def update_document(
             )
     db_document.update_time = now
     await db.commit()
+    await bump_document_count_version([user.id])
+    if publish_state_changed:
+        await bump_public_search_version()
     if section_process_tasks is not None:
         section_process_tasks.apply_async()
     return schemas.common.SuccessResponse()
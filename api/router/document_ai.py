@@ -29,7 +29,7 @@ from router.ai import (
     _build_mcp_recursion_limit_notice_key,
     _is_graph_recursion_limit_error,
     _normalize_chat_images,
-    create_agent,
+    acquire_agent,
 )
 from common.access_control import ensure_document_access
 
@@ -516,7 +516,7 @@ async def _stream_document_answer_request(
             )
         )
 
-        agent, model_id = await create_agent(
+        agent_lease = await acquire_agent(
             user_id=user.id,
             enable_mcp=document_ask_request.enable_mcp,
             model_id=document_ask_request.model_id,
@@ -547,18 +547,21 @@ async def _stream_document_answer_request(
         )
         return
 
-    async for event in _stream_document_answer_with_agent(
-        document_id=document_id,
-        document_title=document_title,
-        user=user,
-        model_id=model_id,
-        system_prompt=system_prompt,
-        messages=messages,
-        chunk_citations=chunk_citations,
-        agent=agent,
-        chat_id=chat_id,
-    ):
-        yield event
+    try:
+        async for event in _stream_document_answer_with_agent(
+            document_id=document_id,
+            document_title=document_title,
+            user=user,
+            model_id=agent_lease.model_id,
+            system_prompt=system_prompt,
+            messages=messages,
+            chunk_citations=chunk_citations,
+            agent=agent_lease.agent,
+            chat_id=chat_id,
+        ):
+            yield event
+    finally:
+        agent_lease.release()
 
 
 @document_ai_router.post("/ask")
@@ -8,6 +8,7 @@ import models
 import schemas
 from common.remote_file_cleanup import delete_document_remote_files
 from common.dependencies import get_async_db, get_current_user
+from common.document_count_cache import bump_document_count_version
 from data.milvus.delete import delete_documents_from_milvus
 from data.neo4j.delete import delete_documents_and_related_from_neo4j
 from enums.document import DocumentCategory
@@ -99,6 +100,7 @@ async def star_document(
             document_id=star_request.document_id
         )
     await db.commit()
+    await bump_document_count_version([user.id])
     return schemas.common.SuccessResponse(message="The star status of the document is successfully updated")
 
 
@@ -133,6 +135,7 @@ async def read_document(
             document_id=read_request.document_id
         )
     await db.commit()
+    await bump_document_count_version([user.id])
     return schemas.common.SuccessResponse(message="The read status of the document is successfully updated")
 
 
@@ -207,4 +210,5 @@ async def delete_document(
         asyncio.to_thread(delete_documents_from_milvus, doc_ids=document_ids),
     )
     await db.commit()
+    await bump_document_count_version([user.id])
     return SuccessResponse(message="The documents is deleted successfully")
@@ -8,6 +8,7 @@ import models
 import schemas
 from common.dependencies import get_async_db, get_current_user
 from common.encrypt import decrypt_share_access_key, encrypt_share_access_key
+from common.public_search_cache import bump_public_search_version
 from common.resource_actions import resolve_publish_action
 
 document_publish_manage_router = APIRouter()
@@ -48,6 +49,8 @@ async def document_publish_request(
         )
 
     await db.commit()
+    if action in ("create", "delete"):
+        await bump_public_search_version()
     return schemas.common.SuccessResponse()
 
 
@@ -19,7 +19,9 @@ from data.milvus.search import (
 from enums.document import DocumentCategory
 from proxy.file_system_proxy import FileSystemProxy
 from common.access_control import ensure_document_access, ensure_publish_access_key
-from common.query_helpers import resolve_infinite_scroll_meta
+from common.query_helpers import resolve_infinite_scroll_meta, split_infinite_scroll_page
+from common.document_count_cache import resolve_user_document_count
+from common.public_search_cache import get_cached_public_search, set_cached_public_search
 
 document_query_router = APIRouter()
 
@@ -653,39 +655,38 @@ async def search_user_unread_documents(
     db: AsyncSession = Depends(get_async_db),
     user: models.user.User = Depends(get_current_user)
 ):
-    has_more = False
-    next_start = None
     db_documents = await crud.document.search_user_unread_documents_async(
         db=db,
         user_id=user.id,
         start=search_unread_list_request.start,
-        limit=search_unread_list_request.limit,
+        limit=search_unread_list_request.limit + 1,
         keyword=search_unread_list_request.keyword,
         label_ids=search_unread_list_request.label_ids,
         desc=search_unread_list_request.desc
     )
-
+    db_documents, next_item_id = split_infinite_scroll_page(
+        items=db_documents,
+        limit=search_unread_list_request.limit,
+    )
     documents = await get_document_infos(db=db, documents=db_documents)
-    next_document = None
-    if search_unread_list_request.limit > 0 and len(documents) == search_unread_list_request.limit:
-        next_document = await crud.document.search_next_user_unread_document_async(
-            db=db,
-            user_id=user.id,
-            document=db_documents[-1],
-            keyword=search_unread_list_request.keyword,
-            label_ids=search_unread_list_request.label_ids,
-            desc=search_unread_list_request.desc
-        )
     has_more, next_start = resolve_infinite_scroll_meta(
         page_item_count=len(documents),
         limit=search_unread_list_request.limit,
-        next_item_id=next_document.id if next_document is not None else None,
+        next_item_id=next_item_id,
     )
-    total = await crud.document.count_user_unread_documents_async(
-        db=db,
+    total = await resolve_user_document_count(
         user_id=user.id,
+        scope="unread",
         keyword=search_unread_list_request.keyword,
-        label_ids=search_unread_list_request.label_ids
+        label_ids=search_unread_list_request.label_ids,
+        start=search_unread_list_request.start,
+        count_on_first_page_only=search_unread_list_request.count_on_first_page_only,
+        count=lambda: crud.document.count_user_unread_documents_async(
+            db=db,
+            user_id=user.id,
+            keyword=search_unread_list_request.keyword,
+            label_ids=search_unread_list_request.label_ids,
+        ),
     )
     return schemas.pagination.InfiniteScrollPagination(
         total=total,
@@ -702,38 +703,38 @@ async def recent_read_document(
     db: AsyncSession = Depends(get_async_db),
     user: models.user.User = Depends(get_current_user)
 ):
-    has_more = False
-    next_start = None
     db_documents = await crud.document.search_user_recent_read_documents_async(
         db=db,
         user_id=user.id,
         start=search_recent_read_request.start,
-        limit=search_recent_read_request.limit,
+        limit=search_recent_read_request.limit + 1,
         keyword=search_recent_read_request.keyword,
         label_ids=search_recent_read_request.label_ids,
         desc=search_recent_read_request.desc
     )
+    db_documents, next_item_id = split_infinite_scroll_page(
+        items=db_documents,
+        limit=search_recent_read_request.limit,
+    )
     documents = await get_document_infos(db=db, documents=db_documents)
-    next_document = None
-    if search_recent_read_request.limit > 0 and len(documents) == search_recent_read_request.limit:
-        next_document = await crud.document.search_next_user_recent_read_document_async(
-            db=db,
-            user_id=user.id,
-            document=db_documents[-1],
-            keyword=search_recent_read_request.keyword,
-            label_ids=search_recent_read_request.label_ids,
-            desc=search_recent_read_request.desc
-        )
     has_more, next_start = resolve_infinite_scroll_meta(
         page_item_count=len(documents),
         limit=search_recent_read_request.limit,
-        next_item_id=next_document.id if next_document is not None else None,
+        next_item_id=next_item_id,
     )
-    total = await crud.document.count_user_recent_read_documents_async(
-        db=db,
+    total = await resolve_user_document_count(
         user_id=user.id,
+        scope="recent_read",
         keyword=search_recent_read_request.keyword,
-        label_ids=search_recent_read_request.label_ids
+        label_ids=search_recent_read_request.label_ids,
+        start=search_recent_read_request.start,
+        count_on_first_page_only=search_recent_read_request.count_on_first_page_only,
+        count=lambda: crud.document.count_user_recent_read_documents_async(
+            db=db,
+            user_id=user.id,
+            keyword=search_recent_read_request.keyword,
+            label_ids=search_recent_read_request.label_ids,
+        ),
     )
     return schemas.pagination.InfiniteScrollPagination(
         total=total,
@@ -750,38 +751,38 @@ async def search_all_mine_documents(
     db: AsyncSession = Depends(get_async_db),
     user: models.user.User = Depends(get_current_user)
 ):
-    has_more = False
-    next_start = None
     db_documents = await crud.document.search_user_documents_async(
         db=db,
         user_id=user.id,
         start=search_all_my_document_request.start,
-        limit=search_all_my_document_request.limit,
+        limit=search_all_my_document_request.limit + 1,
         keyword=search_all_my_document_request.keyword,
         label_ids=search_all_my_document_request.label_ids,
         desc=search_all_my_document_request.desc
     )
+    db_documents, next_item_id = split_infinite_scroll_page(
+        items=db_documents,
+        limit=search_all_my_document_request.limit,
+    )
     documents = await get_document_infos(db=db, documents=db_documents)
-    next_document = None
-    if search_all_my_document_request.limit > 0 and len(documents) == search_all_my_document_request.limit:
-        next_document = await crud.document.search_next_user_document_async(
-            db=db,
-            user_id=user.id,
-            document=db_documents[-1],
-            keyword=search_all_my_document_request.keyword,
-            label_ids=search_all_my_document_request.label_ids,
-            desc=search_all_my_document_request.desc
-        )
     has_more, next_start = resolve_infinite_scroll_meta(
         page_item_count=len(documents),
         limit=search_all_my_document_request.limit,
-        next_item_id=next_document.id if next_document is not None else None,
+        next_item_id=next_item_id,
     )
-    total = await crud.document.count_user_documents_async(
-        db=db,
+    total = await resolve_user_document_count(
         user_id=user.id,
+        scope="mine",
         keyword=search_all_my_document_request.keyword,
-        label_ids=search_all_my_document_request.label_ids
+        label_ids=search_all_my_document_request.label_ids,
+        start=search_all_my_document_request.start,
+        count_on_first_page_only=search_all_my_document_request.count_on_first_page_only,
+        count=lambda: crud.document.count_user_documents_async(
+            db=db,
+            user_id=user.id,
+            keyword=search_all_my_document_request.keyword,
+            label_ids=search_all_my_document_request.label_ids,
+        ),
     )
     return schemas.pagination.InfiniteScrollPagination(
         total=total,
@@ -798,38 +799,38 @@ async def search_my_star_documents(
     db: AsyncSession = Depends(get_async_db),
     user: models.user.User = Depends(get_current_user)
 ):
-    has_more = False
-    next_start = None
     db_documents = await crud.document.search_user_stared_documents_async(
         db=db,
         user_id=user.id,
         start=search_my_star_documents_request.start,
-        limit=search_my_star_documents_request.limit,
+        limit=search_my_star_documents_request.limit + 1,
         keyword=search_my_star_documents_request.keyword,
         label_ids=search_my_star_documents_request.label_ids,
         desc=search_my_star_documents_request.desc
     )
+    db_documents, next_item_id = split_infinite_scroll_page(
+        items=db_documents,
+        limit=search_my_star_documents_request.limit,
+    )
     documents = await get_document_infos(db=db, documents=db_documents)
-    next_document = None
-    if search_my_star_documents_request.limit > 0 and len(documents) == search_my_star_documents_request.limit:
-        next_document = await crud.document.search_next_user_star_document_async(
-            db=db,
-            user_id=user.id,
-            document=db_documents[-1],
-            keyword=search_my_star_documents_request.keyword,
-            label_ids=search_my_star_documents_request.label_ids,
-            desc=search_my_star_documents_request.desc
-        )
     has_more, next_start = resolve_infinite_scroll_meta(
         page_item_count=len(documents),
         limit=search_my_star_documents_request.limit,
-        next_item_id=next_document.id if next_document is not None else None,
+        next_item_id=next_item_id,
     )
-    total = await crud.document.count_user_stared_documents_async(
-        db=db,
+    total = await resolve_user_document_count(
         user_id=user.id,
+        scope="star",
         keyword=search_my_star_documents_request.keyword,
-        label_ids=search_my_star_documents_request.label_ids
+        label_ids=search_my_star_documents_request.label_ids,
+        start=search_my_star_documents_request.start,
+        count_on_first_page_only=search_my_star_documents_request.count_on_first_page_only,
+        count=lambda: crud.document.count_user_stared_documents_async(
+            db=db,
+            user_id=user.id,
+            keyword=search_my_star_documents_request.keyword,
+            label_ids=search_my_star_documents_request.label_ids,
+        ),
     )
     return schemas.pagination.InfiniteScrollPagination(
         total=total,
@@ -916,6 +917,7 @@ async def search_knowledge_vector(
             user_id=user.id,
             keyword=query,
             limit=vector_search_request.limit,
+            order_by_relevance=True,
         )
         documents = [
             schemas.document.DocumentInfo.model_validate(document)
@@ -933,6 +935,7 @@ async def search_knowledge_vector(
         user_id=user.id,
         keyword=query,
         limit=vector_search_request.limit,
+        order_by_relevance=True,
     )
     snippets_pool: dict[int, str] = {
         cast(int, chunk['doc_id']): cast(str, chunk.get('text') or '')
@@ -972,6 +975,7 @@ async def search_public_knowledge_vector(
             db=db,
             keyword=query,
             limit=vector_search_request.limit,
+            order_by_relevance=True,
         )
         documents = [
             schemas.document.DocumentInfo.model_validate(document)
@@ -979,9 +983,25 @@ async def search_public_knowledge_vector(
         ]
         return schemas.document.VectorSearchResponse(documents=documents)
 
-    # Vector mode: pull a wider candidate set from milvus, then keep only
-    # documents that are currently published. Without the post-filter, the
-    # public endpoint would leak private documents.
+    # Vector mode results only change when a document is published or
+    # unpublished, or when the worker finishes embedding a published document,
+    # so hot public queries are served from the versioned cache without
+    # touching milvus.
+    cache_version, cached = await get_cached_public_search(
+        query=query,
+        limit=vector_search_request.limit,
+    )
+    if cached is not None:
+        ordered_ids, snippets = cached
+        return await _build_public_vector_search_response(
+            db=db,
+            ordered_ids=ordered_ids,
+            snippets=snippets,
+        )
+
+    # Pull a wider candidate set from milvus, then keep only documents that
+    # are currently published. Without the post-filter, the public endpoint
+    # would leak private documents.
     candidate_top_k = max(vector_search_request.limit * 4, 20)
     fused_chunks = await public_hybrid_search(
         search_text=query,
@@ -991,12 +1011,20 @@ async def search_public_knowledge_vector(
         db=db,
         keyword=query,
         limit=vector_search_request.limit,
+        order_by_relevance=True,
     )
     candidate_document_ids: list[int] = [
         cast(int, chunk.get('doc_id')) for chunk in fused_chunks
     ]
     candidate_document_ids.extend(doc.id for doc in title_matches)
     if not candidate_document_ids:
+        await set_cached_public_search(
+            version=cache_version,
+            query=query,
+            limit=vector_search_request.limit,
+            document_ids=[],
+            snippets={},
+        )
         return schemas.document.VectorSearchResponse(documents=[])
 
     publish_records = await crud.document.get_publish_documents_by_document_ids_async(
@@ -1020,6 +1048,28 @@ async def search_public_knowledge_vector(
         limit=vector_search_request.limit,
     )
     snippets = {doc_id: snippet_by_id[doc_id] for doc_id in ordered_ids if doc_id in snippet_by_id}
+    await set_cached_public_search(
+        version=cache_version,
+        query=query,
+        limit=vector_search_request.limit,
+        document_ids=ordered_ids,
+        snippets=snippets,
+    )
+    return await _build_public_vector_search_response(
+        db=db,
+        ordered_ids=ordered_ids,
+        snippets=snippets,
+    )
+
+
+async def _build_public_vector_search_response(
+    *,
+    db: AsyncSession,
+    ordered_ids: list[int],
+    snippets: dict[int, str],
+) -> schemas.document.VectorSearchResponse:
+    if not ordered_ids:
+        return schemas.document.VectorSearchResponse(documents=[])
     db_documents = await crud.document.get_documents_by_document_ids_async(
         db=db,
         document_ids=ordered_ids,
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import crud
 import models
 import schemas
+from common.document_count_cache import bump_document_count_version
 from common.dependencies import get_async_db, get_current_user, plan_ability_checked
 from enums.ability import Ability
 from common.access_control import has_document_full_access
@@ -125,6 +126,7 @@ async def document_user_add_request(
         managed_by=user.id,
     )
     await db.commit()
+    await bump_document_count_version([document_user_add_request.user_id])
     return schemas.common.SuccessResponse()
 
 
@@ -169,4 +171,5 @@ async def delete_document_user(
         user_id=document_user_delete_request.user_id,
     )
     await db.commit()
+    await bump_document_count_version([document_user_delete_request.user_id])
     return schemas.common.SuccessResponse()
@@ -12,6 +12,12 @@ import crud
 import models
 import schemas
 from common.encrypt import encrypt_file_system_config, decrypt_file_system_config
+from common.file_migration import get_stored_file_migration_job, start_stored_file_migration_job
+from common.presigned_url_cache import (
+    get_cached_stored_file_location,
+    get_presigned_url as get_cached_presigned_url,
+    set_cached_stored_file_location,
+)
 from common.upload_limits import (
     can_upgrade_document_upload,
     get_document_upload_limit_bytes,
@@ -345,15 +351,22 @@ async def resolve_file(
     key = _normalize_and_validate_path(path)
 
     if user_file_system_id is None:
-        async with async_session_context() as db:
-            stored_file = await crud.file_system.get_stored_file_by_owner_path_async(
-                db=db,
-                owner_user_id=owner_id,
+        hit, user_file_system_id = get_cached_stored_file_location(owner_id=owner_id, path=key)
+        if not hit:
+            async with async_session_context() as db:
+                stored_file = await crud.file_system.get_stored_file_by_owner_path_async(
+                    db=db,
+                    owner_user_id=owner_id,
+                    path=key,
+                )
+            user_file_system_id = stored_file.user_file_system_id if stored_file is not None else None
+            set_cached_stored_file_location(
+                owner_id=owner_id,
                 path=key,
+                user_file_system_id=user_file_system_id,
             )
-        user_file_system_id = stored_file.user_file_system_id if stored_file is not None else None
 
-    # 2) 初始化文件服务
+    # 2) 初始化文件服务（FileSystemProxy 进程内缓存，命中时无数据库 / 网络开销）
     file_service = (
         await FileSystemProxy.create_for_user_file_system(
             user_id=owner_id,
@@ -363,15 +376,20 @@ async def resolve_file(
         else await FileSystemProxy.create(user_id=owner_id)
     )
 
-    # 3) 生成短期 presigned URL（建议 60~300 秒）
-    url = file_service.presign_get_url(
-        file_path=key, 
-        expires_seconds=120
+    # 3) 复用未临近过期的 presigned URL，签名在本地完成
+    url, max_age = get_cached_presigned_url(
+        service=file_service,
+        owner_id=owner_id,
+        user_file_system_id=user_file_system_id,
+        path=key,
     )
 
-    # 4) 返回 Redirect（307：保留 method；GET 用 302/307 都行）
-    # 你也可以用 302
-    return RedirectResponse(url=url, status_code=307)
+    # 4) 返回 Redirect，并允许浏览器在 URL 有效期内复用该跳转
+    return RedirectResponse(
+        url=url,
+        status_code=307,
+        headers={"Cache-Control": f"private, max-age={max_age}"},
+    )
 
 
 @file_system_router.post("/files/search", response_model=schemas.file_system.StoredFileSearchResponse)
@@ -454,59 +472,25 @@ async def migrate_stored_files(
     if source_user_file_system.id == target_user_file_system.id:
         raise schemas.error.CustomException(code=400, message="Source and target file systems must be different")
 
-    if migrate_file_system_request.stored_file_ids:
-        stored_files = await crud.file_system.get_stored_files_by_ids_async(
-            db=db,
-            owner_user_id=current_user.id,
-            stored_file_ids=migrate_file_system_request.stored_file_ids,
-        )
-        stored_files = [
-            stored_file
-            for stored_file in stored_files
-            if stored_file.user_file_system_id == source_user_file_system.id
-        ]
-    else:
-        stored_files = await crud.file_system.search_stored_files_async(
-            db=db,
-            owner_user_id=current_user.id,
-            user_file_system_id=source_user_file_system.id,
-            limit=500,
-        )
-
-    source_service = await FileSystemProxy.create_for_user_file_system(
+    # 迁移在 celery worker 中后台执行（流式 / 服务端复制，按文件检查点），这里只登记并入队
+    job_state = await start_stored_file_migration_job(
         user_id=current_user.id,
-        user_file_system_id=source_user_file_system.id,
-    )
-    target_service = await FileSystemProxy.create_for_user_file_system(
-        user_id=current_user.id,
-        user_file_system_id=target_user_file_system.id,
-    )
-
-    migrated = 0
-    failed = 0
-    for stored_file in stored_files:
-        try:
-            content = await source_service.get_file_content_by_file_path(stored_file.path)
-            await target_service.upload_raw_content_to_path(
-                file_path=stored_file.path,
-                content=content,
-                content_type=stored_file.content_type,
-            )
-            await crud.file_system.update_stored_file_location_async(
-                db=db,
-                stored_file=stored_file,
-                user_file_system_id=target_user_file_system.id,
-                file_system_id=target_user_file_system.file_system_id,
-            )
-            migrated += 1
-        except Exception:
-            failed += 1
-    await db.commit()
-    return schemas.file_system.StoredFileMigrateResponse(
-        migrated=migrated,
-        skipped=0,
-        failed=failed,
+        source_user_file_system_id=source_user_file_system.id,
+        target_user_file_system_id=target_user_file_system.id,
+        stored_file_ids=migrate_file_system_request.stored_file_ids or None,
     )
+    return schemas.file_system.StoredFileMigrateResponse(**job_state)
+
+
+@file_system_router.post("/files/migrate/detail", response_model=schemas.file_system.StoredFileMigrateResponse)
+async def get_stored_file_migration(
+    stored_file_migrate_job_request: schemas.file_system.StoredFileMigrateJobRequest,
+    current_user: models.user.User = Depends(get_current_user),
+):
+    job_state = await get_stored_file_migration_job(stored_file_migrate_job_request.job_id)
+    if job_state is None or job_state.get("user_id") != current_user.id:
+        raise schemas.error.CustomException(code=404, message="Migration job not found")
+    return schemas.file_system.StoredFileMigrateResponse(**job_state)
 
 @file_system_router.post('/user-file-system/detail', response_model=schemas.file_system.UserFileSystemDetail)
 async def get_user_file_system_info(
@@ -618,6 +602,7 @@ async def delete_user_file_system(
     db_user_file_system.delete_at =now
     
     await db.commit()
+    await FileSystemProxy.invalidate(user_id=current_user.id)
     return schemas.common.SuccessResponse()
 
 @file_system_router.post("/update", response_model=schemas.common.NormalResponse)
@@ -642,6 +627,8 @@ async def update_file_system(
             user_file_system.config_json = encrypt_file_system_config(user_file_system_update_request.config_json)
         user_file_system.update_time = now
     await db.commit()
+    if user_file_system_update_request.config_json is not None:
+        await FileSystemProxy.invalidate(user_id=user_file_system.user_id)
     return schemas.common.SuccessResponse()
 
 
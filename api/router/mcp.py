@@ -5,6 +5,7 @@ import crud
 import models
 import schemas
 from common.dependencies import get_async_db, get_current_user
+from common.mcp_agent_pool import bump_ai_agent_config_version
 from enums.mcp import MCPCategory
 
 mcp_router = APIRouter()
@@ -141,6 +142,7 @@ async def create_server(
             server_id=db_base_mcp_server.id
         )
     await db.commit()
+    await bump_ai_agent_config_version(user.id)
     return schemas.common.SuccessResponse()
 
 @mcp_router.post("/server/update", response_model=schemas.common.NormalResponse)
@@ -217,6 +219,7 @@ async def update_server(
         if mcp_server_update_request.category is not None:
             db_base_mcp_server.category = mcp_server_update_request.category
     await db.commit()
+    await bump_ai_agent_config_version(user.id)
     return schemas.common.SuccessResponse()
 
 @mcp_router.post("/server/delete", response_model=schemas.common.NormalResponse)
@@ -262,4 +265,5 @@ async def delete_server(mcp_server_delete_request: schemas.mcp.MCPServerDeleteRe
         base_server_id=mcp_server_delete_request.id
     )
     await db.commit()
+    await bump_ai_agent_config_version(user.id)
     return schemas.common.SuccessResponse()
@@ -64,9 +64,9 @@ async def websocket_connect(
                 )
             )
     except WebSocketDisconnect:
-        notificationManager.disconnect(websocket_id, websocket=websocket)
+        await notificationManager.disconnect(websocket_id, websocket=websocket)
     except Exception as e:
-        notificationManager.disconnect(websocket_id, websocket=websocket)
+        await notificationManager.disconnect(websocket_id, websocket=websocket)
         exception_logger.error(
             format_log_message(
                 "notification_websocket_failed",
@@ -28,6 +28,7 @@ from common.file import get_remote_file_signed_url, get_remote_file_signed_urls
 from common.hash import hash_password, password_needs_rehash, verify_password
 from common.jwt_utils import REFRESH_TOKEN_TYPE, create_token
 from common.logger import exception_logger, format_log_message
+from common.mcp_agent_pool import bump_ai_agent_config_version
 from common.passkey import get_optional_webauthn_context
 from common.resource_plan_access import (
     ensure_default_resources_access,
@@ -45,6 +46,7 @@ from router.user_shared import (
     issue_tokens_or_create_mfa_challenge,
     setup_default_file_system_for_user_async,
 )
+from proxy.file_system_proxy import FileSystemProxy
 from schemas.error import CustomException
 
 user_router = APIRouter()
@@ -250,6 +252,7 @@ async def update_default_file_system(
     db_user.default_user_file_system = default_user_file_system
     db_user.update_time = datetime.now(timezone.utc)
     await db.commit()
+    await FileSystemProxy.invalidate(user_id=user.id)
     return schemas.common.SuccessResponse(message="The default file system is updated successfully.")
 
 @user_router.post('/default-engine/update', response_model=schemas.common.NormalResponse)
@@ -304,6 +307,7 @@ async def update_default_model(
         default_ai_interaction_language=default_model_update_request.default_ai_interaction_language,
     )
     await db.commit()
+    await bump_ai_agent_config_version(user.id)
     return schemas.common.SuccessResponse(message="The default model is updated successfully.")
 
 @user_router.post('/fans', response_model=schemas.pagination.InfiniteScrollPagination[schemas.user.UserPublicInfo])
@@ -242,6 +242,8 @@ class SearchUnreadListRequest(BaseModel):
     limit: int = 10
     label_ids: list[int] | None = None
     desc: bool = True
+    # 仅首页统计 total；后续页返回缓存中的 total（过期则为 None），适合无限滚动
+    count_on_first_page_only: bool = False
 
 class SearchRecentReadRequest(BaseModel):
     keyword: str | None = None
@@ -249,6 +251,8 @@ class SearchRecentReadRequest(BaseModel):
     limit: int = 10
     label_ids: list[int] | None = None
     desc: bool = True
+    # 仅首页统计 total；后续页返回缓存中的 total（过期则为 None），适合无限滚动
+    count_on_first_page_only: bool = False
 
 class SearchAllMyDocumentsRequest(BaseModel):
     keyword: str | None = None
@@ -256,6 +260,8 @@ class SearchAllMyDocumentsRequest(BaseModel):
     limit: int = 10
     label_ids: list[int] | None = None
     desc: bool = True
+    # 仅首页统计 total；后续页返回缓存中的 total（过期则为 None），适合无限滚动
+    count_on_first_page_only: bool = False
 
 class SearchMyStarDocumentsRequest(BaseModel):
     keyword: str | None = None
@@ -263,6 +269,8 @@ class SearchMyStarDocumentsRequest(BaseModel):
     limit: int = 10
     label_ids: list[int] | None = None
     desc: bool = True
+    # 仅首页统计 total；后续页返回缓存中的 total（过期则为 None），适合无限滚动
+    count_on_first_page_only: bool = False
 
 class SearchPublicDocumentsRequest(BaseModel):
     keyword: str | None = None
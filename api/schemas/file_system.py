@@ -67,10 +67,22 @@ class StoredFileSyncResponse(BaseModel):
     candidates: int
     total: int
 
+class StoredFileMigrateJobRequest(BaseModel):
+    job_id: str
+
 class StoredFileMigrateResponse(BaseModel):
-    migrated: int
-    skipped: int
-    failed: int
+    job_id: str | None = None
+    status: str | None = None
+    total: int | None = None
+    migrated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_copied: int = 0
+    server_side_copies: int = 0
+    elapsed_seconds: float | None = None
+    throughput_bytes_per_second: int | None = None
+    throughput_files_per_second: float | None = None
+    error: str | None = None
 
 class FileSystemInfoRequest(BaseModel):
     file_system_id: int
@@ -23,7 +23,8 @@ class PageableRequest(BaseModel):
     page_size: int
 
 class InfiniteScrollPagination(BaseModel, Generic[T]):
-    total: int
+    # 请求 count_on_first_page_only 且缓存的 total 已过期时，后续页返回 None（未知）
+    total: int | None
     start: int | None = None
     limit: int
     has_more: bool
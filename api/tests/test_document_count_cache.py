@@ -0,0 +1,60 @@
+import asyncio
+
+from common import document_count_cache
+from common.document_count_cache import document_count_cache_key
+from common.query_helpers import split_infinite_scroll_page
+
+
+class _Item:
+    def __init__(self, id: int):
+        self.id = id
+
+
+def test_document_count_cache_key_ignores_label_order():
+    assert document_count_cache_key(
+        version="1", user_id=7, scope="mine", keyword="ai", label_ids=[3, 1]
+    ) == document_count_cache_key(
+        version="1", user_id=7, scope="mine", keyword="ai", label_ids=[1, 3]
+    )
+
+
+def test_document_count_cache_key_separates_scope_version_and_filters():
+    base = document_count_cache_key(version="1", user_id=7, scope="mine", keyword=None, label_ids=None)
+    assert base == document_count_cache_key(version="1", user_id=7, scope="mine", keyword="", label_ids=None)
+    assert base != document_count_cache_key(version="2", user_id=7, scope="mine", keyword=None, label_ids=None)
+    assert base != document_count_cache_key(version="1", user_id=7, scope="unread", keyword=None, label_ids=None)
+    assert base != document_count_cache_key(version="1", user_id=7, scope="mine", keyword=None, label_ids=[])
+
+
+def test_split_infinite_scroll_page_uses_extra_row_as_next_start():
+    page, next_id = split_infinite_scroll_page(items=[_Item(9), _Item(8), _Item(7)], limit=2)
+    assert [item.id for item in page] == [9, 8]
+    assert next_id == 7
+
+    page, next_id = split_infinite_scroll_page(items=[_Item(9)], limit=2)
+    assert [item.id for item in page] == [9]
+    assert next_id is None
+
+    assert split_infinite_scroll_page(items=[_Item(9)], limit=0) == ([], None)
+
+
+def test_later_page_reports_unknown_total_once_cached_count_expired(monkeypatch):
+    async def cache_miss(**kwargs):
+        return "1", None
+
+    async def count():
+        raise AssertionError("later pages must not run the count query")
+
+    monkeypatch.setattr(document_count_cache, "get_cached_document_count", cache_miss)
+    total = asyncio.run(
+        document_count_cache.resolve_user_document_count(
+            user_id=7,
+            scope="mine",
+            keyword=None,
+            label_ids=None,
+            start=42,
+            count_on_first_page_only=True,
+            count=count,
+        )
+    )
+    assert total is None
@@ -0,0 +1,26 @@
+import asyncio
+
+from common import presigned_url_cache
+from proxy.file_system_proxy import FileSystemProxy
+from router import file_system
+
+
+class _FakeService:
+    def presign_get_url(self, file_path: str, expires_seconds: int = 3600) -> str:
+        return f"https://bucket.example/{file_path}?sig=1"
+
+
+def test_resolve_file_redirects_to_presigned_url(monkeypatch):
+    presigned_url_cache._presigned_urls.clear()
+
+    async def create_for_user_file_system(*, user_id, user_file_system_id):
+        return _FakeService()
+
+    monkeypatch.setattr(FileSystemProxy, "create_for_user_file_system", create_for_user_file_system)
+
+    response = asyncio.run(
+        file_system.resolve_file(path="images/a.png", owner_id=1, user_file_system_id=2)
+    )
+    assert response.status_code == 307
+    assert response.headers["location"] == "https://bucket.example/images/a.png?sig=1"
+    assert response.headers["cache-control"].startswith("private, max-age=")
@@ -0,0 +1,24 @@
+from sqlalchemy.dialects import postgresql
+
+import models
+from crud.keyword_search import document_label_filter, keyword_filter, keyword_like_pattern
+
+
+def test_keyword_like_pattern_escapes_wildcards():
+    assert keyword_like_pattern("abc") == "%abc%"
+    assert keyword_like_pattern("50%_off") == "%50\\%\\_off%"
+    assert keyword_like_pattern("a\\b") == "%a\\\\b%"
+
+
+def test_keyword_filter_matches_any_column_with_ilike():
+    clause = keyword_filter("abc", models.document.Document.title, models.document.Document.description)
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    assert "document.title ILIKE" in sql
+    assert "document.description ILIKE" in sql
+    assert " OR " in sql
+
+
+def test_document_label_filter_is_correlated_exists():
+    sql = str(document_label_filter([1, 2]).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXISTS (SELECT")
+    assert "document_document_label.document_id = document.id" in sql
@@ -0,0 +1,73 @@
+import asyncio
+
+import common.mcp_agent_pool as mcp_agent_pool
+from common.mcp_agent_pool import (
+    acquire_mcp_agent,
+    close_mcp_agents_for_current_loop,
+    mcp_server_fingerprint,
+)
+
+
+class _FakeAgent:
+
+    def __init__(self):
+        self.system_prompt = None
+        self._system_message = None
+        self._initialized = True
+        self._conversation_history = []
+        self.closed = False
+
+    def clear_conversation_history(self):
+        self._conversation_history = []
+
+    def _create_agent(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+def test_mcp_server_fingerprint_ignores_key_order():
+    first = mcp_server_fingerprint({"url": "http://mcp.test", "headers": {"a": "1", "b": "2"}})
+    second = mcp_server_fingerprint({"headers": {"b": "2", "a": "1"}, "url": "http://mcp.test"})
+    assert first == second
+    assert first != mcp_server_fingerprint({"url": "http://mcp.test", "headers": {"a": "2"}})
+
+
+def test_acquire_mcp_agent_reuses_reset_agent_until_version_changes(monkeypatch):
+    versions = {"current": "0:0"}
+
+    async def fake_version(user_id):
+        return versions["current"]
+
+    monkeypatch.setattr(mcp_agent_pool, "get_ai_agent_config_version", fake_version)
+    built: list[_FakeAgent] = []
+
+    async def create():
+        built.append(_FakeAgent())
+        return built[-1], 3
+
+    async def scenario():
+        first = await acquire_mcp_agent(user_id=1, model_id=None, enable_mcp=True, create=create)
+        busy = await acquire_mcp_agent(user_id=1, model_id=None, enable_mcp=True, create=create)
+        assert busy.agent is not first.agent
+        first.agent.system_prompt = "document prompt"
+        first.agent._conversation_history.append("message")
+        busy.release()
+        first.release()
+
+        again = await acquire_mcp_agent(user_id=1, model_id=None, enable_mcp=True, create=create)
+        assert again.agent is first.agent
+        assert again.model_id == 3
+        assert again.agent.system_prompt is None
+        assert again.agent._conversation_history == []
+        again.release()
+
+        versions["current"] = "0:1"
+        fresh = await acquire_mcp_agent(user_id=1, model_id=None, enable_mcp=True, create=create)
+        assert fresh.agent is built[-1] and len(built) == 3
+        fresh.release()
+        await close_mcp_agents_for_current_loop()
+        assert all(agent.closed for agent in built)
+
+    asyncio.run(scenario())
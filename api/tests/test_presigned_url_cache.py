@@ -0,0 +1,53 @@
+from common import presigned_url_cache
+from common.presigned_url_cache import (
+    PRESIGNED_URL_EXPIRES_SECONDS,
+    PRESIGNED_URL_MIN_REMAINING_SECONDS,
+    get_cached_stored_file_location,
+    get_presigned_url,
+    set_cached_stored_file_location,
+)
+
+
+class _FakeService:
+    def __init__(self):
+        self.signed = 0
+
+    def presign_get_url(self, file_path: str, expires_seconds: int = 3600) -> str:
+        self.signed += 1
+        return f"https://bucket.example/{file_path}?sig={self.signed}"
+
+
+def _reset():
+    presigned_url_cache._presigned_urls.clear()
+    presigned_url_cache._stored_file_locations.clear()
+
+
+def test_signed_url_is_reused_until_close_to_expiry():
+    _reset()
+    service = _FakeService()
+    url, max_age = get_presigned_url(service=service, owner_id=1, user_file_system_id=2, path="a.png", now=0)
+    assert max_age == PRESIGNED_URL_EXPIRES_SECONDS - PRESIGNED_URL_MIN_REMAINING_SECONDS
+
+    reused, reused_max_age = get_presigned_url(service=service, owner_id=1, user_file_system_id=2, path="a.png", now=100)
+    assert reused == url and service.signed == 1
+    assert reused_max_age == max_age - 100
+
+    late = PRESIGNED_URL_EXPIRES_SECONDS - PRESIGNED_URL_MIN_REMAINING_SECONDS
+    resigned, _ = get_presigned_url(service=service, owner_id=1, user_file_system_id=2, path="a.png", now=late)
+    assert resigned != url and service.signed == 2
+
+
+def test_rebuilt_service_does_not_reuse_old_urls():
+    _reset()
+    get_presigned_url(service=_FakeService(), owner_id=1, user_file_system_id=None, path="a.png", now=0)
+    replacement = _FakeService()
+    get_presigned_url(service=replacement, owner_id=1, user_file_system_id=None, path="a.png", now=1)
+    assert replacement.signed == 1
+
+
+def test_stored_file_location_cache_remembers_untracked_paths():
+    _reset()
+    assert get_cached_stored_file_location(owner_id=1, path="a.png", now=0) == (False, None)
+    set_cached_stored_file_location(owner_id=1, path="a.png", user_file_system_id=None, now=0)
+    assert get_cached_stored_file_location(owner_id=1, path="a.png", now=1) == (True, None)
+    assert get_cached_stored_file_location(owner_id=1, path="a.png", now=3600) == (False, None)
@@ -0,0 +1,14 @@
+from common.public_search_cache import normalize_public_search_query, public_search_cache_key
+
+
+def test_query_normalization_ignores_case_and_whitespace():
+    assert normalize_public_search_query("  Hello   World\n") == "hello world"
+    assert public_search_cache_key(version="3", query="Hello World", limit=10) == public_search_cache_key(
+        version="3", query="  hello   world ", limit=10
+    )
+
+
+def test_cache_key_changes_with_publish_version_and_limit():
+    key = public_search_cache_key(version="3", query="revornix", limit=10)
+    assert key != public_search_cache_key(version="4", query="revornix", limit=10)
+    assert key != public_search_cache_key(version="3", query="revornix", limit=20)
@@ -3,6 +3,9 @@ from numpy.typing import NDArray
 
 
 class EmbeddingEngineBase:
+    # Identifies the vector space; part of the embedding cache key.
+    model_name: str
+    dim: int
 
     async def embed(self, texts: list[str]) -> NDArray[np.float32]:
         raise NotImplementedError("EmbeddingEngine is an abstract class")
@@ -2,11 +2,12 @@ from urllib.parse import urljoin
 
 import httpx
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 from pydantic import BaseModel
 
 from base_implement.engine_base import EngineBase
+from common.browser_pool import render_page
 from common.logger import exception_logger
+from common.worker_loop import get_loop_http_client
 from engine.video_plugins import VideoPluginGroup
 
 
@@ -19,6 +20,20 @@ class WebsiteInfo(BaseModel):
     cover: str | None = None
 
 
+class WebsiteSnapshot(BaseModel):
+    """Everything one pooled-browser navigation yields for a URL."""
+    url: str
+    final_url: str
+    html: str
+    status: int | None = None
+    page_title: str | None = None
+    title: str
+    description: str | None = None
+    keywords: str | None = None
+    cover: str | None = None
+    pdf: bytes | None = None
+
+
 class FileInfo(BaseModel):
     title: str
     description: str | None = None
@@ -42,30 +57,79 @@ class MarkdownEngineBase(EngineBase):
             )
         return self._video_plugin_group
 
+    @staticmethod
+    def extract_website_metadata(
+        soup: BeautifulSoup
+    ) -> tuple[str, str | None, str | None]:
+        # 标题：优先 og:title，其次 <title>
+        title: str | None = None
+        og_title_meta = soup.find("meta", property="og:title")
+        if og_title_meta is not None and og_title_meta.get("content"):
+            title = str(og_title_meta.get("content"))
+        if not title and soup.title is not None and soup.title.string:
+            title = str(soup.title.string.strip())
+
+        # 描述：优先 og:description，其次 meta[name=description]
+        description: str | None = None
+        og_description_meta = soup.find("meta", property="og:description")
+        normal_description_meta = soup.find("meta", attrs={"name": "description"})
+        if og_description_meta is not None:
+            description = str(og_description_meta.get("content"))
+        if not description and normal_description_meta is not None:
+            description = str(normal_description_meta.get("content"))
+
+        keywords_meta = soup.find("meta", attrs={"name": "keywords"})
+        keywords = str(keywords_meta.get("content")) if keywords_meta else None
+        return title or "Unknown Title", description, keywords
+
+    @classmethod
+    async def snapshot_website(
+        cls,
+        url: str,
+        *,
+        timeout_ms: int = 15000,
+        pdf: bool = False,
+    ) -> WebsiteSnapshot:
+        """Render ``url`` once in the shared browser pool and derive the HTML,
+        metadata, cover (and optionally a PDF print) from that one navigation."""
+        rendered = await render_page(url, timeout_ms=timeout_ms, pdf=pdf)
+        soup = BeautifulSoup(rendered.html, "html.parser")
+        title, description, keywords = cls.extract_website_metadata(soup)
+        return WebsiteSnapshot(
+            url=url,
+            final_url=rendered.url,
+            html=rendered.html,
+            status=rendered.status,
+            page_title=rendered.title,
+            title=title,
+            description=description,
+            keywords=keywords,
+            cover=await cls.get_website_cover_from_soup(url=url, soup=soup),
+            pdf=rendered.pdf,
+        )
+
     @staticmethod
     async def get_website_cover_by_playwright(
         url: str
     ) -> str | None:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
-                page = await browser.new_page()
-                await page.goto(
-                    url,
-                    wait_until="domcontentloaded",
-                    timeout=15000,
-                )
-                html_content = await page.content()
-            except Exception as e:
-                exception_logger.error(
-                    f"Failed to load website cover page: {url}, error: {e}"
-                )
-                return None
-            finally:
-                await browser.close()
+        try:
+            rendered = await render_page(url, timeout_ms=15000)
+        except Exception as e:
+            exception_logger.error(
+                f"Failed to load website cover page: {url}, error: {e}"
+            )
+            return None
 
-        soup = BeautifulSoup(html_content, "html.parser")
+        return await MarkdownEngineBase.get_website_cover_from_soup(
+            url=url,
+            soup=BeautifulSoup(rendered.html, "html.parser"),
+        )
 
+    @staticmethod
+    async def get_website_cover_from_soup(
+        url: str,
+        soup: BeautifulSoup,
+    ) -> str | None:
         og = soup.find("meta", property="og:image")
         if og and og.get("content"):
             return str(og.get("content"))
@@ -89,24 +153,24 @@ class MarkdownEngineBase(EngineBase):
         biggest_url = None
         biggest_size = 0
 
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            for img in imgs:
-                raw = img.get("src") or img.get("data-src")
-                if not raw:
-                    continue
+        client = get_loop_http_client()
+        for img in imgs:
+            raw = img.get("src") or img.get("data-src")
+            if not raw:
+                continue
 
-                src = normalize_src(url, str(raw))
+            src = normalize_src(url, str(raw))
 
-                try:
-                    head = await client.head(src)
-                    size = int(head.headers.get("Content-Length", 0))
-                except Exception as e:
-                    exception_logger.error(f"Failed to get image size: {src}, error: {e}")
-                    continue
+            try:
+                head = await client.head(src, timeout=timeout, follow_redirects=True)
+                size = int(head.headers.get("Content-Length", 0))
+            except Exception as e:
+                exception_logger.error(f"Failed to get image size: {src}, error: {e}")
+                continue
 
-                if size > biggest_size:
-                    biggest_size = size
-                    biggest_url = src
+            if size > biggest_size:
+                biggest_size = size
+                biggest_url = src
 
         return biggest_url
 
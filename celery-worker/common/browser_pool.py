@@ -0,0 +1,250 @@
+"""Process-wide headless Chromium pool for website rendering.
+
+Website conversion used to launch a fresh Chromium per call — and the cover
+lookup launched a second one for the same URL — so browser cold start
+dominated website ingest latency. Playwright objects are bound to the event
+loop that created them while celery tasks run on per-task / per-thread loops,
+so the pool owns one background thread with its own loop, one long-lived
+browser, and a fresh browser context per render so no cookies, storage,
+cache or permissions carry over between users. Callers on any loop submit a
+navigation with ``render_page`` and await the result, the same hand-off
+``EmbeddingBroker`` uses for its model thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+from playwright.async_api import Browser, Playwright, async_playwright
+from playwright.async_api import Error as PlaywrightError
+
+from common.logger import exception_logger, info_logger, log_event
+from config.browser import (
+    BROWSER_POOL_BROWSER_MAX_PAGES,
+    BROWSER_POOL_MAX_PAGES,
+)
+
+
+@dataclass
+class RenderedPage:
+    requested_url: str
+    url: str
+    html: str
+    title: str | None = None
+    status: int | None = None
+    pdf: bytes | None = None
+
+
+class BrowserPool:
+
+    def __init__(
+        self,
+        *,
+        max_pages: int,
+        browser_max_pages: int,
+    ):
+        self.max_pages = max(1, max_pages)
+        self.browser_max_pages = max(1, browser_max_pages)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        # Everything below is only touched on the pool loop.
+        self._semaphore: asyncio.Semaphore | None = None
+        self._launch_lock: asyncio.Lock | None = None
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._browser_pages = 0
+        self._in_flight_by_browser: dict[Browser, int] = {}
+        self._launches = 0
+        self._renders = 0
+        self._failures = 0
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "launches": self._launches,
+            "renders": self._renders,
+            "failures": self._failures,
+            "in_flight": sum(self._in_flight_by_browser.values()),
+        }
+
+    async def render(
+        self,
+        url: str,
+        *,
+        timeout_ms: int = 15000,
+        wait_until: str = "domcontentloaded",
+        pdf: bool = False,
+    ) -> RenderedPage:
+        """Navigate once and return the final HTML, title, status and
+        (optionally) a PDF print of the page."""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._render(url, timeout_ms=timeout_ms, wait_until=wait_until, pdf=pdf),
+            loop,
+        )
+        return await asyncio.wrap_future(future)
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            return self._loop
+        with self._start_lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="browser-pool", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    async def _render(
+        self,
+        url: str,
+        *,
+        timeout_ms: int,
+        wait_until: str,
+        pdf: bool,
+    ) -> RenderedPage:
+        if self._semaphore is None or self._launch_lock is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+        async with self._semaphore:
+            retried = False
+            while True:
+                browser = await self._get_browser()
+                try:
+                    return await self._render_once(
+                        browser,
+                        url,
+                        timeout_ms=timeout_ms,
+                        wait_until=wait_until,
+                        pdf=pdf,
+                    )
+                except PlaywrightError as e:
+                    self._failures += 1
+                    if browser.is_connected() or retried:
+                        raise
+                    # Chromium crashed under us; relaunch and retry once.
+                    retried = True
+                    exception_logger.warning(
+                        f"Browser pool lost its browser while rendering {url}, relaunching: {e}"
+                    )
+
+    async def _get_browser(self) -> Browser:
+        assert self._launch_lock is not None
+        async with self._launch_lock:
+            browser = self._browser
+            if (
+                browser is not None
+                and browser.is_connected()
+                and self._browser_pages < self.browser_max_pages
+            ):
+                return browser
+            self._browser = None
+            if browser is not None:
+                # Retired (recycled or crashed): close it once its pages finish.
+                await self._close_browser_if_idle(browser)
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            launch_started_at = time.perf_counter()
+            browser = await self._playwright.chromium.launch(headless=True)
+            self._launches += 1
+            self._browser = browser
+            self._browser_pages = 0
+            self._in_flight_by_browser[browser] = 0
+            log_event(
+                info_logger,
+                "browser_pool_launch",
+                launch_ms=round((time.perf_counter() - launch_started_at) * 1000, 2),
+                launches=self._launches,
+            )
+            return browser
+
+    async def _render_once(
+        self,
+        browser: Browser,
+        url: str,
+        *,
+        timeout_ms: int,
+        wait_until: str,
+        pdf: bool,
+    ) -> RenderedPage:
+        self._in_flight_by_browser[browser] = self._in_flight_by_browser.get(browser, 0) + 1
+        self._browser_pages += 1
+        try:
+            # Creating a context takes milliseconds; only the browser launch is
+            # worth amortising.
+            context = await browser.new_context()
+            try:
+                page = await context.new_page()
+                response = await page.goto(url, wait_until=wait_until, timeout=timeout_ms)
+                rendered = RenderedPage(
+                    requested_url=url,
+                    url=page.url,
+                    html=await page.content(),
+                    title=await page.title(),
+                    status=response.status if response is not None else None,
+                    pdf=await page.pdf() if pdf else None,
+                )
+            finally:
+                await self._close_quietly(context)
+            self._renders += 1
+            return rendered
+        finally:
+            self._in_flight_by_browser[browser] -= 1
+            if browser is not self._browser:
+                await self._close_browser_if_idle(browser)
+
+    async def _close_browser_if_idle(self, browser: Browser) -> None:
+        if self._in_flight_by_browser.get(browser, 0) > 0:
+            return
+        self._in_flight_by_browser.pop(browser, None)
+        await self._close_quietly(browser)
+
+    @staticmethod
+    async def _close_quietly(closable) -> None:
+        try:
+            await closable.close()
+        except Exception:
+            pass
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool(
+                    max_pages=int(BROWSER_POOL_MAX_PAGES),
+                    browser_max_pages=int(BROWSER_POOL_BROWSER_MAX_PAGES),
+                )
+    return _pool
+
+
+async def render_page(
+    url: str,
+    *,
+    timeout_ms: int = 15000,
+    wait_until: str = "domcontentloaded",
+    pdf: bool = False,
+) -> RenderedPage:
+    return await get_browser_pool().render(
+        url,
+        timeout_ms=timeout_ms,
+        wait_until=wait_until,
+        pdf=pdf,
+    )
@@ -4,6 +4,7 @@ load_dotenv(override=True)
 import asyncio
 import os
 import threading
+import time
 from datetime import datetime, timezone
 
 from celery import Celery
@@ -19,6 +20,7 @@ from celery.signals import (
 from common.env import is_env_enabled
 from common.logger import exception_logger, info_logger, log_event
 from common.tracing import sentry_before_send_attach_otel, setup_worker_tracing
+from common.worker_loop import close_loop_resources, is_persistent_loop_mode, run_on_worker_loop
 from config.redis import REDIS_PORT, REDIS_URL
 from config.sentry import WORKER_SENTRY_DSN, WORKER_SENTRY_ENABLE
 
@@ -71,34 +73,94 @@ def _initialize_worker_sentry() -> None:
 
 
 def _run(coro):
-    """Drive ``coro`` on a fresh event loop and clean up per-loop resources.
+    """Drive ``coro`` to completion for a celery task.
 
-    Each celery task gets its own loop via ``asyncio.run``. Resources whose
-    lifetime is tied to the loop (notably the neo4j async driver, which binds
-    to the loop that created it) are closed inside that same loop here, in a
+    ``CELERY_TASK_EVENT_LOOP_MODE=per_task`` (default) runs it on a fresh loop
+    via ``asyncio.run``. Resources whose lifetime is tied to the loop (the
+    neo4j async driver, which binds to the loop that created it, pooled db
+    engines, shared http clients) are closed inside that same loop in a
     ``finally`` block, so they never leak across loops.
+
+    ``persistent`` runs it on the calling worker thread's long-lived loop and
+    keeps those resources alive for the next task on the thread.
     """
+    if is_persistent_loop_mode():
+        return _run_on_thread_loop(coro)
+    return _run_on_fresh_loop(coro)
+
+
+def _log_loop_overhead(
+    *,
+    loop_mode: str,
+    submitted_at: float,
+    started_at: float | None,
+    finished_at: float | None,
+) -> None:
+    ended_at = time.perf_counter()
+    log_event(
+        info_logger,
+        "celery_task_loop_overhead",
+        loop_mode=loop_mode,
+        startup_ms=round((started_at - submitted_at) * 1000, 3) if started_at is not None else None,
+        teardown_ms=round((ended_at - finished_at) * 1000, 3) if finished_at is not None else None,
+    )
+
+
+def _run_on_fresh_loop(coro):
+    submitted_at = time.perf_counter()
+    started_at: float | None = None
+    finished_at: float | None = None
+
     async def _wrapped():
+        nonlocal started_at, finished_at
+        started_at = time.perf_counter()
         try:
             return await coro
         finally:
-            # Imported lazily to avoid a circular import (data.neo4j.base
-            # depends on common.logger which is in the same package tree).
-            try:
-                from data.neo4j.base import close_neo4j_driver_for_current_loop
-                await close_neo4j_driver_for_current_loop()
-            except Exception as cleanup_exc:  # pragma: no cover — defensive
-                exception_logger.warning(
-                    f"neo4j per-loop cleanup failed: {cleanup_exc}"
-                )
+            finished_at = time.perf_counter()
+            await close_loop_resources()
+
+    try:
+        return asyncio.run(_wrapped())
+    finally:
+        _log_loop_overhead(
+            loop_mode="per_task",
+            submitted_at=submitted_at,
+            started_at=started_at,
+            finished_at=finished_at,
+        )
+
 
-    return asyncio.run(_wrapped())
+def _run_on_thread_loop(coro):
+    submitted_at = time.perf_counter()
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    async def _wrapped():
+        nonlocal started_at, finished_at
+        started_at = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            finished_at = time.perf_counter()
+
+    try:
+        return run_on_worker_loop(_wrapped())
+    finally:
+        _log_loop_overhead(
+            loop_mode="persistent",
+            submitted_at=submitted_at,
+            started_at=started_at,
+            finished_at=finished_at,
+        )
 
 
 def _start_background_coroutine(target, *, name: str) -> None:
     def _runner() -> None:
         try:
-            _run(target())
+            # One-off thread: its loop would never be reused, so always use a
+            # fresh loop that cleans up after itself.
+            _run_on_fresh_loop(target())
         except Exception as e:
             exception_logger.error(f"{name} failed on worker startup: {e}")
 
@@ -651,6 +713,40 @@ def update_section_process_status(
     )
 
 
+@celery_app.task
+def start_rebuild_user_graph_communities(
+    user_id: int,
+):
+    """Deferred Louvain rebuild for one user's graph partition.
+
+    Enqueued (with a countdown) by ``common.graph_community.mark_user_graph_dirty``
+    so that many document ingests inside one window coalesce into one run."""
+    from common.graph_community import run_user_community_rebuild
+
+    _run(run_user_community_rebuild(user_id=user_id))
+
+
+@celery_app.task
+def start_migrate_stored_files(
+    job_id: str,
+    user_id: int,
+    source_user_file_system_id: int,
+    target_user_file_system_id: int,
+    stored_file_ids: list[int] | None = None,
+):
+    from common.file_migration import run_stored_file_migration
+
+    _run(
+        run_stored_file_migration(
+            job_id=job_id,
+            user_id=user_id,
+            source_user_file_system_id=source_user_file_system_id,
+            target_user_file_system_id=target_user_file_system_id,
+            stored_file_ids=stored_file_ids,
+        )
+    )
+
+
 @celery_app.task
 def start_trigger_user_notification_event(
     user_id: int,
@@ -668,6 +764,21 @@ def start_trigger_user_notification_event(
     )
 
 
+@celery_app.task
+def start_trigger_bulk_notification_event(
+    trigger_event_uuid: str,
+    recipients: list[dict],
+):
+    from notification.dispatch import run_bulk_notification_event_workflow
+
+    _run(
+        run_bulk_notification_event_workflow(
+            trigger_event_uuid=trigger_event_uuid,
+            recipients=recipients,
+        )
+    )
+
+
 if __name__ == "__main__":
     from workflow.section_process_workflow import run_section_process_workflow
 
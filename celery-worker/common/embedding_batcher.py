@@ -0,0 +1,101 @@
+"""Micro-batched embedding stage for chunk streams.
+
+Embedding one chunk per call costs one ``SentenceTransformer.encode`` forward
+pass (local engine) or one HTTP round-trip (cloud engine) per chunk. This stage
+sits between ``stream_chunk_document`` and the per-chunk processing: it reads
+ahead up to ``max_batch_size`` chunks (or until ``max_wait_ms`` passes without
+the batch filling up), embeds them with a single ``embed`` call and yields the
+chunks back in stream order with ``chunk.embedding`` already set.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from common.embedding_utils import coerce_embedding_vectors
+from data.custom_types.all import ChunkInfo
+
+DEFAULT_EMBED_BATCH_SIZE = 32
+DEFAULT_EMBED_BATCH_MAX_WAIT_MS = 200.0
+
+_STREAM_END = object()
+
+
+@dataclass
+class EmbeddingBatchMetrics:
+    batches: int = 0
+    chunks: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.chunks / self.batches if self.batches else 0.0
+
+
+async def stream_embedded_chunks(
+    chunks: AsyncIterator[ChunkInfo],
+    *,
+    embedding_engine,
+    max_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    max_wait_ms: float = DEFAULT_EMBED_BATCH_MAX_WAIT_MS,
+    metrics: EmbeddingBatchMetrics | None = None,
+) -> AsyncIterator[ChunkInfo]:
+    max_batch_size = max(1, int(max_batch_size))
+    max_wait_seconds = max(0.0, max_wait_ms) / 1000
+    # Bounded so a fast source stays at most one batch ahead of the embedder.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_batch_size)
+
+    async def _produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            batch: list[ChunkInfo] = [item]
+            deadline = time.monotonic() + max_wait_seconds
+            while len(batch) < max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except TimeoutError:
+                    break
+                if item is _STREAM_END:
+                    finished = True
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                batch.append(item)
+
+            embed_start = time.perf_counter()
+            vectors_raw = await embedding_engine.embed([chunk.text for chunk in batch])
+            vectors = coerce_embedding_vectors(
+                vectors_raw=vectors_raw,
+                expected_count=len(batch),
+            )
+            if metrics is not None:
+                metrics.batches += 1
+                metrics.chunks += len(batch)
+                metrics.elapsed_ms += (time.perf_counter() - embed_start) * 1000
+            for chunk, vector in zip(batch, vectors, strict=True):
+                chunk.embedding = vector
+                yield chunk
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,194 @@
+"""Background migration of a user's stored files between file systems.
+
+The api validates the request, records the job in Redis and enqueues
+``start_migrate_stored_files``; this module does the transfer. Files are read
+in keyset pages and copied with bounded concurrency through
+``RemoteFileServiceProtocol.copy_file_to`` (server-side or streamed copy for
+S3-compatible services), so neither the file count nor the object size is
+held in memory. Each ``StoredFile`` row is moved to the target right after
+its object lands — that commit is the per-file checkpoint: a job that dies
+midway is resumed by simply running it again, the files already moved no
+longer match the source file system.
+
+Job state lives in the ``file_migration:job:<id>`` hash, which the api reads
+for progress and throughput. Key names are shared with
+``api/common/file_migration.py``.
+"""
+import asyncio
+import time
+
+import crud
+from common.logger import exception_logger, info_logger, log_event
+from common.redis import redis_pool
+from config.file_system import FILE_MIGRATION_CONCURRENCY
+from data.sql.base import async_session_context
+from proxy.file_system_proxy import FileSystemProxy
+
+FILE_MIGRATION_JOB_KEY_PREFIX = "file_migration:job:"
+FILE_MIGRATION_ACTIVE_KEY_PREFIX = "file_migration:active:"
+FILE_MIGRATION_JOB_TTL_SECONDS = 7 * 24 * 3600
+# The active marker blocks a second migration for the same user; it is kept
+# alive by a heartbeat so a crashed job frees it after at most this long.
+FILE_MIGRATION_ACTIVE_TTL_SECONDS = 300
+FILE_MIGRATION_HEARTBEAT_SECONDS = 60
+FILE_MIGRATION_PAGE_SIZE = 200
+
+
+async def _heartbeat(*, redis_conn, user_id: int, job_id: str) -> None:
+    job_key = f"{FILE_MIGRATION_JOB_KEY_PREFIX}{job_id}"
+    active_key = f"{FILE_MIGRATION_ACTIVE_KEY_PREFIX}{user_id}"
+    while True:
+        await asyncio.sleep(FILE_MIGRATION_HEARTBEAT_SECONDS)
+        try:
+            await redis_conn.set(active_key, job_id, ex=FILE_MIGRATION_ACTIVE_TTL_SECONDS)
+            await redis_conn.expire(job_key, FILE_MIGRATION_JOB_TTL_SECONDS)
+        except Exception as e:
+            exception_logger.warning(f"File migration heartbeat failed: job_id={job_id}, error={e}")
+
+
+async def run_stored_file_migration(
+    *,
+    job_id: str,
+    user_id: int,
+    source_user_file_system_id: int,
+    target_user_file_system_id: int,
+    stored_file_ids: list[int] | None = None,
+) -> None:
+    job_key = f"{FILE_MIGRATION_JOB_KEY_PREFIX}{job_id}"
+    active_key = f"{FILE_MIGRATION_ACTIVE_KEY_PREFIX}{user_id}"
+    started_at = time.monotonic()
+    concurrency = max(1, int(FILE_MIGRATION_CONCURRENCY))
+    redis_conn = await redis_pool()
+    heartbeat_task = asyncio.create_task(
+        _heartbeat(redis_conn=redis_conn, user_id=user_id, job_id=job_id)
+    )
+    counters = {"migrated": 0, "skipped": 0, "failed": 0, "bytes_copied": 0, "server_side_copies": 0}
+
+    async def _publish_progress(**fields) -> None:
+        elapsed = max(time.monotonic() - started_at, 1e-6)
+        await redis_conn.hset(
+            job_key,
+            mapping={
+                **fields,
+                "elapsed_seconds": round(elapsed, 2),
+                "throughput_bytes_per_second": int(counters["bytes_copied"] / elapsed),
+                "throughput_files_per_second": round(counters["migrated"] / elapsed, 3),
+                "updated_at": int(time.time()),
+            },
+        )
+
+    try:
+        async with async_session_context() as db:
+            db_target_user_file_system = await crud.file_system.get_user_file_system_by_id_async(
+                db=db,
+                user_file_system_id=target_user_file_system_id,
+            )
+            if db_target_user_file_system is None or db_target_user_file_system.user_id != user_id:
+                raise Exception("Target file system not found")
+            target_file_system_id = db_target_user_file_system.file_system_id
+            total = await crud.file_system.count_stored_files_for_migration_async(
+                db=db,
+                owner_user_id=user_id,
+                user_file_system_id=source_user_file_system_id,
+                stored_file_ids=stored_file_ids,
+            )
+
+        source_service = await FileSystemProxy.create_for_user_file_system(
+            user_id=user_id,
+            user_file_system_id=source_user_file_system_id,
+        )
+        target_service = await FileSystemProxy.create_for_user_file_system(
+            user_id=user_id,
+            user_file_system_id=target_user_file_system_id,
+        )
+        await redis_conn.hset(job_key, mapping={"status": "running", "total": total})
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _migrate_one(stored_file_id: int, path: str, content_type: str | None) -> None:
+            async with semaphore:
+                try:
+                    size_bytes, mode = await source_service.copy_file_to(
+                        file_path=path,
+                        target=target_service,
+                        content_type=content_type,
+                    )
+                    async with async_session_context() as db:
+                        await crud.file_system.update_stored_file_location_async(
+                            db=db,
+                            stored_file_id=stored_file_id,
+                            user_file_system_id=target_user_file_system_id,
+                            file_system_id=target_file_system_id,
+                            size_bytes=size_bytes,
+                        )
+                        await db.commit()
+                    counters["migrated"] += 1
+                    counters["bytes_copied"] += size_bytes
+                    if mode == "server_side":
+                        counters["server_side_copies"] += 1
+                except Exception as e:
+                    counters["failed"] += 1
+                    exception_logger.error(
+                        f"Failed to migrate stored file: job_id={job_id}, "
+                        f"stored_file_id={stored_file_id}, path={path}, error={e}"
+                    )
+
+        after_id = 0
+        while True:
+            async with async_session_context() as db:
+                page = await crud.file_system.get_stored_files_for_migration_async(
+                    db=db,
+                    owner_user_id=user_id,
+                    user_file_system_id=source_user_file_system_id,
+                    after_id=after_id,
+                    limit=FILE_MIGRATION_PAGE_SIZE,
+                    stored_file_ids=stored_file_ids,
+                )
+                if not page:
+                    break
+                # 目标文件系统已登记同路径文件时跳过，避免违反唯一约束
+                existing_paths = await crud.file_system.get_stored_file_paths_async(
+                    db=db,
+                    owner_user_id=user_id,
+                    user_file_system_id=target_user_file_system_id,
+                    paths=[stored_file.path for stored_file in page],
+                )
+                items = [
+                    (stored_file.id, stored_file.path, stored_file.content_type)
+                    for stored_file in page
+                ]
+            after_id = items[-1][0]
+            pending = [item for item in items if item[1] not in existing_paths]
+            counters["skipped"] += len(items) - len(pending)
+            await asyncio.gather(*[_migrate_one(*item) for item in pending])
+            await _publish_progress(**counters, last_stored_file_id=after_id)
+
+        await _publish_progress(**counters, status="completed", finished_at=int(time.time()))
+        log_event(
+            info_logger,
+            "file_migration_completed",
+            job_id=job_id,
+            user_id=user_id,
+            total=total,
+            duration_ms=round((time.monotonic() - started_at) * 1000, 2),
+            **counters,
+        )
+    except Exception as e:
+        exception_logger.error(f"File migration failed: job_id={job_id}, error={e}")
+        try:
+            await _publish_progress(**counters, status="failed", error=str(e)[:500], finished_at=int(time.time()))
+        except Exception:
+            pass
+        raise
+    finally:
+        heartbeat_task.cancel()
+        try:
+            await heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            # Only release the marker if it still points at this job.
+            if await redis_conn.get(active_key) == job_id:
+                await redis_conn.delete(active_key)
+            await redis_conn.expire(job_key, FILE_MIGRATION_JOB_TTL_SECONDS)
+        finally:
+            await redis_conn.aclose()
@@ -0,0 +1,175 @@
+"""Deferred, debounced community detection for the knowledge graph.
+
+Document ingest only maintains the document's own neighbourhood (see
+``refresh_document_graph_neighbourhood``). Louvain is expensive and scales with
+the projected graph, so instead of running it per document we record that a
+user's partition changed and schedule at most one rebuild per partition per
+interval:
+
+- ``graph:community:changed:<user_id>`` counts changed entities since the last
+  rebuild (the dirty flag is simply "counter > 0").
+- ``graph:community:scheduled:<user_id>`` is set with ``NX`` when a delayed
+  rebuild task is enqueued, so further changes inside the window coalesce into
+  that one task.
+- ``graph:community:lock:<user_id>`` guards against two workers rebuilding the
+  same partition at once.
+- ``graph:version:<user_id>`` is bumped on every recorded change and after each
+  rebuild. ``graph:version:global`` is bumped by writes that are not scoped to
+  one partition: the ``full`` maintenance mode (global Louvain) and document
+  deletes. Caches derived from the user's graph key on both
+  (``get_user_graph_version``).
+"""
+import time
+import uuid
+
+from celery import current_app
+
+from common.logger import exception_logger, info_logger, log_event
+from common.redis import redis_pool
+from config.neo4j import NEO4J_COMMUNITY_REBUILD_INTERVAL_MINUTES
+from data.neo4j.insert import rebuild_user_communities
+
+COMMUNITY_CHANGED_KEY_PREFIX = "graph:community:changed:"
+COMMUNITY_SCHEDULED_KEY_PREFIX = "graph:community:scheduled:"
+COMMUNITY_LOCK_KEY_PREFIX = "graph:community:lock:"
+GRAPH_VERSION_KEY_PREFIX = "graph:version:"
+GRAPH_VERSION_GLOBAL_KEY = f"{GRAPH_VERSION_KEY_PREFIX}global"
+COMMUNITY_REBUILD_LOCK_TTL_SECONDS = 60 * 60
+COMMUNITY_REBUILD_TASK_NAME = "common.celery.app.start_rebuild_user_graph_communities"
+
+
+def _rebuild_interval_seconds() -> int:
+    try:
+        minutes = float(NEO4J_COMMUNITY_REBUILD_INTERVAL_MINUTES)
+    except (TypeError, ValueError):
+        minutes = 10
+    return max(1, int(minutes * 60))
+
+
+async def get_user_graph_version(redis_conn, user_id: int) -> str:
+    global_version, user_version = await redis_conn.mget(
+        GRAPH_VERSION_GLOBAL_KEY,
+        f"{GRAPH_VERSION_KEY_PREFIX}{user_id}",
+    )
+    return f"{global_version or 0}.{user_version or 0}"
+
+
+async def bump_graph_version(user_id: int | None = None) -> None:
+    """Invalidate graph-derived caches after a write outside the incremental path.
+
+    Without ``user_id`` the global version is bumped, which invalidates every
+    user. Best-effort: failures are logged and never fail the calling write.
+    """
+    key = GRAPH_VERSION_GLOBAL_KEY if user_id is None else f"{GRAPH_VERSION_KEY_PREFIX}{user_id}"
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incr(key)
+    except Exception as e:
+        exception_logger.error(
+            f"Failed to bump graph version: user_id={user_id}, error={e}"
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+def _schedule_rebuild(user_id: int, countdown: int) -> None:
+    current_app.send_task(
+        COMMUNITY_REBUILD_TASK_NAME,
+        kwargs={"user_id": user_id},
+        countdown=countdown,
+    )
+
+
+async def mark_user_graph_dirty(
+    *,
+    user_id: int,
+    changed_entities: int,
+) -> None:
+    """Record a graph change for ``user_id`` and make sure a rebuild is queued.
+
+    Best-effort: failures are logged and never fail the calling ingest.
+    """
+    interval_seconds = _rebuild_interval_seconds()
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incrby(
+            f"{COMMUNITY_CHANGED_KEY_PREFIX}{user_id}",
+            max(1, changed_entities),
+        )
+        await redis_conn.incr(f"{GRAPH_VERSION_KEY_PREFIX}{user_id}")
+        # The marker outlives the countdown so a slow queue cannot cause a
+        # second task to be scheduled for the same window.
+        scheduled = await redis_conn.set(
+            f"{COMMUNITY_SCHEDULED_KEY_PREFIX}{user_id}",
+            "1",
+            nx=True,
+            ex=interval_seconds * 2,
+        )
+        if scheduled:
+            _schedule_rebuild(user_id, interval_seconds)
+    except Exception as e:
+        exception_logger.error(
+            f"Failed to mark graph partition dirty: user_id={user_id}, error={e}"
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+async def run_user_community_rebuild(user_id: int) -> None:
+    changed_key = f"{COMMUNITY_CHANGED_KEY_PREFIX}{user_id}"
+    scheduled_key = f"{COMMUNITY_SCHEDULED_KEY_PREFIX}{user_id}"
+    lock_key = f"{COMMUNITY_LOCK_KEY_PREFIX}{user_id}"
+    lock_token = uuid.uuid4().hex
+    redis_conn = await redis_pool()
+    try:
+        acquired = await redis_conn.set(
+            lock_key,
+            lock_token,
+            nx=True,
+            ex=COMMUNITY_REBUILD_LOCK_TTL_SECONDS,
+        )
+        if not acquired:
+            # Another worker is rebuilding this partition; retry after the window
+            # so the changes recorded meanwhile are not lost. The NX marker keeps
+            # concurrent triggers from queueing more than one retry.
+            interval_seconds = _rebuild_interval_seconds()
+            if await redis_conn.set(scheduled_key, "1", nx=True, ex=interval_seconds * 2):
+                _schedule_rebuild(user_id, interval_seconds)
+            return
+
+        # Clear the scheduled marker first: changes arriving while Louvain runs
+        # will schedule the next window instead of being folded into this run.
+        await redis_conn.delete(scheduled_key)
+        changed_entities = int(await redis_conn.getdel(changed_key) or 0)
+        if changed_entities <= 0:
+            return
+
+        start = time.perf_counter()
+        try:
+            metrics = await rebuild_user_communities(user_id=user_id)
+        except Exception:
+            # Put the changes back and re-arm the window so they are retried.
+            await redis_conn.incrby(changed_key, changed_entities)
+            interval_seconds = _rebuild_interval_seconds()
+            if await redis_conn.set(scheduled_key, "1", nx=True, ex=interval_seconds * 2):
+                _schedule_rebuild(user_id, interval_seconds)
+            raise
+        await redis_conn.incr(f"{GRAPH_VERSION_KEY_PREFIX}{user_id}")
+        log_event(
+            info_logger,
+            "graph_community_rebuilt",
+            user_id=user_id,
+            changed_entities=changed_entities,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+            **metrics,
+        )
+    finally:
+        try:
+            if await redis_conn.get(lock_key) == lock_token:
+                await redis_conn.delete(lock_key)
+        finally:
+            await redis_conn.aclose()
@@ -0,0 +1,374 @@
+"""Shared OpenAI-compatible clients, one per provider endpoint and event loop.
+
+LLM helpers used to build an ``AsyncOpenAI`` per call and close it right
+after, throwing away the keep-alive pool and TLS session every time. Clients
+now live in a registry keyed by ``(base_url, sha256(api_key))``. The
+underlying ``httpx`` pool is bound to the loop that created it, so there is
+one registry per event loop, the same way ``data/neo4j/base.py`` keeps one
+driver per loop.
+
+- ``acquire_llm_client`` hands out the shared client; ``lease.release()``
+  marks it unused again. Never close the client yourself. A lease may be
+  held for a whole workflow.
+- ``LLM_CLIENT_MAX_CONCURRENCY`` caps the HTTP requests in flight per
+  provider (``base_url`` host) and loop. The slot is taken by the client's
+  transport for each request and held until its response body is closed,
+  so it does not depend on how long a lease is held and nested helpers
+  cannot deadlock on it.
+- Clients idle for ``LLM_CLIENT_IDLE_SECONDS`` (or beyond
+  ``LLM_CLIENT_MAX_CLIENTS`` per loop) are closed on the next acquire.
+- ``llm_client_pool_stats`` reports client reuse, waiting / in-flight
+  requests and HTTP latency per provider; the same numbers are logged as
+  ``llm_client_pool_stats`` events every ``LLM_CLIENT_STATS_LOG_SECONDS``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import httpx
+from langfuse.openai import AsyncOpenAI
+from openai import DefaultAsyncHttpxClient
+
+from common.logger import exception_logger, info_logger, log_event
+from config.llm import (
+    LLM_CLIENT_IDLE_SECONDS,
+    LLM_CLIENT_MAX_CLIENTS,
+    LLM_CLIENT_MAX_CONCURRENCY,
+    LLM_CLIENT_MAX_CONNECTIONS,
+    LLM_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_CLIENT_STATS_LOG_SECONDS,
+)
+
+DEFAULT_LLM_PROVIDER = "api.openai.com"
+# Waits for a provider slot longer than this are logged as ``llm_client_wait``.
+LLM_CLIENT_SLOW_WAIT_MS = 1000.0
+
+
+def _int_setting(value: str, default: int, *, minimum: int) -> int:
+    try:
+        return max(minimum, int(float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class _ProviderStats:
+    clients_created: int = 0
+    clients_reused: int = 0
+    clients_evicted: int = 0
+    waiting: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    request_errors: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+
+_STATS_LOCK = threading.Lock()
+_STATS: dict[str, _ProviderStats] = {}
+_last_stats_log_at = time.monotonic()
+
+
+def _update_stats(provider: str, **deltas: float) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(provider, _ProviderStats())
+        for name, delta in deltas.items():
+            setattr(stats, name, getattr(stats, name) + delta)
+
+
+def _record_request(provider: str, latency_ms: float, *, failed: bool) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(provider, _ProviderStats())
+        stats.requests += 1
+        stats.request_errors += int(failed)
+        stats.total_latency_ms += latency_ms
+        stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+
+
+def llm_client_pool_stats() -> dict[str, dict[str, float | int]]:
+    """Per-provider counters for this process."""
+    with _STATS_LOCK:
+        return {
+            provider: {
+                "clients_created": stats.clients_created,
+                "clients_reused": stats.clients_reused,
+                "clients_evicted": stats.clients_evicted,
+                "waiting": stats.waiting,
+                "in_flight": stats.in_flight,
+                "requests": stats.requests,
+                "request_errors": stats.request_errors,
+                "avg_latency_ms": round(stats.total_latency_ms / stats.requests, 2) if stats.requests else 0.0,
+                "max_latency_ms": round(stats.max_latency_ms, 2),
+            }
+            for provider, stats in _STATS.items()
+        }
+
+
+def _maybe_log_stats() -> None:
+    global _last_stats_log_at
+    interval = _int_setting(LLM_CLIENT_STATS_LOG_SECONDS, 60, minimum=0)
+    now = time.monotonic()
+    if interval == 0 or now - _last_stats_log_at < interval:
+        return
+    _last_stats_log_at = now
+    for provider, stats in llm_client_pool_stats().items():
+        log_event(info_logger, "llm_client_pool_stats", provider=provider, **stats)
+
+
+def normalize_llm_base_url(base_url: str | None) -> str:
+    return (base_url or "").strip().rstrip("/")
+
+
+def llm_provider_label(base_url: str | None) -> str:
+    """``host[:port]`` of the endpoint; never contains credentials."""
+    normalized = normalize_llm_base_url(base_url)
+    if not normalized:
+        return DEFAULT_LLM_PROVIDER
+    parsed = urlparse(normalized)
+    host = parsed.hostname or normalized
+    return f"{host}:{parsed.port}" if parsed.port else host
+
+
+def llm_client_key(base_url: str | None, api_key: str | None) -> tuple[str, str]:
+    return (
+        normalize_llm_base_url(base_url),
+        hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(),
+    )
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the provider slot back once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _ProviderSlotTransport(httpx.AsyncBaseTransport):
+    """Takes a slot of the provider's concurrency cap for every request and
+    records its latency (time to response headers)."""
+
+    def __init__(self, *, registry: "_LoopRegistry", provider: str, transport: httpx.AsyncBaseTransport):
+        self._registry = registry
+        self._provider = provider
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        provider = self._provider
+        semaphore = self._registry.semaphore(provider)
+        wait_started_at = time.perf_counter()
+        _update_stats(provider, waiting=1)
+        try:
+            await semaphore.acquire()
+        finally:
+            _update_stats(provider, waiting=-1)
+        wait_ms = (time.perf_counter() - wait_started_at) * 1000
+        if wait_ms >= LLM_CLIENT_SLOW_WAIT_MS:
+            log_event(
+                info_logger,
+                "llm_client_wait",
+                provider=provider,
+                wait_ms=round(wait_ms, 2),
+            )
+        _update_stats(provider, in_flight=1)
+        released = False
+
+        def _release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            semaphore.release()
+            _update_stats(provider, in_flight=-1)
+
+        started_at = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            _record_request(provider, (time.perf_counter() - started_at) * 1000, failed=True)
+            _release()
+            raise
+        # Time to response headers; streamed bodies are not included.
+        _record_request(
+            provider,
+            (time.perf_counter() - started_at) * 1000,
+            failed=response.status_code >= 400,
+        )
+        if response.is_closed:
+            # Body already read by the transport (e.g. an in-memory response).
+            _release()
+        else:
+            response.stream = _SlotReleasingStream(response.stream, _release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _build_http_client(registry: "_LoopRegistry", provider: str) -> httpx.AsyncClient:
+    max_connections = _int_setting(LLM_CLIENT_MAX_CONNECTIONS, 20, minimum=1)
+    return DefaultAsyncHttpxClient(
+        transport=_ProviderSlotTransport(
+            registry=registry,
+            provider=provider,
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=min(
+                        max_connections,
+                        _int_setting(LLM_CLIENT_MAX_KEEPALIVE_CONNECTIONS, 10, minimum=0),
+                    ),
+                ),
+            ),
+        ),
+    )
+
+
+@dataclass
+class _PooledClient:
+    client: AsyncOpenAI
+    provider: str
+    leases: int = 0
+    last_used_at: float = 0.0
+
+
+class _LoopRegistry:
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.clients: OrderedDict[tuple[str, str], _PooledClient] = OrderedDict()
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self.semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_int_setting(LLM_CLIENT_MAX_CONCURRENCY, 16, minimum=1))
+            self.semaphores[provider] = semaphore
+        return semaphore
+
+    def client(self, *, key: tuple[str, str], base_url: str | None, api_key: str | None, provider: str) -> _PooledClient:
+        pooled = self.clients.get(key)
+        if pooled is not None:
+            _update_stats(provider, clients_reused=1)
+        else:
+            pooled = _PooledClient(
+                client=AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=_build_http_client(self, provider),
+                ),
+                provider=provider,
+            )
+            self.clients[key] = pooled
+            _update_stats(provider, clients_created=1)
+        self.clients.move_to_end(key)
+        return pooled
+
+    def pop_evictable(self, now: float) -> list[_PooledClient]:
+        idle_seconds = _int_setting(LLM_CLIENT_IDLE_SECONDS, 300, minimum=1)
+        max_clients = _int_setting(LLM_CLIENT_MAX_CLIENTS, 64, minimum=1)
+        overflow = len(self.clients) - max_clients
+        evicted: list[_PooledClient] = []
+        # Oldest first; leased clients are never closed.
+        for key, pooled in list(self.clients.items()):
+            if pooled.leases > 0:
+                continue
+            if overflow > 0 or now - pooled.last_used_at >= idle_seconds:
+                evicted.append(self.clients.pop(key))
+                overflow -= 1
+        return evicted
+
+
+# loop_id -> registry; see data/neo4j/base.py for why loops are keyed by id().
+_registries: dict[int, _LoopRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def _registry_for_running_loop() -> _LoopRegistry:
+    loop = asyncio.get_running_loop()
+    registry = _registries.get(id(loop))
+    if registry is not None and registry.loop is loop:
+        return registry
+    with _registries_lock:
+        # Loops closed without close_llm_clients_for_current_loop: their
+        # clients cannot be closed any more, only forgotten.
+        for loop_id, stale in list(_registries.items()):
+            if stale.loop.is_closed():
+                _registries.pop(loop_id, None)
+        registry = _registries.get(id(loop))
+        if registry is None or registry.loop is not loop:
+            registry = _LoopRegistry(loop)
+            _registries[id(loop)] = registry
+        return registry
+
+
+async def _close_clients(clients: list[_PooledClient]) -> None:
+    for pooled in clients:
+        _update_stats(pooled.provider, clients_evicted=1)
+        try:
+            await pooled.client.close()
+        except Exception as e:
+            exception_logger.warning(f"Failed to close pooled llm client for {pooled.provider}: {e}")
+
+
+class LLMClientLease:
+
+    def __init__(self, *, pooled: _PooledClient):
+        self.client = pooled.client
+        self.provider = pooled.provider
+        self._pooled = pooled
+        self._released = False
+
+    async def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._pooled.leases -= 1
+        self._pooled.last_used_at = time.monotonic()
+        _maybe_log_stats()
+
+
+async def acquire_llm_client(*, base_url: str | None, api_key: str | None) -> LLMClientLease:
+    """Shared client for ``(base_url, api_key)``. Always ``await
+    lease.release()`` in a ``finally`` block; requests made through the
+    client wait for a provider slot on their own."""
+    registry = _registry_for_running_loop()
+    await _close_clients(registry.pop_evictable(time.monotonic()))
+    pooled = registry.client(
+        key=llm_client_key(base_url, api_key),
+        base_url=base_url,
+        api_key=api_key,
+        provider=llm_provider_label(base_url),
+    )
+    pooled.leases += 1
+    return LLMClientLease(pooled=pooled)
+
+
+async def close_llm_clients_for_current_loop() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _registries_lock:
+        registry = _registries.pop(id(loop), None)
+    if registry is None or registry.loop is not loop:
+        return
+    clients = list(registry.clients.values())
+    registry.clients.clear()
+    await _close_clients(clients)
@@ -0,0 +1,25 @@
+from common.logger import exception_logger, format_log_message
+from common.redis import redis_pool
+
+# 与 api common/public_search_cache.py 共用同一个版本号：公开文档的向量检索结果
+# 按该版本缓存，文档的 chunk 写入 milvus 后需要让旧缓存失效
+PUBLIC_SEARCH_VERSION_KEY = "public:search:version"
+
+
+async def bump_public_search_version() -> None:
+    """Invalidate every cached public search result. Call once the chunks of a
+    published document are searchable."""
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        await redis_conn.incr(PUBLIC_SEARCH_VERSION_KEY)
+    except Exception as e:
+        exception_logger.warning(
+            format_log_message(
+                "public_search_cache_invalidate_failed",
+                error=e,
+            )
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
@@ -0,0 +1,103 @@
+"""Event loops and loop-bound resources for celery task execution.
+
+``CELERY_TASK_EVENT_LOOP_MODE=per_task`` runs every task on a fresh loop
+(``asyncio.run``) and closes everything bound to that loop when the task ends,
+so the neo4j driver, database connections and http clients are rebuilt — and
+their TCP/TLS/bolt handshakes paid again — for every task.
+
+``persistent`` gives each worker thread (``--pool=threads``) one long-lived
+loop. Tasks on that thread are driven with ``run_until_complete`` on the same
+loop, so the loop-bound resources below are created once per thread and reused
+by every later task.
+"""
+import asyncio
+import threading
+from typing import Any
+
+import httpx
+
+from common.logger import exception_logger
+from config.worker import CELERY_TASK_EVENT_LOOP_MODE
+
+_thread_state = threading.local()
+
+# loop_id -> (loop, client); see data/neo4j/base.py for why loops are keyed by id().
+_http_clients_by_loop: dict[int, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_http_clients_lock = threading.Lock()
+
+
+def is_persistent_loop_mode() -> bool:
+    return CELERY_TASK_EVENT_LOOP_MODE == "persistent"
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """The long-lived loop owned by the calling thread, created on first use."""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop
+
+
+def run_on_worker_loop(coro) -> Any:
+    loop = get_worker_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+def get_loop_http_client() -> httpx.AsyncClient:
+    """Shared ``httpx.AsyncClient`` bound to the running loop. Pass per-request
+    options (``timeout``, ``follow_redirects``, ``headers``) on each call
+    instead of configuring the client; never close it yourself."""
+    loop = asyncio.get_running_loop()
+    entry = _http_clients_by_loop.get(id(loop))
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+    with _http_clients_lock:
+        entry = _http_clients_by_loop.get(id(loop))
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        _http_clients_by_loop[id(loop)] = (loop, client)
+        return client
+
+
+async def close_loop_http_client() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    entry = _http_clients_by_loop.pop(id(loop), None)
+    if entry is None:
+        return
+    try:
+        await entry[1].aclose()
+    except Exception as exc:  # pragma: no cover — best-effort cleanup
+        exception_logger.warning(f"Failed to close loop http client: {exc}")
+
+
+async def close_loop_resources() -> None:
+    """Close every resource bound to the running loop. Must run inside that
+    loop, right before it is closed."""
+    # Imported lazily to avoid a circular import (data.* depends on
+    # common.logger which is in the same package tree).
+    from common.llm_client_pool import close_llm_clients_for_current_loop
+    from data.neo4j.base import close_neo4j_driver_for_current_loop
+    from data.sql.base import close_sql_engine_for_current_loop
+    from notification.provider_clients import close_notification_http_clients_for_current_loop
+
+    for close in (
+        close_neo4j_driver_for_current_loop,
+        close_sql_engine_for_current_loop,
+        close_loop_http_client,
+        close_llm_clients_for_current_loop,
+        close_notification_http_clients_for_current_loop,
+    ):
+        try:
+            await close()
+        except Exception as cleanup_exc:  # pragma: no cover — defensive
+            exception_logger.warning(
+                f"per-loop cleanup {close.__name__} failed: {cleanup_exc}"
+            )
@@ -0,0 +1,7 @@
+import os
+
+# 网页渲染用的常驻 headless Chromium 池（common/browser_pool.py），每个 worker 进程一个浏览器
+# 同时打开的页面上限
+BROWSER_POOL_MAX_PAGES = os.environ.get('BROWSER_POOL_MAX_PAGES', '4')
+# 浏览器累计渲染多少个页面后整体重启，限制 Chromium 内存增长
+BROWSER_POOL_BROWSER_MAX_PAGES = os.environ.get('BROWSER_POOL_BROWSER_MAX_PAGES', '200')
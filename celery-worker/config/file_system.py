@@ -2,4 +2,6 @@ import os
 
 FILE_SYSTEM_USER_NAME = os.environ.get('FILE_SYSTEM_USER_NAME')
 FILE_SYSTEM_PASSWORD = os.environ.get('FILE_SYSTEM_PASSWORD')
-FILE_SYSTEM_SERVER_PUBLIC_URL = os.environ.get('FILE_SYSTEM_SERVER_PUBLIC_URL')
\ No newline at end of file
+FILE_SYSTEM_SERVER_PUBLIC_URL = os.environ.get('FILE_SYSTEM_SERVER_PUBLIC_URL')
+# 存储迁移任务（common/file_migration.py）同时传输的文件数
+FILE_MIGRATION_CONCURRENCY = os.environ.get('FILE_MIGRATION_CONCURRENCY', '4')
@@ -0,0 +1,13 @@
+import os
+
+# OpenAI 兼容客户端池（common/llm_client_pool.py），按 (base_url, api_key) 在每个事件循环内共享
+# 单个客户端的 HTTP 连接池上限，以及其中保持长连接的数量
+LLM_CLIENT_MAX_CONNECTIONS = os.environ.get('LLM_CLIENT_MAX_CONNECTIONS', '20')
+LLM_CLIENT_MAX_KEEPALIVE_CONNECTIONS = os.environ.get('LLM_CLIENT_MAX_KEEPALIVE_CONNECTIONS', '10')
+# 同一个 provider（base_url）在一个事件循环内同时在途的 HTTP 请求上限（按请求占用，与 lease 持有时长无关）
+LLM_CLIENT_MAX_CONCURRENCY = os.environ.get('LLM_CLIENT_MAX_CONCURRENCY', '16')
+# 空闲超过该时长（秒）的客户端会被关闭；每个事件循环最多保留的客户端数量
+LLM_CLIENT_IDLE_SECONDS = os.environ.get('LLM_CLIENT_IDLE_SECONDS', '300')
+LLM_CLIENT_MAX_CLIENTS = os.environ.get('LLM_CLIENT_MAX_CLIENTS', '64')
+# 每隔多少秒输出一次 llm_client_pool_stats 日志，0 表示不输出
+LLM_CLIENT_STATS_LOG_SECONDS = os.environ.get('LLM_CLIENT_STATS_LOG_SECONDS', '60')
@@ -2,4 +2,12 @@ import os
 
 NEO4J_USER = os.environ.get('NEO4J_USER')
 NEO4J_PASS = os.environ.get('NEO4J_PASS')
-NEO4J_URI = os.environ.get('NEO4J_URI')
\ No newline at end of file
+NEO4J_URI = os.environ.get('NEO4J_URI')
+
+# incremental: 每个文档只维护自身 chunk / entity 及 1 跳邻居（HAS_CHUNK、社区归属、degree）
+# full: 每个文档都对全图重跑 HAS_CHUNK / Louvain / degree（旧行为）
+NEO4J_GRAPH_MAINTENANCE_MODE = os.environ.get('NEO4J_GRAPH_MAINTENANCE_MODE', 'incremental').strip().lower()
+
+# 社区聚类（Louvain）不再随每个文档执行，而是按用户分区延迟合并执行：
+# 同一用户在该间隔内的多次图变更只触发一次重算
+NEO4J_COMMUNITY_REBUILD_INTERVAL_MINUTES = os.environ.get('NEO4J_COMMUNITY_REBUILD_INTERVAL_MINUTES', '10')
@@ -0,0 +1,7 @@
+import os
+
+# sequential: 按批次依次把新文档折叠进现有专栏 markdown（旧行为，每批一次串行 LLM 调用）
+# tree: 每个文档先并行生成局部稿，再两两归并成树；叶子 / 中间节点结果持久化到 redis，
+#       新增文档时只需重跑受影响的那条分支
+SECTION_MARKDOWN_COMPOSE_MODE = os.environ.get('SECTION_MARKDOWN_COMPOSE_MODE', 'sequential').strip().lower()
+SECTION_MARKDOWN_COMPOSE_CONCURRENCY = os.environ.get('SECTION_MARKDOWN_COMPOSE_CONCURRENCY', '4')
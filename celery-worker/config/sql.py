@@ -3,4 +3,8 @@ import os
 POSTGRES_USER = os.environ.get('POSTGRES_USER')
 POSTGRES_PASSWORD = os.environ.get('POSTGRES_PASSWORD')
 POSTGRES_DB_URL = os.environ.get('POSTGRES_DB_URL')
-POSTGRES_DB = os.environ.get('POSTGRES_DB')
\ No newline at end of file
+POSTGRES_DB = os.environ.get('POSTGRES_DB')
+# persistent 事件循环模式下每个 worker 线程（事件循环）一个连接池；每个循环同一时间只跑一个任务，
+# 默认保持 2 个连接、最多再临时多开 2 个，注意总连接数 = 线程数（--concurrency）×（两者之和）
+POSTGRES_LOOP_POOL_SIZE = os.environ.get('POSTGRES_LOOP_POOL_SIZE', '2')
+POSTGRES_LOOP_MAX_OVERFLOW = os.environ.get('POSTGRES_LOOP_MAX_OVERFLOW', '2')
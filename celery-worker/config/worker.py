@@ -0,0 +1,6 @@
+import os
+
+# per_task: 每个 celery 任务通过 asyncio.run 新建事件循环，结束时关闭 neo4j driver 等循环绑定资源（旧行为）
+# persistent: 每个 worker 线程持有一个长期存活的事件循环，neo4j driver / 数据库连接池 / http client
+#             绑定在该循环上跨任务复用
+CELERY_TASK_EVENT_LOOP_MODE = os.environ.get('CELERY_TASK_EVENT_LOOP_MODE', 'per_task').strip().lower()
@@ -177,6 +177,17 @@ async def get_document_by_document_id_async(
     )
     return (await db.execute(stmt)).scalar_one_or_none()
 
+
+async def get_publish_document_by_document_id_async(
+    db: AsyncSession,
+    document_id: int,
+):
+    stmt = select(models.document.PublishDocument).where(
+        models.document.PublishDocument.document_id == document_id,
+        models.document.PublishDocument.delete_at.is_(None),
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
 def get_quick_note_document_by_document_id(
     db: Session, 
     document_id: int
@@ -1,6 +1,6 @@
 import models
 from datetime import datetime, timezone
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
@@ -157,3 +157,87 @@ async def upsert_stored_file_async(
         stored_file.update_time = now
     await db.flush()
     return stored_file
+
+
+async def get_stored_files_for_migration_async(
+    db: AsyncSession,
+    *,
+    owner_user_id: int,
+    user_file_system_id: int,
+    after_id: int = 0,
+    limit: int = 200,
+    stored_file_ids: list[int] | None = None,
+):
+    """Keyset page (ascending id) of the files still living on
+    ``user_file_system_id``; migrated files drop out because their location
+    changes, so re-running a migration resumes where it stopped."""
+    stmt = (
+        select(models.file_system.StoredFile)
+        .where(
+            models.file_system.StoredFile.owner_user_id == owner_user_id,
+            models.file_system.StoredFile.user_file_system_id == user_file_system_id,
+            models.file_system.StoredFile.delete_at.is_(None),
+            models.file_system.StoredFile.id > after_id,
+        )
+        .order_by(models.file_system.StoredFile.id)
+        .limit(limit)
+    )
+    if stored_file_ids is not None:
+        stmt = stmt.where(models.file_system.StoredFile.id.in_(stored_file_ids))
+    return list((await db.execute(stmt)).scalars().all())
+
+
+
+async def count_stored_files_for_migration_async(
+    db: AsyncSession,
+    *,
+    owner_user_id: int,
+    user_file_system_id: int,
+    stored_file_ids: list[int] | None = None,
+) -> int:
+    stmt = select(func.count(models.file_system.StoredFile.id)).where(
+        models.file_system.StoredFile.owner_user_id == owner_user_id,
+        models.file_system.StoredFile.user_file_system_id == user_file_system_id,
+        models.file_system.StoredFile.delete_at.is_(None),
+    )
+    if stored_file_ids is not None:
+        stmt = stmt.where(models.file_system.StoredFile.id.in_(stored_file_ids))
+    return int((await db.execute(stmt)).scalar_one())
+
+async def get_stored_file_paths_async(
+    db: AsyncSession,
+    *,
+    owner_user_id: int,
+    user_file_system_id: int,
+    paths: list[str],
+) -> set[str]:
+    if not paths:
+        return set()
+    result = await db.execute(
+        select(models.file_system.StoredFile.path).where(
+            models.file_system.StoredFile.owner_user_id == owner_user_id,
+            models.file_system.StoredFile.user_file_system_id == user_file_system_id,
+            models.file_system.StoredFile.path.in_(paths),
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def update_stored_file_location_async(
+    db: AsyncSession,
+    *,
+    stored_file_id: int,
+    user_file_system_id: int,
+    file_system_id: int,
+    size_bytes: int | None = None,
+):
+    stored_file = await db.get(models.file_system.StoredFile, stored_file_id)
+    if stored_file is None:
+        return None
+    stored_file.user_file_system_id = user_file_system_id
+    stored_file.file_system_id = file_system_id
+    if size_bytes is not None and stored_file.size_bytes is None:
+        stored_file.size_bytes = size_bytes
+    stored_file.update_time = datetime.now(timezone.utc)
+    await db.flush()
+    return stored_file
@@ -307,6 +307,29 @@ async def create_notification_record_async(
     return notification
 
 
+async def create_notification_records_async(
+    db: AsyncSession,
+    records: list[dict],
+):
+    """Insert many records with one flush; each dict carries task_id, title,
+    content, cover and link."""
+    now = datetime.now(timezone.utc)
+    notifications = [
+        models.notification.NotificationRecord(
+            task_id=record["task_id"],
+            title=record["title"],
+            content=record.get("content"),
+            cover=record.get("cover"),
+            link=record.get("link"),
+            create_time=now,
+        )
+        for record in records
+    ]
+    db.add_all(notifications)
+    await db.flush()
+    return notifications
+
+
 def get_usable_notification_sources_for_user(
     db: Session,
     user_id: int,
@@ -495,6 +518,19 @@ async def get_notification_template_by_id_async(
     )
     return (await db.execute(stmt)).scalar_one_or_none()
 
+
+async def get_notification_templates_by_ids_async(
+    db: AsyncSession,
+    notification_template_ids: list[int],
+):
+    if not notification_template_ids:
+        return []
+    stmt = select(models.notification.NotificationTemplate).where(
+        models.notification.NotificationTemplate.id.in_(notification_template_ids),
+        models.notification.NotificationTemplate.delete_at.is_(None),
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
 def get_all_notification_templates(
     db: Session
 ):
@@ -569,6 +605,49 @@ async def get_notification_tasks_by_user_id_and_notification_trigger_event_async
     )
     return list((await db.execute(stmt)).scalars().all())
 
+
+async def get_enabled_template_notification_tasks_by_user_ids_and_trigger_event_async(
+    db: AsyncSession,
+    user_ids: list[int],
+    trigger_event_uuid: str,
+):
+    """(NotificationTask, notification_template_id) rows for every enabled,
+    template-based task of ``user_ids`` subscribed to the trigger event."""
+    if not user_ids:
+        return []
+    stmt = (
+        select(
+            models.notification.NotificationTask,
+            models.notification.NotificationTaskContentTemplate.notification_template_id,
+        )
+        .join(
+            models.notification.NotificationTaskTriggerEvent,
+            models.notification.NotificationTask.id
+            == models.notification.NotificationTaskTriggerEvent.notification_task_id,
+        )
+        .join(
+            models.notification.TriggerEvent,
+            models.notification.TriggerEvent.id
+            == models.notification.NotificationTaskTriggerEvent.trigger_event_id,
+        )
+        .join(
+            models.notification.NotificationTaskContentTemplate,
+            models.notification.NotificationTaskContentTemplate.notification_task_id
+            == models.notification.NotificationTask.id,
+        )
+        .where(
+            models.notification.NotificationTask.creator_id.in_(user_ids),
+            models.notification.NotificationTask.enable.is_(True),
+            models.notification.NotificationTask.delete_at.is_(None),
+            models.notification.NotificationTaskTriggerEvent.delete_at.is_(None),
+            models.notification.NotificationTaskContentTemplate.delete_at.is_(None),
+            models.notification.TriggerEvent.uuid == trigger_event_uuid,
+            models.notification.TriggerEvent.delete_at.is_(None),
+        )
+        .order_by(models.notification.NotificationTask.id)
+    )
+    return [(row[0], row[1]) for row in (await db.execute(stmt)).all()]
+
 def get_trigger_event_by_uuid(
     db: Session,
     uuid: str
@@ -744,6 +823,19 @@ async def get_notification_target_by_id_async(
     )
     return (await db.execute(stmt)).scalar_one_or_none()
 
+
+async def get_notification_targets_by_ids_async(
+    db: AsyncSession,
+    notification_target_ids: list[int],
+):
+    if not notification_target_ids:
+        return []
+    stmt = select(models.notification.NotificationTarget).where(
+        models.notification.NotificationTarget.id.in_(notification_target_ids),
+        models.notification.NotificationTarget.delete_at.is_(None),
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
 def get_notification_source_by_id(
     db: Session,
     notification_source_id: int
@@ -770,6 +862,23 @@ async def get_notification_source_by_id_async(
     )
     return (await db.execute(stmt)).scalar_one_or_none()
 
+
+async def get_notification_sources_by_ids_async(
+    db: AsyncSession,
+    notification_source_ids: list[int],
+):
+    if not notification_source_ids:
+        return []
+    stmt = (
+        select(models.notification.NotificationSource)
+        .options(joinedload(models.notification.NotificationSource.notification_source_provided))
+        .where(
+            models.notification.NotificationSource.id.in_(notification_source_ids),
+            models.notification.NotificationSource.delete_at.is_(None),
+        )
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
 def get_notification_record_by_notification_record_id(
     db: Session,
     notification_record_id: int
@@ -229,6 +229,36 @@ async def get_users_for_section_by_section_id_async(
     return list((await db.execute(stmt)).scalars().all())
 
 
+async def get_user_roles_for_section_by_section_id_async(
+    db: AsyncSession,
+    section_id: int,
+    filter_roles: list[UserSectionRole] | None = None,
+) -> list[tuple[int, int]]:
+    """Same recipients as ``get_users_for_section_by_section_id_async`` but
+    only ``(user_id, role)`` pairs, without loading full user rows."""
+    now = datetime.now(timezone.utc)
+    stmt = (
+        select(models.section.SectionUser.user_id, models.section.SectionUser.role)
+        .join(
+            models.user.User,
+            models.section.SectionUser.user_id == models.user.User.id,
+        )
+        .where(
+            models.user.User.delete_at.is_(None),
+            models.section.SectionUser.delete_at.is_(None),
+            models.section.SectionUser.section_id == section_id,
+            or_(
+                models.section.SectionUser.expire_time > now,
+                models.section.SectionUser.expire_time.is_(None),
+            ),
+        )
+        .order_by(models.section.SectionUser.user_id)
+    )
+    if filter_roles is not None:
+        stmt = stmt.where(models.section.SectionUser.role.in_(filter_roles))
+    return [(int(user_id), int(role)) for user_id, role in (await db.execute(stmt)).all()]
+
+
 def get_section_by_section_id(
     db: Session,
     section_id: int
@@ -1,8 +1,8 @@
 import crud
 import json
+import bisect
 import hashlib
 import asyncio
-import inspect
 import time
 import gzip
 import models
@@ -10,6 +10,7 @@ from io import BytesIO
 from dataclasses import dataclass
 from typing import cast
 from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import LLMClientLease, acquire_llm_client
 from common.logger import exception_logger
 from langfuse import propagate_attributes
 from common.markdown_helpers import get_markdown_content_by_document_id
@@ -46,39 +47,17 @@ def _clear_torch_cache() -> None:
         return
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
-async def close_extract_llm_client(llm_client: AsyncOpenAI) -> None:
-    await _safe_close_async_client(llm_client)
-
-
 CHUNK_SNAPSHOT_ROOT = ".cache/document-chunks"
-CHUNK_SNAPSHOT_META_VERSION = 1
+# v2: the chunk file is a sequence of independently gzipped frames (one gzip
+# member per CHUNK_SNAPSHOT_FRAME_CHUNKS chunks) and the meta file carries a
+# [first_chunk_idx, byte_offset, byte_length] entry per frame, so readers can
+# fetch just the frames they need with ranged GETs. Concatenated gzip members
+# are still one valid gzip stream, so a full read works for both versions.
+CHUNK_SNAPSHOT_META_VERSION = 2
+CHUNK_SNAPSHOT_LEGACY_META_VERSION = 1
+CHUNK_SNAPSHOT_FRAME_CHUNKS = 16
+CHUNK_SNAPSHOT_MAX_FRAMES_PER_READ = 8
+CHUNK_SNAPSHOT_RANGED_READ_CONCURRENCY = 8
 
 
 @dataclass
@@ -90,6 +69,8 @@ class DocumentChunkSnapshotInfo:
     source_signature: str
     markdown_length: int
     chunk_count: int
+    format_version: int = CHUNK_SNAPSHOT_META_VERSION
+    frames: list[tuple[int, int, int]] | None = None
 
 
 def make_chunk_id(
@@ -214,11 +195,18 @@ def _hash_source_signature(source: str) -> str:
 def _snapshot_paths(document_id: int, source_signature: str) -> tuple[str, str]:
     base_path = f"{CHUNK_SNAPSHOT_ROOT}/{document_id}/{source_signature}"
     return (
-        f"{base_path}.chunks.jsonl.gz",
+        f"{base_path}.chunks.v2.jsonl.gz",
         f"{base_path}.meta.json",
     )
 
 
+def _snapshot_meta_path_for_chunk_path(chunk_path: str) -> str | None:
+    suffix = ".chunks.v2.jsonl.gz"
+    if not chunk_path.endswith(suffix):
+        return None
+    return f"{chunk_path[:-len(suffix)]}.meta.json"
+
+
 def _coerce_text_content(content: str | bytes, *, source: str) -> str:
     if isinstance(content, str):
         return content
@@ -250,8 +238,15 @@ async def _load_snapshot_metadata(
         raise
 
     metadata = json.loads(_coerce_text_content(raw_metadata, source=meta_path))
-    if metadata.get("version") != CHUNK_SNAPSHOT_META_VERSION:
+    version = metadata.get("version")
+    if version not in (CHUNK_SNAPSHOT_META_VERSION, CHUNK_SNAPSHOT_LEGACY_META_VERSION):
         return None
+    frames = None
+    if version == CHUNK_SNAPSHOT_META_VERSION:
+        frames = [
+            (int(first_idx), int(offset), int(length))
+            for first_idx, offset, length in metadata["frames"]
+        ]
     return DocumentChunkSnapshotInfo(
         document_id=int(metadata["document_id"]),
         owner_id=int(metadata.get("owner_id", 0)),
@@ -260,6 +255,8 @@ async def _load_snapshot_metadata(
         source_signature=str(metadata["source_signature"]),
         markdown_length=int(metadata["markdown_length"]),
         chunk_count=int(metadata["chunk_count"]),
+        format_version=int(version),
+        frames=frames,
     )
 
 
@@ -404,11 +401,20 @@ async def ensure_document_chunk_snapshot(
         _clear_torch_cache()
     chunk_build_elapsed_ms = (time.perf_counter() - chunk_build_start) * 1000
 
-    snapshot_lines = "\n".join(
-        json.dumps(record, ensure_ascii=False)
-        for record in chunk_records
-    )
-    compressed_snapshot = gzip.compress(snapshot_lines.encode("utf-8"))
+    frames: list[tuple[int, int, int]] = []
+    compressed_frames: list[bytes] = []
+    frame_offset = 0
+    for frame_start in range(0, len(chunk_records), CHUNK_SNAPSHOT_FRAME_CHUNKS):
+        frame_records = chunk_records[frame_start:frame_start + CHUNK_SNAPSHOT_FRAME_CHUNKS]
+        frame_lines = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in frame_records
+        )
+        compressed_frame = gzip.compress(frame_lines.encode("utf-8"))
+        frames.append((int(frame_records[0]["idx"]), frame_offset, len(compressed_frame)))
+        compressed_frames.append(compressed_frame)
+        frame_offset += len(compressed_frame)
+    compressed_snapshot = b"".join(compressed_frames)
 
     await remote_file_service.upload_raw_content_to_path(
         file_path=chunk_path,
@@ -423,6 +429,8 @@ async def ensure_document_chunk_snapshot(
         source_signature=source_signature,
         markdown_length=len(markdown_content),
         chunk_count=len(chunk_records),
+        format_version=CHUNK_SNAPSHOT_META_VERSION,
+        frames=frames,
     )
     await remote_file_service.upload_raw_content_to_path(
         file_path=meta_path,
@@ -435,6 +443,8 @@ async def ensure_document_chunk_snapshot(
                 "source_signature": metadata.source_signature,
                 "markdown_length": metadata.markdown_length,
                 "chunk_count": metadata.chunk_count,
+                "frame_chunks": CHUNK_SNAPSHOT_FRAME_CHUNKS,
+                "frames": [list(frame) for frame in frames],
             },
             ensure_ascii=False,
         ),
@@ -452,6 +462,130 @@ async def ensure_document_chunk_snapshot(
     return metadata
 
 
+def _select_snapshot_frames(
+    frames: list[tuple[int, int, int]],
+    *,
+    start_chunk_idx: int,
+    selected_chunk_indexes: set[int] | None,
+) -> list[int]:
+    if not frames:
+        return []
+    first_idxs = [first_idx for first_idx, _, _ in frames]
+    if selected_chunk_indexes is None:
+        first_frame = max(0, bisect.bisect_right(first_idxs, start_chunk_idx) - 1)
+        return list(range(first_frame, len(frames)))
+    return sorted(
+        {
+            bisect.bisect_right(first_idxs, chunk_idx) - 1
+            for chunk_idx in selected_chunk_indexes
+            if chunk_idx >= start_chunk_idx and chunk_idx >= first_idxs[0]
+        }
+    )
+
+
+def _group_snapshot_frame_reads(frame_indexes: list[int]) -> list[list[int]]:
+    """Merge neighbouring frames into one ranged read (capped per read)."""
+    reads: list[list[int]] = []
+    for frame_index in frame_indexes:
+        if (
+            reads
+            and reads[-1][-1] == frame_index - 1
+            and len(reads[-1]) < CHUNK_SNAPSHOT_MAX_FRAMES_PER_READ
+        ):
+            reads[-1].append(frame_index)
+        else:
+            reads.append([frame_index])
+    return reads
+
+
+def _parse_snapshot_records(data: bytes) -> list[dict]:
+    return [
+        json.loads(line)
+        for line in data.decode("utf-8").splitlines()
+        if line.strip()
+    ]
+
+
+async def _load_snapshot_frame_index(
+    *,
+    remote_file_service: RemoteFileServiceProtocol,
+    chunk_snapshot_path: str,
+) -> list[tuple[int, int, int]] | None:
+    meta_path = _snapshot_meta_path_for_chunk_path(chunk_snapshot_path)
+    if meta_path is None:
+        return None
+    try:
+        snapshot = await _load_snapshot_metadata(
+            remote_file_service=remote_file_service,
+            meta_path=meta_path,
+        )
+    except Exception as e:
+        exception_logger.warning(
+            f"Failed to load chunk snapshot index, fallback to full read: {chunk_snapshot_path}, error: {e}"
+        )
+        return None
+    if snapshot is None or snapshot.chunk_path != chunk_snapshot_path:
+        return None
+    return snapshot.frames
+
+
+async def _iter_snapshot_records_ranged(
+    *,
+    remote_file_service: RemoteFileServiceProtocol,
+    chunk_snapshot_path: str,
+    frames: list[tuple[int, int, int]],
+    frame_indexes: list[int],
+    read_stats: dict[str, int],
+) -> AsyncGenerator[dict, None]:
+    semaphore = asyncio.Semaphore(CHUNK_SNAPSHOT_RANGED_READ_CONCURRENCY)
+
+    async def _read(read_frames: list[int]) -> list[dict]:
+        first_offset = frames[read_frames[0]][1]
+        last_offset, last_length = frames[read_frames[-1]][1], frames[read_frames[-1]][2]
+        async with semaphore:
+            data = await remote_file_service.get_file_content_range_by_file_path(
+                file_path=chunk_snapshot_path,
+                start=first_offset,
+                end=last_offset + last_length - 1,
+            )
+        read_stats["ranged_reads"] += 1
+        read_stats["bytes_read"] += len(data)
+        records: list[dict] = []
+        for frame_index in read_frames:
+            _, offset, length = frames[frame_index]
+            frame_data = data[offset - first_offset:offset - first_offset + length]
+            records.extend(_parse_snapshot_records(gzip.decompress(frame_data)))
+        return records
+
+    reads = _group_snapshot_frame_reads(frame_indexes)
+    # Fetch a window of reads concurrently, but keep output in chunk order and
+    # stop fetching once the consumer has what it needs.
+    for window_start in range(0, len(reads), CHUNK_SNAPSHOT_RANGED_READ_CONCURRENCY):
+        window = reads[window_start:window_start + CHUNK_SNAPSHOT_RANGED_READ_CONCURRENCY]
+        for records in await asyncio.gather(*[_read(read_frames) for read_frames in window]):
+            for record in records:
+                yield record
+
+
+async def _iter_snapshot_records_full(
+    *,
+    remote_file_service: RemoteFileServiceProtocol,
+    chunk_snapshot_path: str,
+    read_stats: dict[str, int],
+) -> AsyncGenerator[dict, None]:
+    raw_snapshot = await remote_file_service.get_file_content_by_file_path(
+        file_path=chunk_snapshot_path,
+    )
+    snapshot_bytes = _coerce_bytes_content(raw_snapshot, source=chunk_snapshot_path)
+    read_stats["bytes_read"] += len(snapshot_bytes)
+    with gzip.GzipFile(fileobj=BytesIO(snapshot_bytes), mode="rb") as snapshot_file:
+        for raw_line in snapshot_file:
+            line = raw_line.decode("utf-8").strip()
+            if not line:
+                continue
+            yield json.loads(line)
+
+
 async def _stream_chunk_document_from_snapshot(
     *,
     doc_id: int,
@@ -462,31 +596,74 @@ async def _stream_chunk_document_from_snapshot(
     selected_chunk_indexes: set[int] | None = None,
 ) -> AsyncGenerator[ChunkInfo, None]:
     remote_file_service = await FileSystemProxy.create(user_id=user_id)
-    raw_snapshot = await remote_file_service.get_file_content_by_file_path(
-        file_path=chunk_snapshot_path,
+    frames = await _load_snapshot_frame_index(
+        remote_file_service=remote_file_service,
+        chunk_snapshot_path=chunk_snapshot_path,
     )
-    snapshot_bytes = _coerce_bytes_content(raw_snapshot, source=chunk_snapshot_path)
+    read_stats = {"ranged_reads": 0, "bytes_read": 0}
     yielded_chunks = 0
-    with gzip.GzipFile(fileobj=BytesIO(snapshot_bytes), mode="rb") as snapshot_file:
-        for raw_line in snapshot_file:
-            line = raw_line.decode("utf-8").strip()
-            if not line:
-                continue
-            record = json.loads(line)
-            chunk_idx = int(record["idx"])
-            if chunk_idx < start_chunk_idx:
-                continue
-            if selected_chunk_indexes is not None and chunk_idx not in selected_chunk_indexes:
-                continue
-            yield ChunkInfo(
-                id=str(record["id"]),
-                text=str(record["text"]),
-                idx=chunk_idx,
-                doc_id=int(record["doc_id"]),
+    yielded_chunk_idxs: set[int] = set()
+    read_mode = "full"
+
+    def _accept(record: dict) -> ChunkInfo | None:
+        chunk_idx = int(record["idx"])
+        if chunk_idx < start_chunk_idx or chunk_idx in yielded_chunk_idxs:
+            return None
+        if selected_chunk_indexes is not None and chunk_idx not in selected_chunk_indexes:
+            return None
+        return ChunkInfo(
+            id=str(record["id"]),
+            text=str(record["text"]),
+            idx=chunk_idx,
+            doc_id=int(record["doc_id"]),
+        )
+
+    done = False
+    if frames is not None:
+        read_mode = "ranged"
+        try:
+            async for record in _iter_snapshot_records_ranged(
+                remote_file_service=remote_file_service,
+                chunk_snapshot_path=chunk_snapshot_path,
+                frames=frames,
+                frame_indexes=_select_snapshot_frames(
+                    frames,
+                    start_chunk_idx=start_chunk_idx,
+                    selected_chunk_indexes=selected_chunk_indexes,
+                ),
+                read_stats=read_stats,
+            ):
+                chunk_info = _accept(record)
+                if chunk_info is None:
+                    continue
+                yield chunk_info
+                yielded_chunk_idxs.add(chunk_info.idx)
+                yielded_chunks += 1
+                if max_chunks is not None and yielded_chunks >= max_chunks:
+                    break
+            done = True
+        except Exception as e:
+            # e.g. a file service without ranged reads; chunks already yielded
+            # are skipped by the full read below.
+            exception_logger.warning(
+                f"Ranged chunk snapshot read failed, fallback to full read: {chunk_snapshot_path}, error: {e}"
             )
-            yielded_chunks += 1
+            read_mode = "ranged_fallback_full"
+
+    if not done:
+        async for record in _iter_snapshot_records_full(
+            remote_file_service=remote_file_service,
+            chunk_snapshot_path=chunk_snapshot_path,
+            read_stats=read_stats,
+        ):
             if max_chunks is not None and yielded_chunks >= max_chunks:
                 break
+            chunk_info = _accept(record)
+            if chunk_info is None:
+                continue
+            yield chunk_info
+            yielded_chunk_idxs.add(chunk_info.idx)
+            yielded_chunks += 1
     set_stage_metrics(
         chunk_source_stage="stream_chunk_snapshot",
         document_id=doc_id,
@@ -494,6 +671,9 @@ async def _stream_chunk_document_from_snapshot(
         chunks=yielded_chunks,
         start_chunk_idx=start_chunk_idx,
         max_chunks=max_chunks,
+        snapshot_read_mode=read_mode,
+        snapshot_ranged_reads=read_stats["ranged_reads"],
+        snapshot_bytes_read=read_stats["bytes_read"],
     )
 
 # -----------------------------
@@ -1098,9 +1278,11 @@ async def resolve_entities_with_semantic_dedupe(
 
     return resolved_entities, resolved_relations
 
-async def get_extract_llm_client(
+async def acquire_extract_llm_client(
     user_id: int
-) -> AsyncOpenAI:
+) -> LLMClientLease:
+    """Pooled client of the user's document reader model; release the lease
+    when the extraction is done."""
     async with async_session_context() as db:
         db_user = await crud.user.get_user_by_id_async(
             db=db, 
@@ -1116,8 +1298,7 @@ async def get_extract_llm_client(
             model_id=db_user.default_document_reader_model_id
         )).get_configuration()
 
-        llm_client = AsyncOpenAI(
-            api_key=model_configuration.api_key,
+        return await acquire_llm_client(
             base_url=model_configuration.base_url,
+            api_key=model_configuration.api_key,
         )
-        return llm_client
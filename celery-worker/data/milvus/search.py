@@ -143,3 +143,20 @@ async def full_text_search(
         ),
     )
     return _parse_results(results)
+
+# ===================== 文档已有向量 =====================
+async def get_document_chunk_embeddings(
+    document_id: int,
+    limit: int = 64
+) -> list[list[float]]:
+    """Stored chunk vectors of one document (at most ``limit``, in chunk
+    order); empty when the document has not been embedded yet."""
+    rows = await asyncio.to_thread(
+        milvus_client.query,
+        collection_name=MILVUS_COLLECTION,
+        filter=_build_document_filter([document_id]),
+        output_fields=["idx", "embedding"],
+        limit=limit,
+    )
+    rows = sorted(rows, key=lambda row: row.get("idx") or 0)
+    return [list(row["embedding"]) for row in rows if row.get("embedding") is not None]
@@ -6,19 +6,25 @@ The neo4j async driver internally binds to whichever asyncio loop instantiated
 it. Reusing the same driver from a different (or closed) loop raises
 ``Future attached to a different loop``.
 
-The celery worker invokes ``asyncio.run(coro)`` per task — each task therefore
+By default the celery worker invokes ``asyncio.run(coro)`` per task — each task therefore
 runs in a brand-new loop that is closed when the task finishes. We solve this
 by keeping a *driver-per-loop* registry and closing each driver inside its own
 loop just before that loop shuts down.
 
+With ``CELERY_TASK_EVENT_LOOP_MODE=persistent`` each worker thread keeps one
+loop alive across tasks instead (see ``common/worker_loop.py``), so the driver
+of that loop — and its bolt connection pool — is reused by every task on the
+thread.
+
 Usage contract
 --------------
 1. ``async_neo4j_driver`` proxies to the driver bound to the *currently
    running* loop, lazily creating one on first access.
-2. The task entry point (see ``common/celery/app.py::_run``) **must** call
-   ``await close_neo4j_driver_for_current_loop()`` at the end of every coro it
-   runs. The wrapper there does this in a ``finally`` block so leaks are
-   impossible regardless of success / failure.
+2. Whoever closes a loop **must** first call
+   ``await close_neo4j_driver_for_current_loop()`` inside it. In per-task mode
+   the task entry point (``common/celery/app.py::_run``) does this in a
+   ``finally`` block (via ``close_loop_resources``) so leaks are impossible
+   regardless of success / failure.
 """
 import asyncio
 from threading import Lock
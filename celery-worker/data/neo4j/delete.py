@@ -1,4 +1,5 @@
 from data.neo4j.base import async_neo4j_driver
+from common.graph_community import bump_graph_version
 from common.logger import info_logger
 
 async def clear_data():
@@ -17,6 +18,8 @@ async def delete_documents_and_related_from_neo4j(
 
     async with async_neo4j_driver.session() as session:
         await session.execute_write(_delete_documents_tx, doc_ids)
+    # 删除会清理共享的 Entity / Community，按全局版本失效图谱缓存
+    await bump_graph_version()
 
 async def _delete_documents_tx(
     tx, 
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
+from uuid import uuid4
 from data.custom_types.all import ChunkInfo, RelationInfo, EntityInfo, DocumentInfo
 from data.neo4j.base import async_neo4j_driver
+from common.logger import exception_logger
 
 def now_str():
     return datetime.now(tz=timezone.utc).isoformat()
@@ -38,7 +40,19 @@ async def upsert_doc_neo4j(
 # -----------------------------
 # 1.1) Neo4j：Document -> Chunk 关系
 # -----------------------------
-async def upsert_doc_chunk_relations():
+async def upsert_doc_chunk_relations(
+    doc_id: int | None = None
+):
+    if doc_id is not None:
+        # 增量模式：只为当前文档的 chunk 建立 HAS_CHUNK，避免扫描全图
+        cypher = """
+        MATCH (d:Document {id: $doc_id})
+        MATCH (c:Chunk {doc_id: $doc_id})
+        MERGE (d)-[:HAS_CHUNK]->(c)
+        """
+        async with async_neo4j_driver.session() as session:
+            await session.run(cypher, doc_id=doc_id)
+        return
     cypher = """
     MATCH (c:Chunk)
     WHERE c.doc_id IS NOT NULL
@@ -257,3 +271,240 @@ async def annotate_node_degrees():
             WITH n, COUNT { (n)--() } AS deg
             SET n.degree = deg
         """)
+
+
+# -----------------------------
+# 12) 增量图维护：只处理单个文档的 chunk / entity 及其 1 跳邻居
+# -----------------------------
+_GRAPH_INDEX_STATEMENTS = (
+    "CREATE INDEX chunk_doc_id IF NOT EXISTS FOR (c:Chunk) ON (c.doc_id)",
+    "CREATE INDEX chunk_id IF NOT EXISTS FOR (c:Chunk) ON (c.id)",
+    "CREATE INDEX entity_id IF NOT EXISTS FOR (e:Entity) ON (e.id)",
+    "CREATE INDEX document_id IF NOT EXISTS FOR (d:Document) ON (d.id)",
+    "CREATE INDEX community_id IF NOT EXISTS FOR (com:Community) ON (com.id)",
+)
+_graph_indexes_ready = False
+
+
+async def ensure_graph_indexes():
+    """The incremental passes look nodes up by ``doc_id`` / ``id``; without
+    these indexes each lookup is still a label scan over the whole graph.
+    """
+    global _graph_indexes_ready
+    if _graph_indexes_ready:
+        return
+    async with async_neo4j_driver.session() as session:
+        for statement in _GRAPH_INDEX_STATEMENTS:
+            try:
+                await session.run(statement)
+            except Exception as e:
+                # 已存在同属性的约束等情况下建索引会失败，不影响后续查询
+                exception_logger.warning(f"Failed to ensure neo4j index: {statement}: {e}")
+    _graph_indexes_ready = True
+
+
+async def assign_document_entity_communities(
+    doc_id: int
+):
+    """Attach the document's entities and chunks to the owner's communities.
+
+    Entities are shared across users (``make_entity_id`` does not include the
+    owner), so membership is kept per partition: an entity belongs to at most
+    one ``u{user}:`` community per user, expressed by its ``BELONGS_TO`` edges.
+    Entities without a community in the owner's partition join the most common
+    one among their 1-hop entity neighbours; the rest wait for the partition's
+    deferred Louvain rebuild (``common.graph_community``).
+    """
+    async with async_neo4j_driver.session() as session:
+        await session.run("""
+            MATCH (d:Document {id: $doc_id})
+            WITH 'u' + toString(d.creator_id) + ':' AS prefix
+            MATCH (:Chunk {doc_id: $doc_id})-[:MENTIONS]->(e:Entity)
+            WHERE NOT EXISTS {
+                MATCH (e)-[:BELONGS_TO]->(own:Community)
+                WHERE own.id STARTS WITH prefix
+            }
+            WITH DISTINCT prefix, e
+            MATCH (e)--(:Entity)-[:BELONGS_TO]->(com:Community)
+            WHERE com.id STARTS WITH prefix
+            WITH e, com, count(*) AS votes
+            ORDER BY votes DESC, com.id ASC
+            WITH e, collect(com)[0] AS com
+            MERGE (e)-[:BELONGS_TO]->(com)
+        """, {"doc_id": doc_id})
+
+        await session.run("""
+            MATCH (d:Document {id: $doc_id})
+            WITH 'u' + toString(d.creator_id) + ':' AS prefix
+            MATCH (c:Chunk {doc_id: $doc_id})-[:MENTIONS]->(:Entity)-[:BELONGS_TO]->(com:Community)
+            WHERE com.id STARTS WITH prefix
+            WITH DISTINCT c, com
+            MERGE (c)-[:BELONGS_TO]->(com)
+        """, {"doc_id": doc_id})
+
+        await session.run("""
+            MATCH (:Chunk {doc_id: $doc_id})-[:BELONGS_TO]->(com:Community)
+            WITH DISTINCT com
+            SET com.size = COUNT { (com)<-[:BELONGS_TO]-() }
+        """, {"doc_id": doc_id})
+
+
+async def annotate_document_node_degrees(
+    doc_id: int
+):
+    """Refresh ``degree`` for the document's chunks, the entities they mention,
+    those entities' 1-hop entity neighbours and the touched communities.
+    """
+    async with async_neo4j_driver.session() as session:
+        await session.run("""
+            MATCH (n:Chunk {doc_id: $doc_id})
+            SET n.degree = COUNT { (n)--() }
+        """, {"doc_id": doc_id})
+        await session.run("""
+            MATCH (:Chunk {doc_id: $doc_id})-[:MENTIONS]->(e:Entity)
+            WITH DISTINCT e
+            OPTIONAL MATCH (e)--(nb:Entity)
+            WITH collect(DISTINCT e) + collect(DISTINCT nb) AS nodes
+            UNWIND nodes AS n
+            WITH DISTINCT n
+            SET n.degree = COUNT { (n)--() }
+        """, {"doc_id": doc_id})
+        await session.run("""
+            MATCH (:Chunk {doc_id: $doc_id})-[:BELONGS_TO]->(com:Community)
+            WITH DISTINCT com
+            SET com.degree = COUNT { (com)--() }
+        """, {"doc_id": doc_id})
+
+
+async def refresh_document_graph_neighbourhood(
+    doc_id: int
+):
+    """Incremental replacement for the global post-processing passes
+    (``upsert_doc_chunk_relations`` / ``create_communities_from_chunks`` /
+    ``create_community_nodes_and_relationships_with_size`` /
+    ``annotate_node_degrees``). Cost scales with the document, not the graph.
+    """
+    await ensure_graph_indexes()
+    await upsert_doc_chunk_relations(doc_id=doc_id)
+    await assign_document_entity_communities(doc_id=doc_id)
+    await annotate_document_node_degrees(doc_id=doc_id)
+
+
+# -----------------------------
+# 13) 按用户分区的社区聚类（Louvain），由延迟任务触发
+# -----------------------------
+def user_community_prefix(user_id: int) -> str:
+    return f"u{user_id}:"
+
+
+async def rebuild_user_communities(
+    user_id: int
+) -> dict[str, int]:
+    """Run Louvain over the entities mentioned by ``user_id``'s documents only.
+
+    The in-memory projection gets a unique name so concurrent rebuilds (other
+    users, other workers) never collide, and community ids are prefixed with the
+    partition so ids from different partitions cannot clash. Entities are shared
+    between users, so the result is stored only as ``BELONGS_TO`` edges to this
+    partition's communities; ``e.community`` and other partitions' edges are
+    left alone.
+    """
+    await ensure_graph_indexes()
+    graph_name = f"community_u{user_id}_{uuid4().hex}"
+    prefix = user_community_prefix(user_id)
+    now = now_str()
+    async with async_neo4j_driver.session() as session:
+        result = await session.run("""
+            MATCH (:Document {creator_id: $user_id})-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(source:Entity)
+            WITH DISTINCT source
+            OPTIONAL MATCH (source)-[]->(target:Entity)
+            WHERE EXISTS {
+                MATCH (:Document {creator_id: $user_id})-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(target)
+            }
+            WITH gds.graph.project(
+                $graph_name,
+                source,
+                target,
+                {},
+                {undirectedRelationshipTypes: ['*']}
+            ) AS g
+            RETURN g.nodeCount AS node_count, g.relationshipCount AS relationship_count
+        """, {"user_id": user_id, "graph_name": graph_name})
+        record = await result.single()
+        node_count = int(record["node_count"]) if record is not None else 0
+        relationship_count = int(record["relationship_count"]) if record is not None else 0
+        if node_count == 0:
+            return {"nodes": 0, "relationships": 0, "communities": 0}
+
+        try:
+            result = await session.run("""
+                CALL gds.louvain.stream($graph_name) YIELD nodeId, communityId
+                WITH gds.util.asNode(nodeId) AS e, $prefix + toString(communityId) AS comm_id
+                MERGE (com:Community {id: comm_id})
+                ON CREATE SET com.created_at = datetime($now)
+                SET com.updated_at = datetime($now)
+                WITH e, com
+                OPTIONAL MATCH (e)-[old:BELONGS_TO]->(prev:Community)
+                WHERE prev.id STARTS WITH $prefix AND prev <> com
+                DELETE old
+                MERGE (e)-[:BELONGS_TO]->(com)
+                RETURN count(DISTINCT com) AS community_count
+            """, {"graph_name": graph_name, "prefix": prefix, "now": now})
+            record = await result.single()
+            community_count = int(record["community_count"]) if record is not None else 0
+        finally:
+            await session.run(
+                "CALL gds.graph.drop($graph_name, false) YIELD graphName RETURN graphName",
+                {"graph_name": graph_name},
+            )
+
+        # 不再被该用户文档提及的实体，移出该用户分区（其它分区的成员关系保留）
+        await session.run("""
+            MATCH (e:Entity)-[old:BELONGS_TO]->(com:Community)
+            WHERE com.id STARTS WITH $prefix
+              AND NOT EXISTS {
+                MATCH (:Document {creator_id: $user_id})-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(e)
+              }
+            DELETE old
+        """, {"user_id": user_id, "prefix": prefix})
+
+        await session.run("""
+            MATCH (:Document {creator_id: $user_id})-[:HAS_CHUNK]->(c:Chunk)
+            OPTIONAL MATCH (c)-[old:BELONGS_TO]->(prev:Community)
+            WHERE prev.id STARTS WITH $prefix
+            WITH c, collect(old) AS old_rels
+            FOREACH (rel IN old_rels | DELETE rel)
+            WITH c
+            MATCH (c)-[:MENTIONS]->(:Entity)-[:BELONGS_TO]->(com:Community)
+            WHERE com.id STARTS WITH $prefix
+            WITH DISTINCT c, com
+            MERGE (c)-[:BELONGS_TO]->(com)
+        """, {"user_id": user_id, "prefix": prefix})
+
+        await session.run("""
+            MATCH (com:Community)
+            WHERE com.id STARTS WITH $prefix
+              AND NOT (com)<-[:BELONGS_TO]-()
+            DETACH DELETE com
+        """, {"prefix": prefix})
+        await session.run("""
+            MATCH (com:Community)
+            WHERE com.id STARTS WITH $prefix
+            SET com.size = COUNT { (com)<-[:BELONGS_TO]-() },
+                com.degree = COUNT { (com)--() }
+        """, {"prefix": prefix})
+
+        await session.run("""
+            MATCH (:Document {creator_id: $user_id})-[:HAS_CHUNK]->(c:Chunk)
+            SET c.degree = COUNT { (c)--() }
+            WITH DISTINCT c
+            MATCH (c)-[:MENTIONS]->(e:Entity)
+            WITH DISTINCT e
+            SET e.degree = COUNT { (e)--() }
+        """, {"user_id": user_id})
+
+    return {
+        "nodes": node_count,
+        "relationships": relationship_count,
+        "communities": community_count,
+    }
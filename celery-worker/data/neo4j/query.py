@@ -1,11 +1,10 @@
 import crud
-import inspect
 
 from langfuse import propagate_attributes
 
 from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
-from common.logger import exception_logger
 from common.ai import (
     _get_user_ai_interaction_language,
     build_text_output_language_instruction,
@@ -16,33 +15,6 @@ from prompts.query import query_context_summary
 from proxy.ai_model_proxy import AIModelProxy
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
-
-
 async def get_query_result_summary_llm_client(
     user_id: int
 ):
@@ -100,10 +72,11 @@ async def global_query(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        llm_client = AsyncOpenAI(
+        llm_lease = await acquire_llm_client(
+            base_url=model_configuration.base_url,
             api_key=model_configuration.api_key,
-            base_url=model_configuration.base_url
         )
+        llm_client = llm_lease.client
         try:
             resp = await llm_client.chat.completions.create(
                 model=model_configuration.model_name,
@@ -115,7 +88,7 @@ async def global_query(
             output_text = resp.choices[0].message.content
             return output_text
         finally:
-            await _safe_close_async_client(llm_client)
+            await llm_lease.release()
 
 async def naive_query(
     user_id: int, 
@@ -149,10 +122,11 @@ async def naive_query(
         user_id=str(user_id),
         tags=[f'model:{model_configuration.model_name}']
     ):
-        llm_client = AsyncOpenAI(
+        llm_lease = await acquire_llm_client(
+            base_url=model_configuration.base_url,
             api_key=model_configuration.api_key,
-            base_url=model_configuration.base_url
         )
+        llm_client = llm_lease.client
         try:
             resp = await llm_client.chat.completions.create(
                 model=model_configuration.model_name,
@@ -164,4 +138,4 @@ async def naive_query(
             output_text = resp.choices[0].message.content
             return output_text
         finally:
-            await _safe_close_async_client(llm_client)
+            await llm_lease.release()
@@ -1,9 +1,19 @@
+import asyncio
 from contextlib import asynccontextmanager
+from threading import Lock
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import NullPool
-from config.sql import POSTGRES_PASSWORD, POSTGRES_DB, POSTGRES_DB_URL, POSTGRES_USER
+from config.sql import (
+    POSTGRES_DB,
+    POSTGRES_DB_URL,
+    POSTGRES_LOOP_MAX_OVERFLOW,
+    POSTGRES_LOOP_POOL_SIZE,
+    POSTGRES_PASSWORD,
+    POSTGRES_USER,
+)
+from config.worker import CELERY_TASK_EVENT_LOOP_MODE
 
 SQLALCHEMY_DATABASE_URL = f"postgresql+psycopg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_DB_URL}/{POSTGRES_DB}"
 
@@ -28,10 +38,73 @@ async_session_scope = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# With CELERY_TASK_EVENT_LOOP_MODE=persistent each worker thread keeps its loop
+# for its whole lifetime, so a real connection pool per loop is safe and saves
+# a connect + auth round-trip on every session. A loop runs one task at a
+# time, so the pool stays small: the worker holds up to
+# concurrency x (POSTGRES_LOOP_POOL_SIZE + POSTGRES_LOOP_MAX_OVERFLOW)
+# connections.
+_pooled_engines_by_loop: dict[
+    int,
+    tuple[asyncio.AbstractEventLoop, AsyncEngine, async_sessionmaker[AsyncSession]],
+] = {}
+_pooled_engines_lock = Lock()
+
+
+def _pool_setting(value: str, default: int) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _session_scope_for_running_loop() -> async_sessionmaker[AsyncSession]:
+    if CELERY_TASK_EVENT_LOOP_MODE != "persistent":
+        return async_session_scope
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return async_session_scope
+    entry = _pooled_engines_by_loop.get(id(loop))
+    if entry is not None and entry[0] is loop and not loop.is_closed():
+        return entry[2]
+    with _pooled_engines_lock:
+        entry = _pooled_engines_by_loop.get(id(loop))
+        if entry is not None and entry[0] is loop and not loop.is_closed():
+            return entry[2]
+        engine = create_async_engine(
+            SQLALCHEMY_DATABASE_URL,
+            pool_size=max(1, _pool_setting(POSTGRES_LOOP_POOL_SIZE, 2)),
+            max_overflow=_pool_setting(POSTGRES_LOOP_MAX_OVERFLOW, 2),
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            echo=False,
+        )
+        session_scope = async_sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        _pooled_engines_by_loop[id(loop)] = (loop, engine, session_scope)
+        return session_scope
+
+
+async def close_sql_engine_for_current_loop() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    entry = _pooled_engines_by_loop.pop(id(loop), None)
+    if entry is None:
+        return
+    await entry[1].dispose()
+
 
 @asynccontextmanager
 async def async_session_context():
-    session = async_session_scope()
+    session = _session_scope_for_running_loop()()
     try:
         yield session
     finally:
@@ -0,0 +1,196 @@
+"""In-process embedding broker.
+
+With ``--pool=threads --concurrency=20`` every task used to push its own
+``encode`` call through ``asyncio.to_thread``: up to 20 threads contending on
+one model, each running a tiny batch. The broker instead gives the model to a
+single worker thread. Callers (from any task / event loop) enqueue their texts
+and await a future; the worker drains whatever is queued, regroups the texts by
+token length so each forward pass pads as little as possible, and scatters the
+vectors back to the waiting callers.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.typing import NDArray
+
+from common.logger import exception_logger, info_logger, log_event
+
+DEFAULT_MAX_BATCH_SIZE = 64
+# Upper bound for ``batch_size * longest_sequence_in_batch``, i.e. the padded
+# token count of one forward pass.
+DEFAULT_MAX_BATCH_TOKENS = 16384
+DEFAULT_MAX_WAIT_MS = 5.0
+STATS_LOG_INTERVAL_SECONDS = 60.0
+
+
+@dataclass
+class _EmbeddingRequest:
+    texts: list[str]
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBroker:
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        encode: Callable[[list[str]], NDArray[np.float32]],
+        token_length: Callable[[str], int],
+        dim: int,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        self.name = name
+        self.dim = dim
+        self._encode = encode
+        self._token_length = token_length
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_batch_tokens = max(1, max_batch_tokens)
+        self._max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self._queue: queue.Queue[_EmbeddingRequest] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._requests = 0
+        self._encode_elapsed_ms = 0.0
+        self._recent_latency_ms: deque[float] = deque(maxlen=512)
+        self._recent_batch_sizes: deque[int] = deque(maxlen=512)
+        self._last_stats_log = time.monotonic()
+
+    async def embed(self, texts: list[str]) -> NDArray[np.float32]:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put(_EmbeddingRequest(texts=list(texts), future=future))
+        return await asyncio.wrap_future(future)
+
+    def metrics(self) -> dict[str, float | int]:
+        with self._stats_lock:
+            latencies = sorted(self._recent_latency_ms)
+            batch_sizes = list(self._recent_batch_sizes)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "avg_batch_size": round(sum(batch_sizes) / len(batch_sizes), 2) if batch_sizes else 0.0,
+                "encode_elapsed_ms": round(self._encode_elapsed_ms, 2),
+                "latency_p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+                "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)], 2) if latencies else 0.0,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"embedding-broker-{self.name}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _drain(self) -> list[_EmbeddingRequest]:
+        requests = [self._queue.get()]
+        pending_texts = len(requests[0].texts)
+        deadline = time.monotonic() + self._max_wait_seconds
+        while pending_texts < self._max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                request = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            requests.append(request)
+            pending_texts += len(request.texts)
+        return requests
+
+    def _plan_batches(self, lengths: list[int]) -> list[list[int]]:
+        # Sorting by length keeps similarly sized texts together, so the padded
+        # size of every forward pass stays close to its real token count.
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        batches: list[list[int]] = []
+        current: list[int] = []
+        for i in order:
+            longest = lengths[i]
+            if current and (
+                len(current) >= self._max_batch_size
+                or (len(current) + 1) * longest > self._max_batch_tokens
+            ):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run(self) -> None:
+        while True:
+            requests = self._drain()
+            requests = [r for r in requests if r.future.set_running_or_notify_cancel()]
+            if not requests:
+                continue
+            texts = [text for r in requests for text in r.texts]
+            try:
+                lengths = [max(1, self._token_length(text)) for text in texts]
+                vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+                encode_start = time.perf_counter()
+                batch_sizes: list[int] = []
+                for batch in self._plan_batches(lengths):
+                    vectors[batch] = self._encode([texts[i] for i in batch])
+                    batch_sizes.append(len(batch))
+                encode_elapsed_ms = (time.perf_counter() - encode_start) * 1000
+            except Exception as e:
+                exception_logger.error(f"Embedding broker {self.name} failed to encode batch: {e}")
+                for r in requests:
+                    r.future.set_exception(e)
+                continue
+
+            offset = 0
+            finished_at = time.perf_counter()
+            for r in requests:
+                r.future.set_result(vectors[offset:offset + len(r.texts)])
+                offset += len(r.texts)
+            self._record(requests, batch_sizes, encode_elapsed_ms, finished_at)
+
+    def _record(
+        self,
+        requests: list[_EmbeddingRequest],
+        batch_sizes: list[int],
+        encode_elapsed_ms: float,
+        finished_at: float,
+    ) -> None:
+        with self._stats_lock:
+            self._batches += len(batch_sizes)
+            self._requests += len(requests)
+            self._texts += sum(batch_sizes)
+            self._encode_elapsed_ms += encode_elapsed_ms
+            self._recent_batch_sizes.extend(batch_sizes)
+            self._recent_latency_ms.extend(
+                (finished_at - r.enqueued_at) * 1000 for r in requests
+            )
+            now = time.monotonic()
+            if now - self._last_stats_log < STATS_LOG_INTERVAL_SECONDS:
+                return
+            self._last_stats_log = now
+        log_event(info_logger, "embedding_broker_stats", broker=self.name, **self.metrics())
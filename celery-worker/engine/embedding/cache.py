@@ -0,0 +1,268 @@
+"""Content-addressed embedding cache.
+
+Vectors are keyed by ``(model name, dim, sha256(text))`` — the same content
+hash ``make_chunk_id`` uses — so re-processing a document, near-duplicate web
+pages and repeated entity context samples reuse earlier vectors instead of
+paying for another forward pass / cloud call.
+
+``CachedEmbeddingEngine`` wraps any engine, so every caller of
+``get_embedding_engine()`` consults the cache without code changes.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import redis.asyncio as redis
+from numpy.typing import NDArray
+
+from base_implement.embedding_engine_base import EmbeddingEngineBase
+from common.logger import exception_logger
+from config.base import BASE_DIR
+from config.embedding import (
+    EMBEDDING_CACHE_BACKEND,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_MB,
+    EMBEDDING_CACHE_REDIS_TTL_SECONDS,
+)
+from config.redis import REDIS_PORT, REDIS_URL
+
+EMBEDDING_CACHE_KEY_PREFIX = "embedding:"
+# Recompute the on-disk total after this many writes instead of on every put.
+_DISK_SIZE_CHECK_EVERY = 256
+# Evict down to this fraction of the limit so eviction doesn't run on every put.
+_DISK_EVICT_TARGET_RATIO = 0.9
+# A hit only rewrites ``last_access`` once it is this stale; LRU order at this
+# granularity is enough for eviction and keeps reads from turning into writes.
+_DISK_TOUCH_INTERVAL_SECONDS = 3600
+
+
+def _int_setting(raw: str | None, default: int) -> int:
+    try:
+        return int(float(raw)) if raw is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def embedding_cache_key(*, model_name: str, dim: int, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{EMBEDDING_CACHE_KEY_PREFIX}{model_name}:{dim}:{digest}"
+
+
+class EmbeddingCacheBackend:
+    hits = 0
+    misses = 0
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        raise NotImplementedError("EmbeddingCacheBackend is an abstract class")
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        raise NotImplementedError("EmbeddingCacheBackend is an abstract class")
+
+
+class DiskEmbeddingCache(EmbeddingCacheBackend):
+    """SQLite file with least-recently-used eviction once ``max_bytes`` is hit."""
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max(1, max_bytes)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._writes_since_size_check = _DISK_SIZE_CHECK_EVERY
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _get_many_sync(self, keys: list[str]) -> list[bytes | None]:
+        with self._lock:
+            conn = self._connection()
+            found: dict[str, bytes] = {}
+            now = time.time()
+            stale_keys: list[str] = []
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector, last_access FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, vector, last_access in rows:
+                    found[key] = vector
+                    if now - last_access >= _DISK_TOUCH_INTERVAL_SECONDS:
+                        stale_keys.append(key)
+            if stale_keys:
+                conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in stale_keys],
+                )
+                conn.commit()
+            return [found.get(key) for key in keys]
+
+    def _set_many_sync(self, items: dict[str, bytes]) -> None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, size, last_access) VALUES (?, ?, ?, ?)",
+                [(key, value, len(value), now) for key, value in items.items()],
+            )
+            conn.commit()
+            self._writes_since_size_check += len(items)
+            if self._writes_since_size_check < _DISK_SIZE_CHECK_EVERY:
+                return
+            self._writes_since_size_check = 0
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * _DISK_EVICT_TARGET_RATIO)
+            freed = 0
+            evict_keys: list[str] = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM embeddings ORDER BY last_access ASC"
+            ):
+                if total - freed <= target:
+                    break
+                evict_keys.append(key)
+                freed += size
+            conn.executemany("DELETE FROM embeddings WHERE key = ?", [(k,) for k in evict_keys])
+            conn.commit()
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return await asyncio.to_thread(self._get_many_sync, keys)
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        await asyncio.to_thread(self._set_many_sync, items)
+
+
+class RedisEmbeddingCache(EmbeddingCacheBackend):
+    """Shared across workers; entries expire after ``ttl_seconds`` and size is
+    bounded by the Redis ``maxmemory`` / eviction policy."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = max(1, ttl_seconds)
+
+    def _client(self) -> redis.Redis:
+        # Raw bytes (no decode_responses) — vectors are stored as float32 buffers.
+        return redis.from_url(f"redis://{REDIS_URL}:{REDIS_PORT}/1")
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        client = self._client()
+        try:
+            return await client.mget(keys)
+        finally:
+            await client.aclose()
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        client = self._client()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, ex=self.ttl_seconds)
+                await pipe.execute()
+        finally:
+            await client.aclose()
+
+
+class CachedEmbeddingEngine(EmbeddingEngineBase):
+
+    def __init__(
+        self,
+        engine: EmbeddingEngineBase,
+        backend: EmbeddingCacheBackend,
+    ):
+        self.engine = engine
+        self.backend = backend
+        self.model_name = engine.model_name
+        self.dim = engine.dim
+
+    async def embed(self, texts: list[str]) -> NDArray[np.float32]:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        keys = [
+            embedding_cache_key(model_name=self.model_name, dim=self.dim, text=text)
+            for text in texts
+        ]
+        unique_keys = list(dict.fromkeys(keys))
+        vectors: dict[str, NDArray[np.float32]] = {}
+        try:
+            cached = await self.backend.get_many(unique_keys)
+        except Exception as e:
+            exception_logger.warning(f"Embedding cache read failed, embedding without cache: {e}")
+            cached = [None] * len(unique_keys)
+        for key, raw in zip(unique_keys, cached, strict=True):
+            if raw is None:
+                continue
+            vector = np.frombuffer(raw, dtype=np.float32)
+            if vector.shape[0] == self.dim:
+                vectors[key] = vector
+
+        missing_keys = [key for key in unique_keys if key not in vectors]
+        self.backend.hits += len(unique_keys) - len(missing_keys)
+        self.backend.misses += len(missing_keys)
+        if missing_keys:
+            text_by_key = dict(zip(keys, texts, strict=True))
+            fresh = np.asarray(
+                await self.engine.embed([text_by_key[key] for key in missing_keys]),
+                dtype=np.float32,
+            )
+            for key, vector in zip(missing_keys, fresh, strict=True):
+                vectors[key] = vector
+            try:
+                await self.backend.set_many(
+                    {key: vectors[key].tobytes() for key in missing_keys}
+                )
+            except Exception as e:
+                exception_logger.warning(f"Embedding cache write failed: {e}")
+
+        return np.stack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+
+
+_backend: EmbeddingCacheBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_embedding_cache_backend() -> EmbeddingCacheBackend | None:
+    """Process-wide backend selected by ``EMBEDDING_CACHE_BACKEND``; ``None``
+    when caching is switched off."""
+    global _backend
+    backend_name = (EMBEDDING_CACHE_BACKEND or "").strip().lower()
+    if backend_name not in ("disk", "redis"):
+        return None
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if backend_name == "redis":
+                    _backend = RedisEmbeddingCache(
+                        ttl_seconds=_int_setting(EMBEDDING_CACHE_REDIS_TTL_SECONDS, 7 * 24 * 3600),
+                    )
+                else:
+                    cache_dir = (
+                        Path(EMBEDDING_CACHE_DIR)
+                        if EMBEDDING_CACHE_DIR
+                        else BASE_DIR / ".cache" / "embeddings"
+                    )
+                    _backend = DiskEmbeddingCache(
+                        path=cache_dir / "embeddings.sqlite3",
+                        max_bytes=_int_setting(EMBEDDING_CACHE_MAX_MB, 1024) * 1024 * 1024,
+                    )
+    return _backend
@@ -5,10 +5,19 @@ import os
 
 from common.env import is_env_enabled
 
-def get_embedding_engine():
+def _get_raw_embedding_engine():
     if is_env_enabled(os.getenv("ALI_DASHSCOPE_EMBEDDING_ON")):
         from engine.embedding.qwen_cloud import CloudQwen3EmbeddingEngine
         return CloudQwen3EmbeddingEngine()
     else:
         from engine.embedding.qwen_local import LocalQwen3EmbeddingEngine
         return LocalQwen3EmbeddingEngine()
+
+def get_embedding_engine():
+    from engine.embedding.cache import CachedEmbeddingEngine, get_embedding_cache_backend
+
+    engine = _get_raw_embedding_engine()
+    backend = get_embedding_cache_backend()
+    if backend is None:
+        return engine
+    return CachedEmbeddingEngine(engine=engine, backend=backend)
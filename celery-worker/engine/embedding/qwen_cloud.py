@@ -18,6 +18,7 @@ class CloudQwen3EmbeddingEngine(EmbeddingEngineBase):
             raise Exception("Please set ALI_DASHSCOPE_EMBEDDING_API_KEY environment variable")
         
         self.model = model
+        self.model_name = model
         self.dim = dim
         
         self.client = AsyncOpenAI(
@@ -1,11 +1,16 @@
+import threading
 import torch
-import asyncio
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from numpy.typing import NDArray
 from base_implement.embedding_engine_base import EmbeddingEngineBase
+from engine.embedding.broker import EmbeddingBroker
+
+LOCAL_EMBEDDING_MODEL_NAME = "Qwen/Qwen3-Embedding-0.6B"
 
 _model = None
+_broker: EmbeddingBroker | None = None
+_broker_lock = threading.Lock()
 
 def get_device() -> str:
     if torch.cuda.is_available():
@@ -19,28 +24,54 @@ def get_embedding_model() -> SentenceTransformer:
     global _model
     if _model is None:
         _model = SentenceTransformer(
-            "Qwen/Qwen3-Embedding-0.6B",
+            LOCAL_EMBEDDING_MODEL_NAME,
             device=get_device()
         )
     return _model
 
+def get_embedding_broker(dim: int = 1024) -> EmbeddingBroker:
+    """Process-wide broker: the only place that calls ``model.encode``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                model = get_embedding_model()
+                max_seq_length = model.get_max_seq_length() or 8192
+
+                @torch.inference_mode()
+                def _encode(texts: list[str]) -> NDArray[np.float32]:
+                    return model.encode(
+                        sentences=texts,
+                        batch_size=len(texts),
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                    ).astype("float32")
+
+                def _token_length(text: str) -> int:
+                    return min(
+                        len(model.tokenizer.encode(text, add_special_tokens=False)),
+                        max_seq_length,
+                    )
+
+                _broker = EmbeddingBroker(
+                    name="qwen3-local",
+                    encode=_encode,
+                    token_length=_token_length,
+                    dim=dim,
+                )
+    return _broker
+
 class LocalQwen3EmbeddingEngine(EmbeddingEngineBase):
     def __init__(self, dim: int = 1024):
         self.model = get_embedding_model()
+        self.model_name = LOCAL_EMBEDDING_MODEL_NAME
         self.dim = dim
+        self.broker = get_embedding_broker(dim=dim)
 
-    @torch.inference_mode()
     async def embed(self, texts: list[str]) -> NDArray[np.float32]:
         if not texts:
             return np.empty((0, self.dim), dtype=np.float32)
-
-        embeddings = await asyncio.to_thread(
-            self.model.encode,
-            sentences=texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-        )
-        return embeddings.astype("float32")
+        return await self.broker.embed(texts)
 
 if __name__ == "__main__":
     import asyncio
@@ -1,5 +1,6 @@
 import httpx
 from base_implement.markdown_engine_base import MarkdownEngineBase, WebsiteInfo
+from common.worker_loop import get_loop_http_client
 from enums.engine_enums import EngineProvided, EngineCategory
 
 class JinaEngine(MarkdownEngineBase):
@@ -30,16 +31,19 @@ class JinaEngine(MarkdownEngineBase):
         }
         # as jina ai sometimes do take a lot of times to response, so we set a timeout
         timeout = httpx.Timeout(30.0, connect=10.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(f'https://r.jina.ai/{url}', headers=headers)
-            title = response.json().get('data').get('title')
-            description = response.json().get('data').get('description')
-            content = response.json().get('data').get('content')
-            cover = await self.get_website_cover_by_playwright(url=url)
-            return WebsiteInfo(
-                url=url,
-                title=title,
-                description=description,
-                content=content,
-                cover=cover
-            )
\ No newline at end of file
+        response = await get_loop_http_client().get(
+            f'https://r.jina.ai/{url}',
+            headers=headers,
+            timeout=timeout,
+        )
+        title = response.json().get('data').get('title')
+        description = response.json().get('data').get('description')
+        content = response.json().get('data').get('content')
+        cover = await self.get_website_cover_by_playwright(url=url)
+        return WebsiteInfo(
+            url=url,
+            title=title,
+            description=description,
+            content=content,
+            cover=cover
+        )
\ No newline at end of file
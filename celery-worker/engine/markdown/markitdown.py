@@ -1,11 +1,9 @@
 import asyncio
 import io
 
-from bs4 import BeautifulSoup
 from langfuse import propagate_attributes
 from langfuse.openai import OpenAI
 from markitdown import MarkItDown
-from playwright.async_api import async_playwright
 
 import crud
 from base_implement.markdown_engine_base import FileInfo, MarkdownEngineBase, WebsiteInfo
@@ -44,14 +42,9 @@ class MarkitdownEngine(MarkdownEngineBase):
                 "There is something wrong with the user's configuration of the markitdown engine"
             )
 
-        # 2. 用 Playwright 获取 HTML
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            # 可以适当等到网络空闲，页面更稳定
-            await page.goto(url, wait_until="domcontentloaded")
-            html_content = await page.content()
-            await browser.close()
+        # 2. 用常驻浏览器池打开一次页面，HTML / meta 信息 / 封面都来自这一次导航
+        snapshot = await self.snapshot_website(url, timeout_ms=30000)
+        html_content = snapshot.html
 
         if not self.user_id:
             raise Exception("The user_id is not set.")
@@ -84,44 +77,13 @@ class MarkitdownEngine(MarkdownEngineBase):
             md_result = await asyncio.to_thread(md.convert_stream, stream)
             content = md_result.text_content
 
-            # 4. 用 BeautifulSoup 解析 meta 信息
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # 标题提取：优先 og:title，其次 <title>
-            og_title_meta = soup.find("meta", property="og:title")
-            normal_title_tag = soup.title
-
-            title: str = "Unknown Title"
-            if og_title_meta is not None:
-                title = str(og_title_meta.get("content"))
-            if not title and normal_title_tag is not None:
-                # 有些页面 title 可能是 None
-                title = str(normal_title_tag.string.strip()) if normal_title_tag.string else "Unknown Title"
-
-            # 描述提取：优先 og:description，其次 meta[name=description]
-            og_description_meta = soup.find("meta", property="og:description")
-            normal_description_meta = soup.find("meta", attrs={"name": "description"})
-
-            description: str | None = None
-            if og_description_meta is not None:
-                description = str(og_description_meta.get("content"))
-            if not description and normal_description_meta is not None:
-                description = str(normal_description_meta.get("content"))
-
-            # 关键字提取
-            keywords_meta = soup.find("meta", attrs={"name": "keywords"})
-            keywords = str(keywords_meta.get("content")) if keywords_meta else None
-
-            # 5. 封面图获取（可以考虑后续改造成复用当前 soup/HTML，避免再次 Playwright 打开）
-            cover = await self.get_website_cover_by_playwright(url)
-
             return WebsiteInfo(
                 url=url,
-                title=title,
-                description=description,
+                title=snapshot.title,
+                description=snapshot.description,
                 content=content,
-                cover=cover,
-                keywords=keywords
+                cover=snapshot.cover,
+                keywords=snapshot.keywords
             )
 
     async def analyse_file(
@@ -16,7 +16,6 @@ from urllib.parse import urlsplit, urlunsplit
 from common.markdown_helpers import extract_title_and_summary
 from base_implement.markdown_engine_base import MarkdownEngineBase, WebsiteInfo, FileInfo
 from enums.engine_enums import EngineProvided, EngineCategory
-from playwright.async_api import async_playwright
 from data.sql.base import async_session_context
 from common.logger import info_logger, exception_logger, format_log_message
 from proxy.file_system_proxy import FileSystemProxy
@@ -449,24 +448,15 @@ class MineruApiEngine(MarkdownEngineBase):
             page_title: str | None = None
             final_url: str | None = None
             response_status: int | None = None
+            cover: str | None = None
             stage = "render_website_pdf"
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    try:
-                        page = await browser.new_page()
-                        response = await page.goto(
-                            url,
-                            wait_until="domcontentloaded",
-                            timeout=15000,
-                        )
-                        final_url = page.url
-                        page_title = await page.title()
-                        if response is not None:
-                            response_status = response.status
-                        await page.pdf(path=str(temp_shot_pdf_path))
-                    finally:
-                        await browser.close()
+                snapshot = await self.snapshot_website(url, timeout_ms=15000, pdf=True)
+                final_url = snapshot.final_url
+                page_title = snapshot.page_title
+                response_status = snapshot.status
+                cover = snapshot.cover
+                temp_shot_pdf_path.write_bytes(snapshot.pdf or b"")
 
                 stage = "extract_website_pdf"
                 results = await self._extract_files([str(temp_shot_pdf_path)])
@@ -498,7 +488,7 @@ class MineruApiEngine(MarkdownEngineBase):
             title=title,
             description=description,
             content=content,
-            cover=await self.get_website_cover_by_playwright(url),
+            cover=cover,
         )
 
     async def analyse_file(self, file_path: str) -> FileInfo:
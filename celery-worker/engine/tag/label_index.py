@@ -0,0 +1,98 @@
+"""Per-user label vectors for the auto-tagger.
+
+Auto-tagging used to hand every label of the user to the LLM. Labels are now
+embedded with the shared embedding engine — whose content-addressed cache
+means each label name is computed once — and kept here as one normalized
+matrix per user, rebuilt only when the user's labels change.
+``shortlist_labels`` ranks them against a document vector so the LLM only
+adjudicates the nearest few.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+import schemas
+from common.embedding_utils import coerce_embedding_vectors
+from engine.embedding.factory import get_embedding_engine
+
+LABEL_INDEX_MAX_USERS = 512
+
+
+@dataclass
+class UserLabelIndex:
+    signature: str
+    labels: list[schemas.document.DocumentLabel]
+    matrix: NDArray[np.float32]
+
+
+_indexes: OrderedDict[int, UserLabelIndex] = OrderedDict()
+
+
+def label_signature(labels: list[schemas.document.DocumentLabel]) -> str:
+    payload = "\n".join(f"{label.id}\t{label.name}" for label in sorted(labels, key=lambda label: label.id))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_rows(vectors) -> NDArray[np.float32]:
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def document_query_vector(
+    digest_vector,
+    chunk_vectors: list[list[float]] | None = None,
+) -> NDArray[np.float32]:
+    """Digest vector, pulled towards the centroid of the stored chunk
+    vectors when the document has been embedded already."""
+    query = normalize_rows(digest_vector)[0]
+    if chunk_vectors and len(chunk_vectors[0]) == query.shape[0]:
+        centroid = normalize_rows(normalize_rows(chunk_vectors).mean(axis=0))[0]
+        query = normalize_rows(query + centroid)[0]
+    return query
+
+
+async def get_user_label_index(
+    user_id: int,
+    labels: list[schemas.document.DocumentLabel],
+) -> UserLabelIndex:
+    signature = label_signature(labels)
+    index = _indexes.get(user_id)
+    if index is not None and index.signature == signature:
+        _indexes.move_to_end(user_id)
+        return index
+
+    names = [label.name for label in labels]
+    vectors = coerce_embedding_vectors(
+        vectors_raw=await get_embedding_engine().embed(names),
+        expected_count=len(names),
+    )
+    index = UserLabelIndex(
+        signature=signature,
+        labels=list(labels),
+        matrix=normalize_rows(vectors),
+    )
+    _indexes[user_id] = index
+    _indexes.move_to_end(user_id)
+    while len(_indexes) > LABEL_INDEX_MAX_USERS:
+        _indexes.popitem(last=False)
+    return index
+
+
+def shortlist_labels(
+    index: UserLabelIndex,
+    query_vector: NDArray[np.float32],
+    *,
+    limit: int,
+) -> list[schemas.document.DocumentLabel]:
+    """The ``limit`` labels closest to ``query_vector`` (cosine), best first."""
+    if limit <= 0 or not index.labels:
+        return []
+    scores = index.matrix @ query_vector
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [index.labels[int(i)] for i in order]
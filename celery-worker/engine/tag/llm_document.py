@@ -1,44 +1,26 @@
 import json
-import inspect
 
 import crud
 import schemas
 from langfuse import propagate_attributes
 
-from langfuse.openai import AsyncOpenAI
+from common.embedding_utils import extract_single_embedding_vector
+from common.llm_client_pool import acquire_llm_client
 
-from common.logger import exception_logger
+from common.logger import exception_logger, info_logger, log_event
 from prompts.document_auto_tag import document_auto_tag_prompt
 from common.markdown_helpers import get_markdown_content_by_document_id
+from data.milvus.search import get_document_chunk_embeddings
 from data.sql.base import async_session_context
+from engine.embedding.factory import get_embedding_engine
+from engine.tag.label_index import document_query_vector, get_user_label_index, shortlist_labels
 from proxy.ai_model_proxy import AIModelProxy
 
-
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to close async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to close async llm client: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except RuntimeError as e:
-            if "Event loop is closed" not in str(e):
-                exception_logger.warning(f"Failed to aclose async llm client: {e}")
-        except Exception as e:
-            exception_logger.warning(f"Failed to aclose async llm client: {e}")
+# 交给 LLM 裁决的候选标签数量上限；标签总数不超过该值时直接全部交给 LLM
+TAG_CANDIDATE_LIMIT = 20
+# 没有摘要时，用标题 + 描述 + 正文开头这么多字符作为文档摘要
+TAG_DOCUMENT_DIGEST_CHARS = 4000
+TAG_CHUNK_VECTOR_LIMIT = 64
 
 
 class LLMDocumentTagEngine:
@@ -57,6 +39,7 @@ class LLMDocumentTagEngine:
     ) -> list[schemas.document.DocumentLabel] | None:
         model_id: int | None = None
         tags: list[schemas.document.DocumentLabel] = []
+        summary: str | None = None
         async with async_session_context() as db:
             db_user = await crud.user.get_user_by_id_async(
                 db=db,
@@ -76,7 +59,16 @@ class LLMDocumentTagEngine:
             )
             if db_document is None:
                 raise Exception("The document you want to generate the tags is not found")
-            
+            title = db_document.title
+            description = db_document.description
+
+            db_summarize_task = await crud.task.get_document_summarize_task_by_document_id_async(
+                db=db,
+                document_id=document_id
+            )
+            if db_summarize_task is not None:
+                summary = db_summarize_task.summary
+
             db_tags = await crud.document.get_user_labels_by_user_id_async(
                 db=db,
                 user_id=self.user_id
@@ -85,29 +77,53 @@ class LLMDocumentTagEngine:
                 schemas.document.DocumentLabel(id=x.id, name=x.name)
                 for x in db_tags
             ]
+        if not tags:
+            return []
         if model_id is None:
             raise Exception('User does not have a default document reader model')
         model_configuration = (await AIModelProxy.create(
             user_id=self.user_id,
             model_id=model_id
         )).get_configuration()
-        document_content = await get_markdown_content_by_document_id(
+
+        document_summary = await self._build_document_summary(
+            document_id=document_id,
+            title=title,
+            description=description,
+            summary=summary,
+        )
+        candidates = tags
+        chunk_vector_count = 0
+        if len(tags) > TAG_CANDIDATE_LIMIT:
+            candidates, chunk_vector_count = await self._shortlist_candidates(
+                document_id=document_id,
+                document_summary=document_summary,
+                tags=tags,
+            )
+        log_event(
+            info_logger,
+            "document_tag_candidates",
             document_id=document_id,
             user_id=self.user_id,
+            labels=len(tags),
+            candidates=len(candidates),
+            chunk_vectors=chunk_vector_count,
+            summary_chars=len(document_summary),
         )
-        
+
         prompt = document_auto_tag_prompt(
-            document_content=document_content,
-            tags=tags
+            document_summary=document_summary,
+            tags=candidates
         )
         with propagate_attributes(
             user_id=str(self.user_id),
             tags=[f'model:{model_configuration.model_name}']
         ):
-            llm_client = AsyncOpenAI(
+            llm_lease = await acquire_llm_client(
                 base_url=model_configuration.base_url,
-                api_key=model_configuration.api_key
+                api_key=model_configuration.api_key,
             )
+            llm_client = llm_lease.client
             try:
                 response = await llm_client.chat.completions.create(
                     model=model_configuration.model_name,
@@ -121,17 +137,76 @@ class LLMDocumentTagEngine:
                 )
                 if len(response.choices) > 0 and response.choices[0].message is not None and response.choices[0].message.content is not None:
                     res = json.loads(response.choices[0].message.content)
-                    res = [
-                        schemas.document.DocumentLabel(
-                            id=x['id'],
-                            name=x['name']
-                        )
-                        for x in res.get('tags')
-                    ]
-                    return res
+                    # 只接受候选集中的标签，模型偶尔会编造或改写 id
+                    candidates_by_id = {candidate.id: candidate for candidate in candidates}
+                    selected: list[schemas.document.DocumentLabel] = []
+                    for x in res.get('tags') or []:
+                        try:
+                            candidate = candidates_by_id.get(int(x['id']))
+                        except (KeyError, TypeError, ValueError):
+                            candidate = None
+                        if candidate is not None and candidate not in selected:
+                            selected.append(candidate)
+                    return selected
                 return None
             finally:
-                await _safe_close_async_client(llm_client)
+                await llm_lease.release()
+
+    async def _build_document_summary(
+        self,
+        *,
+        document_id: int,
+        title: str | None,
+        description: str | None,
+        summary: str | None,
+    ) -> str:
+        if summary:
+            return "\n\n".join(part for part in (title, summary) if part)
+        document_content = await get_markdown_content_by_document_id(
+            document_id=document_id,
+            user_id=self.user_id,
+        )
+        return "\n\n".join(
+            part for part in (
+                title,
+                description,
+                (document_content or "")[:TAG_DOCUMENT_DIGEST_CHARS],
+            ) if part
+        )
+
+    async def _shortlist_candidates(
+        self,
+        *,
+        document_id: int,
+        document_summary: str,
+        tags: list[schemas.document.DocumentLabel],
+    ) -> tuple[list[schemas.document.DocumentLabel], int]:
+        """Nearest labels by embedding; falls back to every label when the
+        embedding stage fails, so tagging keeps working without vectors."""
+        try:
+            index = await get_user_label_index(self.user_id, tags)
+            digest_vector = extract_single_embedding_vector(
+                await get_embedding_engine().embed([document_summary])
+            )
+            try:
+                chunk_vectors = await get_document_chunk_embeddings(
+                    document_id=document_id,
+                    limit=TAG_CHUNK_VECTOR_LIMIT,
+                )
+            except Exception as e:
+                exception_logger.warning(f"Failed to load chunk vectors for tagging document {document_id}: {e}")
+                chunk_vectors = []
+            return (
+                shortlist_labels(
+                    index,
+                    document_query_vector(digest_vector, chunk_vectors),
+                    limit=TAG_CANDIDATE_LIMIT,
+                ),
+                len(chunk_vectors),
+            )
+        except Exception as e:
+            exception_logger.warning(f"Label shortlist failed for document {document_id}, using all labels: {e}")
+            return tags, 0
 
 if __name__ == '__main__':
     async def main():
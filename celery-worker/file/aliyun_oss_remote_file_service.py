@@ -11,11 +11,16 @@ from botocore.config import Config
 
 from common.logger import exception_logger
 from enums.file import RemoteFileService
+from file.s3_transfer import S3CopyMixin
 from protocol.remote_file_service import RemoteFileServiceProtocol
 from datetime import timedelta
 
 
-class AliyunOSSRemoteFileService(RemoteFileServiceProtocol):
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
+class AliyunOSSRemoteFileService(S3CopyMixin, RemoteFileServiceProtocol):
 
     def __init__(self):
         super().__init__(
@@ -120,7 +125,8 @@ class AliyunOSSRemoteFileService(RemoteFileServiceProtocol):
 
                 config = Config(
                     s3={"addressing_style": "virtual"},
-                    signature_version='s3'
+                    signature_version='s3',
+                    max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS
                 )
 
                 s3 = boto3.client(
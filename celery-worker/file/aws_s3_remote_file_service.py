@@ -8,10 +8,15 @@ from datetime import datetime, timedelta, timezone
 
 from common.logger import exception_logger
 from enums.file import RemoteFileService
+from file.s3_transfer import S3CopyMixin
 from protocol.remote_file_service import RemoteFileServiceProtocol
 
 
-class AWSS3RemoteFileService(RemoteFileServiceProtocol):
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
+class AWSS3RemoteFileService(S3CopyMixin, RemoteFileServiceProtocol):
 
     def __init__(self):
         super().__init__(
@@ -122,6 +127,7 @@ class AWSS3RemoteFileService(RemoteFileServiceProtocol):
                         retries={"max_attempts": 5, "mode": "standard"},
                         connect_timeout=5,
                         read_timeout=60,
+                        max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS,
                     )
                 )
                 self.s3_client = s3
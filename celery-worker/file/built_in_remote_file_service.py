@@ -17,6 +17,7 @@ from common.logger import exception_logger, info_logger
 from config.file_system import FILE_SYSTEM_PASSWORD, FILE_SYSTEM_SERVER_PUBLIC_URL, FILE_SYSTEM_USER_NAME
 from data.sql.base import async_session_context
 from enums.file import RemoteFileService
+from file.s3_transfer import S3CopyMixin
 from protocol.remote_file_service import RemoteFileServiceProtocol
 
 FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
@@ -25,7 +26,7 @@ FILE_SYSTEM_TRANSFER_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
 FILE_SYSTEM_TRANSFER_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
 
 
-class BuiltInRemoteFileService(RemoteFileServiceProtocol):
+class BuiltInRemoteFileService(S3CopyMixin, RemoteFileServiceProtocol):
 
     def __init__(self):
         super().__init__(
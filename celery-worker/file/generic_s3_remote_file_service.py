@@ -8,11 +8,16 @@ from datetime import datetime, timedelta, timezone
 
 from common.logger import exception_logger, info_logger
 from enums.file import RemoteFileService
+from file.s3_transfer import S3CopyMixin
 from protocol.remote_file_service import RemoteFileServiceProtocol
 from botocore.exceptions import ClientError
 
 
-class GenericS3RemoteFileService(RemoteFileServiceProtocol):
+# Clients are cached and shared by concurrent tasks (see FileSystemProxy).
+FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS = 32
+
+
+class GenericS3RemoteFileService(S3CopyMixin, RemoteFileServiceProtocol):
 
     def __init__(self):
         super().__init__(
@@ -100,6 +105,7 @@ class GenericS3RemoteFileService(RemoteFileServiceProtocol):
                         retries={"max_attempts": 5, "mode": "standard"},
                         connect_timeout=5,
                         read_timeout=30,
+                        max_pool_connections=FILE_SYSTEM_HTTP_MAX_POOL_CONNECTIONS,
                         s3={
                             'addressing_style': 'virtual'
                         },
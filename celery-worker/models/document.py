@@ -53,6 +53,18 @@ class Document(Base):
     creator: Mapped["User"] = relationship("User", backref="created_documents")
 
 
+class PublishDocument(Base):
+    __tablename__ = "publish_document"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    document_id: Mapped[int] = mapped_column(ForeignKey("document.id"), index=True, nullable=False)
+    uuid: Mapped[str] = mapped_column(String(32), index=True, nullable=False)
+    access_key_encrypted: Mapped[str | None] = mapped_column(String(128), comment='AES-GCM encrypted share access key; NULL means the link is fully public')
+    create_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    update_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    delete_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
 
 class DocumentLabel(Base):
     __tablename__ = "document_document_label"
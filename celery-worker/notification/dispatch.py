@@ -1,15 +1,22 @@
 import asyncio
+import json
 import traceback
 from typing import TypedDict
 
 import crud
+from common.encrypt import decrypt_notification_target_config
 from common.logger import exception_logger
+from protocol.notification_tool import NotificationDelivery
 from proxy.notification_proxy import NotificationProxy
 from data.sql.base import async_session_context
 from workflow.timing import set_stage_metrics, timed_stage
 
 WORKFLOW_NAME = "notification_event"
 NOTIFICATION_DISPATCH_CONCURRENCY = 5
+# 批量分发：同时渲染的消息数 / 同时发送的通知源分组数 / 每个分组内的发送并发
+NOTIFICATION_BULK_RENDER_CONCURRENCY = 5
+NOTIFICATION_BULK_SOURCE_CONCURRENCY = 5
+NOTIFICATION_BULK_DISPATCH_CONCURRENCY = 10
 
 
 class NotificationDispatchPayload(TypedDict, total=False):
@@ -19,6 +26,11 @@ class NotificationDispatchPayload(TypedDict, total=False):
     template_id: int
 
 
+class NotificationRecipient(TypedDict):
+    user_id: int
+    params: dict | None
+
+
 async def _dispatch_notification(
     *,
     user_id: int,
@@ -156,3 +168,239 @@ async def run_notification_event_workflow(
                     for payload in payloads
                 ]
             )
+
+
+async def _render_bulk_message(
+    *,
+    template_id: int,
+    template_uuid: str,
+    params: dict | None,
+    semaphore: asyncio.Semaphore,
+):
+    async with semaphore:
+        try:
+            notification_template = NotificationProxy.get_notification_template(template_uuid)
+            message = await notification_template.generate(params=params)
+            if message is None:
+                raise Exception(f'Failed to generate the message using template {template_id}')
+            return message
+        except Exception as render_error:
+            return render_error
+
+
+async def _send_bulk_source_group(
+    *,
+    notification_tool,
+    deliveries: list[NotificationDelivery],
+    semaphore: asyncio.Semaphore,
+) -> list[Exception | None]:
+    async with semaphore:
+        try:
+            return await notification_tool.send_notification_batch(
+                deliveries,
+                concurrency=NOTIFICATION_BULK_DISPATCH_CONCURRENCY,
+            )
+        except Exception as send_error:
+            return [send_error] * len(deliveries)
+
+
+async def run_bulk_notification_event_workflow(
+    *,
+    trigger_event_uuid: str,
+    recipients: list[NotificationRecipient],
+) -> None:
+    """Fan one trigger event out to many users.
+
+    Tasks, sources, targets and templates for every recipient are loaded with
+    a handful of set-based queries; a message is rendered once per (template,
+    ``shared_render_key``) and resolved once per channel; deliveries are then
+    grouped by notification source so each provider can reuse one connection
+    (``send_notification_batch``) and records are written in one commit.
+    """
+    with timed_stage(
+        workflow_name=WORKFLOW_NAME,
+        node_name="run_bulk_notification_event_workflow",
+        stage_name="dispatch_bulk_event",
+        context={"trigger_event_uuid": trigger_event_uuid, "recipient_count": len(recipients)},
+    ):
+        params_by_user_id: dict[int, dict | None] = {
+            int(recipient["user_id"]): recipient.get("params")
+            for recipient in recipients
+        }
+        async with async_session_context() as db:
+            db_trigger_event = await crud.notification.get_trigger_event_by_uuid_async(
+                db=db,
+                uuid=trigger_event_uuid,
+            )
+            if db_trigger_event is None:
+                raise Exception("Trigger event not found")
+            task_rows = await crud.notification.get_enabled_template_notification_tasks_by_user_ids_and_trigger_event_async(
+                db=db,
+                user_ids=list(params_by_user_id),
+                trigger_event_uuid=db_trigger_event.uuid,
+            )
+            db_sources = await crud.notification.get_notification_sources_by_ids_async(
+                db=db,
+                notification_source_ids=list({task.notification_source_id for task, _ in task_rows}),
+            )
+            db_targets = await crud.notification.get_notification_targets_by_ids_async(
+                db=db,
+                notification_target_ids=list({task.notification_target_id for task, _ in task_rows}),
+            )
+            db_templates = await crud.notification.get_notification_templates_by_ids_async(
+                db=db,
+                notification_template_ids=list({template_id for _, template_id in task_rows}),
+            )
+        sources_by_id = {db_source.id: db_source for db_source in db_sources}
+        targets_by_id = {db_target.id: db_target for db_target in db_targets}
+        template_uuids_by_id = {db_template.id: db_template.uuid for db_template in db_templates}
+
+        # 1. 每个 (模板, 共享渲染 key) 只渲染一次；不支持共享的模板按接收者渲染
+        message_key_by_task_id: dict[int, tuple] = {}
+        render_jobs: dict[tuple, tuple[int, str, dict | None]] = {}
+        for db_task, template_id in task_rows:
+            template_uuid = template_uuids_by_id.get(template_id)
+            if template_uuid is None:
+                continue
+            params = params_by_user_id.get(db_task.creator_id)
+            try:
+                shared_key = NotificationProxy.get_notification_template(template_uuid).shared_render_key(params)
+            except Exception:
+                shared_key = None
+            message_key = (
+                (template_id, shared_key)
+                if shared_key is not None
+                else (template_id, "user", db_task.creator_id)
+            )
+            message_key_by_task_id[db_task.id] = message_key
+            render_jobs.setdefault(message_key, (template_id, template_uuid, params))
+
+        render_semaphore = asyncio.Semaphore(NOTIFICATION_BULK_RENDER_CONCURRENCY)
+        message_keys = list(render_jobs)
+        rendered = await asyncio.gather(
+            *[
+                _render_bulk_message(
+                    template_id=render_jobs[message_key][0],
+                    template_uuid=render_jobs[message_key][1],
+                    params=render_jobs[message_key][2],
+                    semaphore=render_semaphore,
+                )
+                for message_key in message_keys
+            ]
+        )
+        messages_by_key = dict(zip(message_keys, rendered))
+
+        # 2. 按通知源分组，每条投递携带各自的目标配置
+        tools_by_source_id: dict[int, object] = {}
+        groups: dict[int, list[tuple]] = {}
+        resolved_by_key: dict[tuple, object] = {}
+        for db_task, _ in task_rows:
+            message_key = message_key_by_task_id.get(db_task.id)
+            db_source = sources_by_id.get(db_task.notification_source_id)
+            db_target = targets_by_id.get(db_task.notification_target_id)
+            try:
+                if message_key is None:
+                    raise Exception("Notification template not found")
+                if db_source is None:
+                    raise Exception("Notification source not found")
+                if db_target is None:
+                    raise Exception("Notification target not found")
+                message = messages_by_key[message_key]
+                if isinstance(message, Exception):
+                    raise message
+                notification_tool = tools_by_source_id.get(db_source.id)
+                if notification_tool is None:
+                    notification_tool = NotificationProxy.build_notification_tool(
+                        notification_source=db_source,
+                    )
+                    tools_by_source_id[db_source.id] = notification_tool
+                resolved_key = (message_key, notification_tool.channel_key)
+                resolved_message = resolved_by_key.get(resolved_key)
+                if resolved_message is None:
+                    resolved_message = NotificationProxy.resolve_message_for_channel(
+                        message=message,
+                        channel_key=notification_tool.channel_key,
+                    )
+                    resolved_by_key[resolved_key] = resolved_message
+                if resolved_message.title is None:
+                    raise Exception("Notification title is empty after resolution")
+                delivery = NotificationDelivery(
+                    target_config=(
+                        json.loads(decrypt_notification_target_config(db_target.config_json))
+                        if db_target.config_json is not None
+                        else None
+                    ),
+                    title=resolved_message.title,
+                    content=resolved_message.content,
+                    content_type=resolved_message.content_type,
+                    plain_content=resolved_message.plain_content,
+                    cover=resolved_message.cover,
+                    link=resolved_message.link,
+                )
+            except Exception as prepare_error:
+                exception_logger.error(
+                    f"Failed to dispatch notification: user_id={db_task.creator_id}, "
+                    f"trigger_event_uuid={trigger_event_uuid}, source_id={db_task.notification_source_id}, "
+                    f"target_id={db_task.notification_target_id}, task_id={db_task.id}, error={prepare_error}"
+                )
+                continue
+            groups.setdefault(db_source.id, []).append((db_task, delivery))
+
+        # 3. 每个通知源一批发送
+        source_semaphore = asyncio.Semaphore(NOTIFICATION_BULK_SOURCE_CONCURRENCY)
+        source_ids = list(groups)
+        results = await asyncio.gather(
+            *[
+                _send_bulk_source_group(
+                    notification_tool=tools_by_source_id[source_id],
+                    deliveries=[delivery for _, delivery in groups[source_id]],
+                    semaphore=source_semaphore,
+                )
+                for source_id in source_ids
+            ]
+        )
+
+        records: list[dict] = []
+        failed_count = 0
+        for source_id, errors in zip(source_ids, results):
+            for (db_task, delivery), send_error in zip(groups[source_id], errors):
+                if send_error is not None:
+                    failed_count += 1
+                    exception_logger.error(
+                        f"Failed to dispatch notification: user_id={db_task.creator_id}, "
+                        f"trigger_event_uuid={trigger_event_uuid}, source_id={source_id}, "
+                        f"target_id={db_task.notification_target_id}, task_id={db_task.id}, error={send_error}"
+                    )
+                    continue
+                records.append(
+                    {
+                        "task_id": db_task.id,
+                        "title": delivery.title,
+                        "content": delivery.content,
+                        "cover": delivery.cover,
+                        "link": delivery.link,
+                    }
+                )
+
+        if records:
+            try:
+                async with async_session_context() as db:
+                    await crud.notification.create_notification_records_async(
+                        db=db,
+                        records=records,
+                    )
+                    await db.commit()
+            except Exception as record_error:
+                exception_logger.error(
+                    f"Failed to write notification records: trigger_event_uuid={trigger_event_uuid}, "
+                    f"count={len(records)}, error={record_error}"
+                )
+
+        set_stage_metrics(
+            notification_recipient_count=len(params_by_user_id),
+            notification_payload_count=len(task_rows),
+            notification_render_count=len(render_jobs),
+            notification_source_group_count=len(groups),
+            notification_sent_count=len(records),
+            notification_failed_count=failed_count,
+        )
@@ -18,6 +18,9 @@ from data.sql.base import async_session_context
 from enums.notification import NotificationTriggerEventUUID
 from enums.section import UserSectionRole
 
+# 专栏通知按批投递：每个 celery 任务最多携带的接收者数
+NOTIFICATION_BULK_RECIPIENTS_PER_TASK = 500
+
 
 def _emit_user_notification_event(
     *,
@@ -65,9 +68,12 @@ async def emit_document_process_completed(document_id: int) -> None:
 async def emit_section_process_completed(section_id: int) -> None:
     """Notify section participants (creator/members/subscribers) that the
     section's full processing pipeline has finished (core processing plus any
-    settled auto follow-up such as podcast generation)."""
+    settled auto follow-up such as podcast generation).
+
+    Large sections can have thousands of subscribers, so recipients are sent
+    in chunks to the bulk dispatcher instead of one task per user."""
     async with async_session_context() as db:
-        db_users = await crud.section.get_users_for_section_by_section_id_async(
+        user_roles = await crud.section.get_user_roles_for_section_by_section_id_async(
             db=db,
             section_id=section_id,
             filter_roles=[
@@ -77,10 +83,29 @@ async def emit_section_process_completed(section_id: int) -> None:
             ],
         )
 
-    for db_user in db_users:
-        _emit_user_notification_event(
-            user_id=db_user.id,
-            trigger_event_uuid=NotificationTriggerEventUUID.SECTION_PROCESS_COMPLETED.value,
-            params={"section_id": section_id, "receiver_id": db_user.id},
-            log_context=f"section_process_completed section_id={section_id}, user_id={db_user.id}",
-        )
+    recipients = [
+        {
+            "user_id": user_id,
+            "params": {
+                "section_id": section_id,
+                "receiver_id": user_id,
+                "receiver_role": role,
+            },
+        }
+        for user_id, role in user_roles
+    ]
+    for start in range(0, len(recipients), NOTIFICATION_BULK_RECIPIENTS_PER_TASK):
+        chunk = recipients[start:start + NOTIFICATION_BULK_RECIPIENTS_PER_TASK]
+        try:
+            current_app.send_task(
+                "common.celery.app.start_trigger_bulk_notification_event",
+                kwargs={
+                    "trigger_event_uuid": NotificationTriggerEventUUID.SECTION_PROCESS_COMPLETED.value,
+                    "recipients": chunk,
+                },
+            )
+        except Exception as e:
+            exception_logger.error(
+                f"Failed to dispatch notification event: section_process_completed "
+                f"section_id={section_id}, recipients={len(chunk)}, error={e}"
+            )
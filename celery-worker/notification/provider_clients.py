@@ -0,0 +1,124 @@
+"""Long-lived HTTP clients and cached credentials for notification providers.
+
+Every send used to open its own ``httpx.AsyncClient`` — a TLS handshake, plus
+HTTP/2 setup for APNs, per notification — and signed a fresh APNs provider
+JWT each time. Clients here are kept per provider and per event loop (httpx
+connection pools are bound to the loop that created them), so consecutive
+sends reuse warm connections and concurrent APNs pushes multiplex as HTTP/2
+streams over one connection. Callers must not close the returned clients.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+
+import httpx
+import jwt
+
+from common.logger import exception_logger
+
+APPLE_PUBLIC_KEYS_URL = "https://appleid.apple.com/auth/keys"
+APPLE_PUBLIC_KEYS_TTL_SECONDS = 3600
+# Apple rejects provider tokens older than an hour and throttles tokens that
+# are regenerated more often than every 20 minutes.
+APNS_PROVIDER_TOKEN_REFRESH_SECONDS = 50 * 60
+
+_WEBHOOK_CLIENT_OPTIONS = {
+    "timeout": 10,
+    "limits": httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+}
+_PROVIDER_CLIENT_OPTIONS = {
+    # APNs wants one long-lived HTTP/2 connection with many streams rather
+    # than many connections.
+    "apns": {
+        "http2": True,
+        "timeout": 10,
+        "limits": httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=600),
+    },
+}
+
+_lock = threading.Lock()
+# loop_id -> (loop, provider -> client); loops are keyed by id() and checked by
+# identity because a new loop can reuse a dead loop's id.
+_clients_by_loop: dict[int, tuple[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]] = {}
+_apns_provider_tokens: dict[tuple[str, str, str], tuple[float, str]] = {}
+_apple_public_keys: tuple[float, list[dict]] | None = None
+
+
+def get_notification_http_client(provider: str) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _clients_by_loop.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            entry = (loop, {})
+            _clients_by_loop[id(loop)] = entry
+        client = entry[1].get(provider)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_PROVIDER_CLIENT_OPTIONS.get(provider, _WEBHOOK_CLIENT_OPTIONS))
+            entry[1][provider] = client
+        return client
+
+
+async def close_notification_http_clients_for_current_loop() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _lock:
+        entry = _clients_by_loop.pop(id(loop), None)
+    if entry is None or entry[0] is not loop:
+        return
+    for provider, client in entry[1].items():
+        try:
+            await client.aclose()
+        except Exception as e:
+            exception_logger.warning(f"Failed to close {provider} notification client: {e}")
+
+
+def get_apns_provider_token(
+    *,
+    team_id: str,
+    key_id: str,
+    private_key: bytes,
+) -> str:
+    cache_key = (team_id, key_id, hashlib.sha256(private_key).hexdigest())
+    now = time.time()
+    with _lock:
+        cached = _apns_provider_tokens.get(cache_key)
+        if cached is not None and now - cached[0] < APNS_PROVIDER_TOKEN_REFRESH_SECONDS:
+            return cached[1]
+    token = jwt.encode(
+        payload={
+            "iss": team_id,
+            "iat": int(now),
+            "exp": int(now) + 3600  # 设置过期时间为1小时以内
+        },
+        algorithm="ES256",
+        headers={
+            "alg": "ES256",
+            "kid": key_id
+        },
+        key=private_key
+    )
+    with _lock:
+        _apns_provider_tokens[cache_key] = (now, token)
+    return token
+
+
+async def get_apple_public_keys(*, force_refresh: bool = False) -> list[dict]:
+    """Apple's Sign in with Apple JWKS, cached for an hour. Pass
+    ``force_refresh`` when a token names a ``kid`` the cached set lacks (Apple
+    rotated its keys)."""
+    global _apple_public_keys
+    cached = _apple_public_keys
+    if (
+        not force_refresh
+        and cached is not None
+        and time.monotonic() - cached[0] < APPLE_PUBLIC_KEYS_TTL_SECONDS
+    ):
+        return cached[1]
+    response = await get_notification_http_client("apple_id").get(APPLE_PUBLIC_KEYS_URL, timeout=5)
+    response.raise_for_status()
+    keys = response.json()["keys"]
+    _apple_public_keys = (time.monotonic(), keys)
+    return keys
@@ -25,6 +25,15 @@ class SectionProcessCompletedNotificationTemplate(NotificationTemplate):
             description_zh="这是一个专栏更新通知模板"
         )
 
+    def shared_render_key(
+        self,
+        params: dict | None
+    ) -> str | None:
+        # 消息内容只取决于专栏和接收者角色，批量分发时同一角色只渲染一次
+        if params is None or params.get('receiver_role') is None:
+            return None
+        return f"section:{params.get('section_id')}:role:{params.get('receiver_role')}"
+
     async def generate(
         self,
         params: dict | None
@@ -45,18 +54,22 @@ class SectionProcessCompletedNotificationTemplate(NotificationTemplate):
             )
             if not db_section:
                 raise Exception("section not found")
-            db_user_section = await crud.section.get_section_user_by_section_id_and_user_id_async(
-                db=db,
-                section_id=section_id,
-                user_id=receiver_id,
-            )
-            if not db_user_section:
-                raise Exception("user not in section")
-
             section_title = db_section.title
             section_cover = db_section.cover
             section_creator_id = db_section.creator_id
-            section_role = db_user_section.role
+            # 批量分发时调用方已从专栏成员列表中带上角色，无需再逐个查询
+            receiver_role = params.get('receiver_role')
+            if receiver_role is not None:
+                section_role = UserSectionRole(int(receiver_role))
+            else:
+                db_user_section = await crud.section.get_section_user_by_section_id_and_user_id_async(
+                    db=db,
+                    section_id=section_id,
+                    user_id=receiver_id,
+                )
+                if not db_user_section:
+                    raise Exception("user not in section")
+                section_role = db_user_section.role
 
         cover = None
         if section_cover is not None:
@@ -1,6 +1,5 @@
 import json
 import os
-import time
 import uuid
 
 import httpx
@@ -11,10 +10,13 @@ from urllib.parse import parse_qs, urljoin, urlparse
 
 from common.logger import exception_logger
 from config.base import WEB_BASE_URL
+from notification.provider_clients import (
+    get_apns_provider_token,
+    get_apple_public_keys,
+    get_notification_http_client,
+)
 from protocol.notification_tool import NotificationToolProtocol
 
-APPLE_PUBLIC_KEYS_URL = "https://appleid.apple.com/auth/keys"
-
 
 def _normalize_base_url(raw: str | None) -> str | None:
     if raw is None:
@@ -229,20 +231,12 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
         apns_topic: str
     ):
         """
-        动态生成 APNs 请求所需的 HTTP Headers，包括最新的 JWT Token。
+        动态生成 APNs 请求所需的 HTTP Headers，JWT Token 在有效期内复用。
         """
-        token = jwt.encode(
-            payload={
-                "iss": team_id,
-                "iat": int(time.time()),
-                "exp": int(time.time()) + 3600  # 设置过期时间为1小时以内
-            },
-            algorithm="ES256",
-            headers={
-                "alg": "ES256",
-                "kid": key_id
-            },
-            key=private_key
+        token = get_apns_provider_token(
+            team_id=team_id,
+            key_id=key_id,
+            private_key=private_key if isinstance(private_key, bytes) else private_key.encode(),
         )
         return {
             "authorization": "bearer " + token,
@@ -250,16 +244,15 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
             "apns-id": str(uuid.uuid4())
         }
 
-    def _fetch_apple_public_keys(
-        self
+    async def _fetch_apple_public_keys(
+        self,
+        force_refresh: bool = False
     ):
         """
-        从 Apple 的公开 URL 获取公钥。
+        从 Apple 的公开 URL 获取公钥（进程内缓存）。
         """
         try:
-            response = httpx.get(APPLE_PUBLIC_KEYS_URL, timeout=5)
-            response.raise_for_status()
-            return response.json()["keys"]
+            return await get_apple_public_keys(force_refresh=force_refresh)
         except httpx.HTTPError as e:
             exception_logger.error(f"HTTP error occurred: {e}")
             raise Exception(f"Failed to fetch Apple public keys: {e}") from e
@@ -308,7 +301,7 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
             issuer="https://appleid.apple.com"
         )
 
-    def _decode_identity_token(
+    async def _decode_identity_token(
         self,
         identity_token: str
     ):
@@ -316,7 +309,7 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
         主逻辑：获取 Apple 公钥、解析 JWT 头部、验证 JWT。
         """
         # Step 1: 获取 Apple 公钥
-        keys = self._fetch_apple_public_keys()
+        keys = await self._fetch_apple_public_keys()
 
         # Step 2: 解码 JWT 头部以获取 kid
         try:
@@ -326,7 +319,9 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
             exception_logger.error(f"Failed to decode JWT header: {e}")
             raise Exception(f"Invalid ID token header: {e}") from e
 
-        # Step 3: 根据 kid 获取对应的公钥
+        # Step 3: 根据 kid 获取对应的公钥（找不到时说明 Apple 轮换了公钥，强制刷新一次缓存）
+        if not any(key.get("kid") == kid for key in keys):
+            keys = await self._fetch_apple_public_keys(force_refresh=True)
         public_key_data = self._get_public_key(kid, keys)
 
         # Step 4: 将 JWK 转换为 PEM 格式
@@ -404,11 +399,10 @@ class AppleSandboxNotificationTool(NotificationToolProtocol):
                 data.update(nav_params)
         if cover is not None:
             data.update({'sender_avatar': cover})
-        async with httpx.AsyncClient(http2=True, timeout=10) as client:
-            try:
-                res = await client.post(url=url, headers=headers, json=data)
-                res.raise_for_status()
-                return True
-            except Exception as e:
-                exception_logger.error("Error sending notification to APNs:", e)
-                return False
+        try:
+            res = await get_notification_http_client("apns").post(url=url, headers=headers, json=data)
+            res.raise_for_status()
+            return True
+        except Exception as e:
+            exception_logger.error(f"Error sending notification to APNs: {e}")
+            return False
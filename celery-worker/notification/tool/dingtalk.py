@@ -6,10 +6,9 @@ import time
 import urllib.parse
 from urllib.parse import urljoin
 
-import httpx
-
 from common.logger import exception_logger
 from config.base import WEB_BASE_URL
+from notification.provider_clients import get_notification_http_client
 from protocol.notification_tool import NotificationToolProtocol
 
 
@@ -111,8 +110,7 @@ class DingTalkNotificationTool(NotificationToolProtocol):
 
         try:
             headers = {"Content-Type": "application/json"}
-            async with httpx.AsyncClient(timeout=10) as client:
-                res = await client.post(webhook_url, json=payload, headers=headers)
+            res = await get_notification_http_client("dingtalk").post(webhook_url, json=payload, headers=headers)
 
             # 先检查 HTTP 状态码
             if res.status_code != 200:
@@ -13,7 +13,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from common.logger import exception_logger
 from config.base import WEB_BASE_URL
-from protocol.notification_tool import NotificationToolProtocol
+from protocol.notification_tool import NotificationDelivery, NotificationToolProtocol
 
 
 class EmailNotificationTool(NotificationToolProtocol):
@@ -23,6 +23,8 @@ class EmailNotificationTool(NotificationToolProtocol):
 
     # 模板目录（相对项目根或配置路径）
     TEMPLATE_PATH = Path(__file__).parent / "email_templates"
+    # 单个 SMTP 连接最多连续投递的邮件数，很多服务商会限制单会话的发信量
+    SMTP_MAX_MESSAGES_PER_CONNECTION = 100
 
     def __init__(self):
         super().__init__(
@@ -59,19 +61,10 @@ class EmailNotificationTool(NotificationToolProtocol):
 
         return normalized_link
 
-    async def send_notification(
-        self,
-        title: str,
-        content: str | None = None,
-        content_type: str | None = None,
-        plain_content: str | None = None,
-        cover: str | None = None,
-        link: str | None = None
-    ):
+    def _get_smtp_settings(self) -> tuple[str, int, str, str, str]:
         source_config = self.get_source_config()
-        target_config = self.get_target_config()
-        if source_config is None or target_config is None:
-            raise ValueError("The source or target config of the notification is not set")
+        if source_config is None:
+            raise ValueError("The source config of the notification is not set")
 
         smtp_host = source_config.get('host')
         smtp_port = source_config.get('port')
@@ -80,11 +73,21 @@ class EmailNotificationTool(NotificationToolProtocol):
         sender_name = source_config.get('sender_name', username)
         if not smtp_host or not smtp_port or not username or not password or not sender_name:
             raise Exception(f"[EmailNotify] SMTP config is not complete")
+        return smtp_host, smtp_port, username, password, sender_name
 
-        recipient = target_config.get('email')
-        if not recipient:
-            raise Exception(f"[EmailNotify] Email recipient not set: {recipient}")
-
+    def _build_message(
+        self,
+        *,
+        sender_name: str,
+        username: str,
+        recipient: str,
+        title: str,
+        content: str | None = None,
+        content_type: str | None = None,
+        plain_content: str | None = None,
+        cover: str | None = None,
+        link: str | None = None
+    ) -> str:
         normalized_title = (title or "").strip()
         normalized_link = self._resolve_notification_link(link)
         if content_type == "html":
@@ -140,13 +143,44 @@ class EmailNotificationTool(NotificationToolProtocol):
         alternative.attach(MIMEText(plain_body, "plain", "utf-8"))
         alternative.attach(MIMEText(html_body, "html", "utf-8"))
         msg.attach(alternative)
+        return msg.as_string()
+
+    async def send_notification(
+        self,
+        title: str,
+        content: str | None = None,
+        content_type: str | None = None,
+        plain_content: str | None = None,
+        cover: str | None = None,
+        link: str | None = None
+    ):
+        target_config = self.get_target_config()
+        if target_config is None:
+            raise ValueError("The source or target config of the notification is not set")
+        smtp_host, smtp_port, username, password, sender_name = self._get_smtp_settings()
+
+        recipient = target_config.get('email')
+        if not recipient:
+            raise Exception(f"[EmailNotify] Email recipient not set: {recipient}")
+
+        message = self._build_message(
+            sender_name=sender_name,
+            username=username,
+            recipient=recipient,
+            title=title,
+            content=content,
+            content_type=content_type,
+            plain_content=plain_content,
+            cover=cover,
+            link=link,
+        )
 
         try:
             def _send():
                 context = ssl.create_default_context()
                 with smtplib.SMTP_SSL(host=smtp_host, port=smtp_port, context=context, timeout=10) as server:
                     server.login(user=username, password=password)
-                    server.sendmail(from_addr=username, to_addrs=[recipient], msg=msg.as_string())
+                    server.sendmail(from_addr=username, to_addrs=[recipient], msg=message)
 
             return await asyncio.to_thread(_send)
 
@@ -156,3 +190,59 @@ class EmailNotificationTool(NotificationToolProtocol):
         except Exception as err:
             exception_logger.error(f"[EmailNotify] Unexpected error: {err}", exc_info=True)
             raise
+
+    async def send_notification_batch(
+        self,
+        deliveries: list[NotificationDelivery],
+        concurrency: int = 10
+    ) -> list[Exception | None]:
+        """批量发送：同一个 SMTP 源只建立一次 SSL 连接并登录一次，连续投递多封邮件。"""
+        smtp_host, smtp_port, username, password, sender_name = self._get_smtp_settings()
+        results: list[Exception | None] = [None] * len(deliveries)
+        prepared: list[tuple[int, str, str]] = []
+        for index, delivery in enumerate(deliveries):
+            recipient = (delivery.target_config or {}).get('email')
+            if not recipient:
+                results[index] = Exception(f"[EmailNotify] Email recipient not set: {recipient}")
+                continue
+            prepared.append((
+                index,
+                recipient,
+                self._build_message(
+                    sender_name=sender_name,
+                    username=username,
+                    recipient=recipient,
+                    title=delivery.title,
+                    content=delivery.content,
+                    content_type=delivery.content_type,
+                    plain_content=delivery.plain_content,
+                    cover=delivery.cover,
+                    link=delivery.link,
+                ),
+            ))
+
+        def _send_all():
+            context = ssl.create_default_context()
+            for start in range(0, len(prepared), self.SMTP_MAX_MESSAGES_PER_CONNECTION):
+                chunk = prepared[start:start + self.SMTP_MAX_MESSAGES_PER_CONNECTION]
+                next_pending = 0
+                try:
+                    with smtplib.SMTP_SSL(host=smtp_host, port=smtp_port, context=context, timeout=10) as server:
+                        server.login(user=username, password=password)
+                        for position, (index, recipient, message) in enumerate(chunk):
+                            try:
+                                server.sendmail(from_addr=username, to_addrs=[recipient], msg=message)
+                            except smtplib.SMTPServerDisconnected:
+                                raise
+                            except smtplib.SMTPException as smtp_err:
+                                results[index] = smtp_err
+                            next_pending = position + 1
+                except Exception as err:
+                    # 连接 / 登录失败或连接中断：本批次尚未投递的邮件全部记为失败
+                    exception_logger.error(f"[EmailNotify] SMTP batch error: {err}", exc_info=True)
+                    for index, _, _ in chunk[next_pending:]:
+                        if results[index] is None:
+                            results[index] = err
+
+        await asyncio.to_thread(_send_all)
+        return results
@@ -4,17 +4,35 @@ import hashlib
 import hmac
 import io
 import json
+import threading
 import time
 from typing import Any
 from urllib.parse import urljoin
 
-import httpx
 import lark_oapi as lark
 from lark_oapi.api.im.v1 import CreateImageRequest, CreateImageRequestBody, CreateImageResponse
 
 from common.logger import exception_logger
 from config.base import WEB_BASE_URL
-from protocol.notification_tool import NotificationToolProtocol
+from notification.provider_clients import get_notification_http_client
+from protocol.notification_tool import NotificationDelivery, NotificationToolProtocol
+
+_lark_clients: dict[tuple[str, str], lark.Client] = {}
+_lark_clients_lock = threading.Lock()
+
+
+def _get_lark_client(*, app_id: str, app_secret: str) -> lark.Client:
+    cache_key = (app_id, hashlib.sha256(app_secret.encode("utf-8")).hexdigest())
+    with _lark_clients_lock:
+        client = _lark_clients.get(cache_key)
+        if client is None:
+            client = lark.Client.builder() \
+                .app_id(app_id=app_id) \
+                .app_secret(app_secret=app_secret) \
+                .log_level(lark.LogLevel.DEBUG) \
+                .build()
+            _lark_clients[cache_key] = client
+        return client
 
 
 class FeishuNotificationTool(NotificationToolProtocol):
@@ -26,6 +44,8 @@ class FeishuNotificationTool(NotificationToolProtocol):
             tool_name_zh="飞书通知工具",
             channel_key="feishu",
         )
+        # cover url -> 飞书 image_key；浅拷贝出的工具实例共享这个字典，批量发送时同一封面只上传一次
+        self._cover_image_keys: dict[str, str | None] = {}
 
     def _resolve_notification_link(self, link: str | None) -> str | None:
         if link is None:
@@ -61,12 +81,8 @@ class FeishuNotificationTool(NotificationToolProtocol):
         if app_id is None or app_secret is None:
             raise ValueError("The app_id or app_secret of the notification is not set")
 
-        # 创建client
-        client = lark.Client.builder() \
-            .app_id(app_id=app_id) \
-            .app_secret(app_secret=app_secret) \
-            .log_level(lark.LogLevel.DEBUG) \
-            .build()
+        # 复用 client：lark client 内部缓存 tenant_access_token，每次新建都会重新换取 token
+        client = _get_lark_client(app_id=app_id, app_secret=app_secret)
 
         # 构造请求对象
         request: CreateImageRequest = CreateImageRequest.builder() \
@@ -102,6 +118,18 @@ class FeishuNotificationTool(NotificationToolProtocol):
 
         return response.data.image_key
 
+    async def _resolve_cover_image_key(
+        self,
+        cover: str
+    ) -> str | None:
+        if cover in self._cover_image_keys:
+            return self._cover_image_keys[cover]
+        cover_res = await get_notification_http_client("feishu").get(cover, follow_redirects=True)
+        cover_res.raise_for_status()
+        image_key = await asyncio.to_thread(self.upload_image, image=cover_res.content)
+        self._cover_image_keys[cover] = image_key
+        return image_key
+
     def gen_sign(
         self,
         timestamp: int,
@@ -150,10 +178,7 @@ class FeishuNotificationTool(NotificationToolProtocol):
         ]
 
         if cover:
-            async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-                cover_res = await client.get(cover)
-                cover_res.raise_for_status()
-            image_key = await asyncio.to_thread(self.upload_image, image=cover_res.content)
+            image_key = await self._resolve_cover_image_key(cover)
             if image_key is not None:
                 elements.insert(0, {
                     "tag": "img",
@@ -229,10 +254,22 @@ class FeishuNotificationTool(NotificationToolProtocol):
             })
         try:
             headers = {"Content-Type": "application/json"}
-            async with httpx.AsyncClient(timeout=10) as client:
-                res = await client.post(webhook_url, json=payload, headers=headers)
+            res = await get_notification_http_client("feishu").post(webhook_url, json=payload, headers=headers)
             if res.json().get('code') != 0:
                 exception_logger.error(f'Failed to send notification to Feishu: {res.json()}')
 
         except Exception as e:
             exception_logger.error(f"Failed to send notification to Feishu: {e}")
+
+    async def send_notification_batch(
+        self,
+        deliveries: list[NotificationDelivery],
+        concurrency: int = 10
+    ) -> list[Exception | None]:
+        # 先把本批次出现的封面各上传一次，之后每条 webhook 消息直接引用 image_key
+        for cover in dict.fromkeys(delivery.cover for delivery in deliveries if delivery.cover):
+            try:
+                await self._resolve_cover_image_key(cover)
+            except Exception as e:
+                exception_logger.error(f"Failed to upload Feishu cover image {cover}: {e}")
+        return await super().send_notification_batch(deliveries, concurrency=concurrency)
@@ -1,8 +1,10 @@
+import asyncio
+
 import telegram
 from urllib.parse import urljoin
 
 from config.base import WEB_BASE_URL
-from protocol.notification_tool import NotificationToolProtocol
+from protocol.notification_tool import NotificationDelivery, NotificationToolProtocol
 
 
 class TelegramNotificationTool(NotificationToolProtocol):
@@ -88,6 +90,27 @@ class TelegramNotificationTool(NotificationToolProtocol):
             raise Exception("The chat_id of the notification is not set")
         
         bot = telegram.Bot(token=bot_token)
+        await self._send_with_bot(
+            bot=bot,
+            chat_id=chat_id,
+            title=title,
+            content=content,
+            plain_content=plain_content,
+            cover=cover,
+            link=link,
+        )
+
+    async def _send_with_bot(
+        self,
+        *,
+        bot: telegram.Bot,
+        chat_id: str,
+        title: str,
+        content: str | None = None,
+        plain_content: str | None = None,
+        cover: str | None = None,
+        link: str | None = None
+    ):
         normalized_title = title
         normalized_content = (content if content is not None else plain_content) or ""
         normalized_link = self._resolve_notification_link(link)
@@ -119,3 +142,38 @@ class TelegramNotificationTool(NotificationToolProtocol):
         full_text = "\n\n".join(part for part in text_parts if part)
         for chunk in self._split_text_chunks(full_text, self.MAX_TEXT_LENGTH):
             await bot.send_message(chat_id=chat_id, text=chunk)
+
+    async def send_notification_batch(
+        self,
+        deliveries: list[NotificationDelivery],
+        concurrency: int = 10
+    ) -> list[Exception | None]:
+        """同一个 bot 的批量发送共用一个已初始化的 Bot（及其连接池），不再每条消息新建。"""
+        source_config = self.get_source_config()
+        bot_token = source_config.get("bot_token") if source_config else None
+        if not bot_token:
+            raise Exception("The bot_token of the notification is not set")
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _send(bot: telegram.Bot, delivery: NotificationDelivery) -> Exception | None:
+            chat_id = (delivery.target_config or {}).get("chat_id")
+            if not chat_id:
+                return Exception("The chat_id of the notification is not set")
+            async with semaphore:
+                try:
+                    await self._send_with_bot(
+                        bot=bot,
+                        chat_id=chat_id,
+                        title=delivery.title,
+                        content=delivery.content,
+                        plain_content=delivery.plain_content,
+                        cover=delivery.cover,
+                        link=delivery.link,
+                    )
+                    return None
+                except Exception as e:
+                    return e
+
+        async with telegram.Bot(token=bot_token) as bot:
+            return list(await asyncio.gather(*[_send(bot, delivery) for delivery in deliveries]))
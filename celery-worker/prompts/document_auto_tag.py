@@ -1,7 +1,7 @@
 from schemas.document import DocumentLabel
 
 def document_auto_tag_prompt(
-    document_content: str,
+    document_summary: str,
     tags: list[DocumentLabel]
 ):
     prompt = f"""
@@ -13,11 +13,11 @@ Your task is to select the most appropriate tags for the given document based ON
 INPUT
 ====================
 
-[Document Content]
-{document_content}
+[Document Summary]
+{document_summary}
 
 [Candidate Tag Set]
-Each tag contains an id and a name. You may ONLY choose from this list:
+The tags of the user closest to this document. Each tag contains an id and a name. You may ONLY choose from this list:
 {tags}
 
 ====================
@@ -26,4 +26,12 @@ class NotificationTemplate(Protocol):
     async def generate(
         self
     ) -> schemas.notification.Message:
-        raise NotImplementedError("Not implemented")
\ No newline at end of file
+        raise NotImplementedError("Not implemented")
+
+    def shared_render_key(
+        self,
+        params: dict | None
+    ) -> str | None:
+        """Recipients whose params map to the same key get the same message, so
+        bulk dispatch renders it once. ``None`` renders per recipient."""
+        return None
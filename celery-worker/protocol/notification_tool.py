@@ -1,6 +1,22 @@
+import asyncio
+import copy
 import json
+from dataclasses import dataclass
 from typing import Any
 
+
+@dataclass
+class NotificationDelivery:
+    """One message to one target, sent through a tool's source config."""
+    target_config: dict[str, Any] | None
+    title: str
+    content: str | None = None
+    content_type: str | None = None
+    plain_content: str | None = None
+    cover: str | None = None
+    link: str | None = None
+
+
 class NotificationToolProtocol():
     
     def __init__(
@@ -59,3 +75,33 @@ class NotificationToolProtocol():
         link: str | None = None
     ):
         raise NotImplementedError("Method not implemented")
+
+    async def send_notification_batch(
+        self,
+        deliveries: list[NotificationDelivery],
+        concurrency: int = 10
+    ) -> list[Exception | None]:
+        """Send every delivery through this tool's source config; returns one
+        entry per delivery (``None`` on success). Tools that can share a
+        connection or an upload across deliveries override this."""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _send(delivery: NotificationDelivery) -> Exception | None:
+            async with semaphore:
+                tool = copy.copy(self)
+                if delivery.target_config is not None:
+                    tool.set_target_config(delivery.target_config)
+                try:
+                    await tool.send_notification(
+                        title=delivery.title,
+                        content=delivery.content,
+                        content_type=delivery.content_type,
+                        plain_content=delivery.plain_content,
+                        cover=delivery.cover,
+                        link=delivery.link,
+                    )
+                    return None
+                except Exception as e:
+                    return e
+
+        return list(await asyncio.gather(*[_send(delivery) for delivery in deliveries]))
@@ -43,6 +43,38 @@ class RemoteFileServiceProtocol():
     ) -> str | bytes:
         raise NotImplementedError("Method not implemented")
     
+    async def get_file_content_range_by_file_path(
+        self,
+        file_path: str,
+        start: int,
+        end: int,
+    ) -> bytes:
+        """Bytes ``start``..``end`` (inclusive) of the file. Services without
+        ranged reads fall back to slicing the full content."""
+        content = await self.get_file_content_by_file_path(file_path=file_path)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return content[start:end + 1]
+
+    async def copy_file_to(
+        self,
+        file_path: str,
+        target: "RemoteFileServiceProtocol",
+        content_type: str | None = None,
+    ) -> tuple[int, str]:
+        """Copy ``file_path`` to the same path on ``target`` and return
+        ``(bytes copied, transfer mode)``. Services that can stream or copy
+        server-side override this; the default buffers the whole file."""
+        content = await self.get_file_content_by_file_path(file_path=file_path)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        await target.upload_raw_content_to_path(
+            file_path=file_path,
+            content=content,
+            content_type=content_type,
+        )
+        return len(content), "buffered"
+
     async def upload_file_to_path(
         self, 
         file_path: str, 
@@ -88,34 +88,48 @@ class NotificationProxy:
             if notification_target is None:
                 raise Exception("Notification target not found")
 
-            notification_tool = None
-
-            if notification_source.notification_source_provided.uuid == NotificationSourceProvided.EMAIL.meta.uuid:
-                notification_tool = EmailNotificationTool()
-            elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.APPLE.meta.uuid:
-                notification_tool = AppleNotificationTool()
-            elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.APPLE_SANDBOX.meta.uuid:
-                notification_tool = AppleSandboxNotificationTool()
-            elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.FEISHU.meta.uuid:
-                notification_tool = FeishuNotificationTool()
-            elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.DINGTALK.meta.uuid:
-                notification_tool = DingTalkNotificationTool()
-            elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.TELEGRAM.meta.uuid:
-                notification_tool = TelegramNotificationTool()
-            else:
-                raise Exception("Notification source not supported")
-            
-            if notification_source.config_json is not None:
-                notification_tool.set_source_config(
-                    json.loads(decrypt_notification_source_config(notification_source.config_json))
-                )
-
-            if notification_target.config_json is not None:
-                notification_tool.set_target_config(
-                    json.loads(decrypt_notification_target_config(notification_target.config_json))
-                )
-            
-            return notification_tool
+            return NotificationProxy.build_notification_tool(
+                notification_source=notification_source,
+                notification_target=notification_target,
+            )
+
+    @staticmethod
+    def build_notification_tool(
+        *,
+        notification_source,
+        notification_target=None,
+    ):
+        """Build a tool from already-loaded source (with
+        ``notification_source_provided``) and target rows. Without a target the
+        tool only carries the source config, for ``send_notification_batch``."""
+        notification_tool = None
+
+        if notification_source.notification_source_provided.uuid == NotificationSourceProvided.EMAIL.meta.uuid:
+            notification_tool = EmailNotificationTool()
+        elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.APPLE.meta.uuid:
+            notification_tool = AppleNotificationTool()
+        elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.APPLE_SANDBOX.meta.uuid:
+            notification_tool = AppleSandboxNotificationTool()
+        elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.FEISHU.meta.uuid:
+            notification_tool = FeishuNotificationTool()
+        elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.DINGTALK.meta.uuid:
+            notification_tool = DingTalkNotificationTool()
+        elif notification_source.notification_source_provided.uuid == NotificationSourceProvided.TELEGRAM.meta.uuid:
+            notification_tool = TelegramNotificationTool()
+        else:
+            raise Exception("Notification source not supported")
+
+        if notification_source.config_json is not None:
+            notification_tool.set_source_config(
+                json.loads(decrypt_notification_source_config(notification_source.config_json))
+            )
+
+        if notification_target is not None and notification_target.config_json is not None:
+            notification_tool.set_target_config(
+                json.loads(decrypt_notification_target_config(notification_target.config_json))
+            )
+
+        return notification_tool
 
     @staticmethod
     async def create_message_using_template(
@@ -133,6 +147,20 @@ class NotificationProxy:
                 raise Exception("Notification template not found")
             template_uuid = db_notification_template.uuid
 
+        notification_template = NotificationProxy.get_notification_template(template_uuid)
+
+        message = await notification_template.generate(
+            params=params
+        )
+        if message is None:
+            raise Exception(f'Failed to generate the message using template {template_id}')
+
+        return message
+
+    @staticmethod
+    def get_notification_template(
+        template_uuid: str | None
+    ):
         if template_uuid == NotificationTemplate.SECTION_COMMENTED.meta.uuid:
             notification_template = SectionCommentedNotificationTemplate()
         elif template_uuid == NotificationTemplate.DOCUMENT_COMMENTED.meta.uuid:
@@ -157,11 +185,4 @@ class NotificationProxy:
             notification_template = DocumentJoinRequestHandledNotificationTemplate()
         else:
             raise Exception('Unsupported notification template')
-
-        message = await notification_template.generate(
-            params=params
-        )
-        if message is None:
-            raise Exception(f'Failed to generate the message using template {template_id}')
-
-        return message
+        return notification_template
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from contextlib import aclosing
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, TypedDict
@@ -14,14 +15,17 @@ from common.ai import (
     summary_content,
 )
 from common.dependencies import check_deployed_by_official_in_fuc, plan_ability_checked_in_func
+from common.graph_community import bump_graph_version, mark_user_graph_dirty
+from common.embedding_batcher import EmbeddingBatchMetrics, stream_embedded_chunks
 from common.embedding_utils import extract_single_embedding_vector
 from common.jwt_utils import create_token
+from common.llm_client_pool import LLMClientLease, acquire_llm_client
 from common.logger import exception_logger
 from common.document_guard import ensure_document_active
+from common.public_search_cache import bump_public_search_version
 from data.common import (
-    close_extract_llm_client,
+    acquire_extract_llm_client,
     extract_entities_relations,
-    get_extract_llm_client,
     resolve_entities_with_semantic_dedupe,
     stream_chunk_document,
 )
@@ -31,6 +35,7 @@ from data.neo4j.insert import (
     annotate_node_degrees,
     create_communities_from_chunks,
     create_community_nodes_and_relationships_with_size,
+    refresh_document_graph_neighbourhood,
     upsert_chunk_entity_relations,
     upsert_chunks_neo4j,
     upsert_doc_chunk_relations,
@@ -39,6 +44,7 @@ from data.neo4j.insert import (
     upsert_relations_neo4j,
 )
 from data.neo4j.search import get_entities_by_text_and_type
+from config.neo4j import NEO4J_GRAPH_MAINTENANCE_MODE
 from data.sql.base import async_session_context
 from engine.embedding.factory import get_embedding_engine
 from enums.ability import Ability
@@ -72,6 +78,8 @@ CHUNK_PREPROCESS_CONCURRENCY = 6
 CHUNK_EXTRACT_CONCURRENCY = 6
 CHUNK_SUMMARY_CONCURRENCY = 4
 CHUNK_UPSERT_BATCH_SIZE = 24
+CHUNK_EMBED_BATCH_SIZE = 32
+CHUNK_EMBED_BATCH_MAX_WAIT_MS = 200
 SUMMARY_REDUCE_BATCH_SIZE = 10
 
 
@@ -183,10 +191,13 @@ async def _preprocess_chunk(
     summary_model_configuration: Any | None = None,
     summary_client: AsyncOpenAI | None = None,
 ) -> ChunkPreprocessResult:
-    embedding_start = time.perf_counter()
-    embedding_raw = await embedding_engine.embed([chunk_info.text])
-    embedding_elapsed_ms = (time.perf_counter() - embedding_start) * 1000
-    chunk_info.embedding = extract_single_embedding_vector(embedding_raw)
+    embedding_elapsed_ms = 0.0
+    if chunk_info.embedding is None:
+        # Normally filled by the batched embedding stage upstream.
+        embedding_start = time.perf_counter()
+        embedding_raw = await embedding_engine.embed([chunk_info.text])
+        embedding_elapsed_ms = (time.perf_counter() - embedding_start) * 1000
+        chunk_info.embedding = extract_single_embedding_vector(embedding_raw)
 
     async def _run_extract_step() -> tuple[list[EntityInfo], list[RelationInfo], float]:
         async with extract_semaphore:
@@ -406,20 +417,23 @@ async def _process_document_chunks(
     if document_id is None or user_id is None or model_id is None or llm_model is None:
         raise Exception("Document chunk workflow missing context")
 
-    llm_client = await get_extract_llm_client(
+    llm_lease = await acquire_extract_llm_client(
         user_id=user_id
     )
+    llm_client = llm_lease.client
     summary_model_configuration = None
+    summary_lease: LLMClientLease | None = None
     summary_client: AsyncOpenAI | None = None
     if auto_summary:
         summary_model_configuration = (await AIModelProxy.create(
             user_id=user_id,
             model_id=model_id,
         )).get_configuration()
-        summary_client = AsyncOpenAI(
-            api_key=summary_model_configuration.api_key,
+        summary_lease = await acquire_llm_client(
             base_url=summary_model_configuration.base_url,
+            api_key=summary_model_configuration.api_key,
         )
+        summary_client = summary_lease.client
     embedding_engine = get_embedding_engine()
     entities: list[EntityInfo] = []
     relations: list[RelationInfo] = []
@@ -449,6 +463,7 @@ async def _process_document_chunks(
     upsert_batches = 0
     upsert_milvus_elapsed_ms = 0.0
     upsert_neo4j_elapsed_ms = 0.0
+    embedding_batch_metrics = EmbeddingBatchMetrics()
 
     async def _consume_preprocessed_result(
         result: ChunkPreprocessResult,
@@ -550,6 +565,7 @@ async def _process_document_chunks(
                     CHUNK_SUMMARY_CONCURRENCY if auto_summary else 0
                 ),
                 "summary_reduce_batch_size": SUMMARY_REDUCE_BATCH_SIZE,
+                "embed_batch_size": CHUNK_EMBED_BATCH_SIZE,
             },
         ):
             async def _run_preprocess(
@@ -570,22 +586,30 @@ async def _process_document_chunks(
                         summary_client=summary_client,
                     )
 
-            async for chunk_info in stream_chunk_document(doc_id=document_id):
-                pending_tasks.add(asyncio.create_task(_run_preprocess(chunk_info)))
-                if len(pending_tasks) < CHUNK_PREPROCESS_CONCURRENCY:
-                    continue
-
-                done, pending_tasks = await asyncio.wait(
-                    pending_tasks,
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
-                for done_task in done:
-                    result = done_task.result()
-                    ready_results[result.chunk_info.idx] = result
+            embedded_chunks = stream_embedded_chunks(
+                stream_chunk_document(doc_id=document_id),
+                embedding_engine=embedding_engine,
+                max_batch_size=CHUNK_EMBED_BATCH_SIZE,
+                max_wait_ms=CHUNK_EMBED_BATCH_MAX_WAIT_MS,
+                metrics=embedding_batch_metrics,
+            )
+            async with aclosing(embedded_chunks):
+                async for chunk_info in embedded_chunks:
+                    pending_tasks.add(asyncio.create_task(_run_preprocess(chunk_info)))
+                    if len(pending_tasks) < CHUNK_PREPROCESS_CONCURRENCY:
+                        continue
+
+                    done, pending_tasks = await asyncio.wait(
+                        pending_tasks,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for done_task in done:
+                        result = done_task.result()
+                        ready_results[result.chunk_info.idx] = result
 
-                while next_chunk_idx in ready_results:
-                    await _consume_preprocessed_result(ready_results.pop(next_chunk_idx))
-                    next_chunk_idx += 1
+                    while next_chunk_idx in ready_results:
+                        await _consume_preprocessed_result(ready_results.pop(next_chunk_idx))
+                        next_chunk_idx += 1
 
             while pending_tasks:
                 done, pending_tasks = await asyncio.wait(
@@ -638,7 +662,11 @@ async def _process_document_chunks(
             chunks=processed_chunks,
             entities=extracted_entities_total,
             relations=extracted_relations_total,
-            embedding_elapsed_ms=preprocess_embedding_elapsed_ms,
+            embedding_elapsed_ms=(
+                preprocess_embedding_elapsed_ms + embedding_batch_metrics.elapsed_ms
+            ),
+            embedding_batches=embedding_batch_metrics.batches,
+            embedding_avg_batch_size=round(embedding_batch_metrics.avg_batch_size, 2),
             extract_elapsed_ms=preprocess_extract_elapsed_ms,
             chunk_summary_elapsed_ms=preprocess_summary_elapsed_ms,
             summary_reduce_batches=summary_reduce_batches,
@@ -665,9 +693,9 @@ async def _process_document_chunks(
             exception_logger.error(f"Failed to update chunk-related task status: {status_error}")
         raise
     finally:
-        await close_extract_llm_client(llm_client)
-        if summary_client is not None:
-            await close_extract_llm_client(summary_client)
+        await llm_lease.release()
+        if summary_lease is not None:
+            await summary_lease.release()
 
     with timed_stage(
         workflow_name=WORKFLOW_NAME,
@@ -709,6 +737,10 @@ async def _process_document_chunks(
                             db_document.title = final_summary_info.title
                             db_document.description = final_summary_info.description
                 await db.commit()
+                db_publish_document = await crud.document.get_publish_document_by_document_id_async(
+                    db=db,
+                    document_id=document_id,
+                )
         except Exception:
             try:
                 await _mark_chunk_related_tasks_failed(
@@ -718,6 +750,9 @@ async def _process_document_chunks(
             except Exception as status_error:
                 exception_logger.error(f"Failed to update chunk-related task status: {status_error}")
             raise
+    # 已公开的文档此时才能被公开检索命中，让公开检索缓存失效
+    if db_publish_document is not None:
+        await bump_public_search_version()
     # 5) 图谱构建
     deployed_by_official = check_deployed_by_official_in_fuc()
     access_token: str | None = None
@@ -803,7 +838,7 @@ async def _process_document_chunks(
             stage_name="graph_upsert_doc_chunk_relations",
             context={"document_id": document_id},
         ):
-            await upsert_doc_chunk_relations()
+            await upsert_doc_chunk_relations(doc_id=document_id)
         with timed_stage(
             workflow_name=WORKFLOW_NAME,
             node_name="process_document_chunks",
@@ -838,11 +873,23 @@ async def _process_document_chunks(
             workflow_name=WORKFLOW_NAME,
             node_name="process_document_chunks",
             stage_name="graph_build_communities",
-            context={"document_id": document_id},
+            context={
+                "document_id": document_id,
+                "maintenance_mode": NEO4J_GRAPH_MAINTENANCE_MODE,
+            },
         ):
-            await create_communities_from_chunks()
-            await create_community_nodes_and_relationships_with_size()
-            await annotate_node_degrees()
+            if NEO4J_GRAPH_MAINTENANCE_MODE == "full":
+                await create_communities_from_chunks()
+                await create_community_nodes_and_relationships_with_size()
+                await annotate_node_degrees()
+                # 全量 Louvain 会改动所有用户的社区，按全局版本失效缓存
+                await bump_graph_version()
+            else:
+                await refresh_document_graph_neighbourhood(doc_id=document_id)
+                await mark_user_graph_dirty(
+                    user_id=doc_info.creator_id,
+                    changed_entities=len(entities),
+                )
         with timed_stage(
             workflow_name=WORKFLOW_NAME,
             node_name="process_document_chunks",
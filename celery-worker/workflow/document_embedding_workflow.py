@@ -8,6 +8,7 @@ from langgraph.graph import StateGraph, END
 
 from common.logger import exception_logger
 from common.document_guard import ensure_document_active
+from common.public_search_cache import bump_public_search_version
 from common.embedding_utils import coerce_embedding_vectors
 from data.common import stream_chunk_document
 from data.milvus.insert import upsert_milvus
@@ -233,6 +234,13 @@ async def _mark_embedding_success(
             db_embedding_task.celery_task_id = None
             db_embedding_task.update_time = datetime.now(timezone.utc)
             await db.commit()
+        db_publish_document = await crud.document.get_publish_document_by_document_id_async(
+            db=db,
+            document_id=document_id,
+        )
+    # 已公开的文档此时才能被公开检索命中，让公开检索缓存失效
+    if db_publish_document is not None:
+        await bump_public_search_version()
     return state
 
 
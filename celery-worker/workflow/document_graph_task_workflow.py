@@ -6,14 +6,14 @@ import crud
 from langgraph.graph import StateGraph, END
 
 from common.dependencies import check_deployed_by_official_in_fuc, plan_ability_checked_in_func
+from common.graph_community import bump_graph_version, mark_user_graph_dirty
 from common.jwt_utils import create_token
 from common.logger import exception_logger
 from common.document_guard import ensure_document_active
 from data.common import (
-    close_extract_llm_client,
     stream_chunk_document,
     extract_entities_relations,
-    get_extract_llm_client,
+    acquire_extract_llm_client,
     resolve_entities_with_semantic_dedupe,
 )
 from data.custom_types.all import DocumentInfo
@@ -27,8 +27,10 @@ from data.neo4j.insert import (
     upsert_chunks_neo4j,
     upsert_doc_chunk_relations,
     upsert_doc_neo4j,
+    refresh_document_graph_neighbourhood,
 )
 from data.neo4j.search import get_entities_by_text_and_type
+from config.neo4j import NEO4J_GRAPH_MAINTENANCE_MODE
 from engine.embedding.factory import get_embedding_engine
 from data.sql.base import async_session_context
 from enums.ability import Ability
@@ -50,6 +52,7 @@ class DocumentGraphState(TypedDict, total=False):
     model_id: int
     llm_model_name: str
     chunk_snapshot_path: str | None
+    extracted_entities_count: int
 
 
 WORKFLOW_NAME = "document_graph_task"
@@ -169,9 +172,10 @@ async def _extract_chunks(state: DocumentGraphState) -> DocumentGraphState:
         raise Exception("Knowledge graph workflow missing required context")
     await _ensure_graph_task_not_cancelled(document_id)
 
-    llm_client = await get_extract_llm_client(
+    llm_lease = await acquire_extract_llm_client(
         user_id=user_id
     )
+    llm_client = llm_lease.client
     existing_entities_index: dict[tuple[str, str], list[dict]] = {}
     embedding_engine = get_embedding_engine()
     chunk_count = 0
@@ -243,8 +247,9 @@ async def _extract_chunks(state: DocumentGraphState) -> DocumentGraphState:
             upsert_elapsed_ms=upsert_elapsed_ms,
         )
     finally:
-        await close_extract_llm_client(llm_client)
+        await llm_lease.release()
 
+    state["extracted_entities_count"] = extracted_entities_count
     return state
 
 
@@ -277,6 +282,20 @@ async def _persist_graph(state: DocumentGraphState) -> DocumentGraphState:
         await upsert_doc_neo4j(
             docs_info=[doc_info]
         )
+    if NEO4J_GRAPH_MAINTENANCE_MODE != "full":
+        # MENTIONS 已在逐 chunk 的 upsert 中按实体写入，这里只维护本文档的邻域
+        with timed_stage(
+            workflow_name=WORKFLOW_NAME,
+            node_name="persist_graph",
+            stage_name="refresh_document_graph_neighbourhood",
+            context={"document_id": document_id},
+        ):
+            await refresh_document_graph_neighbourhood(doc_id=document_id)
+        await mark_user_graph_dirty(
+            user_id=doc_info.creator_id,
+            changed_entities=state.get("extracted_entities_count", 0),
+        )
+        return state
     with timed_stage(
         workflow_name=WORKFLOW_NAME,
         node_name="persist_graph",
@@ -300,6 +319,8 @@ async def _persist_graph(state: DocumentGraphState) -> DocumentGraphState:
         await create_communities_from_chunks()
         await create_community_nodes_and_relationships_with_size()
         await annotate_node_degrees()
+    # 全量 Louvain 会改动所有用户的社区，按全局版本失效缓存
+    await bump_graph_version()
     return state
 
 
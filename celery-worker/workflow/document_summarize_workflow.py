@@ -9,12 +9,11 @@ from common.ai import reducer_summary, summary_content
 from common.logger import exception_logger
 from common.document_guard import ensure_document_active
 from data.common import (
+    acquire_extract_llm_client,
     build_sampled_chunk_indexes,
-    close_extract_llm_client,
     ensure_document_chunk_snapshot,
     extract_entities_relations,
     get_document_markdown_length,
-    get_extract_llm_client,
     stream_chunk_document,
 )
 from data.sql.base import async_session_context
@@ -159,9 +158,10 @@ async def _summarize_document(
             )
         )
 
-    llm_client = await get_extract_llm_client(
+    llm_lease = await acquire_extract_llm_client(
         user_id=user_id
     )
+    llm_client = llm_lease.client
     final_summary_info = None
     chunk_count = 0
     extract_elapsed_ms = 0.0
@@ -231,7 +231,7 @@ async def _summarize_document(
             reduce_elapsed_ms=reduce_elapsed_ms,
         )
     finally:
-        await close_extract_llm_client(llm_client)
+        await llm_lease.release()
     if final_summary_info is not None:
         state["summary"] = final_summary_info.summary
         state["title"] = final_summary_info.title
@@ -1,6 +1,5 @@
 import asyncio
 import base64
-import inspect
 import json
 import re
 import time
@@ -10,7 +9,7 @@ from io import BytesIO
 
 import crud
 from langfuse import propagate_attributes
-from langfuse.openai import AsyncOpenAI
+from common.llm_client_pool import acquire_llm_client
 
 from base_implement.image_generate_engine_base import ImageGenerateEngineBase
 from common.ai import (
@@ -80,27 +79,6 @@ def _compact_markdown(markdown: str, max_chars: int) -> str:
     )
 
 
-async def _safe_close_async_client(client: AsyncOpenAI) -> None:
-    close_fn = getattr(client, "close", None)
-    if callable(close_fn):
-        try:
-            result = close_fn()
-            if inspect.isawaitable(result):
-                await result
-        except Exception as e:
-            exception_logger.warning(f"[SectionPPT] close llm client failed: {e}")
-        return
-
-    aclose_fn = getattr(client, "aclose", None)
-    if callable(aclose_fn):
-        try:
-            result = aclose_fn()
-            if inspect.isawaitable(result):
-                await result
-        except Exception as e:
-            exception_logger.warning(f"[SectionPPT] aclose llm client failed: {e}")
-
-
 async def _write_manifest(
     *,
     remote_file_service: RemoteFileServiceProtocol,
@@ -261,10 +239,11 @@ async def _plan_section_ppt(
         user_id=str(user_id),
         tags=[f"model:{model_conf.model_name}"],
     ):
-        client = AsyncOpenAI(
-            api_key=model_conf.api_key,
+        lease = await acquire_llm_client(
             base_url=model_conf.base_url,
+            api_key=model_conf.api_key,
         )
+        client = lease.client
         try:
             completion = await client.chat.completions.create(
                 model=model_conf.model_name,
@@ -304,7 +283,7 @@ async def _plan_section_ppt(
                 slides=slides,
             )
         finally:
-            await _safe_close_async_client(client)
+            await lease.release()
 
 
 async def _generate_slide_image(
@@ -1,9 +1,12 @@
 import asyncio
 import base64
+import hashlib
+import json
 import re
 import time
 import uuid
 from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import TypedDict
 
@@ -12,7 +15,10 @@ from celery import current_app
 from langgraph.graph import StateGraph, END
 
 from common.ai import make_section_markdown
+from common.graph_community import get_user_graph_version
 from common.logger import exception_logger, info_logger
+from common.redis import redis_pool
+from config.section import SECTION_MARKDOWN_COMPOSE_CONCURRENCY, SECTION_MARKDOWN_COMPOSE_MODE
 from data.custom_types.all import EntityInfo, RelationInfo
 from data.neo4j.base import async_neo4j_driver
 from data.sql.base import async_session_context
@@ -67,26 +73,34 @@ async def _ensure_section_process_task_not_cancelled(section_id: int) -> None:
             )
 
 
-ENTITY_QUERY = """
+# Top-k selection happens in Neo4j: entities are ranked by how often the
+# section's documents mention them, then by graph degree and community size,
+# and only the budgeted slice leaves the server (``total`` is the full count).
+RANKED_ENTITY_QUERY = """
     MATCH (d:Document)
     WHERE d.creator_id = $user_id AND d.id IN $doc_ids
     MATCH (d)-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(e:Entity)
     WITH e, count(*) AS mention_count
-    RETURN e.id AS id, e.text AS text, e.entity_type AS entity_type
-    ORDER BY mention_count DESC, id ASC
+    OPTIONAL MATCH (e)-[:BELONGS_TO]->(com:Community)
+    WHERE NOT toString(com.id) STARTS WITH 'u'
+       OR com.id STARTS WITH 'u' + toString($user_id) + ':'
+    WITH e, mention_count, max(coalesce(com.size, 0)) AS community_size
+    ORDER BY mention_count DESC, coalesce(e.degree, 0) DESC, community_size DESC, e.id ASC
+    WITH collect({id: e.id, text: e.text, entity_type: e.entity_type}) AS ranked
+    RETURN size(ranked) AS total, ranked[0..$limit] AS entities
 """
 
-EDGE_QUERY = """
-    MATCH (d:Document)
-    WHERE d.creator_id = $user_id AND d.id IN $doc_ids
-    MATCH (d)-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(e:Entity)
-    WITH collect(DISTINCT e) AS entities
-    UNWIND entities AS e1
-    MATCH (e1)-[r]->(e2)
-    WHERE e2 IN entities
+# Relations are taken among the selected entities only, so every edge the LLM
+# sees points at an entity it also sees.
+RANKED_EDGE_QUERY = """
+    MATCH (e1:Entity)-[r]->(e2:Entity)
+    WHERE e1.id IN $entity_ids AND e2.id IN $entity_ids
     WITH e1, e2, type(r) AS relation_type, count(*) AS relation_count
-    RETURN e1.id AS src_id, e2.id AS tgt_id, relation_type AS relation_type
-    ORDER BY relation_count DESC, src_id ASC, tgt_id ASC, relation_type ASC
+    ORDER BY relation_count DESC,
+        coalesce(e1.degree, 0) + coalesce(e2.degree, 0) DESC,
+        e1.id ASC, e2.id ASC, relation_type ASC
+    WITH collect({src_id: e1.id, tgt_id: e2.id, relation_type: relation_type}) AS ranked
+    RETURN size(ranked) AS total, ranked[0..$limit] AS relations
 """
 
 DOCUMENT_MARKDOWN_FETCH_CONCURRENCY = 6
@@ -103,6 +117,12 @@ SECTION_MARKDOWN_CONTEXT_HEAD_CHAR_LIMIT = 4_000
 SECTION_MARKDOWN_CONTEXT_MEMORY_CHAR_LIMIT = 5_000
 SECTION_MARKDOWN_FAST_PATH_ENTITY_LIMIT = 12
 SECTION_MARKDOWN_FAST_PATH_RELATION_LIMIT = 12
+SECTION_MARKDOWN_TREE_CACHE_KEY_PREFIX = "section:markdown:tree:"
+SECTION_MARKDOWN_TREE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+# Bump when the compose prompt changes so cached tree nodes are not reused.
+SECTION_MARKDOWN_TREE_CACHE_VERSION = "1"
+SECTION_GRAPH_CONTEXT_CACHE_KEY_PREFIX = "section:graph_context:"
+SECTION_GRAPH_CONTEXT_CACHE_TTL_SECONDS = 7 * 24 * 3600
 SECTION_IMAGE_MIN_CONTENT_CHARS = 2_000
 SECTION_IMAGE_MIN_ENTITY_COUNT = 6
 SECTION_IMAGE_MIN_RELATION_COUNT = 4
@@ -1015,6 +1035,406 @@ async def _compose_section_markdown_in_batches(
     )
     return merged_markdown or ""
 
+def _section_markdown_tree_node_hash(*parts: str) -> str:
+    payload = "\x1f".join((SECTION_MARKDOWN_TREE_CACHE_VERSION, *parts))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _section_markdown_tree_cache_key(section_id: int, node_hash: str) -> str:
+    return f"{SECTION_MARKDOWN_TREE_CACHE_KEY_PREFIX}{section_id}:{node_hash}"
+
+
+async def _load_section_markdown_tree_nodes(
+    *,
+    section_id: int,
+    node_hashes: list[str],
+) -> dict[str, str]:
+    if not node_hashes:
+        return {}
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        values = await redis_conn.mget(
+            [_section_markdown_tree_cache_key(section_id, node_hash) for node_hash in node_hashes]
+        )
+    except Exception as e:
+        exception_logger.warning(
+            f"[SectionMarkdown] tree cache read failed: section={section_id}, error={e}"
+        )
+        return {}
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+    return {
+        node_hash: value
+        for node_hash, value in zip(node_hashes, values)
+        if value
+    }
+
+
+async def _store_section_markdown_tree_nodes(
+    *,
+    section_id: int,
+    nodes: dict[str, str],
+) -> None:
+    if not nodes:
+        return
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        async with redis_conn.pipeline(transaction=False) as pipe:
+            for node_hash, markdown in nodes.items():
+                pipe.set(
+                    _section_markdown_tree_cache_key(section_id, node_hash),
+                    markdown,
+                    ex=SECTION_MARKDOWN_TREE_CACHE_TTL_SECONDS,
+                )
+            await pipe.execute()
+    except Exception as e:
+        exception_logger.warning(
+            f"[SectionMarkdown] tree cache write failed: section={section_id}, error={e}"
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+
+@dataclass
+class SectionGraphContext:
+    entities: list[EntityInfo]
+    relations: list[RelationInfo]
+    total_entities: int
+    total_relations: int
+    cache_hit: bool = False
+
+
+def _section_graph_context_cache_key(
+    *,
+    section_id: int,
+    user_id: int,
+    graph_version: str,
+    graph_document_ids: list[int],
+) -> str:
+    payload = "\x1f".join((
+        str(user_id),
+        graph_version,
+        str(SECTION_MARKDOWN_MAX_ENTITIES),
+        str(SECTION_MARKDOWN_MAX_RELATIONS),
+        ",".join(str(document_id) for document_id in sorted(graph_document_ids)),
+    ))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{SECTION_GRAPH_CONTEXT_CACHE_KEY_PREFIX}{section_id}:{digest}"
+
+
+async def _query_section_graph_context(
+    *,
+    user_id: int,
+    graph_document_ids: list[int],
+) -> SectionGraphContext:
+    async with async_neo4j_driver.session() as session:
+        entities_result = await session.run(
+            RANKED_ENTITY_QUERY,
+            user_id=user_id,
+            doc_ids=graph_document_ids,
+            limit=SECTION_MARKDOWN_MAX_ENTITIES,
+        )
+        entities_record = await entities_result.single()
+        entities = [
+            EntityInfo(
+                id=item["id"],
+                text=item["text"],
+                entity_type=item["entity_type"],
+                chunks=[]
+            )
+            for item in (entities_record["entities"] if entities_record else [])
+        ]
+        relations: list[RelationInfo] = []
+        total_relations = 0
+        if entities:
+            relations_result = await session.run(
+                RANKED_EDGE_QUERY,
+                entity_ids=[entity.id for entity in entities],
+                limit=SECTION_MARKDOWN_MAX_RELATIONS,
+            )
+            relations_record = await relations_result.single()
+            if relations_record:
+                total_relations = relations_record["total"]
+                relations = [
+                    RelationInfo(
+                        src_node=item["src_id"],
+                        tgt_node=item["tgt_id"],
+                        relation_type=item["relation_type"]
+                    )
+                    for item in relations_record["relations"]
+                ]
+    return SectionGraphContext(
+        entities=entities,
+        relations=relations,
+        total_entities=entities_record["total"] if entities_record else 0,
+        total_relations=total_relations,
+    )
+
+
+async def _load_section_graph_context(
+    *,
+    section_id: int,
+    user_id: int,
+    graph_document_ids: list[int],
+) -> SectionGraphContext:
+    """Top-ranked entities/relations of the section's documents, cached per
+    (section, documents, user graph version)."""
+    if not graph_document_ids:
+        return SectionGraphContext(entities=[], relations=[], total_entities=0, total_relations=0)
+    cache_key = None
+    redis_conn = None
+    try:
+        redis_conn = await redis_pool()
+        graph_version = await get_user_graph_version(redis_conn, user_id)
+        cache_key = _section_graph_context_cache_key(
+            section_id=section_id,
+            user_id=user_id,
+            graph_version=graph_version,
+            graph_document_ids=graph_document_ids,
+        )
+        cached = await redis_conn.get(cache_key)
+        if cached:
+            payload = json.loads(cached)
+            return SectionGraphContext(
+                entities=[EntityInfo.model_validate(item) for item in payload["entities"]],
+                relations=[RelationInfo.model_validate(item) for item in payload["relations"]],
+                total_entities=payload["total_entities"],
+                total_relations=payload["total_relations"],
+                cache_hit=True,
+            )
+    except Exception as e:
+        exception_logger.warning(
+            f"[SectionMarkdown] graph context cache read failed: section={section_id}, error={e}"
+        )
+    finally:
+        if redis_conn is not None:
+            await redis_conn.aclose()
+
+    graph_context = await _query_section_graph_context(
+        user_id=user_id,
+        graph_document_ids=graph_document_ids,
+    )
+    if cache_key is not None:
+        redis_conn = None
+        try:
+            redis_conn = await redis_pool()
+            await redis_conn.set(
+                cache_key,
+                json.dumps(
+                    {
+                        "entities": [entity.model_dump(exclude_none=True) for entity in graph_context.entities],
+                        "relations": [relation.model_dump() for relation in graph_context.relations],
+                        "total_entities": graph_context.total_entities,
+                        "total_relations": graph_context.total_relations,
+                    },
+                    ensure_ascii=False,
+                ),
+                ex=SECTION_GRAPH_CONTEXT_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            exception_logger.warning(
+                f"[SectionMarkdown] graph context cache write failed: section={section_id}, error={e}"
+            )
+        finally:
+            if redis_conn is not None:
+                await redis_conn.aclose()
+    return graph_context
+
+
+async def _compose_section_markdown_as_tree(
+    *,
+    section_id: int,
+    user_id: int,
+    model_id: int,
+    markdown_contents: list[str],
+    entities: list[EntityInfo],
+    relations: list[RelationInfo],
+) -> str:
+    """Map-reduce composition: every document batch is drafted on its own (in
+    parallel), then drafts are merged pairwise level by level. Leaves and merge
+    nodes are cached by content hash, so appending a document only recomputes
+    its leaf and the merges on the right-most path of the tree.
+
+    Entities / relations are deliberately not part of the node hash — they grow
+    with every document, and keying on them would invalidate the whole tree."""
+    leaves: list[tuple[str, str]] = []
+    for markdown in markdown_contents:
+        for batch in _build_markdown_batches(
+            markdown_contents=[markdown],
+            max_batch_chars=SECTION_MARKDOWN_BATCH_CHAR_LIMIT,
+        ):
+            leaves.append(
+                (_section_markdown_tree_node_hash("leaf", str(model_id), batch), batch)
+            )
+    if not leaves:
+        return ""
+
+    try:
+        concurrency = max(1, int(SECTION_MARKDOWN_COMPOSE_CONCURRENCY))
+    except (TypeError, ValueError):
+        concurrency = 4
+    semaphore = asyncio.Semaphore(concurrency)
+    leaf_calls = 0
+    merge_calls = 0
+    cached_nodes = 0
+    split_batches = 0
+    context_backoff_count = 0
+
+    async def _compose(
+        *,
+        stage_name: str,
+        current_markdown: str | None,
+        new_markdown: str,
+    ) -> str:
+        async with semaphore:
+            with timed_stage(
+                workflow_name=WORKFLOW_NAME,
+                node_name="build_section_content",
+                stage_name=stage_name,
+                context={
+                    "section_id": section_id,
+                    "context_chars": 0 if current_markdown is None else len(current_markdown),
+                    "batch_chars": len(new_markdown),
+                },
+            ):
+                return await make_section_markdown(
+                    user_id=user_id,
+                    model_id=model_id,
+                    current_markdown_content=current_markdown,
+                    new_markdown_contents_to_append=new_markdown,
+                    entities=entities,
+                    relations=relations,
+                )
+
+    async def _merge(left: str, right: str) -> str:
+        nonlocal merge_calls, context_backoff_count
+        context_char_limit = SECTION_MARKDOWN_CONTEXT_CHAR_LIMIT
+        while True:
+            try:
+                merge_calls += 1
+                return await _compose(
+                    stage_name="compose_section_markdown_tree_merge",
+                    current_markdown=_truncate_markdown_context(left, max_chars=context_char_limit),
+                    new_markdown=_truncate_markdown_context(right, max_chars=context_char_limit) or "",
+                )
+            except Exception as compose_error:
+                if (
+                    not _is_token_limit_error(compose_error)
+                    or context_char_limit <= SECTION_MARKDOWN_CONTEXT_MIN_CHAR_LIMIT
+                ):
+                    raise
+                next_limit = max(
+                    SECTION_MARKDOWN_CONTEXT_MIN_CHAR_LIMIT,
+                    int(context_char_limit * SECTION_MARKDOWN_CONTEXT_BACKOFF_RATE),
+                )
+                context_backoff_count += 1
+                exception_logger.warning(
+                    f"[SectionMarkdown] token limit hit on tree merge and context backoff: "
+                    f"section={section_id}, left_chars={len(left)}, right_chars={len(right)}, "
+                    f"context_limit={context_char_limit}, next_context_limit={next_limit}"
+                )
+                context_char_limit = next_limit
+
+    async def _compose_leaf(batch: str) -> str:
+        nonlocal leaf_calls, split_batches
+        try:
+            leaf_calls += 1
+            return await _compose(
+                stage_name="compose_section_markdown_tree_leaf",
+                current_markdown=None,
+                new_markdown=batch,
+            )
+        except Exception as compose_error:
+            if (
+                not _is_token_limit_error(compose_error)
+                or len(batch) <= SECTION_MARKDOWN_MIN_SPLIT_CHARS * 2
+            ):
+                raise
+            left, right = _split_text_near_middle(batch)
+            if not left or not right:
+                raise
+            split_batches += 1
+            exception_logger.warning(
+                f"[SectionMarkdown] token limit hit on tree leaf and batch split: section={section_id}, "
+                f"original_chars={len(batch)}, left_chars={len(left)}, right_chars={len(right)}"
+            )
+            left_markdown, right_markdown = await asyncio.gather(
+                _compose_leaf(left),
+                _compose_leaf(right),
+            )
+            return await _merge(left_markdown, right_markdown)
+
+    # Map: draft every leaf that isn't cached yet.
+    leaf_hashes = [node_hash for node_hash, _ in leaves]
+    cached = await _load_section_markdown_tree_nodes(
+        section_id=section_id,
+        node_hashes=list(dict.fromkeys(leaf_hashes)),
+    )
+    cached_nodes += len(cached)
+    missing_leaves = {
+        node_hash: batch
+        for node_hash, batch in leaves
+        if node_hash not in cached
+    }
+    drafted = await asyncio.gather(
+        *[_compose_leaf(batch) for batch in missing_leaves.values()]
+    )
+    fresh = dict(zip(missing_leaves.keys(), drafted))
+    await _store_section_markdown_tree_nodes(section_id=section_id, nodes=fresh)
+    level = [(node_hash, cached.get(node_hash) or fresh[node_hash]) for node_hash in leaf_hashes]
+
+    # Reduce: merge neighbours pairwise; an odd node is carried up unchanged.
+    tree_levels = 1
+    while len(level) > 1:
+        tree_levels += 1
+        pairs = [
+            (
+                _section_markdown_tree_node_hash("merge", str(model_id), level[i][0], level[i + 1][0]),
+                level[i][1],
+                level[i + 1][1],
+            )
+            for i in range(0, len(level) - 1, 2)
+        ]
+        cached = await _load_section_markdown_tree_nodes(
+            section_id=section_id,
+            node_hashes=list(dict.fromkeys(node_hash for node_hash, _, _ in pairs)),
+        )
+        cached_nodes += len(cached)
+        missing_pairs = {
+            node_hash: (left, right)
+            for node_hash, left, right in pairs
+            if node_hash not in cached
+        }
+        merged = await asyncio.gather(
+            *[_merge(left, right) for left, right in missing_pairs.values()]
+        )
+        fresh = dict(zip(missing_pairs.keys(), merged))
+        await _store_section_markdown_tree_nodes(section_id=section_id, nodes=fresh)
+        next_level = [
+            (node_hash, cached.get(node_hash) or fresh[node_hash])
+            for node_hash, _, _ in pairs
+        ]
+        if len(level) % 2 == 1:
+            next_level.append(level[-1])
+        level = next_level
+
+    set_stage_metrics(
+        compose_mode="tree",
+        tree_leaves=len(leaves),
+        tree_levels=tree_levels,
+        cached_nodes=cached_nodes,
+        leaf_calls=leaf_calls,
+        merge_calls=merge_calls,
+        split_batches=split_batches,
+        context_backoff_count=context_backoff_count,
+    )
+    return level[0][1]
+
+
 
 async def _fetch_document_markdown(
     *,
@@ -1242,7 +1662,10 @@ async def _build_section_content(
 
     current_markdown_content = None
     force_full_rebuild = bool(state.get("force_full_rebuild"))
-    if section_md_file_name is not None and not force_full_rebuild:
+    # tree mode always recomposes from every ready document; unchanged branches
+    # come from the tree cache, so the previous markdown isn't needed as context.
+    compose_as_tree = SECTION_MARKDOWN_COMPOSE_MODE == "tree"
+    if section_md_file_name is not None and not force_full_rebuild and not compose_as_tree:
         try:
             with timed_stage(
                 workflow_name=WORKFLOW_NAME,
@@ -1269,7 +1692,7 @@ async def _build_section_content(
             f"section={section_id}"
         )
 
-    rebuild_from_all_documents = (
+    rebuild_from_all_documents = compose_as_tree or (
         section_md_file_name is not None
         and not (current_markdown_content or "").strip()
     )
@@ -1290,13 +1713,21 @@ async def _build_section_content(
                     fallback_target_ids.append(section_document.document_id)
                 else:
                     fallback_pending.append((section_document.document_id, reason))
-        if fallback_target_ids:
-            target_document_ids = fallback_target_ids
-        exception_logger.warning(
-            f"[SectionMarkdown] previous markdown missing, fallback to rebuild from source docs: "
-            f"section={section_id}, target_docs={len(target_document_ids)}, "
-            f"pending_docs={len(fallback_pending)}"
-        )
+        if compose_as_tree:
+            # Stable leaf order: new documents land on the right-most branch.
+            target_document_ids = sorted(set(fallback_target_ids) | set(target_document_ids))
+            info_logger.info(
+                f"[SectionMarkdown] tree compose from source docs: section={section_id}, "
+                f"target_docs={len(target_document_ids)}, pending_docs={len(fallback_pending)}"
+            )
+        else:
+            if fallback_target_ids:
+                target_document_ids = fallback_target_ids
+            exception_logger.warning(
+                f"[SectionMarkdown] previous markdown missing, fallback to rebuild from source docs: "
+                f"section={section_id}, target_docs={len(target_document_ids)}, "
+                f"pending_docs={len(fallback_pending)}"
+            )
 
     fetch_semaphore = asyncio.Semaphore(DOCUMENT_MARKDOWN_FETCH_CONCURRENCY)
     fetch_tasks = [
@@ -1372,8 +1803,6 @@ async def _build_section_content(
     if not graph_document_ids:
         graph_document_ids = ok_document_ids
 
-    entities: list[EntityInfo] = []
-    relations: list[RelationInfo] = []
     with timed_stage(
         workflow_name=WORKFLOW_NAME,
         node_name="build_section_content",
@@ -1384,48 +1813,22 @@ async def _build_section_content(
             "graph_documents": len(graph_document_ids),
         },
     ):
-        async with async_neo4j_driver.session() as session:
-            entities_result = await session.run(
-                ENTITY_QUERY,
-                user_id=user_id,
-                doc_ids=graph_document_ids
-            )
-            async for record in entities_result:
-                entities.append(
-                    EntityInfo(
-                        id=record["id"],
-                        text=record["text"],
-                        entity_type=record["entity_type"],
-                        chunks=[]
-                    )
-                )
-            relations_result = await session.run(
-                EDGE_QUERY,
-                user_id=user_id,
-                doc_ids=graph_document_ids
-            )
-            async for record in relations_result:
-                relations.append(
-                    RelationInfo(
-                        src_node=record["src_id"],
-                        tgt_node=record["tgt_id"],
-                        relation_type=record["relation_type"]
-                    )
-                )
-
-    entities_for_ai = entities
-    relations_for_ai = relations
-    if len(entities_for_ai) > SECTION_MARKDOWN_MAX_ENTITIES:
-        entities_for_ai = entities_for_ai[:SECTION_MARKDOWN_MAX_ENTITIES]
-        exception_logger.warning(
-            f"[SectionMarkdown] entities truncated for LLM: section={section_id}, "
-            f"original={len(entities)}, used={len(entities_for_ai)}"
+        graph_context = await _load_section_graph_context(
+            section_id=section_id,
+            user_id=user_id,
+            graph_document_ids=graph_document_ids,
         )
-    if len(relations_for_ai) > SECTION_MARKDOWN_MAX_RELATIONS:
-        relations_for_ai = relations_for_ai[:SECTION_MARKDOWN_MAX_RELATIONS]
-        exception_logger.warning(
-            f"[SectionMarkdown] relations truncated for LLM: section={section_id}, "
-            f"original={len(relations)}, used={len(relations_for_ai)}"
+    entities_for_ai = graph_context.entities
+    relations_for_ai = graph_context.relations
+    if graph_context.total_entities > len(entities_for_ai):
+        info_logger.info(
+            f"[SectionMarkdown] top entities selected for LLM: section={section_id}, "
+            f"original={graph_context.total_entities}, used={len(entities_for_ai)}"
+        )
+    if graph_context.total_relations > len(relations_for_ai):
+        info_logger.info(
+            f"[SectionMarkdown] top relations selected for LLM: section={section_id}, "
+            f"original={graph_context.total_relations}, used={len(relations_for_ai)}"
         )
 
     with timed_stage(
@@ -1439,15 +1842,25 @@ async def _build_section_content(
             "relations": len(relations_for_ai),
         },
     ):
-        content = await _compose_section_markdown_in_batches(
-            section_id=section_id,
-            user_id=user_id,
-            model_id=model_id,
-            current_markdown_content=current_markdown_content,
-            markdown_contents=markdown_contents,
-            entities=entities_for_ai,
-            relations=relations_for_ai,
-        )
+        if compose_as_tree:
+            content = await _compose_section_markdown_as_tree(
+                section_id=section_id,
+                user_id=user_id,
+                model_id=model_id,
+                markdown_contents=markdown_contents,
+                entities=entities_for_ai,
+                relations=relations_for_ai,
+            )
+        else:
+            content = await _compose_section_markdown_in_batches(
+                section_id=section_id,
+                user_id=user_id,
+                model_id=model_id,
+                current_markdown_content=current_markdown_content,
+                markdown_contents=markdown_contents,
+                entities=entities_for_ai,
+                relations=relations_for_ai,
+            )
 
     should_generate_images, skip_image_reason = _should_generate_section_images(
         content=content,
@@ -1572,8 +1985,9 @@ async def _build_section_content(
         target_documents=len(target_document_ids),
         ok_documents=len(ok_document_ids),
         failed_documents=len(failed_document_ids),
-        entities=len(entities),
-        relations=len(relations),
+        entities=graph_context.total_entities,
+        relations=graph_context.total_relations,
+        graph_context_cache_hit=graph_context.cache_hit,
         graph_documents=len(graph_document_ids),
         rebuild_from_all_documents=rebuild_from_all_documents,
         entities_used=len(entities_for_ai),